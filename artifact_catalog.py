@@ -0,0 +1,350 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import glob
+import time
+import struct
+import sqlite3
+import logging
+import threading
+from dotenv import load_dotenv
+
+logger = logging.getLogger(__name__)
+
+# 환경 변수 로드
+load_dotenv()
+
+
+def _env_float(name, default):
+    """주석이 포함될 수 있는 실수 환경변수 로드"""
+    value = os.getenv(name, str(default)).split('#')[0].strip()
+    try:
+        return float(value)
+    except ValueError:
+        return default
+
+
+# 디버깅 파일 카탈로그 (경로, 종류, 크기, 수정 시각)
+CATALOG_FILE = os.getenv('ARTIFACT_CATALOG_FILE', 'artifact_catalog.sqlite').split('#')[0].strip()
+
+# 디버깅 파일 전체 크기 상한 (MB)과 보관 기간 (시간)
+ARTIFACT_MAX_MB = _env_float('ARTIFACT_MAX_MB', 100)
+ARTIFACT_MAX_AGE_HOURS = _env_float('ARTIFACT_MAX_AGE_HOURS', 24)
+
+# 우리 코드 밖에서 생긴 파일도 inotify로 카탈로그에 반영할지 여부 (Linux 전용)
+ARTIFACT_INOTIFY = os.getenv('ARTIFACT_INOTIFY', '0').split('#')[0].strip().lower() in ('1', 'true', 'yes', 'on')
+
+# 한 번에 삭제할 최대 행 수
+DELETE_BATCH = 500
+
+KINDS = {
+    '.png': 'screenshot',
+    '.jpg': 'screenshot',
+    '.html': 'html',
+    '.htm': 'html',
+    '.txt': 'text',
+    '.xml': 'text',
+    '.json': 'text',
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS artifacts (
+    path TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS artifacts_mtime ON artifacts(mtime);
+"""
+
+_lock = threading.RLock()
+_conn = None
+
+
+def kind_of(path):
+    """확장자로 파일 종류 판별 (.gz/.zst 압축 확장자는 건너뜀)"""
+    name = path.lower()
+    for suffix in ('.gz', '.zst'):
+        if name.endswith(suffix):
+            name = name[:-len(suffix)]
+    return KINDS.get(os.path.splitext(name)[1], 'other')
+
+
+def _connect():
+    """카탈로그 연결 (여러 프로세스가 함께 쓰므로 WAL + busy timeout)"""
+    global _conn
+    if _conn is None:
+        directory = os.path.dirname(CATALOG_FILE)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        _conn = sqlite3.connect(CATALOG_FILE, timeout=10, check_same_thread=False)
+        _conn.execute('PRAGMA journal_mode=WAL')
+        _conn.execute('PRAGMA synchronous=NORMAL')
+        _conn.executescript(SCHEMA)
+    return _conn
+
+
+def register(path, kind=None, size=None, mtime=None):
+    """파일 생성/갱신 시 카탈로그에 기록 (크기/시각을 모르면 stat으로 채움)"""
+    path = os.path.abspath(path)
+    if size is None or mtime is None:
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return
+        size = stat.st_size if size is None else size
+        mtime = stat.st_mtime if mtime is None else mtime
+    with _lock:
+        conn = _connect()
+        conn.execute(
+            'INSERT INTO artifacts (path, kind, size, mtime) VALUES (?, ?, ?, ?) '
+            'ON CONFLICT(path) DO UPDATE SET kind = excluded.kind, size = excluded.size, mtime = excluded.mtime',
+            (path, kind or kind_of(path), size, mtime),
+        )
+        conn.commit()
+
+
+def forget(path):
+    """카탈로그에서 항목 제거 (파일은 건드리지 않음)"""
+    with _lock:
+        conn = _connect()
+        conn.execute('DELETE FROM artifacts WHERE path = ?', (os.path.abspath(path),))
+        conn.commit()
+
+
+def totals():
+    """(파일 수, 전체 크기) 조회"""
+    with _lock:
+        return _connect().execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM artifacts').fetchone()
+
+
+def _delete_rows(conn, rows):
+    """파일을 지우고 카탈로그 행 제거 (이미 없는 파일은 행만 제거)"""
+    freed = 0
+    removed = []
+    for path, size in rows:
+        try:
+            os.remove(path)
+            freed += size
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"디버깅 파일 삭제 실패: {path} - {str(e)}")
+            continue
+        removed.append((path,))
+    conn.executemany('DELETE FROM artifacts WHERE path = ?', removed)
+    return freed
+
+
+def enforce(max_bytes=None, max_age_seconds=None, now=None):
+    """보관 기간/크기 상한을 넘는 파일만 골라 삭제 - (삭제 수, 확보 바이트)
+
+    전체 파일을 훑지 않고 mtime 인덱스 조회로 대상만 찾는다.
+    """
+    max_bytes = ARTIFACT_MAX_MB * 1024 * 1024 if max_bytes is None else max_bytes
+    max_age_seconds = ARTIFACT_MAX_AGE_HOURS * 3600 if max_age_seconds is None else max_age_seconds
+    now = now or time.time()
+    deleted, freed = 0, 0
+    with _lock:
+        conn = _connect()
+        if max_age_seconds:
+            cutoff = now - max_age_seconds
+            while True:
+                rows = conn.execute(
+                    'SELECT path, size FROM artifacts WHERE mtime < ? ORDER BY mtime LIMIT ?', (cutoff, DELETE_BATCH)
+                ).fetchall()
+                if not rows:
+                    break
+                before = conn.total_changes
+                freed += _delete_rows(conn, rows)
+                if conn.total_changes == before:
+                    break
+                deleted += conn.total_changes - before
+        if max_bytes:
+            total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM artifacts').fetchone()[0]
+            while total > max_bytes:
+                rows = conn.execute('SELECT path, size FROM artifacts ORDER BY mtime LIMIT ?', (DELETE_BATCH,)).fetchall()
+                if not rows:
+                    break
+                victims = []
+                for path, size in rows:
+                    if total <= max_bytes:
+                        break
+                    victims.append((path, size))
+                    total -= size
+                before = conn.total_changes
+                freed += _delete_rows(conn, victims)
+                if conn.total_changes == before:
+                    break
+                deleted += conn.total_changes - before
+        conn.commit()
+    if deleted:
+        logger.info(f"디버깅 파일 정리: {deleted}개 삭제, {freed / 1048576:.1f}MB 확보")
+    return deleted, freed
+
+
+def bootstrap(directories_and_patterns):
+    """카탈로그가 비어 있으면 기존 파일을 한 번 등록 ([(디렉토리, 패턴 목록), ...])"""
+    if totals()[0]:
+        return 0
+    return sum(scan(directory, patterns) for directory, patterns in directories_and_patterns)
+
+
+def scan(directory, patterns=('*',)):
+    """기존 파일을 카탈로그에 일괄 등록 (처음 도입하거나 카탈로그를 다시 만들 때 한 번)"""
+    rows = []
+    for pattern in patterns:
+        for path in glob.glob(os.path.join(directory, pattern)):
+            if path.endswith('.tmp') or not os.path.isfile(path):
+                continue
+            stat = os.stat(path)
+            rows.append((os.path.abspath(path), kind_of(path), stat.st_size, stat.st_mtime))
+    with _lock:
+        conn = _connect()
+        conn.executemany(
+            'INSERT INTO artifacts (path, kind, size, mtime) VALUES (?, ?, ?, ?) '
+            'ON CONFLICT(path) DO UPDATE SET size = excluded.size, mtime = excluded.mtime',
+            rows,
+        )
+        conn.commit()
+    return len(rows)
+
+
+# inotify 이벤트 마스크 (linux/inotify.h)
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_DELETE = 0x00000200
+_EVENT_HEADER = struct.Struct('iIII')
+
+
+class InotifyWatcher:
+    """디렉토리의 파일 생성/삭제를 inotify로 받아 카탈로그에 반영하는 백그라운드 스레드"""
+
+    def __init__(self, directories):
+        import ctypes
+        self._libc = ctypes.CDLL(None, use_errno=True)
+        self.fd = self._libc.inotify_init1(os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 실패')
+        self.watches = {}
+        mask = IN_CLOSE_WRITE | IN_MOVED_TO | IN_MOVED_FROM | IN_DELETE
+        for directory in directories:
+            os.makedirs(directory, exist_ok=True)
+            wd = self._libc.inotify_add_watch(self.fd, os.fsencode(directory), mask)
+            if wd < 0:
+                raise OSError(ctypes.get_errno(), f'inotify_add_watch 실패: {directory}')
+            self.watches[wd] = directory
+        self._thread = threading.Thread(target=self._run, name='artifact-inotify', daemon=True)
+
+    def start(self):
+        self._thread.start()
+        logger.info(f"디버깅 파일 디렉토리 감시 시작: {', '.join(self.watches.values())}")
+        return self
+
+    def _run(self):
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except OSError:
+                return
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                name = data[offset:offset + length].rstrip(b'\0').decode('utf-8', 'replace')
+                offset += length
+                if not name or name.endswith('.tmp') or wd not in self.watches:
+                    continue
+                path = os.path.join(self.watches[wd], name)
+                try:
+                    if mask & (IN_CLOSE_WRITE | IN_MOVED_TO):
+                        register(path)
+                    elif mask & (IN_DELETE | IN_MOVED_FROM):
+                        forget(path)
+                except Exception as e:
+                    logger.debug("inotify 이벤트 처리 오류: %s (%s)", path, e)
+
+    def stop(self):
+        os.close(self.fd)
+
+
+def start_watcher(directories):
+    """ARTIFACT_INOTIFY가 켜져 있으면 감시 스레드 시작 (지원하지 않는 환경이면 None)"""
+    if not ARTIFACT_INOTIFY or not sys.platform.startswith('linux'):
+        return None
+    try:
+        return InotifyWatcher(directories).start()
+    except Exception as e:
+        logger.warning(f"inotify 감시를 시작할 수 없습니다 (무시됨): {str(e)}")
+        return None
+
+
+def bench(count=100000, directory=None):
+    """카탈로그 정리와 glob + getmtime 정리 비교 (파일 count개 생성)"""
+    import shutil
+    import tempfile
+    global CATALOG_FILE, _conn
+
+    directory = directory or tempfile.mkdtemp(prefix='artifact_bench_')
+    saved_catalog, saved_conn = CATALOG_FILE, _conn
+    CATALOG_FILE, _conn = os.path.join(directory, 'catalog.sqlite'), None
+    files_dir = os.path.join(directory, 'files')
+    os.makedirs(files_dir, exist_ok=True)
+    try:
+        now = time.time()
+        rows = []
+        for i in range(count):
+            path = os.path.join(files_dir, f"page_{i}.html")
+            with open(path, 'wb') as f:
+                f.write(b'x')
+            mtime = now - (count - i) * 10
+            os.utime(path, (mtime, mtime))
+            rows.append((path, 'html', 1, mtime))
+        conn = _connect()
+        conn.executemany('INSERT INTO artifacts (path, kind, size, mtime) VALUES (?, ?, ?, ?)', rows)
+        conn.commit()
+        max_age = 10 * 100  # 가장 최근 100개 남짓만 남기는 기간
+
+        # 기존 방식: 모든 파일에 getmtime 호출 (삭제 대상이 없어도 매번 전체 순회)
+        start = time.perf_counter()
+        stale = [p for p in glob.glob(os.path.join(files_dir, '*.html')) if os.path.getmtime(p) < now - count * 20]
+        glob_scan = time.perf_counter() - start
+
+        # 카탈로그: 삭제 대상이 없으면 인덱스 조회 한 번
+        start = time.perf_counter()
+        enforce(max_bytes=0, max_age_seconds=count * 20, now=now)
+        catalog_noop = time.perf_counter() - start
+
+        # 카탈로그: 대부분 만료된 경우 (대상만 삭제)
+        start = time.perf_counter()
+        deleted, _ = enforce(max_bytes=0, max_age_seconds=max_age, now=now)
+        catalog_delete = time.perf_counter() - start
+
+        result = {
+            'files': count,
+            'glob_getmtime_scan_seconds': round(glob_scan, 4),
+            'glob_stale_found': len(stale),
+            'catalog_noop_seconds': round(catalog_noop, 6),
+            'catalog_delete_seconds': round(catalog_delete, 4),
+            'catalog_deleted': deleted,
+        }
+        print(result)
+        return result
+    finally:
+        if _conn is not None:
+            _conn.close()
+        CATALOG_FILE, _conn = saved_catalog, saved_conn
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    # python artifact_catalog.py --bench [파일 수]
+    if '--bench' in sys.argv:
+        index = sys.argv.index('--bench')
+        count = int(sys.argv[index + 1]) if index + 1 < len(sys.argv) and sys.argv[index + 1].isdigit() else 100000
+        import log_setup
+        log_setup.setup_logging()
+        bench(count)
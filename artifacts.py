@@ -0,0 +1,245 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import gzip
+import time
+import queue
+import atexit
+import logging
+import itertools
+import threading
+import functools
+from dotenv import load_dotenv
+import metrics
+import snapshot_archive
+import artifact_catalog
+import disk_monitor
+
+logger = logging.getLogger(__name__)
+
+# 환경 변수 로드
+load_dotenv()
+
+
+def _env_int(name, default):
+    """주석이 포함될 수 있는 정수 환경변수 로드"""
+    value = os.getenv(name, str(default)).split('#')[0].strip()
+    try:
+        return int(value)
+    except ValueError:
+        return default
+
+
+# 디버깅용 스크린샷/HTML 저장 디렉토리
+ARTIFACT_DIR = os.getenv('ARTIFACT_DIR', 'artifacts').split('#')[0].strip()
+
+# 정상 사이클은 N회에 한 번만 저장 (1이면 매번, 0이면 실패 시에만)
+ARTIFACT_SAMPLE_RATE = _env_int('ARTIFACT_SAMPLE_RATE', 10)
+
+# 텍스트(HTML 등) 압축 방식: gzip, zstd, none
+ARTIFACT_COMPRESSION = os.getenv('ARTIFACT_COMPRESSION', 'gzip').split('#')[0].strip().lower()
+
+# 백그라운드 저장 대기열 크기 (가득 차면 정상 사이클 저장분은 버림)
+ARTIFACT_QUEUE_SIZE = _env_int('ARTIFACT_QUEUE_SIZE', 32)
+
+# 압축할 텍스트 파일 확장자
+TEXT_EXTENSIONS = ('.html', '.htm', '.txt', '.xml', '.json')
+
+ARTIFACT_METRIC = 'bearcreek_artifacts_total'
+ARTIFACT_BYTES_METRIC = 'bearcreek_artifact_bytes_total'
+ARTIFACT_DROPPED_METRIC = 'bearcreek_artifacts_dropped_total'
+
+metrics.describe(ARTIFACT_METRIC, 'counter', '저장한 디버깅 파일 수 (reason=failure|sample)')
+metrics.describe(ARTIFACT_BYTES_METRIC, 'counter', '디스크에 기록한 디버깅 파일 크기 합계 (바이트, 압축 후)')
+metrics.describe(ARTIFACT_DROPPED_METRIC, 'counter', '저장 대기열이 가득 차 버린 디버깅 파일 수')
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+if ARTIFACT_COMPRESSION == 'zstd' and zstandard is None:
+    logger.warning("zstandard 패키지가 없어 gzip으로 압축합니다. (pip install zstandard)")
+    ARTIFACT_COMPRESSION = 'gzip'
+
+_STOP = object()
+_queue = queue.Queue(maxsize=max(ARTIFACT_QUEUE_SIZE, 1))
+_writer = None
+_writer_lock = threading.Lock()
+_cycle_counter = itertools.count()
+
+
+def _decide_sample():
+    if ARTIFACT_SAMPLE_RATE <= 0:
+        return False
+    return next(_cycle_counter) % ARTIFACT_SAMPLE_RATE == 0
+
+
+def sampled():
+    """이번 사이클이 정상 저장 표본인지 (사이클 안에서는 한 번만 결정)"""
+    cycle_state = metrics.current_cycle()
+    if cycle_state is None:
+        return _decide_sample()
+    if 'artifact_sampled' not in cycle_state:
+        cycle_state['artifact_sampled'] = _decide_sample()
+    return cycle_state['artifact_sampled']
+
+
+def wants(failed=False):
+    """저장 정책 확인: 실패는 항상, 정상 사이클은 표본일 때만
+
+    디스크 압박이 warning이면 실패만, critical이면 아무것도 저장하지 않는다.
+    """
+    pressure = disk_monitor.level()
+    if pressure >= disk_monitor.CRITICAL:
+        return False
+    if pressure >= disk_monitor.WARNING:
+        return failed
+    return failed or sampled()
+
+
+def _final_path(name):
+    path = os.path.join(ARTIFACT_DIR, name)
+    if name.lower().endswith(TEXT_EXTENSIONS):
+        if ARTIFACT_COMPRESSION == 'gzip':
+            return path + '.gz'
+        if ARTIFACT_COMPRESSION == 'zstd':
+            return path + '.zst'
+    return path
+
+
+def _encode(path, data):
+    """저장 스레드에서 실행: 확장자에 맞게 압축"""
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    if path.endswith('.gz'):
+        return gzip.compress(data, compresslevel=6)
+    if path.endswith('.zst'):
+        return zstandard.ZstdCompressor(level=3).compress(data)
+    return data
+
+
+def _write_file(path, data, reason):
+    """저장 스레드에서 실행: 압축 후 임시 파일에 쓰고 교체"""
+    payload = _encode(path, data)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(payload)
+    os.replace(tmp_path, path)
+    artifact_catalog.register(path, size=len(payload))
+    metrics.inc(ARTIFACT_METRIC, reason=reason)
+    metrics.inc(ARTIFACT_BYTES_METRIC, len(payload))
+    logger.debug("디버깅 파일 저장: %s (%d bytes)", path, len(payload))
+
+
+def _run_writer():
+    while True:
+        job = _queue.get()
+        try:
+            if job is _STOP:
+                return
+            job()
+        except Exception as e:
+            logger.warning(f"디버깅 파일 저장 중 오류 (무시됨): {str(e)}")
+        finally:
+            _queue.task_done()
+
+
+def _submit(job, wait=False):
+    """저장 스레드에 작업 등록 (대기열이 가득 차면 False)"""
+    _ensure_writer()
+    try:
+        if wait:
+            _queue.put(job, timeout=5)
+        else:
+            _queue.put_nowait(job)
+        return True
+    except queue.Full:
+        metrics.inc(ARTIFACT_DROPPED_METRIC)
+        return False
+
+
+def _ensure_writer():
+    global _writer
+    with _writer_lock:
+        if _writer is None or not _writer.is_alive():
+            os.makedirs(ARTIFACT_DIR, exist_ok=True)
+            _writer = threading.Thread(target=_run_writer, name='artifact-writer', daemon=True)
+            _writer.start()
+
+
+def save(name, data, failed=False, target=None):
+    """디버깅 파일 저장 예약 (정책상 저장하지 않으면 None, 저장하면 최종 경로 반환)
+
+    target을 지정한 텍스트는 저장 정책과 관계없이 스냅샷 보관소에도 기록한다 (디스크 압박 critical 제외).
+    """
+    if data is None:
+        return None
+    if target and snapshot_archive.ARCHIVE_DIR and isinstance(data, str) and disk_monitor.level() < disk_monitor.CRITICAL:
+        _submit(functools.partial(snapshot_archive.archive, target, data, time.time()))
+    if not wants(failed):
+        return None
+    path = _final_path(name)
+    # 실패 기록은 잃지 않도록 잠시 기다림
+    if not _submit(functools.partial(_write_file, path, data, 'failure' if failed else 'sample'), wait=failed):
+        logger.warning(f"디버깅 파일 저장 대기열이 가득 차 건너뜁니다: {name}")
+        return None
+    return path
+
+
+def capture(name, producer, failed=False, target=None):
+    """정책상 저장할 때만 producer()를 호출해 저장 예약 (캡처 중 오류는 무시)"""
+    if not wants(failed):
+        return None
+    try:
+        return save(name, producer(), failed, target)
+    except Exception as e:
+        logger.warning(f"디버깅 파일 캡처 실패 (무시됨): {name} - {str(e)}")
+        return None
+
+
+def element_png(driver, locator=None):
+    """Selenium: 지정한 요소 영역만 PNG로 캡처 (요소가 없으면 전체 화면)"""
+    if locator is not None:
+        try:
+            return driver.find_element(*locator).screenshot_as_png
+        except Exception:
+            pass
+    return driver.get_screenshot_as_png()
+
+
+async def page_png(page, selector=None):
+    """Playwright: 지정한 요소 영역만 PNG로 캡처 (요소가 없으면 보이는 화면)"""
+    if selector:
+        try:
+            return await page.locator(selector).first.screenshot(timeout=2000)
+        except Exception:
+            pass
+    return await page.screenshot()
+
+
+@disk_monitor.subscribe
+def _on_disk_pressure(level, previous, disk):
+    """디스크 압박 시 저장된 디버깅 파일 축소 (warning: 크기 상한의 1/4, critical: 전부 삭제)"""
+    if level >= disk_monitor.CRITICAL:
+        artifact_catalog.enforce(max_bytes=0, max_age_seconds=1)
+    elif level >= disk_monitor.WARNING and artifact_catalog.ARTIFACT_MAX_MB:
+        artifact_catalog.enforce(max_bytes=artifact_catalog.ARTIFACT_MAX_MB * 1024 * 1024 // 4)
+
+
+def flush(timeout=5.0):
+    """대기 중인 저장을 마치고 저장 스레드 종료 (프로세스 종료 시 호출)"""
+    global _writer
+    with _writer_lock:
+        writer, _writer = _writer, None
+    if writer is None or not writer.is_alive():
+        return
+    try:
+        _queue.put(_STOP, timeout=timeout)
+    except queue.Full:
+        return
+    writer.join(timeout)
+
+
+atexit.register(flush)
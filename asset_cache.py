@@ -0,0 +1,369 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""브라우저 세션 사이에 유지되는 정적 에셋(JS, CSS, 이미지, 폰트) 디스크 캐시
+
+체크마다 빈 프로필/컨텍스트로 시작하므로 브라우저 자체 캐시는 매번 비어 있다.
+
+- Playwright: 컨텍스트에 route 계층을 설치해 캐시된 정적 응답을 URL과 검증자(ETag,
+  Last-Modified)로 직접 돌려준다. 달력/예약 시간 같은 동적 요청(document, xhr, fetch)은 그대로 보낸다.
+- Selenium: 요청 가로채기가 없으므로 Chrome 디스크 캐시를 공용 디렉토리(--disk-cache-dir)에
+  두고 --disk-cache-size로 크기를 제한한다. 한 번에 한 브라우저만 쓰도록 잠금으로 보호한다.
+"""
+
+import os
+import json
+import time
+import fcntl
+import shutil
+import sqlite3
+import hashlib
+import logging
+import threading
+from dotenv import load_dotenv
+import metrics
+import disk_monitor
+
+logger = logging.getLogger(__name__)
+
+# 환경 변수 로드
+load_dotenv()
+
+
+def _env_float(name, default):
+    """주석이 포함될 수 있는 실수 환경변수 로드"""
+    value = os.getenv(name, str(default)).split('#')[0].strip()
+    try:
+        return float(value)
+    except ValueError:
+        return default
+
+
+# 캐시 디렉토리 (비우면 캐시 비활성화)
+ASSET_CACHE_DIR = os.getenv('ASSET_CACHE_DIR', 'asset_cache').split('#')[0].strip()
+
+# 엔진별 캐시 크기 상한 (MB) - Playwright 캐시와 Chrome 디스크 캐시에 각각 적용
+ASSET_CACHE_MAX_MB = _env_float('ASSET_CACHE_MAX_MB', 100)
+
+# 응답에 max-age가 없을 때 다시 확인하지 않고 쓰는 기간 (시간)
+ASSET_CACHE_TTL_HOURS = _env_float('ASSET_CACHE_TTL_HOURS', 24)
+
+# 이보다 큰 응답은 저장하지 않음 (MB)
+ASSET_CACHE_MAX_ENTRY_MB = _env_float('ASSET_CACHE_MAX_ENTRY_MB', 5)
+
+# 캐시할 요청 종류 (Playwright resource_type)
+STATIC_TYPES = ('script', 'stylesheet', 'image', 'font')
+
+# 저장하는 응답 헤더 (나머지는 캐시에서 돌려줄 때 의미가 없거나 달라짐)
+KEPT_HEADERS = ('content-type', 'cache-control', 'etag', 'last-modified', 'expires', 'access-control-allow-origin')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS assets (
+    url TEXT PRIMARY KEY,
+    file TEXT NOT NULL,
+    status INTEGER NOT NULL,
+    headers TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    expires REAL NOT NULL,
+    used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS assets_used ON assets(used);
+"""
+
+ASSET_CACHE_REQUESTS_METRIC = 'bearcreek_asset_cache_requests_total'
+ASSET_CACHE_BYTES_METRIC = 'bearcreek_asset_cache_bytes'
+ASSET_CACHE_SAVED_METRIC = 'bearcreek_asset_cache_saved_bytes_total'
+
+metrics.describe(ASSET_CACHE_REQUESTS_METRIC, 'counter', '정적 에셋 요청 수 (result=hit|revalidated|stale|miss)')
+metrics.describe(ASSET_CACHE_BYTES_METRIC, 'gauge', 'Playwright 에셋 캐시 크기 (바이트)')
+metrics.describe(ASSET_CACHE_SAVED_METRIC, 'counter', '캐시에서 돌려줘 네트워크로 받지 않은 본문 크기 (바이트)')
+
+_lock = threading.RLock()
+_conn = None
+
+
+def enabled():
+    return bool(ASSET_CACHE_DIR) and ASSET_CACHE_MAX_MB > 0
+
+
+def _connect():
+    """캐시 색인 연결 (작업 프로세스/단일 실행이 함께 쓰므로 WAL + busy timeout)"""
+    global _conn
+    if _conn is None:
+        os.makedirs(os.path.join(ASSET_CACHE_DIR, 'files'), exist_ok=True)
+        _conn = sqlite3.connect(os.path.join(ASSET_CACHE_DIR, 'index.sqlite'), timeout=10, check_same_thread=False)
+        _conn.execute('PRAGMA journal_mode=WAL')
+        _conn.execute('PRAGMA synchronous=NORMAL')
+        _conn.executescript(SCHEMA)
+    return _conn
+
+
+def _cache_control(headers):
+    """Cache-Control 헤더를 {지시어: 값} 으로"""
+    directives = {}
+    for part in headers.get('cache-control', '').lower().split(','):
+        name, _, value = part.strip().partition('=')
+        if name:
+            directives[name] = value.strip('"')
+    return directives
+
+
+def _expires_at(headers, now):
+    """응답을 다시 확인하지 않고 쓸 수 있는 시각"""
+    directives = _cache_control(headers)
+    if 'no-cache' in directives:
+        return now
+    for name in ('s-maxage', 'max-age'):
+        if directives.get(name, '').isdigit():
+            return now + int(directives[name])
+    return now + ASSET_CACHE_TTL_HOURS * 3600
+
+
+def cacheable(method, status, headers, size):
+    """저장할 수 있는 응답인지 (GET 200, no-store/private 아님, 크기 제한 이하)"""
+    directives = _cache_control(headers)
+    return (
+        method == 'GET' and status == 200 and 'no-store' not in directives and 'private' not in directives
+        and size <= ASSET_CACHE_MAX_ENTRY_MB * 1024 * 1024
+    )
+
+
+def lookup(url):
+    """캐시 항목 {'status', 'headers', 'body', 'expires'} (없거나 본문 파일이 사라졌으면 None)"""
+    with _lock:
+        conn = _connect()
+        row = conn.execute('SELECT file, status, headers, expires FROM assets WHERE url = ?', (url,)).fetchone()
+        if row is None:
+            return None
+        try:
+            with open(os.path.join(ASSET_CACHE_DIR, 'files', row[0]), 'rb') as f:
+                body = f.read()
+        except OSError:
+            conn.execute('DELETE FROM assets WHERE url = ?', (url,))
+            conn.commit()
+            return None
+        conn.execute('UPDATE assets SET used = ? WHERE url = ?', (time.time(), url))
+        conn.commit()
+    return {'status': row[1], 'headers': json.loads(row[2]), 'body': body, 'expires': row[3]}
+
+
+def store(url, status, headers, body):
+    """응답 저장 (본문은 임시 파일에 쓴 뒤 교체)"""
+    headers = {name: value for name, value in headers.items() if name.lower() in KEPT_HEADERS}
+    now = time.time()
+    name = hashlib.sha256(url.encode('utf-8')).hexdigest()
+    path = os.path.join(ASSET_CACHE_DIR, 'files', name)
+    with _lock:
+        conn = _connect()
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(body)
+        os.replace(tmp_path, path)
+        conn.execute(
+            'INSERT OR REPLACE INTO assets (url, file, status, headers, size, expires, used) VALUES (?, ?, ?, ?, ?, ?, ?)',
+            (url, name, status, json.dumps(headers), len(body), _expires_at(headers, now), now),
+        )
+        conn.commit()
+
+
+def refresh(url, headers):
+    """304 응답으로 재검증된 항목의 유효 기간 갱신"""
+    with _lock:
+        conn = _connect()
+        conn.execute('UPDATE assets SET expires = ?, used = ? WHERE url = ?',
+                     (_expires_at({k.lower(): v for k, v in headers.items()}, time.time()), time.time(), url))
+        conn.commit()
+
+
+def enforce(max_bytes=None):
+    """크기 상한을 넘으면 가장 오래 안 쓴 항목부터 삭제 (반환값: 삭제 수)"""
+    if max_bytes is None:
+        max_bytes = ASSET_CACHE_MAX_MB * 1024 * 1024
+    removed = 0
+    with _lock:
+        conn = _connect()
+        total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM assets').fetchone()[0]
+        if total > max_bytes:
+            for url, name, size in conn.execute('SELECT url, file, size FROM assets ORDER BY used').fetchall():
+                if total <= max_bytes:
+                    break
+                try:
+                    os.remove(os.path.join(ASSET_CACHE_DIR, 'files', name))
+                except FileNotFoundError:
+                    pass
+                conn.execute('DELETE FROM assets WHERE url = ?', (url,))
+                total -= size
+                removed += 1
+            conn.commit()
+    metrics.set_gauge(ASSET_CACHE_BYTES_METRIC, total)
+    return removed
+
+
+class Stats:
+    """체크 한 번의 에셋 캐시 적중 현황"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.counts = {'hit': 0, 'revalidated': 0, 'stale': 0, 'miss': 0}
+        self.saved_bytes = 0
+
+    def add(self, result, saved=0):
+        self.counts[result] += 1
+        self.saved_bytes += saved
+        metrics.inc(ASSET_CACHE_REQUESTS_METRIC, engine=self.engine, result=result)
+        if saved:
+            metrics.inc(ASSET_CACHE_SAVED_METRIC, saved, engine=self.engine)
+
+    def report(self):
+        """적중률 로그 및 사이클 요약에 기록"""
+        total = sum(self.counts.values())
+        if not total:
+            return None
+        served = total - self.counts['miss']
+        summary = dict(self.counts, hit_ratio=round(served / total, 3), saved_bytes=self.saved_bytes)
+        cycle_state = metrics.current_cycle()
+        if cycle_state is not None:
+            cycle_state.setdefault('resources', {})['asset_cache'] = summary
+        logger.info(
+            f"에셋 캐시 ({self.engine}): 적중 {self.counts['hit']}, 재검증 {self.counts['revalidated']}, "
+            f"미스 {self.counts['miss']} (적중률 {served / total:.0%}, 절약 {self.saved_bytes / 1048576:.1f}MB)"
+        )
+        return summary
+
+
+async def install(context, engine='playwright'):
+    """Playwright 컨텍스트에 정적 에셋 캐시 route 설치 (반환된 Stats로 체크 끝에 적중률 보고)"""
+    stats = Stats(engine)
+    if not enabled():
+        return stats
+
+    async def handle(route, request):
+        if request.method != 'GET' or request.resource_type not in STATIC_TYPES:
+            await route.continue_()
+            return
+        url = request.url.split('#')[0]
+        entry = lookup(url)
+        if entry is not None and entry['expires'] > time.time():
+            stats.add('hit', len(entry['body']))
+            await route.fulfill(status=entry['status'], headers=entry['headers'], body=entry['body'])
+            return
+
+        headers = dict(request.headers)
+        if entry is not None:
+            cached = {k.lower(): v for k, v in entry['headers'].items()}
+            if 'etag' in cached:
+                headers['if-none-match'] = cached['etag']
+            if 'last-modified' in cached:
+                headers['if-modified-since'] = cached['last-modified']
+        try:
+            response = await route.fetch(headers=headers)
+        except Exception as e:
+            if entry is None:
+                raise
+            # 네트워크 오류 시 만료된 캐시라도 돌려줌
+            logger.debug("에셋 요청 실패, 만료된 캐시 사용: %s (%s)", url, e)
+            stats.add('stale', len(entry['body']))
+            await route.fulfill(status=entry['status'], headers=entry['headers'], body=entry['body'])
+            return
+
+        if response.status == 304 and entry is not None:
+            refresh(url, response.headers)
+            stats.add('revalidated', len(entry['body']))
+            await route.fulfill(status=entry['status'], headers=entry['headers'], body=entry['body'])
+            return
+
+        body = await response.body()
+        stats.add('miss')
+        if cacheable(request.method, response.status, response.headers, len(body)):
+            try:
+                store(url, response.status, response.headers, body)
+            except (OSError, sqlite3.Error) as e:
+                logger.debug("에셋 캐시 저장 실패 (무시됨): %s", e)
+        await route.fulfill(response=response, body=body)
+
+    await context.route('**/*', handle)
+    return stats
+
+
+class ChromeDiskCache:
+    """Selenium용 공용 Chrome 디스크 캐시 디렉토리 임대
+
+    cache = asset_cache.ChromeDiskCache.acquire()
+    for arg in cache.args:
+        chrome_options.add_argument(arg)
+    ...
+    cache.release()
+    """
+
+    def __init__(self, path=None, lock_file=None):
+        self.path = path
+        self._lock_file = lock_file
+        self.args = [f"--disk-cache-dir={path}", f"--disk-cache-size={int(ASSET_CACHE_MAX_MB * 1024 * 1024)}"] if path else []
+
+    @classmethod
+    def acquire(cls):
+        """다른 브라우저가 쓰는 중이면 공용 캐시 없이(빈 인자) 진행"""
+        if not enabled():
+            return cls()
+        path = os.path.abspath(os.path.join(ASSET_CACHE_DIR, 'chrome'))
+        os.makedirs(path, exist_ok=True)
+        lock_file = open(os.path.join(ASSET_CACHE_DIR, 'chrome.lock'), 'w')
+        try:
+            # Chrome 디스크 캐시는 여러 브라우저가 동시에 쓰도록 만들어지지 않았으므로 한 번에 하나만
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            logger.info("공용 Chrome 디스크 캐시를 다른 브라우저가 사용 중이라 이번 체크는 캐시 없이 진행합니다.")
+            return cls()
+        return cls(path, lock_file)
+
+    def release(self):
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+
+
+# Resource Timing의 initiatorType 중 정적 에셋 (link: 스타일시트, css: CSS에서 불러온 이미지/폰트)
+TIMING_TYPES = ('script', 'link', 'img', 'css')
+
+RESOURCE_TIMING_SCRIPT = (
+    "return performance.getEntriesByType('resource')"
+    ".map(e => [e.initiatorType, e.transferSize, e.decodedBodySize]);"
+)
+
+
+def record_resource_timing(driver, engine='selenium'):
+    """Selenium: Resource Timing으로 정적 에셋의 캐시 적중 집계 (transferSize 0 = 캐시에서 읽음)"""
+    stats = Stats(engine)
+    for initiator, transfer_size, body_size in driver.execute_script(RESOURCE_TIMING_SCRIPT) or []:
+        # Timing-Allow-Origin 없는 교차 출처 리소스는 크기가 모두 0이라 판단 불가
+        if initiator not in TIMING_TYPES or not body_size:
+            continue
+        if transfer_size == 0:
+            stats.add('hit', body_size)
+        else:
+            stats.add('miss')
+    return stats
+
+
+def clear_chrome_cache():
+    """사용 중이 아닌 공용 Chrome 디스크 캐시 삭제"""
+    cache = ChromeDiskCache.acquire()
+    try:
+        if cache.path:
+            shutil.rmtree(cache.path, ignore_errors=True)
+    finally:
+        cache.release()
+
+
+@disk_monitor.subscribe
+def _on_disk_pressure(level, previous, disk):
+    """디스크 압박 시 에셋 캐시 축소 (warning: 절반, critical: 전부 비움)"""
+    if level < disk_monitor.WARNING or not enabled() or not os.path.isdir(ASSET_CACHE_DIR):
+        return
+    if level >= disk_monitor.CRITICAL:
+        removed = enforce(max_bytes=0)
+        clear_chrome_cache()
+    else:
+        removed = enforce(max_bytes=ASSET_CACHE_MAX_MB * 1024 * 1024 / 2)
+    if removed:
+        logger.warning(f"디스크 압박으로 에셋 캐시 {removed}개 삭제")
@@ -0,0 +1,348 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""베어크리크 알리미 통합 실행 도구
+
+    python bearcreek.py check [--backend effective] [--single] [--profile N]
+    python bearcreek.py alert [--single]
+    python bearcreek.py clean [--system]
+    python bearcreek.py daemon [--services check,clean] [--backend effective]
+    python bearcreek.py browser
+    python bearcreek.py replay [PATH ...] [--kind reservation] [--since 2025-03-01] [--workers N]
+    python bearcreek.py fixture [--port 8765] [--latency-ms 150] [--error-rate 0.1] [--pages-dir DIR]
+    python bearcreek.py e2e [BACKEND ...] [--cycles 3] [--env KEY=VALUE]
+    python bearcreek.py bench [--budget-ms 100] [--top 10]
+
+선택한 명령/백엔드의 모듈만 import 한다 (selenium, playwright, cloudscraper 등은
+해당 백엔드를 고를 때만 로드되고, 텔레그램 라이브러리는 실제로 발송할 때만 로드된다).
+"""
+
+import os
+import sys
+import argparse
+import importlib
+
+# 체크 백엔드 이름 -> 모듈
+BACKENDS = {
+    'selenium': 'bearcreek_checker',
+    'playwright': 'playwright_checker',
+    'effective': 'effective_checker',
+    'ultimate': 'ultimate_checker',
+    'hedged': 'hedged_fetch',
+}
+
+# 기본 체크 백엔드 (.env의 CHECK_BACKEND)
+DEFAULT_BACKEND = 'effective'
+
+# bench: 명령별 import 대상 (이름 -> 모듈 목록)
+BENCH_TARGETS = dict(
+    [('cli', ('dotenv',))]
+    + [(f'check:{name}', (module,)) for name, module in BACKENDS.items()]
+    + [('alert', ('simple_alert',)), ('clean', ('cleanup',)), ('clean:system', ('simple_cleaner',))]
+    + [('daemon', ('daemon',)), ('browser', ('browser_supervisor',)), ('replay', ('replay',))]
+    + [('fixture', ('fixture_server',)), ('e2e', ('e2e_bench',))]
+)
+
+# bench: CLI 자체 import 시간 상한 (밀리초)
+BENCH_BUDGET_MS = 100.0
+
+# bench: check:* 대상(백엔드 모듈) import 시간 상한 (밀리초, 백엔드 라이브러리 포함)
+BENCH_CHECK_BUDGET_MS = 300.0
+
+
+def _load_env():
+    """.env를 읽고 CLI 기본값 반영 (python-dotenv는 가벼워 CLI에서 바로 사용)"""
+    global DEFAULT_BACKEND, BENCH_BUDGET_MS, BENCH_CHECK_BUDGET_MS
+    from dotenv import load_dotenv
+    load_dotenv()
+    backend = os.getenv('CHECK_BACKEND', DEFAULT_BACKEND).split('#')[0].strip()
+    if backend in BACKENDS:
+        DEFAULT_BACKEND = backend
+    try:
+        BENCH_BUDGET_MS = float(os.getenv('BENCH_BUDGET_MS', str(BENCH_BUDGET_MS)).split('#')[0].strip())
+    except ValueError:
+        pass
+    try:
+        BENCH_CHECK_BUDGET_MS = float(os.getenv('BENCH_CHECK_BUDGET_MS', str(BENCH_CHECK_BUDGET_MS)).split('#')[0].strip())
+    except ValueError:
+        pass
+
+
+def cmd_check(args):
+    """예약 확인: 선택한 백엔드 모듈만 import"""
+    module = BACKENDS[args.backend]
+    checker = importlib.import_module(module)
+    # import 시점에 로깅을 설정하지 않는 백엔드(hedged)도 같은 방식으로 <모듈>.log에 기록 (이미 설정돼 있으면 그대로)
+    import log_setup
+    log_setup.setup_logging(f"{module}.log")
+    if args.profile:
+        import profiler
+        profiler.arm(args.profile)
+    if args.single:
+        checker.logger.info(f"단일 실행 모드로 실행합니다. (백엔드: {args.backend})")
+        checker.check_available_dates()
+    else:
+        checker.run_scheduler()
+    return 0
+
+
+def cmd_alert(args):
+    """수동 확인 알림 발송"""
+    import simple_alert
+    if args.single:
+        simple_alert.logger.info("단일 실행 모드로 실행합니다.")
+        simple_alert.check_and_notify()
+    else:
+        simple_alert.run_scheduler()
+    return 0
+
+
+def cmd_clean(args):
+    """디버깅 파일/로그/임시 파일 정리 (--system: simple_cleaner의 시스템 정리)"""
+    if args.system:
+        import simple_cleaner
+        simple_cleaner.cleanup_system()
+    else:
+        import cleanup
+        cleanup.cleanup_old_files()
+    return 0
+
+
+def cmd_daemon(args):
+    """체커/알림/정리 서비스를 한 프로세스에서 실행"""
+    import daemon
+    services = [name.strip() for name in args.services.split(',') if name.strip()] if args.services else None
+    unknown = [name for name in services or [] if name not in daemon.SERVICE_FACTORIES]
+    if unknown:
+        print(f"알 수 없는 서비스: {', '.join(unknown)} (선택: {', '.join(daemon.SERVICE_FACTORIES)})", file=sys.stderr)
+        return 2
+    return daemon.main(services=services, backend=args.backend)
+
+
+def cmd_browser(args):
+    """공유 헤드리스 Chromium 감독 프로세스 실행 (체커가 CDP로 붙어 씀)"""
+    import browser_supervisor
+    return browser_supervisor.main()
+
+
+def cmd_replay(args):
+    """보관된 페이지를 실제 체크와 같은 추출/비교 코드로 재생 (이벤트는 JSON lines, 처리량은 표준 오류)"""
+    import replay
+    return replay.main(
+        paths=args.paths, kind=args.kind, parser=args.parser, since=args.since, limit=args.limit,
+        workers=args.workers, output=args.output, emit_all=args.all,
+        year=args.year or replay.YEAR, month=args.month or replay.MONTH,
+    )
+
+
+def _fixture_config(args):
+    """fixture/e2e 공통 옵션 -> FixtureSite 설정 (생략한 값은 .env의 FIXTURE_* 사용)"""
+    return {
+        'latency_ms': args.latency_ms, 'jitter_ms': args.jitter_ms, 'error_rate': args.error_rate,
+        'error_status': args.error_status, 'open_dates': args.open_dates, 'tee_times': args.tee_times,
+        'pages_dir': args.pages_dir, 'seed': args.seed,
+    }
+
+
+def cmd_fixture(args):
+    """로컬 fixture 서버 실행 (예약 사이트 + 가짜 텔레그램 Bot API)"""
+    import fixture_server
+    return fixture_server.main(port=args.port, **_fixture_config(args))
+
+
+def cmd_e2e(args):
+    """fixture 서버에 각 체커를 붙여 사이클 시간/CPU/메모리/요청 수 측정"""
+    import e2e_bench
+    unknown = [name for name in args.backends if name not in BACKENDS]
+    if unknown:
+        print(f"알 수 없는 백엔드: {', '.join(unknown)} (선택: {', '.join(BACKENDS)})", file=sys.stderr)
+        return 2
+    overrides = {}
+    for item in args.env or []:
+        key, sep, value = item.partition('=')
+        if not sep or not key:
+            print(f"--env는 KEY=VALUE 형식이어야 합니다: {item}", file=sys.stderr)
+            return 2
+        overrides[key] = value
+    return e2e_bench.main(
+        backends=args.backends, cycles=args.cycles, timeout=args.timeout, env_overrides=overrides,
+        output=args.json, **_fixture_config(args),
+    )
+
+
+def _add_fixture_options(command):
+    command.add_argument('--latency-ms', type=float, help='사이트 응답 지연 (기본값: FIXTURE_LATENCY_MS)')
+    command.add_argument('--jitter-ms', type=float, help='응답 지연 흔들림 ± (기본값: FIXTURE_JITTER_MS)')
+    command.add_argument('--error-rate', type=float, help='오류로 답할 요청 비율 0~1 (기본값: FIXTURE_ERROR_RATE)')
+    command.add_argument('--error-status', type=int, help='오류 응답 상태 코드 (기본값: FIXTURE_ERROR_STATUS)')
+    command.add_argument('--open-dates', type=int, help='달마다 열린 날짜 수 (기본값: FIXTURE_OPEN_DATES)')
+    command.add_argument('--tee-times', type=int, help='열린 날짜마다 시간 수 (기본값: FIXTURE_TEE_TIMES)')
+    command.add_argument('--pages-dir', metavar='DIR', help='녹화한 페이지 디렉토리 (기본값: FIXTURE_PAGES_DIR)')
+    command.add_argument('--seed', type=int, help='열린 날짜/오류 난수 시드 (기본값: FIXTURE_SEED)')
+
+
+def parse_importtime(stderr):
+    """-X importtime 출력에서 [(self_us, cumulative_us, 깊이, 모듈)] 추출"""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len('import time:'):].split('|')
+            depth = (len(name) - len(name.lstrip(' '))) // 2
+            entries.append((int(self_us), int(cumulative_us), depth, name.strip()))
+        except ValueError:
+            continue
+    return entries
+
+
+def measure_imports(modules, runs=3):
+    """새 인터프리터에서 modules를 import 하는 데 걸린 시간 (인터프리터 기본 import 제외, 가장 빠른 실행 기준)
+
+    반환값: (합계 마이크로초, 최상위 패키지별 self 시간 합계 dict) - import 실패 시 (None, 오류 메시지)
+    """
+    import tempfile
+    import subprocess
+
+    here = os.path.dirname(os.path.abspath(__file__))
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [here, os.environ.get('PYTHONPATH')])))
+    code = '; '.join(['import bearcreek'] + [f'import {module}' for module in modules])
+    best = None
+    # 모듈이 import 시점에 만드는 로그 파일이 작업 디렉토리에 남지 않도록 임시 디렉토리에서 실행
+    with tempfile.TemporaryDirectory() as cwd:
+        for _ in range(runs):
+            baseline = {
+                name for _, _, depth, name in parse_importtime(subprocess.run(
+                    [sys.executable, '-X', 'importtime', '-c', 'pass'], cwd=cwd, env=env, capture_output=True, text=True,
+                ).stderr) if depth == 0
+            }
+            result = subprocess.run(
+                [sys.executable, '-X', 'importtime', '-c', code], cwd=cwd, env=env, capture_output=True, text=True,
+            )
+            if result.returncode != 0:
+                return None, (result.stderr.strip().splitlines() or ['알 수 없는 오류'])[-1]
+            entries = parse_importtime(result.stderr)
+            # 최상위 항목 중 인터프리터 시작 시 이미 로드되는 것(site 등)은 제외
+            total = sum(cumulative for _, cumulative, depth, name in entries if depth == 0 and name not in baseline)
+            if best is None or total < best[0]:
+                skip = False
+                packages = {}
+                for self_us, _, depth, name in entries:
+                    if depth == 0:
+                        skip = name in baseline
+                    if not skip:
+                        root = name.split('.')[0]
+                        packages[root] = packages.get(root, 0) + self_us
+                best = (total, packages)
+    return best
+
+
+def cmd_bench(args):
+    """명령별 import 시간 보고 (-X importtime 요약), CLI 자체나 check:* 대상이 상한을 넘으면 종료 코드 1"""
+    targets = args.target or list(BENCH_TARGETS)
+    failed = False
+    print(f"{'대상':<18} {'import':>10}  가장 무거운 패키지 (self 합계)")
+    for target in targets:
+        total, packages = measure_imports(BENCH_TARGETS[target], args.runs)
+        if total is None:
+            print(f"{target:<18} {'실패':>10}  {packages}")
+            continue
+        heaviest = sorted(packages.items(), key=lambda item: item[1], reverse=True)[:args.top]
+        summary = ', '.join(f"{name} {us / 1000:.1f}ms" for name, us in heaviest)
+        print(f"{target:<18} {total / 1000:>8.1f}ms  {summary}")
+        if target == 'cli':
+            budget = args.budget_ms
+        elif target.startswith('check:'):
+            budget = args.check_budget_ms
+        else:
+            continue
+        if total / 1000 > budget:
+            failed = True
+            print(f"{target} import 시간 {total / 1000:.1f}ms가 상한 {budget:g}ms를 넘었습니다.", file=sys.stderr)
+    return 1 if failed else 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='bearcreek', description='베어크리크 골프장 예약 알리미')
+    commands = parser.add_subparsers(dest='command', metavar='{check,alert,clean,daemon,browser,replay,fixture,e2e,bench}')
+    commands.required = True
+
+    check = commands.add_parser('check', help='예약 가능 날짜 확인')
+    check.add_argument('--backend', choices=sorted(BACKENDS), default=DEFAULT_BACKEND,
+                       help=f'체크 방식 (기본값: {DEFAULT_BACKEND}, .env의 CHECK_BACKEND)')
+    check.add_argument('--single', action='store_true', help='한 번만 확인하고 종료')
+    check.add_argument('--profile', type=int, nargs='?', const=1, default=0, metavar='N',
+                       help='처음 N회 사이클 프로파일링')
+    check.set_defaults(handler=cmd_check)
+
+    alert = commands.add_parser('alert', help='수동 확인 알림 발송')
+    alert.add_argument('--single', action='store_true', help='한 번만 발송하고 종료')
+    alert.set_defaults(handler=cmd_alert)
+
+    clean = commands.add_parser('clean', help='디버깅 파일/로그/임시 파일 정리')
+    clean.add_argument('--system', action='store_true', help='디스크 상태에 따른 시스템 정리 (simple_cleaner)')
+    clean.set_defaults(handler=cmd_clean)
+
+    daemon = commands.add_parser('daemon', help='체커/알림/정리 서비스를 한 프로세스에서 실행')
+    daemon.add_argument('--services', metavar='LIST',
+                        help='실행할 서비스 (check, alert, clean, cleanup 중 쉼표로 구분, 기본값: .env의 DAEMON_SERVICES)')
+    daemon.add_argument('--backend', choices=sorted(BACKENDS), default=DEFAULT_BACKEND,
+                        help=f'check 서비스의 체크 방식 (기본값: {DEFAULT_BACKEND})')
+    daemon.set_defaults(handler=cmd_daemon)
+
+    browser = commands.add_parser('browser', help='공유 헤드리스 Chromium 유지 (체커가 CDP로 연결)')
+    browser.set_defaults(handler=cmd_browser)
+
+    replay = commands.add_parser('replay', help='보관된 페이지를 추출/비교 코드로 재생 (처리량 측정)')
+    replay.add_argument('paths', nargs='*', metavar='PATH',
+                        help='디버깅 파일 디렉토리 또는 파일 (생략하면 스냅샷 보관소 ARCHIVE_DIR)')
+    replay.add_argument('--kind', choices=('reservation', 'tee_times', 'calendar_data'), help='재생할 페이지 종류')
+    replay.add_argument('--parser', choices=('title', 'calendar'),
+                        help='예약 페이지 추출 방식 (title: Selenium, calendar: Playwright/CloudScraper, 기본값: 파일 이름에 따라)')
+    replay.add_argument('--since', metavar='DATE', help='보관소: 이 시각 이후 스냅샷만 (예: 2025-03-01)')
+    replay.add_argument('--limit', type=int, help='보관소: 최대 스냅샷 수')
+    replay.add_argument('--workers', type=int, help='추출 작업 프로세스 수 (기본값: REPLAY_WORKERS, 0이면 CPU 수)')
+    replay.add_argument('--output', metavar='FILE', help='이벤트 출력 파일 (기본값: 표준 출력)')
+    replay.add_argument('--all', action='store_true', help='바뀌지 않은 페이지도 출력')
+    replay.add_argument('--year', type=int, help='날짜에 년/월이 없는 칸에 쓸 년도 (기본값: .env의 YEAR)')
+    replay.add_argument('--month', type=int, help='날짜에 월이 없는 칸에 쓸 월 (기본값: .env의 MONTH)')
+    replay.set_defaults(handler=cmd_replay)
+
+    fixture = commands.add_parser('fixture', help='로컬 fixture 서버 실행 (예약 사이트 + 가짜 텔레그램 Bot API)')
+    fixture.add_argument('--port', type=int, help='포트 (기본값: FIXTURE_PORT, 0이면 빈 포트)')
+    _add_fixture_options(fixture)
+    fixture.set_defaults(handler=cmd_fixture)
+
+    e2e = commands.add_parser('e2e', help='fixture 서버에 체커를 붙여 종단간 측정')
+    e2e.add_argument('backends', nargs='*', metavar='BACKEND',
+                     help=f"측정할 백엔드 (기본값: 전체 - {', '.join(BACKENDS)})")
+    e2e.add_argument('--cycles', type=int, default=3, help='백엔드마다 실행할 사이클 수')
+    e2e.add_argument('--timeout', type=float, default=300, help='사이클 하나의 제한 시간 (초)')
+    e2e.add_argument('--env', action='append', metavar='KEY=VALUE', help='체커 프로세스 환경 변수 (여러 번 지정 가능)')
+    e2e.add_argument('--json', metavar='FILE', help='사이클별 기록을 JSON으로 저장')
+    _add_fixture_options(e2e)
+    e2e.set_defaults(handler=cmd_e2e)
+
+    bench = commands.add_parser('bench', help='명령별 import 시간 측정 (-X importtime 요약)')
+    bench.add_argument('target', nargs='*', metavar='TARGET',
+                       help=f"측정 대상 (기본값: 전체 - {', '.join(BENCH_TARGETS)})")
+    bench.add_argument('--budget-ms', type=float, default=BENCH_BUDGET_MS, help='CLI import 시간 상한 (밀리초)')
+    bench.add_argument('--check-budget-ms', type=float, default=BENCH_CHECK_BUDGET_MS,
+                       help='check:* 대상 import 시간 상한 (밀리초)')
+    bench.add_argument('--runs', type=int, default=3, help='대상별 반복 횟수 (가장 빠른 값 사용)')
+    bench.add_argument('--top', type=int, default=5, help='표시할 무거운 패키지 수')
+    bench.set_defaults(handler=cmd_bench)
+    return parser
+
+
+def main(argv=None):
+    _load_env()
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    unknown = [target for target in getattr(args, 'target', []) if target not in BENCH_TARGETS]
+    if unknown:
+        parser.error(f"알 수 없는 측정 대상: {', '.join(unknown)} (선택: {', '.join(BENCH_TARGETS)})")
+    return args.handler(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -6,12 +6,10 @@ import time
 import datetime
 import logging
 import schedule
-import asyncio
 import platform
 import sys
 import pytz
 import uuid
-import random
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
@@ -20,38 +18,26 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
 from dotenv import load_dotenv
-from telegram import Bot
-from telegram.error import TelegramError
+import log_setup
+import notifier
+import message_renderer
+import metrics
+import profiler
+import browser_trace
+import browser_supervisor
+import asset_cache
+import rate_limiter
+import artifacts
+import artifact_catalog
+import profile_manager
+import browser_pool
+import page_parser
 
 # 한국 시간대 설정
 KST = pytz.timezone('Asia/Seoul')
 
-# 로깅 시간 포맷터 클래스 - 한국 시간으로 변환
-class KSTFormatter(logging.Formatter):
-    def converter(self, timestamp):
-        dt = datetime.datetime.fromtimestamp(timestamp, tz=pytz.UTC)
-        return dt.astimezone(KST)
-    
-    def formatTime(self, record, datefmt=None):
-        dt = self.converter(record.created)
-        if datefmt:
-            return dt.strftime(datefmt)
-        else:
-            return dt.strftime("%Y-%m-%d %H:%M:%S")
-
-# 로깅 설정
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("bearcreek_checker.log", encoding='utf-8'),
-        logging.StreamHandler()
-    ]
-)
-
-# 모든 핸들러에 KST 포맷터 적용
-for handler in logging.getLogger().handlers:
-    handler.setFormatter(KSTFormatter('%(asctime)s - %(levelname)s - %(message)s'))
+# 로깅 설정 (큐 기반 비동기 로깅, 파일은 JSON lines 형식)
+log_setup.setup_logging("bearcreek_checker.log")
 
 logger = logging.getLogger(__name__)
 
@@ -93,19 +79,74 @@ except ValueError:
         interval_str = interval_str.split('#')[0].strip()
     CHECK_INTERVAL_MINUTES = int(interval_str)
 
+# 사이트 주소 (벤치마크에서는 로컬 fixture 서버 주소로 바꿈)
+BEARCREEK_BASE_URL = os.getenv('BEARCREEK_BASE_URL', 'https://www.bearcreek.co.kr').split('#')[0].strip().rstrip('/')
+
 # 베어크리크 골프장 예약 페이지 URL
-BEARCREEK_URL = "https://www.bearcreek.co.kr/Reservation/Reservation.aspx?strLGubun=110&strClubCode=N#aCourseSel"
+BEARCREEK_URL = f"{BEARCREEK_BASE_URL}/Reservation/Reservation.aspx?strLGubun=110&strClubCode=N#aCourseSel"
+
+# 작업 프로세스에서 실행할 체크 함수 (스크립트로 실행해도 모듈 이름으로 import 되도록 문자열로 지정)
+BROWSER_CHECK = 'bearcreek_checker:check_available_dates'
+
+# 디버깅 스크린샷을 잘라낼 요소 (달력, 시간 정보 표)
+CALENDAR_LOCATOR = (By.XPATH, "//td[contains(@title, '예약가능')]/ancestor::table[1]")
+TIME_TABLE_LOCATOR = (By.XPATH, "//table[@class='table-body']")
+
+
+def attach_shared_driver(address):
+    """공유 브라우저에 debuggerAddress로 붙고, 이번 체크 전용 브라우저 컨텍스트(쿠키/캐시 분리)의 탭으로 전환"""
+    chrome_options = Options()
+    chrome_options.add_experimental_option("debuggerAddress", address)
+    driver = webdriver.Chrome(service=Service(), options=chrome_options)
+    try:
+        context_id = driver.execute_cdp_cmd('Target.createBrowserContext', {})['browserContextId']
+        target_id = driver.execute_cdp_cmd('Target.createTarget', {'url': 'about:blank', 'browserContextId': context_id})['targetId']
+        # ChromeDriver의 창 핸들은 CDP 타깃 ID
+        driver.switch_to.window(target_id)
+    except Exception:
+        driver.service.stop()
+        raise
+    driver.shared_context_id = context_id
+    driver.set_page_load_timeout(60)
+    return driver
+
+
+def quit_driver(driver):
+    """드라이버 종료 (공유 브라우저에 붙은 경우 브라우저는 두고 이번 컨텍스트와 드라이버만 정리)"""
+    context_id = getattr(driver, 'shared_context_id', None)
+    if context_id is None:
+        try:
+            driver.quit()
+        finally:
+            # 공용 Chrome 디스크 캐시는 브라우저가 끝난 뒤 다음 체크에 넘김
+            disk_cache = getattr(driver, 'disk_cache', None)
+            if disk_cache is not None:
+                disk_cache.release()
+        return
+    try:
+        driver.execute_cdp_cmd('Target.disposeBrowserContext', {'browserContextId': context_id})
+    finally:
+        driver.service.stop()
 
 
-def setup_driver():
-    """Selenium 웹드라이버 설정"""
+def setup_driver(profile=None):
+    """Selenium 웹드라이버 설정 (profile: profile_manager가 할당한 프로필 디렉토리)"""
+    # 공유 브라우저 감독 프로세스가 있으면 붙어서 씀 (브라우저 시작 시간 생략)
+    shared = browser_supervisor.endpoint()
+    if shared:
+        try:
+            driver = attach_shared_driver(shared)
+            browser_supervisor.record_attach('selenium', 'shared')
+            logger.info(f"공유 브라우저에 연결했습니다: {shared}")
+            return driver
+        except Exception as e:
+            logger.warning(f"공유 브라우저 연결 실패, 브라우저를 직접 실행합니다: {str(e)}")
+    browser_supervisor.record_attach('selenium', 'launched')
+    
     try:
-        # 기존 크롬 관련 프로세스 및 임시 폴더 정리
+        # 소유 프로세스가 끝난 프로필 디렉토리와 그 브라우저만 정리 (다른 프로세스의 Chrome/임시 파일은 건드리지 않음)
         try:
-            os.system("pkill -f chrome 2>/dev/null")
-            os.system("pkill -f chromium 2>/dev/null")
-            os.system("rm -rf /tmp/chrome* /tmp/*profile* /tmp/chromedata* 2>/dev/null")
-            logger.info("기존 Chrome 프로세스 및 임시 파일 정리 완료")
+            profile_manager.reclaim()
         except Exception as e:
             logger.warning(f"Chrome 정리 중 오류 (무시됨): {str(e)}")
         
@@ -120,16 +161,26 @@ def setup_driver():
         
         # 드라이버 생성
         try:
+            # 고유한 데이터 디렉토리 설정 (드라이버/브라우저 임시 파일도 같은 디렉토리 아래에 생성)
+            if profile is None:
+                profile = profile_manager.allocate('chromedata')
+            chrome_options.add_argument(f"--user-data-dir={profile.user_data_dir}")
+            
+            # 정적 에셋은 세션 간 공용 디스크 캐시 사용 (다른 브라우저가 쓰는 중이면 프로필 안의 빈 캐시)
+            disk_cache = asset_cache.ChromeDiskCache.acquire()
+            for arg in disk_cache.args:
+                chrome_options.add_argument(arg)
+            
             # Linux 서버 환경
-            service = Service()
+            service = Service(env=profile.environ())
             logger.info("Chrome 드라이버 생성 중...")
             
-            # 고유한 데이터 디렉토리 설정
-            temp_dir = f"/tmp/chromedata-{time.time()}-{random.randint(10000, 99999)}"
-            os.makedirs(temp_dir, exist_ok=True)
-            chrome_options.add_argument(f"--user-data-dir={temp_dir}")
-            
-            driver = webdriver.Chrome(service=service, options=chrome_options)
+            try:
+                driver = webdriver.Chrome(service=service, options=chrome_options)
+            except Exception:
+                disk_cache.release()
+                raise
+            driver.disk_cache = disk_cache
             
             # 페이지 로딩 타임아웃 설정
             driver.set_page_load_timeout(60)
@@ -145,232 +196,216 @@ def setup_driver():
 
 
 async def send_telegram_message(message):
-    """텔레그램 메시지 발송 함수"""
-    if not all([TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID]):
-        logger.error("텔레그램 설정이 완료되지 않았습니다. .env 파일을 확인하세요.")
-        logger.error(f"Bot Token: '{TELEGRAM_BOT_TOKEN}'")
-        logger.error(f"Chat ID: '{TELEGRAM_CHAT_ID}'")
-        return False
-    
-    try:
-        logger.info(f"텔레그램 봇 토큰 유효성 검사 중... (길이: {len(TELEGRAM_BOT_TOKEN)})")
-        logger.info(f"텔레그램 채팅 ID 유효성 검사 중... (값: {TELEGRAM_CHAT_ID})")
-        
-        # 봇 토큰 형식 확인
-        if ":" not in TELEGRAM_BOT_TOKEN:
-            logger.error("봇 토큰 형식이 잘못되었습니다. 올바른 형식: 123456789:AbCdEfGhIjKlMnOpQrStUvWxYz")
-            return False
-        
-        bot = Bot(token=TELEGRAM_BOT_TOKEN)
-        logger.info("텔레그램 봇 객체 생성 완료")
-        
-        # 채팅 ID 처리
-        chat_id = TELEGRAM_CHAT_ID
-        if isinstance(chat_id, str):
-            # 음수 값 유지하면서 변환 시도
-            if chat_id.startswith('-') and chat_id[1:].isdigit():
-                chat_id = int(chat_id)
-                logger.info(f"채팅 ID를 음수 값으로 변환: {chat_id}")
-            elif chat_id.isdigit():
-                chat_id = int(chat_id)
-                logger.info(f"채팅 ID를 숫자로 변환: {chat_id}")
-        
-        response = await bot.send_message(chat_id=chat_id, text=message, parse_mode='HTML')
-        logger.info(f"텔레그램 메시지가 성공적으로 전송되었습니다. 메시지 ID: {response.message_id}")
-        return True
-    except TelegramError as e:
-        logger.error(f"텔레그램 메시지 전송 중 오류가 발생했습니다: {str(e)}")
-        logger.error(f"오류 유형: {type(e).__name__}")
-        # 추가 디버깅 정보
-        if "Unauthorized" in str(e):
-            logger.error("봇 토큰이 유효하지 않습니다. 새로운 토큰을 생성하거나 토큰 값을 확인하세요.")
-        elif "Chat not found" in str(e):
-            logger.error("채팅 ID를 찾을 수 없습니다. 채팅 ID가 올바른지 확인하세요.")
-        elif "Bad Request" in str(e):
-            logger.error("잘못된 요청입니다. 메시지 형식이나 매개변수를 확인하세요.")
-        return False
-    except Exception as e:
-        logger.error(f"텔레그램 메시지 전송 중 예상치 못한 오류가 발생했습니다: {str(e)}")
-        return False
+    """텔레그램 메시지 발송 함수 (공용 notifier 사용)"""
+    return await notifier.send_message(message)
 
 
 def send_telegram_notification(message):
-    """텔레그램 메시지 발송을 위한 동기 래퍼 함수"""
-    asyncio.run(send_telegram_message(message))
+    """텔레그램 메시지 발송을 위한 동기 래퍼 함수 (데몬 모드에서는 데몬 루프에서 발송)"""
+    return notifier.notify(message)
+
+
+def find_available_dates(driver, year=None, month=None):
+    """달력에서 예약 가능 날짜와 날짜별 onclick 추출 -> (날짜 목록, [(날짜, onclick)])
+
+    year/month: title에 년/월이 없는 칸에 쓸 년월 (기본값: YEAR/MONTH)
+    """
+    import freshness
+    year, month = year or YEAR, month or MONTH
+    available_dates = []
+    # "예약가능" 텍스트가 포함된 title 속성을 가진 td 요소 찾기
+    available_tds = driver.find_elements(By.XPATH, "//td[contains(@title, '예약가능')]")
+    logger.info(f"'예약가능' title 속성을 가진 td 요소 수: {len(available_tds)}")
+    
+    # 예약 가능한 날짜 정보를 미리 추출
+    date_infos = []
+    for td in available_tds:
+        try:
+            title = td.get_attribute('title')
+            logger.debug("예약가능 td의 title: '%s'", title)
+    
+            # href 속성에서 날짜 정보 추출 시도
+            a_tag = td.find_element(By.TAG_NAME, 'a')
+            onclick_attr = a_tag.get_attribute('onclick')
+            logger.debug("클릭 이벤트: %s", onclick_attr)
+    
+            # 날짜 추출 (YYYY년 MM월 DD일, MM월 DD일, DD일 순으로 시도)
+            date_str = page_parser.date_from_title(title, year, month)
+            if date_str and date_str not in available_dates:
+                available_dates.append(date_str)
+                freshness.mark_seen(date_str)
+                date_infos.append((date_str, onclick_attr))
+                logger.debug("예약 가능한 날짜 찾음 (title): %s", date_str)
+        except Exception as e:
+            logger.warning(f"예약가능 td 처리 중 오류: {str(e)}")
+    return available_dates, date_infos
+
 
+def fetch_available_dates(year=None, month=None):
+    """year/month(기본값: YEAR/MONTH)의 예약 가능 날짜 조회만 수행 (날짜별 시간 조회와 알림 없음, 실패 시 None)"""
+    import browser_resources
+    year, month = year or YEAR, month or MONTH
+    driver = None
+    profile = None
+    monitor = browser_resources.BrowserMonitor('selenium').start()
+    try:
+        with metrics.span('driver_launch'):
+            profile = profile_manager.allocate('chromedata')
+            driver = setup_driver(profile)
+            monitor.attach(browser_resources.selenium_driver_pid(driver))
+        rate_limiter.acquire(BEARCREEK_URL)
+        with metrics.span('page_load'):
+            driver.get(BEARCREEK_URL)
+        with metrics.span('wait'):
+            time.sleep(10)
+        with metrics.span('dom_extract'):
+            available_dates, _ = find_available_dates(driver, year, month)
+        return [date for date in available_dates if date.startswith(f"{year}-{month:02d}")]
+    except Exception as e:
+        logger.error(f"예약 가능 날짜 조회 중 오류 발생: {str(e)}")
+        return None
+    finally:
+        if driver:
+            quit_driver(driver)
+        monitor.stop()
+        if profile is not None:
+            profile.release()
 
+
+@metrics.timed_cycle('selenium')
+@profiler.profiled('selenium')
 def check_available_dates(single_run=False):
     """베어크리크 골프장 예약 가능 날짜 확인"""
+    import live_board
+    import freshness
+    import browser_resources
+    import disk_monitor
     logger.info("베어크리크 골프장 예약 확인을 시작합니다...")
     
-    # 디스크 공간 확인
+    # 디스크 공간 확인 (압박 단계에 따라 디버깅 파일/보관소/로그/브라우저 프로필이 스스로 줄어듦)
     try:
-        statvfs = os.statvfs("/")
-        free_space_mb = (statvfs.f_frsize * statvfs.f_bavail) / (1024 * 1024)
-        used_percent = 100 - (statvfs.f_bavail / statvfs.f_blocks * 100)
-        logger.info(f"디스크 여유 공간: {free_space_mb:.2f}MB ({used_percent:.1f}% 사용 중)")
-        
-        # 디스크 여유 공간이 500MB 미만이면 임시 파일 정리
-        if free_space_mb < 500:
-            logger.warning("디스크 여유 공간이 부족합니다. 임시 파일 정리를 시도합니다.")
-            os.system("rm -rf /tmp/chrome* /tmp/*profile* /tmp/*.png /tmp/*.html 2>/dev/null")
+        if disk_monitor.check() >= disk_monitor.WARNING:
+            logger.warning(f"디스크 여유 공간이 부족합니다. 디버깅 파일 저장을 줄이고 임시 파일을 정리합니다. ({disk_monitor.describe()})")
+        else:
+            logger.info(f"디스크 상태: {disk_monitor.describe()}")
     except Exception as e:
         logger.error(f"디스크 공간 확인 중 오류: {str(e)}")
     
     driver = None
     available_dates = []
     available_times = {}  # 날짜별 예약 가능 시간을 저장할 딕셔너리
+    profile = None
+    tracer = browser_trace.SeleniumTrace('selenium')
+    monitor = browser_resources.BrowserMonitor('selenium').start()
     
     try:
-        driver = setup_driver()
+        with metrics.span('driver_launch'):
+            profile = profile_manager.allocate('chromedata')
+            driver = setup_driver(profile)
+            monitor.attach(browser_resources.selenium_driver_pid(driver))
+        tracer.start(driver)
         
-        # 베어크리크 골프장 예약 페이지 접속
-        driver.get(BEARCREEK_URL)
+        # 베어크리크 골프장 예약 페이지 접속 (모든 체커/프로세스 공용 요청 한도 안에서)
+        rate_limiter.acquire(BEARCREEK_URL)
+        with metrics.span('page_load'):
+            driver.get(BEARCREEK_URL)
         logger.info("웹페이지에 접속했습니다.")
         
         # 쿠키 설정 및 JavaScript 실행을 위한 시간 대기
-        time.sleep(10)
+        with metrics.span('wait'):
+            time.sleep(10)
         
-        # 페이지 로딩 문제 시 스크린샷 저장
-        driver.save_screenshot("calendar_page.png")
-        logger.info("현재 페이지 스크린샷을 저장했습니다: calendar_page.png")
+        # 정적 에셋 캐시 적중률 기록
+        try:
+            asset_cache.record_resource_timing(driver).report()
+        except Exception as e:
+            logger.debug("에셋 캐시 적중률 확인 실패 (무시됨): %s", e)
         
-        # 페이지 HTML 출력 (디버깅용)
-        page_source = driver.page_source
-        with open("page_source.html", "w", encoding="utf-8") as f:
-            f.write(page_source)
-        logger.info("페이지 소스를 저장했습니다: page_source.html")
+        # 달력 스크린샷 및 페이지 소스 (디버깅용, 표본 사이클만 백그라운드 저장)
+        with metrics.span('screenshot'):
+            artifacts.capture("calendar_page.png", lambda: artifacts.element_png(driver, CALENDAR_LOCATOR))
+        with metrics.span('page_dump'):
+            artifacts.capture("page_source.html", lambda: driver.page_source, target='reservation')
         
         # 예약 가능한 날짜 찾기
         try:
             logger.info("페이지에서 예약 가능한 날짜 찾는 중...")
             
-            # "예약가능" 텍스트가 포함된 title 속성을 가진 td 요소 찾기
-            available_tds = driver.find_elements(By.XPATH, "//td[contains(@title, '예약가능')]")
-            logger.info(f"'예약가능' title 속성을 가진 td 요소 수: {len(available_tds)}")
-            
-            # 예약 가능한 날짜 정보를 미리 추출
-            date_infos = []
-            for td in available_tds:
-                try:
-                    title = td.get_attribute('title')
-                    logger.info(f"예약가능 td의 title: '{title}'")
-                    
-                    # href 속성에서 날짜 정보 추출 시도
-                    a_tag = td.find_element(By.TAG_NAME, 'a')
-                    onclick_attr = a_tag.get_attribute('onclick')
-                    logger.info(f"클릭 이벤트: {onclick_attr}")
-                    
-                    # 날짜 추출
-                    import re
-                    
-                    # YYYY년 MM월 DD일 패턴 추출
-                    date_match = re.search(r'(\d{4})년\s*(\d{2})월\s*(\d{2})일', title)
-                    if date_match:
-                        year, month, day = map(int, date_match.groups())
-                        date_str = f"{year}-{month:02d}-{day:02d}"
-                        if date_str not in available_dates:
-                            available_dates.append(date_str)
-                            date_infos.append((date_str, onclick_attr))
-                            logger.info(f"예약 가능한 날짜 찾음 (title년월일): {date_str}")
-                        continue
-                    
-                    # MM월 DD일 패턴 추출
-                    date_match = re.search(r'(\d{1,2})월\s*(\d{1,2})일', title)
-                    if date_match:
-                        month, day = map(int, date_match.groups())
-                        date_str = f"{YEAR}-{month:02d}-{day:02d}"
-                        if date_str not in available_dates:
-                            available_dates.append(date_str)
-                            date_infos.append((date_str, onclick_attr))
-                            logger.info(f"예약 가능한 날짜 찾음 (title월일): {date_str}")
-                        continue
-                    
-                    # DD일 패턴 추출
-                    day_match = re.search(r'(\d{1,2})일', title)
-                    if day_match:
-                        day = int(day_match.group(1))
-                        date_str = f"{YEAR}-{MONTH:02d}-{day:02d}"
-                        if date_str not in available_dates:
-                            available_dates.append(date_str)
-                            date_infos.append((date_str, onclick_attr))
-                            logger.info(f"예약 가능한 날짜 찾음 (title일): {date_str}")
-                except Exception as e:
-                    logger.warning(f"예약가능 td 처리 중 오류: {str(e)}")
+            with metrics.span('dom_extract'):
+                available_dates, date_infos = find_available_dates(driver)
             
             # 모든 날짜에 대한 시간 정보 가져오기
             for date_str, onclick in date_infos:
-                try:
-                    # 페이지 다시 로드
-                    driver.get(BEARCREEK_URL)
-                    time.sleep(5)
+                with metrics.span('drilldown'):
+                    try:
+                        # 페이지 다시 로드
+                        rate_limiter.acquire(BEARCREEK_URL)
+                        with metrics.span('page_load'):
+                            driver.get(BEARCREEK_URL)
+                        with metrics.span('wait'):
+                            time.sleep(5)
                     
-                    # 클릭할 날짜 요소 다시 찾기
-                    date_xpath = f"//td[contains(@title, '{date_str.replace('-', '년 ', 1).replace('-', '월 ')}일')]//a"
-                    logger.info(f"날짜 요소 찾는 XPath: {date_xpath}")
+                        # 클릭할 날짜 요소 다시 찾기
+                        date_xpath = f"//td[contains(@title, '{date_str.replace('-', '년 ', 1).replace('-', '월 ')}일')]//a"
+                        logger.debug("날짜 요소 찾는 XPath: %s", date_xpath)
                     
-                    try:
-                        date_element = WebDriverWait(driver, 10).until(
-                            EC.element_to_be_clickable((By.XPATH, date_xpath))
-                        )
-                        # 날짜 클릭
-                        driver.execute_script("arguments[0].click();", date_element)
-                        logger.info(f"{date_str} 날짜 클릭됨, 시간 정보 로딩 중...")
-                        
-                        # 시간 정보가 로드될 때까지 충분히 기다림
-                        time.sleep(10)
+                        try:
+                            date_element = WebDriverWait(driver, 10).until(
+                                EC.element_to_be_clickable((By.XPATH, date_xpath))
+                            )
+                            # 날짜 클릭 (시간 정보 요청이 나가므로 요청 한도 적용)
+                            rate_limiter.acquire(BEARCREEK_URL)
+                            driver.execute_script("arguments[0].click();", date_element)
+                            logger.info(f"{date_str} 날짜 클릭됨, 시간 정보 로딩 중...")
                         
-                        # 해당 날짜에 대한 시간 정보 페이지 스크린샷 저장
-                        screenshot_file = f"time_info_{date_str}.png"
-                        driver.save_screenshot(screenshot_file)
-                        logger.info(f"시간 정보 페이지 스크린샷 저장: {screenshot_file}")
+                            # 시간 정보가 로드될 때까지 충분히 기다림
+                            with metrics.span('wait'):
+                                time.sleep(10)
                         
-                        # 페이지 소스 저장
-                        html_file = f"time_page_{date_str}.html"
-                        with open(html_file, "w", encoding="utf-8") as f:
-                            f.write(driver.page_source)
-                        logger.info(f"시간 정보 페이지 소스 저장: {html_file}")
+                            # 시간 정보 표 스크린샷 및 페이지 소스 (디버깅용, 표본 사이클만)
+                            with metrics.span('screenshot'):
+                                artifacts.capture(f"time_info_{date_str}.png", lambda: artifacts.element_png(driver, TIME_TABLE_LOCATOR))
+                            with metrics.span('page_dump'):
+                                artifacts.capture(f"time_page_{date_str}.html", lambda: driver.page_source, target='tee_times')
                         
-                        # 시간 정보 행 찾기
-                        time_rows = driver.find_elements(By.XPATH, "//table[@class='table-body']//tr")
+                            # 시간 정보 행 찾기
+                            time_rows = driver.find_elements(By.XPATH, "//table[@class='table-body']//tr")
                         
-                        if not time_rows:
-                            logger.info(f"{date_str}에 예약 가능한 시간이 없거나 이미 예약된 상태입니다. 건너뜁니다.")
-                            continue
+                            if not time_rows:
+                                logger.info(f"{date_str}에 예약 가능한 시간이 없거나 이미 예약된 상태입니다. 건너뜁니다.")
+                                continue
                         
-                        logger.info(f"시간 정보 행 찾음 ({len(time_rows)}개): //table[@class='table-body']//tr")
+                            logger.info(f"시간 정보 행 찾음 ({len(time_rows)}개): //table[@class='table-body']//tr")
                         
-                        # 시간 정보 추출 및 저장
-                        time_info = []
-                        for row in time_rows:
-                            try:
-                                cells = row.find_elements(By.TAG_NAME, "td")
-                                if len(cells) >= 4:
-                                    course = cells[0].text.strip()
-                                    tee_time = cells[1].text.strip()
-                                    price = cells[3].text.strip()
-                                    
-                                    if course and tee_time:  # 의미 있는 데이터인지 확인
-                                        time_info.append(f"{course} {tee_time} ({price}원)")
-                                        logger.info(f"시간 정보 추출: {course} {tee_time} ({price}원)")
-                            except Exception as e:
-                                logger.warning(f"시간 정보 행 처리 중 오류: {str(e)}")
+                            # 시간 정보 추출 및 저장
+                            time_info = []
+                            for row in time_rows:
+                                try:
+                                    cells = row.find_elements(By.TAG_NAME, "td")
+                                    if len(cells) >= 4:
+                                        # 코스와 시간이 있는 행만 사용 (의미 있는 데이터인지 확인)
+                                        entry = page_parser.format_tee_time(cells[0].text, cells[1].text, cells[3].text)
+                                        if entry:
+                                            time_info.append(entry)
+                                            logger.debug("시간 정보 추출: %s", entry)
+                                except Exception as e:
+                                    logger.warning(f"시간 정보 행 처리 중 오류: {str(e)}")
                         
-                        if time_info:
-                            available_times[date_str] = time_info
-                            logger.info(f"{date_str}에 {len(time_info)}개의 이용 가능 시간 찾음")
-                        else:
-                            logger.warning(f"{date_str}에 이용 가능한 시간 정보를 찾지 못함")
-                            # 시간 정보가 없으면 예약 가능한 날짜에서 제외
-                            if date_str in available_dates:
-                                available_dates.remove(date_str)
-                                logger.info(f"{date_str}는 시간 정보가 없어 예약 가능한 날짜에서 제외되었습니다.")
+                            if time_info:
+                                available_times[date_str] = time_info
+                                logger.info(f"{date_str}에 {len(time_info)}개의 이용 가능 시간 찾음")
+                            else:
+                                logger.warning(f"{date_str}에 이용 가능한 시간 정보를 찾지 못함")
+                                # 시간 정보가 없으면 예약 가능한 날짜에서 제외
+                                if date_str in available_dates:
+                                    available_dates.remove(date_str)
+                                    logger.info(f"{date_str}는 시간 정보가 없어 예약 가능한 날짜에서 제외되었습니다.")
+                        except Exception as e:
+                            logger.error(f"날짜 요소 클릭 또는 시간 정보 테이블 대기 중 오류: {str(e)}")
+                            artifacts.capture(f"click_error_{date_str.replace('-', '_')}.png", driver.get_screenshot_as_png, failed=True)
                     except Exception as e:
-                        logger.error(f"날짜 요소 클릭 또는 시간 정보 테이블 대기 중 오류: {str(e)}")
-                        driver.save_screenshot(f"click_error_{date_str.replace('-', '_')}.png")
-                except Exception as e:
-                    logger.error(f"{date_str} 시간 정보 추출 중 오류: {str(e)}")
-                    driver.save_screenshot(f"time_error_{date_str.replace('-', '_')}.png")
+                        logger.error(f"{date_str} 시간 정보 추출 중 오류: {str(e)}")
+                        artifacts.capture(f"time_error_{date_str.replace('-', '_')}.png", driver.get_screenshot_as_png, failed=True)
             
             # 콘솔에 예약 가능한 날짜 출력
             print("\n===== 예약 가능한 날짜 =====")
@@ -394,33 +429,36 @@ def check_available_dates(single_run=False):
             print(f"알림 시간: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
             print("===========================\n")
             
+            # 알림 대기열 등록 시점 기록
+            freshness.mark_enqueued(target_month_dates)
+            
+            # 라이브 보드 모드: 고정 메시지 하나만 갱신
+            if live_board.is_live_mode():
+                board_slots = {date: available_times.get(date, []) for date in target_month_dates}
+                with metrics.span('telegram_send'):
+                    live_board.update_live_board(
+                        f"{YEAR}-{MONTH:02d}",
+                        f"🏌️ <b>베어크리크 춘천 {MONTH}월 예약 현황</b>",
+                        board_slots,
+                        BEARCREEK_URL,
+                    )
             # 텔레그램 메시지 발송 (설정된 월 예약만)
-            if target_month_dates:
+            elif target_month_dates:
                 logger.info(f"{MONTH}월 예약 가능한 날짜를 {len(target_month_dates)}개 찾았습니다!")
                 
-                # 텔레그램 메시지 생성 및 발송
-                telegram_message = f"🏌️ <b>베어크리크 춘천 {MONTH}월 예약 가능 알림</b>\n\n"
-                telegram_message += f"현재 베어크리크 춘천 골프장에 {MONTH}월 예약 가능한 날짜가 있습니다!\n\n"
-                telegram_message += "<b>예약 가능 날짜:</b>\n"
-                
-                for date in target_month_dates:
-                    telegram_message += f"• <b>{date}</b>\n"
-                    
-                    # 해당 날짜의 예약 가능 시간 추가
-                    if date in available_times and available_times[date]:
-                        telegram_message += "  <u>이용 가능 시간:</u>\n"
-                        for time_slot in available_times[date]:
-                            telegram_message += f"  - {time_slot}\n"
-                    
-                telegram_message += f"\n예약 페이지: {BEARCREEK_URL}\n"
-                telegram_message += f"알림 시간: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
-                
-                # 텔레그램 봇 토큰과 채팅 ID 확인
-                logger.info(f"Telegram Bot Token 확인: {TELEGRAM_BOT_TOKEN[:5]}...{TELEGRAM_BOT_TOKEN[-5:] if TELEGRAM_BOT_TOKEN else ''}")
-                logger.info(f"Telegram Chat ID 확인: {TELEGRAM_CHAT_ID}")
+                # 텔레그램 메시지 생성 (4096자 초과 시 날짜 단위로 분할)
+                telegram_messages = message_renderer.render_availability(
+                    f"🏌️ <b>베어크리크 춘천 {MONTH}월 예약 가능 알림</b>",
+                    {date: available_times.get(date, []) for date in target_month_dates},
+                    BEARCREEK_URL,
+                    intro=f"현재 베어크리크 춘천 골프장에 {MONTH}월 예약 가능한 날짜가 있습니다!",
+                    notify_time=datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                )
                 
                 try:
-                    send_telegram_notification(telegram_message)
+                    with metrics.span('telegram_send'):
+                        for telegram_message in telegram_messages:
+                            send_telegram_notification(telegram_message)
                 except Exception as e:
                     logger.error(f"텔레그램 메시지 발송 중 예외 발생: {str(e)}")
                     logger.warning("텔레그램 메시지 발송은 실패했지만, 위 콘솔 출력에서 예약 가능한 날짜를 확인할 수 있습니다.")
@@ -428,30 +466,35 @@ def check_available_dates(single_run=False):
                 logger.info(f"{MONTH}월에 예약 가능한 날짜가 없습니다. 텔레그램 알림 생략.")
         except Exception as e:
             logger.error(f"달력 확인 중 오류 발생: {str(e)}")
-            driver.save_screenshot("date_check_error.png")
+            artifacts.capture("date_check_error.png", driver.get_screenshot_as_png, failed=True)
     except TimeoutException:
         logger.error("페이지 로딩 시간이 초과되었습니다.")
         if driver:
-            driver.save_screenshot("timeout_error.png")
+            artifacts.capture("timeout_error.png", driver.get_screenshot_as_png, failed=True)
     except WebDriverException as e:
         logger.error(f"웹드라이버 오류 발생: {str(e)}")
     except Exception as e:
         logger.error(f"예약 확인 중 오류 발생: {str(e)}")
         if driver:
-            driver.save_screenshot("error.png")
+            artifacts.capture("error.png", driver.get_screenshot_as_png, failed=True)
     finally:
-        # 드라이버 종료
+        # 드라이버 종료 (느린 체크는 먼저 브라우저 추적 데이터 보관)
         if driver:
-            driver.quit()
+            tracer.finish(driver, BEARCREEK_URL)
+            quit_driver(driver)
+        # 브라우저 자원 사용량 기록 및 남은 프로세스 정리
+        monitor.stop()
         
         # 임시 파일 정리
         try:
-            logger.info("임시 파일 정리 중...")
-            os.system("rm -rf /tmp/chrome* /tmp/*profile* /tmp/chromedata* 2>/dev/null")
-            # 현재 디렉토리의 오래된 PNG 및 HTML 파일 정리 (7일 이상)
-            os.system("find . -name '*.png' -mtime +7 -delete 2>/dev/null")
-            os.system("find . -name '*.html' -mtime +7 -delete 2>/dev/null")
-            logger.info("임시 파일 정리 완료")
+            with metrics.span('cleanup'):
+                logger.info("임시 파일 정리 중...")
+                # 이번 체크의 프로필 디렉토리만 삭제
+                if profile is not None:
+                    profile.release()
+                # 7일 지난 디버깅 파일 정리 (카탈로그 조회로 대상만 삭제)
+                artifact_catalog.enforce(max_bytes=0, max_age_seconds=7 * 86400)
+                logger.info("임시 파일 정리 완료")
         except Exception as e:
             logger.warning(f"임시 파일 정리 중 오류 (무시됨): {str(e)}")
             
@@ -467,24 +510,44 @@ def check_available_dates(single_run=False):
 
 def run_scheduler():
     """스케줄러 실행"""
+    import heap_monitor
+    import disk_monitor
     logger.info(f"베어크리크 예약 확인 스케줄러가 시작되었습니다. 확인 주기: {CHECK_INTERVAL_MINUTES}분")
     
+    # 메트릭 엔드포인트 시작 (METRICS_PORT 설정 시)
+    metrics.start_metrics_server()
+    
+    # SIGUSR1 수신 시 다음 사이클 프로파일링
+    profiler.install_signal_handler()
+    
+    # 힙 추적 및 RSS 상한 점검 시작 (HEAP_TRACE, MAX_RSS_MB 설정 시)
+    heap_monitor.start()
+    
+    # 디스크 압박 감시 시작 (단계에 따라 디버깅 파일/보관소/로그 보관량 축소)
+    disk_monitor.start()
+    
+    # 체크는 브라우저 작업 프로세스에서 실행 (멈춘 브라우저가 스케줄러를 막지 않도록)
+    check_job = browser_pool.background(BROWSER_CHECK)
+    
     # 즉시 한 번 실행
-    check_available_dates()
+    check_job()
     
     # 스케줄 설정
-    schedule.every(CHECK_INTERVAL_MINUTES).minutes.do(check_available_dates)
+    schedule.every(CHECK_INTERVAL_MINUTES).minutes.do(check_job)
     
     # 스케줄러 무한 루프
     while True:
         schedule.run_pending()
+        heap_monitor.tick()
         time.sleep(1)
 
 
 if __name__ == "__main__":
     logger.info("베어크리크 알리미가 시작되었습니다.")
     
-    # 커맨드라인 인자 확인
+    # 커맨드라인 인자 확인 (--profile N: 처음 N회 사이클 프로파일링)
+    profiler.arm_from_argv(sys.argv)
+    
     if len(sys.argv) > 1 and sys.argv[1] == "--single":
         # 단일 실행 모드
         logger.info("단일 실행 모드로 실행합니다.")
@@ -0,0 +1,469 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""브라우저 체크를 별도 작업 프로세스에서 실행하는 프로세스 풀
+
+멈춘 Chromium/Playwright 호출이 스케줄러 스레드를 막지 않도록 체크 함수를 작업
+프로세스(자기 프로세스 그룹의 리더)에서 실행한다. 시간 제한을 넘기거나 작업
+프로세스가 죽으면 감시 스레드가 그 작업 프로세스의 프로세스 그룹과 하위 프로세스만
+PID로 종료하고 새 작업 프로세스를 띄운다.
+
+    result = browser_pool.run('bearcreek_checker:check_available_dates')
+"""
+
+import os
+import sys
+import time
+import atexit
+import signal
+import logging
+import itertools
+import importlib
+import threading
+import subprocess
+import collections
+import multiprocessing
+import multiprocessing.connection
+import concurrent.futures
+from dotenv import load_dotenv
+import metrics
+import profiler
+import log_setup
+import heap_monitor
+import profile_manager
+import browser_resources
+
+logger = logging.getLogger(__name__)
+
+# 환경 변수 로드
+load_dotenv()
+
+
+def _env_float(name, default):
+    """주석이 포함될 수 있는 실수 환경변수 로드"""
+    value = os.getenv(name, str(default)).split('#')[0].strip()
+    try:
+        return float(value)
+    except ValueError:
+        return default
+
+
+# 작업 프로세스 수 (0이면 격리하지 않고 호출한 스레드에서 바로 실행)
+BROWSER_WORKERS = int(_env_float('BROWSER_WORKERS', 1))
+
+# 작업 하나의 시간 제한 (초) - 넘기면 작업 프로세스를 프로세스 그룹째 종료
+BROWSER_TASK_TIMEOUT_SECONDS = _env_float('BROWSER_TASK_TIMEOUT_SECONDS', 300)
+
+# 이 횟수만큼 작업한 작업 프로세스는 새로 띄움 (누적 메모리 정리, 0이면 비활성화)
+BROWSER_WORKER_MAX_TASKS = int(_env_float('BROWSER_WORKER_MAX_TASKS', 20))
+
+# 감시 스레드 점검 간격 (초)
+WATCH_INTERVAL_SECONDS = 0.2
+
+BROWSER_TASK_METRIC = 'bearcreek_browser_tasks_total'
+BROWSER_TASK_WAIT_METRIC = 'bearcreek_browser_task_wait_seconds'
+BROWSER_WORKER_RESTART_METRIC = 'bearcreek_browser_worker_restarts_total'
+
+metrics.describe(BROWSER_TASK_METRIC, 'counter', '브라우저 작업 프로세스에서 실행한 작업 수 (result=ok|error|timeout|crashed|cancelled)')
+metrics.describe(BROWSER_TASK_WAIT_METRIC, 'histogram', '브라우저 작업이 빈 작업 프로세스를 기다린 시간 (초)')
+metrics.describe(BROWSER_WORKER_RESTART_METRIC, 'counter', '브라우저 작업 프로세스를 새로 띄운 횟수 (reason=timeout|crashed|recycled|cancelled)')
+
+
+class BrowserTaskError(Exception):
+    """작업 프로세스 안에서 체크 함수가 예외를 던짐 (원래 예외 유형과 메시지 포함)"""
+
+
+class BrowserTaskTimeout(BrowserTaskError):
+    """작업이 시간 제한을 넘겨 작업 프로세스를 종료함"""
+
+
+class BrowserTaskCancelled(BrowserTaskError):
+    """cancel()로 실행 중인 작업을 중단함"""
+
+
+class BrowserWorkerCrashed(BrowserTaskError):
+    """작업 도중 작업 프로세스가 비정상 종료함"""
+
+
+def _resolve(target):
+    """'모듈:함수' 문자열을 함수로 변환"""
+    module, _, name = target.partition(':')
+    return getattr(importlib.import_module(module), name)
+
+
+def _worker_main(conn, log_file):
+    """작업 프로세스 본체: 작업을 받아 실행하고 결과와 메트릭을 돌려줌"""
+    # Ctrl+C는 부모가 처리하고 작업 프로세스는 부모가 정리
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    log_setup.setup_logging(log_file or None)
+    # 요약 파일은 부모가 작업 프로세스의 메트릭을 합쳐서 기록
+    metrics.METRICS_SUMMARY_FILE = ''
+    while True:
+        try:
+            task = conn.recv()
+        except (EOFError, OSError):
+            return
+        if task is None:
+            return
+        task_id, target, args, profile = task
+        if profile:
+            profiler.arm(1)
+        try:
+            reply = (task_id, True, _resolve(target)(*args))
+        except BaseException as e:
+            reply = (task_id, False, f"{type(e).__name__}: {str(e)}")
+        try:
+            conn.send(reply + (metrics.export_state(),))
+        except (EOFError, OSError):
+            return
+        except Exception as e:
+            # 결과를 pickle 할 수 없는 경우
+            conn.send((task_id, False, f"결과 전달 실패: {str(e)}", metrics.export_state()))
+
+
+class _DuplexConnection:
+    """작업 프로세스 쪽: 받는 파이프와 보내는 파이프를 하나의 연결처럼 사용"""
+
+    def __init__(self, read_fd, write_fd):
+        self._reader = multiprocessing.connection.Connection(read_fd, writable=False)
+        self._writer = multiprocessing.connection.Connection(write_fd, readable=False)
+
+    def recv(self):
+        return self._reader.recv()
+
+    def send(self, obj):
+        self._writer.send(obj)
+
+
+def _worker_entry(argv):
+    """python -c 'import browser_pool; browser_pool._worker_entry(...)'로 시작된 작업 프로세스 진입점"""
+    read_fd, write_fd, log_file = int(argv[0]), int(argv[1]), argv[2]
+    _worker_main(_DuplexConnection(read_fd, write_fd), log_file)
+
+
+class _Worker:
+    """작업 프로세스 하나와 부모 쪽 파이프
+
+    multiprocessing의 spawn처럼 부모의 __main__ 스크립트를 다시 실행하지 않도록 새 인터프리터로
+    browser_pool만 import 해서 시작하고, start_new_session으로 exec 전에 자기 프로세스 그룹의 리더가 된다
+    (드라이버/브라우저 자식들도 이 그룹에 들어감).
+    """
+
+    def __init__(self, log_file):
+        task_read, task_write = os.pipe()
+        result_read, result_write = os.pipe()
+        here = os.path.dirname(os.path.abspath(__file__))
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [here, os.environ.get('PYTHONPATH')])))
+        code = f"import browser_pool; browser_pool._worker_entry({[str(task_read), str(result_write), log_file or '']!r})"
+        try:
+            self.process = subprocess.Popen(
+                [sys.executable, '-c', code], env=env, pass_fds=(task_read, result_write),
+                stdin=subprocess.DEVNULL, start_new_session=True,
+            )
+        finally:
+            os.close(task_read)
+            os.close(result_write)
+        self.pid = self.process.pid
+        self.sender = multiprocessing.connection.Connection(task_write, readable=False)
+        self.conn = multiprocessing.connection.Connection(result_read, writable=False)
+        self.task = None
+        self.completed = 0
+
+    def alive(self):
+        return self.process.poll() is None
+
+    def send(self, obj):
+        self.sender.send(obj)
+
+    def _close(self):
+        self.sender.close()
+        self.conn.close()
+
+    def kill(self):
+        """작업 프로세스의 프로세스 그룹과, 그룹을 벗어난 하위 프로세스까지 PID로 종료"""
+        # 그룹을 죽이면 자식들이 init으로 넘어가 트리에서 사라지므로 먼저 하위 프로세스를 기록
+        leftovers = {}
+        for child in browser_resources.descendants(self.pid) if browser_resources.available() else []:
+            stat = browser_resources.read_stat(child)
+            if stat is not None:
+                leftovers[child] = stat[3]
+        # 아직 wait 하지 않은 자식이므로 PID(=프로세스 그룹 ID)가 재사용되지 않음
+        try:
+            os.killpg(self.pid, signal.SIGKILL)
+        except OSError:
+            self.process.kill()
+        try:
+            self.process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            pass
+        # Playwright처럼 브라우저를 별도 프로세스 그룹으로 띄운 경우
+        if leftovers:
+            browser_resources.kill_processes(leftovers)
+        self._close()
+
+    def stop(self, timeout=5):
+        """작업이 없을 때 정상 종료 (응답이 없으면 kill)"""
+        try:
+            self.send(None)
+        except OSError:
+            pass
+        try:
+            self.process.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            self.kill()
+            return
+        self._close()
+
+
+class BrowserPool:
+    """브라우저 작업 프로세스 풀 (작업 큐 + 시간 제한 감시 + 자동 재시작)"""
+
+    def __init__(self, size=None, timeout=None, max_tasks=None):
+        self.size = max(int(size or BROWSER_WORKERS), 1)
+        self.timeout = timeout or BROWSER_TASK_TIMEOUT_SECONDS
+        self.max_tasks = BROWSER_WORKER_MAX_TASKS if max_tasks is None else max_tasks
+        self._log_file = None
+        self._pending = collections.deque()
+        self._workers = []
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """작업 프로세스와 감시 스레드 시작 (이미 실행 중이면 무시)"""
+        with self._lock:
+            if self._thread is not None:
+                return self
+            self._log_file = log_setup.current_log_file()
+            self._workers = [_Worker(self._log_file) for _ in range(self.size)]
+            self._thread = threading.Thread(target=self._watch, name='browser-pool', daemon=True)
+            self._thread.start()
+        logger.info(
+            f"브라우저 작업 프로세스 {self.size}개 시작 (PID {', '.join(str(w.pid) for w in self._workers)}, "
+            f"작업 시간 제한 {self.timeout:g}초)"
+        )
+        return self
+
+    def submit(self, target, *args, timeout=None):
+        """'모듈:함수'를 작업 프로세스에서 실행하도록 큐에 넣고 Future 반환"""
+        if self._closed.is_set():
+            raise RuntimeError("브라우저 작업 풀이 종료되었습니다.")
+        self.start()
+        future = concurrent.futures.Future()
+        with self._lock:
+            self._pending.append((next(self._ids), target, args, timeout or self.timeout, future, time.monotonic()))
+        return future
+
+    def run(self, target, *args, timeout=None):
+        """작업 프로세스에서 실행하고 결과를 기다림 (시간 제한은 감시 스레드가 보장)"""
+        return self.submit(target, *args, timeout=timeout).result()
+
+    def cancel(self, future):
+        """작업 취소 (대기 중이면 큐에서 빼고, 실행 중이면 감시 스레드가 그 작업 프로세스를 종료)"""
+        if future.cancel():
+            return True
+        with self._lock:
+            for worker in self._workers:
+                if worker.task is not None and worker.task['future'] is future:
+                    worker.task['cancelled'] = True
+                    return True
+        return False
+
+    def _watch(self):
+        while not self._closed.is_set():
+            try:
+                self._dispatch()
+                busy = {worker.conn: worker for worker in self._workers if worker.task is not None}
+                if busy:
+                    ready = multiprocessing.connection.wait(list(busy), timeout=WATCH_INTERVAL_SECONDS)
+                else:
+                    self._closed.wait(WATCH_INTERVAL_SECONDS)
+                    ready = []
+                for conn in ready:
+                    self._receive(busy[conn])
+                self._check_workers()
+            except Exception as e:
+                logger.error(f"브라우저 작업 감시 중 오류: {type(e).__name__}: {str(e)}")
+                self._closed.wait(1)
+
+    def _dispatch(self):
+        """빈 작업 프로세스에 대기 중인 작업 전달"""
+        for worker in self._workers:
+            with self._lock:
+                if worker.task is not None or not self._pending:
+                    continue
+                task_id, target, args, timeout, future, queued = self._pending.popleft()
+            if not future.set_running_or_notify_cancel():
+                continue
+            metrics.observe(BROWSER_TASK_WAIT_METRIC, time.monotonic() - queued)
+            worker.task = {'id': task_id, 'target': target, 'future': future, 'deadline': time.monotonic() + timeout}
+            try:
+                worker.send((task_id, target, args, profiler.claim()))
+            except OSError:
+                # 이미 죽은 작업 프로세스 - _check_workers에서 처리
+                pass
+
+    def _receive(self, worker):
+        try:
+            task_id, ok, value, state = worker.conn.recv()
+        except (EOFError, OSError):
+            # 작업 중 종료 - _check_workers에서 처리
+            return
+        task, worker.task = worker.task, None
+        worker.completed += 1
+        metrics.merge_state(state)
+        if ok:
+            metrics.inc(BROWSER_TASK_METRIC, result='ok')
+            task['future'].set_result(value)
+        else:
+            metrics.inc(BROWSER_TASK_METRIC, result='error')
+            task['future'].set_exception(BrowserTaskError(value))
+        if self.max_tasks and worker.completed >= self.max_tasks:
+            self._replace(worker, 'recycled')
+
+    def _check_workers(self):
+        """시간 제한을 넘긴 작업과 죽은 작업 프로세스 처리"""
+        now = time.monotonic()
+        for worker in list(self._workers):
+            task = worker.task
+            if not worker.alive():
+                if task is not None:
+                    metrics.inc(BROWSER_TASK_METRIC, result='crashed')
+                    logger.error(f"브라우저 작업 프로세스(PID {worker.pid})가 작업 중 종료되었습니다 (종료 코드 {worker.process.returncode}): {task['target']}")
+                    task['future'].set_exception(BrowserWorkerCrashed(f"작업 프로세스 종료 코드 {worker.process.returncode}"))
+                self._replace(worker, 'crashed')
+            elif task is not None and now > task['deadline']:
+                metrics.inc(BROWSER_TASK_METRIC, result='timeout')
+                logger.warning(f"브라우저 작업 시간 초과: {task['target']} - 작업 프로세스(PID {worker.pid})를 프로세스 그룹째 종료합니다.")
+                self._replace(worker, 'timeout')
+                task['future'].set_exception(BrowserTaskTimeout(f"{task['target']} 작업이 시간 제한을 넘었습니다."))
+            elif task is not None and task.get('cancelled'):
+                metrics.inc(BROWSER_TASK_METRIC, result='cancelled')
+                logger.info(f"브라우저 작업 취소: {task['target']} - 작업 프로세스(PID {worker.pid})를 프로세스 그룹째 종료합니다.")
+                self._replace(worker, 'cancelled')
+                task['future'].set_exception(BrowserTaskCancelled(f"{task['target']} 작업이 취소되었습니다."))
+
+    def _replace(self, worker, reason):
+        """작업 프로세스를 정리하고 새로 띄움"""
+        if reason == 'recycled':
+            worker.stop()
+        else:
+            worker.kill()
+        worker.task = None
+        metrics.inc(BROWSER_WORKER_RESTART_METRIC, reason=reason)
+        # 종료된 작업 프로세스가 쓰던 브라우저 프로필 디렉토리 회수
+        profile_manager.reclaim()
+        if self._closed.is_set():
+            return
+        replacement = _Worker(self._log_file)
+        self._workers[self._workers.index(worker)] = replacement
+        logger.info(f"브라우저 작업 프로세스를 새로 띄웠습니다 ({reason}): PID {worker.pid} -> {replacement.pid}")
+
+    def busy(self):
+        """대기 중이거나 실행 중인 작업이 있는지"""
+        with self._lock:
+            return bool(self._pending) or any(worker.task is not None for worker in self._workers)
+
+    def rss(self):
+        """작업 프로세스 트리(브라우저 포함) RSS 합계 (바이트)"""
+        if not browser_resources.available():
+            return 0
+        with self._lock:
+            pids = [worker.pid for worker in self._workers]
+        return sum(browser_resources.sample_tree(pid, include_root=True)['rss_bytes'] for pid in pids)
+
+    def shutdown(self):
+        """대기 중인 작업을 취소하고 작업 프로세스 종료"""
+        self._closed.set()
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join(timeout=5)
+        with self._lock:
+            pending, self._pending = list(self._pending), collections.deque()
+        for _, _, _, _, future, _ in pending:
+            future.cancel()
+        for worker in self._workers:
+            if worker.task is not None:
+                worker.kill()
+                worker.task['future'].set_exception(BrowserWorkerCrashed("브라우저 작업 풀 종료"))
+            else:
+                worker.stop()
+        self._workers = []
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """프로세스 공용 풀 (처음 사용할 때 생성)"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = BrowserPool()
+            # 종료하거나 RSS 상한으로 자기 자신을 다시 실행할 때 작업 프로세스가 고아로 남지 않도록
+            atexit.register(shutdown)
+            heap_monitor.before_restart(shutdown)
+            # RSS 상한에는 브라우저가 실제로 도는 작업 프로세스도 세고, 진행 중인 체크가 있으면 재시작을 미룸
+            heap_monitor.include_rss(_pool_rss)
+            heap_monitor.defer_restart_while(_pool_busy)
+        return _pool
+
+
+def _pool_rss():
+    pool = _pool
+    return pool.rss() if pool is not None else 0
+
+
+def _pool_busy():
+    pool = _pool
+    return pool is not None and pool.busy()
+
+
+def shutdown():
+    """공용 풀 종료"""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown()
+
+
+def run(target, *args, timeout=None):
+    """체크 함수를 작업 프로세스에서 실행하고 결과 반환 (BROWSER_WORKERS=0이면 현재 스레드에서 실행)
+
+    작업이 실패하거나 시간 제한을 넘기면 로그를 남기고 None을 반환한다.
+    """
+    if BROWSER_WORKERS <= 0:
+        return _resolve(target)(*args)
+    try:
+        return get_pool().run(target, *args, timeout=timeout)
+    except BrowserTaskError as e:
+        logger.error(f"브라우저 작업 실패 ({target}): {str(e)}")
+        return None
+
+
+def _log_failure(future):
+    if future.cancelled():
+        return
+    error = future.exception()
+    if error is not None:
+        logger.error(f"브라우저 작업 실패: {str(error)}")
+
+
+def background(target, *args):
+    """스케줄러용 작업 함수: 작업 프로세스에 맡기고 바로 반환 (이전 작업이 진행 중이면 이번 주기는 건너뜀)"""
+    state = {'future': None}
+
+    def job():
+        if BROWSER_WORKERS <= 0:
+            return _resolve(target)(*args)
+        future = state['future']
+        if future is not None and not future.done():
+            logger.warning(f"이전 브라우저 작업이 아직 진행 중이라 이번 주기는 건너뜁니다: {target}")
+            return None
+        state['future'] = get_pool().submit(target, *args)
+        state['future'].add_done_callback(_log_failure)
+        return None
+
+    return job
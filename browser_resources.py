@@ -0,0 +1,360 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import time
+import signal
+import logging
+import threading
+from dotenv import load_dotenv
+import metrics
+
+logger = logging.getLogger(__name__)
+
+# 환경 변수 로드
+load_dotenv()
+
+
+def _env_float(name, default):
+    """주석이 포함될 수 있는 실수 환경변수 로드"""
+    value = os.getenv(name, str(default)).split('#')[0].strip()
+    try:
+        return float(value)
+    except ValueError:
+        return default
+
+
+PROC_DIR = '/proc'
+
+# 브라우저 프로세스 트리 한도 (넘으면 경고 후 on_limit 콜백 호출, 0이면 검사 안 함)
+BROWSER_MEMORY_LIMIT_MB = _env_float('BROWSER_MEMORY_LIMIT_MB', 800)
+BROWSER_FD_LIMIT = int(_env_float('BROWSER_FD_LIMIT', 2000))
+BROWSER_PROCESS_LIMIT = int(_env_float('BROWSER_PROCESS_LIMIT', 40))
+
+# 프로세스 트리 샘플링 간격 (초)
+BROWSER_SAMPLE_INTERVAL_SECONDS = _env_float('BROWSER_SAMPLE_INTERVAL_SECONDS', 1.0)
+
+# 종료 후에도 남아 있는 브라우저 프로세스를 PID로 종료할지 여부
+BROWSER_KILL_LEAKS = os.getenv('BROWSER_KILL_LEAKS', '1').split('#')[0].strip().lower() in ('1', 'true', 'yes', 'on')
+
+MB = 1024 * 1024
+
+# 브라우저 메모리 히스토그램 버킷 (바이트)
+MEMORY_BUCKETS = tuple(mb * MB for mb in (64, 128, 256, 384, 512, 768, 1024, 1536, 2048))
+
+BROWSER_PEAK_MEMORY_METRIC = 'bearcreek_browser_peak_memory_bytes'
+BROWSER_PEAK_METRIC = 'bearcreek_browser_peak'
+BROWSER_CPU_METRIC = 'bearcreek_browser_cpu_seconds'
+BROWSER_LIMIT_METRIC = 'bearcreek_browser_limit_exceeded_total'
+BROWSER_LEAK_METRIC = 'bearcreek_browser_leaked_processes_total'
+
+metrics.describe(BROWSER_PEAK_MEMORY_METRIC, 'histogram', '체크당 브라우저 프로세스 트리 최대 메모리 (바이트, kind=rss|pss)')
+metrics.describe(BROWSER_PEAK_METRIC, 'gauge', '최근 체크의 브라우저 프로세스 트리 최대값 (resource=rss_bytes|pss_bytes|processes|fds)')
+metrics.describe(BROWSER_CPU_METRIC, 'histogram', '체크당 브라우저 프로세스 트리 CPU 사용 시간 (초)')
+metrics.describe(BROWSER_LIMIT_METRIC, 'counter', '브라우저 자원 한도 초과 횟수')
+metrics.describe(BROWSER_LEAK_METRIC, 'counter', '브라우저 종료 후 남아 있던 프로세스 수')
+
+try:
+    CLOCK_TICKS = os.sysconf('SC_CLK_TCK')
+    PAGE_SIZE = os.sysconf('SC_PAGE_SIZE')
+except (AttributeError, ValueError, OSError):
+    CLOCK_TICKS, PAGE_SIZE = 100, 4096
+
+
+def available():
+    """/proc 기반 자원 측정이 가능한 환경인지 확인"""
+    return os.path.isdir(os.path.join(PROC_DIR, 'self'))
+
+
+def read_stat(pid):
+    """/proc/<pid>/stat에서 (이름, 부모 PID, CPU 틱, 시작 시각, RSS 바이트) 읽기 (없으면 None)"""
+    try:
+        with open(f"{PROC_DIR}/{pid}/stat", 'rb') as f:
+            data = f.read().decode('utf-8', 'replace')
+    except OSError:
+        return None
+    # 프로세스 이름에 공백/괄호가 들어갈 수 있으므로 마지막 ')' 기준으로 분리
+    comm = data[data.find('(') + 1:data.rfind(')')]
+    fields = data[data.rfind(')') + 2:].split()
+    if fields[0] == 'Z':
+        return None
+    return comm, int(fields[1]), int(fields[11]) + int(fields[12]), int(fields[19]), int(fields[21]) * PAGE_SIZE
+
+
+def read_pss(pid):
+    """/proc/<pid>/smaps_rollup의 PSS (공유 페이지를 나눠 계산한 실제 점유량, 바이트)"""
+    try:
+        with open(f"{PROC_DIR}/{pid}/smaps_rollup", 'rb') as f:
+            for line in f:
+                if line.startswith(b'Pss:'):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def count_fds(pid):
+    """열린 파일 디스크립터 수"""
+    try:
+        return len(os.listdir(f"{PROC_DIR}/{pid}/fd"))
+    except OSError:
+        return 0
+
+
+def _children(pid):
+    """직계 자식 PID 목록 (/proc/<pid>/task/*/children 사용, 미지원 커널이면 None)"""
+    try:
+        tids = os.listdir(f"{PROC_DIR}/{pid}/task")
+    except OSError:
+        return []
+    children = []
+    for tid in tids:
+        try:
+            with open(f"{PROC_DIR}/{pid}/task/{tid}/children", 'rb') as f:
+                children.extend(int(child) for child in f.read().split())
+        except FileNotFoundError:
+            return None
+        except OSError:
+            continue
+    return children
+
+
+def descendants(root=None):
+    """root(기본값: 현재 프로세스)의 모든 하위 프로세스 PID"""
+    root = root or os.getpid()
+    result = []
+    queue = [root]
+    while queue:
+        pid = queue.pop()
+        children = _children(pid)
+        if children is None:
+            return _descendants_by_scan(root)
+        result.extend(children)
+        queue.extend(children)
+    return result
+
+
+def _descendants_by_scan(root):
+    """children 파일이 없는 커널용: /proc 전체를 훑어 부모-자식 관계 구성"""
+    by_parent = {}
+    for name in os.listdir(PROC_DIR):
+        if not name.isdigit():
+            continue
+        stat = read_stat(name)
+        if stat is not None:
+            by_parent.setdefault(stat[1], []).append(int(name))
+    result = []
+    queue = [root]
+    while queue:
+        children = by_parent.get(queue.pop(), [])
+        result.extend(children)
+        queue.extend(children)
+    return result
+
+
+def sample_tree(root=None, exclude=(), include_root=False):
+    """하위 프로세스 트리의 자원 사용량 스냅샷 (include_root: root 자신도 포함)"""
+    snapshot = {'processes': 0, 'rss_bytes': 0, 'pss_bytes': 0, 'fds': 0, 'pids': {}}
+    pids = descendants(root)
+    if include_root and root:
+        pids = [root] + pids
+    for pid in pids:
+        if pid in exclude:
+            continue
+        stat = read_stat(pid)
+        if stat is None:
+            continue
+        comm, _, cpu_ticks, start_ticks, rss = stat
+        pss = read_pss(pid)
+        snapshot['processes'] += 1
+        snapshot['rss_bytes'] += rss
+        snapshot['pss_bytes'] += pss if pss is not None else rss
+        snapshot['fds'] += count_fds(pid)
+        snapshot['pids'][pid] = (start_ticks, comm, cpu_ticks)
+    return snapshot
+
+
+def selenium_driver_pid(driver):
+    """chromedriver 프로세스 PID - Chrome은 그 하위 프로세스 (알 수 없으면 None)"""
+    process = getattr(getattr(driver, 'service', None), 'process', None)
+    return getattr(process, 'pid', None)
+
+
+def playwright_driver_pid(playwright):
+    """Playwright 드라이버(node) 프로세스 PID - 직접 띄운 브라우저는 그 하위 프로세스 (알 수 없으면 None)"""
+    try:
+        return playwright._connection._transport._proc.pid
+    except AttributeError:
+        return None
+
+
+def _alive(pid, start_ticks):
+    """같은 프로세스(PID 재사용 아님)가 아직 살아 있는지 확인"""
+    stat = read_stat(pid)
+    return stat is not None and stat[3] == start_ticks
+
+
+def kill_processes(pids, grace_seconds=2.0):
+    """{pid: 시작 시각} 목록을 SIGTERM 후 남으면 SIGKILL로 종료 (PID 재사용 확인)"""
+    targets = {pid: start for pid, start in pids.items() if _alive(pid, start)}
+    for pid in targets:
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except OSError:
+            pass
+    deadline = time.monotonic() + grace_seconds
+    while targets and time.monotonic() < deadline:
+        time.sleep(0.1)
+        targets = {pid: start for pid, start in targets.items() if _alive(pid, start)}
+    for pid in targets:
+        try:
+            os.kill(pid, signal.SIGKILL)
+        except OSError:
+            pass
+
+
+class BrowserMonitor:
+    """체크 한 번 동안 브라우저 프로세스 트리의 메모리/CPU/프로세스/FD 사용량 추적
+
+    with browser_resources.BrowserMonitor('selenium') as monitor:
+        driver = setup_driver()
+        monitor.attach(driver.service.process.pid)
+        ...
+        driver.quit()
+
+    attach로 등록한 프로세스(이 체크가 띄운 chromedriver, Playwright 드라이버, 브라우저)와
+    그 하위 프로세스만 추적한다. 데몬/헤지 모드에서 한 프로세스 안의 다른 체크가 띄운 브라우저나
+    작업 프로세스는 측정하지도, 남은 프로세스로 보고 종료하지도 않는다.
+    """
+
+    def __init__(self, checker=None, on_limit=None, interval=None):
+        self.checker = checker or metrics.current_checker()
+        self.on_limit = on_limit
+        self.interval = interval or BROWSER_SAMPLE_INTERVAL_SECONDS
+        self.enabled = available()
+        self.peak = {'processes': 0, 'rss_bytes': 0, 'pss_bytes': 0, 'fds': 0}
+        self.exceeded = set()
+        self.seen = {}
+        self._cpu_ticks = {}
+        self._roots = {}  # 추적할 프로세스 트리의 루트 PID -> 시작 시각
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
+
+    def attach(self, pid):
+        """이 체크가 띄운 프로세스 pid와 그 하위 프로세스를 추적 대상에 추가 (pid가 None이면 무시)"""
+        if not self.enabled or not pid:
+            return self
+        stat = read_stat(pid)
+        if stat is None:
+            return self
+        with self._lock:
+            self._roots[pid] = stat[3]
+        try:
+            self.sample()
+        except Exception as e:
+            logger.debug("브라우저 자원 샘플링 오류: %s", e)
+        return self
+
+    def start(self):
+        """샘플링 스레드 시작 (attach로 등록한 프로세스 트리만 측정)"""
+        if not self.enabled:
+            return self
+        self._thread = threading.Thread(target=self._run, name='browser-monitor', daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.sample()
+            except Exception as e:
+                logger.debug("브라우저 자원 샘플링 오류: %s", e)
+
+    def sample(self):
+        """현재 사용량을 한 번 측정해 최대값과 한도 초과 여부 갱신"""
+        snapshot = {'processes': 0, 'rss_bytes': 0, 'pss_bytes': 0, 'fds': 0, 'pids': {}}
+        with self._lock:
+            roots = dict(self._roots)
+        for root, start_ticks in roots.items():
+            # 루트가 끝났으면 PID가 재사용됐을 수 있으므로 그 트리는 더 보지 않음 (이미 본 프로세스는 stop에서 확인)
+            if not _alive(root, start_ticks):
+                continue
+            tree = sample_tree(root, exclude=snapshot['pids'], include_root=True)
+            for key in ('processes', 'rss_bytes', 'pss_bytes', 'fds'):
+                snapshot[key] += tree[key]
+            snapshot['pids'].update(tree['pids'])
+        with self._lock:
+            for key in self.peak:
+                if snapshot[key] > self.peak[key]:
+                    self.peak[key] = snapshot[key]
+            for pid, (start_ticks, comm, cpu_ticks) in snapshot['pids'].items():
+                self.seen[pid] = (start_ticks, comm)
+                self._cpu_ticks[pid] = cpu_ticks
+        self._check_limits(snapshot)
+        return snapshot
+
+    def _check_limits(self, snapshot):
+        limits = {
+            'memory': (snapshot['pss_bytes'], BROWSER_MEMORY_LIMIT_MB * MB),
+            'fds': (snapshot['fds'], BROWSER_FD_LIMIT),
+            'processes': (snapshot['processes'], BROWSER_PROCESS_LIMIT),
+        }
+        for resource, (value, limit) in limits.items():
+            if not limit or value <= limit or resource in self.exceeded:
+                continue
+            self.exceeded.add(resource)
+            metrics.inc(BROWSER_LIMIT_METRIC, checker=self.checker, resource=resource)
+            logger.warning(f"브라우저 자원 한도 초과 ({self.checker}): {resource} {value} > {limit}")
+            if self.on_limit is not None:
+                try:
+                    self.on_limit(resource, value)
+                except Exception as e:
+                    logger.error(f"브라우저 한도 초과 처리 중 오류: {str(e)}")
+
+    def cpu_seconds(self):
+        """추적한 프로세스들이 사용한 CPU 시간 합계 (마지막 샘플 기준)"""
+        with self._lock:
+            return sum(self._cpu_ticks.values()) / CLOCK_TICKS
+
+    def stop(self):
+        """샘플링 종료, 메트릭 기록, 남은 프로세스 정리 후 요약 반환"""
+        if not self.enabled or self._thread is None:
+            return None
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+        summary = dict(self.peak, cpu_seconds=round(self.cpu_seconds(), 3))
+        metrics.observe(BROWSER_PEAK_MEMORY_METRIC, self.peak['rss_bytes'], buckets=MEMORY_BUCKETS, checker=self.checker, kind='rss')
+        metrics.observe(BROWSER_PEAK_MEMORY_METRIC, self.peak['pss_bytes'], buckets=MEMORY_BUCKETS, checker=self.checker, kind='pss')
+        metrics.observe(BROWSER_CPU_METRIC, summary['cpu_seconds'], checker=self.checker)
+        for resource, value in self.peak.items():
+            metrics.set_gauge(BROWSER_PEAK_METRIC, value, checker=self.checker, resource=resource)
+
+        leaked = {pid: start for pid, (start, _) in self.seen.items() if _alive(pid, start)}
+        if leaked:
+            names = sorted({self.seen[pid][1] for pid in leaked})
+            metrics.inc(BROWSER_LEAK_METRIC, len(leaked), checker=self.checker)
+            logger.warning(f"브라우저 종료 후 남은 프로세스 {len(leaked)}개 ({', '.join(names)}): {sorted(leaked)}")
+            if BROWSER_KILL_LEAKS:
+                kill_processes(leaked)
+        summary['leaked'] = len(leaked)
+
+        cycle_state = metrics.current_cycle()
+        if cycle_state is not None:
+            cycle_state.setdefault('resources', {})['browser'] = summary
+        logger.info(
+            f"브라우저 자원 ({self.checker}): PSS 최대 {self.peak['pss_bytes'] / MB:.0f}MB, "
+            f"RSS 최대 {self.peak['rss_bytes'] / MB:.0f}MB, 프로세스 {self.peak['processes']}개, "
+            f"FD {self.peak['fds']}개, CPU {summary['cpu_seconds']:.1f}초"
+        )
+        return summary
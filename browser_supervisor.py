@@ -0,0 +1,295 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""헤드리스 Chromium 하나를 띄워 두고 CDP(원격 디버깅)로 체커들이 붙어 쓰게 하는 감독 프로세스
+
+    nohup python bearcreek.py browser > /dev/null 2>&1 &
+    python bearcreek.py check --backend playwright --single   # 공유 브라우저에 새 컨텍스트로 연결
+
+체커는 endpoint()가 주소를 돌려주면 Playwright connect_over_cdp / Selenium debuggerAddress로
+붙고, 감독 프로세스가 없으면 지금처럼 브라우저를 직접 띄운다.
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import signal
+import logging
+import threading
+import subprocess
+from dotenv import load_dotenv
+import metrics
+import profile_manager
+import browser_resources
+
+logger = logging.getLogger(__name__)
+
+# 환경 변수 로드
+load_dotenv()
+
+
+def _env_float(name, default):
+    """주석이 포함될 수 있는 실수 환경변수 로드"""
+    value = os.getenv(name, str(default)).split('#')[0].strip()
+    try:
+        return float(value)
+    except ValueError:
+        return default
+
+
+# 체커가 공유 브라우저를 찾아 붙을지 여부 (0이면 항상 직접 실행)
+BROWSER_SHARED = os.getenv('BROWSER_SHARED', '1').split('#')[0].strip().lower() in ('1', 'true', 'yes', 'on')
+
+# 원격 디버깅 포트 (항상 127.0.0.1에만 바인딩)
+BROWSER_SUPERVISOR_PORT = int(_env_float('BROWSER_SUPERVISOR_PORT', 9222))
+
+# Chromium 실행 파일 (비우면 /usr/bin/chromium-browser, PATH, Playwright 번들 순으로 찾음)
+BROWSER_SUPERVISOR_BINARY = os.getenv('BROWSER_SUPERVISOR_BINARY', '').split('#')[0].strip()
+
+# 브라우저 상태 점검 간격 (초)과 연속 무응답 허용 횟수
+BROWSER_SUPERVISOR_CHECK_SECONDS = _env_float('BROWSER_SUPERVISOR_CHECK_SECONDS', 5)
+BROWSER_SUPERVISOR_MAX_FAILURES = int(_env_float('BROWSER_SUPERVISOR_MAX_FAILURES', 3))
+
+# 다시 띄우기에 실패하면 점검 간격부터 두 배씩 늘려 이 시간(초)까지 기다렸다가 재시도
+BROWSER_SUPERVISOR_RETRY_MAX_SECONDS = _env_float('BROWSER_SUPERVISOR_RETRY_MAX_SECONDS', 300)
+
+# 이 시간이 지나면 브라우저를 새로 띄움 (누적 메모리/캐시 정리, 0이면 비활성화)
+BROWSER_SUPERVISOR_RECYCLE_HOURS = _env_float('BROWSER_SUPERVISOR_RECYCLE_HOURS', 24)
+
+# 체커 쪽 연결 확인 시간 제한 (초) - 감독 프로세스가 없을 때 단일 실행이 늦어지지 않도록 짧게
+PROBE_TIMEOUT_SECONDS = 0.5
+
+# 실행 중인 공유 브라우저 정보 (PID, 시작 시각, 포트) - 프로필 전용 루트(0700) 아래에 기록
+STATE_FILE = os.path.join(profile_manager.BROWSER_PROFILE_ROOT, 'supervisor.json')
+
+BROWSER_ATTACH_METRIC = 'bearcreek_browser_attach_total'
+
+metrics.describe(BROWSER_ATTACH_METRIC, 'counter', '체커가 브라우저를 얻은 방식 (mode=shared|launched)')
+
+# 공유 브라우저 실행 인자 (Playwright 체커의 스텔스 실행 인자와 같은 계열)
+CHROMIUM_ARGS = (
+    '--headless=new',
+    '--no-sandbox',
+    '--disable-dev-shm-usage',
+    '--disable-blink-features=AutomationControlled',
+    '--disable-extensions',
+    '--disable-background-networking',
+    '--disable-background-timer-throttling',
+    '--disable-renderer-backgrounding',
+    '--disable-backgrounding-occluded-windows',
+    '--no-first-run',
+    '--no-default-browser-check',
+)
+
+
+def _read_state():
+    try:
+        with open(STATE_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _probe(port, timeout=PROBE_TIMEOUT_SECONDS):
+    """/json/version 요청으로 브라우저가 CDP 요청에 응답하는지 확인"""
+    import http.client
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=timeout)
+    try:
+        conn.request('GET', '/json/version')
+        response = conn.getresponse()
+        return response.status == 200 and 'webSocketDebuggerUrl' in json.loads(response.read() or b'{}')
+    except (OSError, ValueError, http.client.HTTPException):
+        return False
+    finally:
+        conn.close()
+
+
+def endpoint():
+    """실행 중인 공유 브라우저의 CDP 주소 ('127.0.0.1:9222'), 없거나 응답하지 않으면 None"""
+    if not BROWSER_SHARED:
+        return None
+    state = _read_state()
+    if not state:
+        return None
+    # 같은 포트의 다른 브라우저(개발용 Chrome 등)에 붙지 않도록 감독 프로세스가 띄운 브라우저인지 확인
+    stat = browser_resources.read_stat(state['pid'])
+    if stat is None or stat[3] != state['start_ticks']:
+        return None
+    if not _probe(state['port']):
+        return None
+    return f"127.0.0.1:{state['port']}"
+
+
+def record_attach(checker, mode):
+    """체커가 공유 브라우저를 썼는지(shared) 직접 띄웠는지(launched) 기록"""
+    metrics.inc(BROWSER_ATTACH_METRIC, checker=checker, mode=mode)
+
+
+def find_binary():
+    """Chromium 실행 파일 경로"""
+    if BROWSER_SUPERVISOR_BINARY:
+        return BROWSER_SUPERVISOR_BINARY
+    # Selenium 체커와 같은 시스템 Chromium 우선
+    for candidate in ('/usr/bin/chromium-browser', shutil.which('chromium'), shutil.which('chromium-browser'),
+                      shutil.which('google-chrome')):
+        if candidate and os.path.exists(candidate):
+            return candidate
+    try:
+        from playwright.sync_api import sync_playwright
+        with sync_playwright() as playwright:
+            return playwright.chromium.executable_path
+    except Exception as e:
+        raise RuntimeError(f"Chromium 실행 파일을 찾을 수 없습니다. BROWSER_SUPERVISOR_BINARY를 설정하세요. ({str(e)})")
+
+
+class Supervisor:
+    """공유 Chromium을 띄우고, 죽거나 응답이 없거나 자원 한도를 넘으면 다시 띄움"""
+
+    def __init__(self, port=None, binary=None):
+        self.port = port or BROWSER_SUPERVISOR_PORT
+        self.binary = binary or find_binary()
+        self.process = None
+        self.profile = None
+        self.monitor = None
+        self.started = None
+        self._limit_exceeded = None
+        self._launch_failures = 0
+        self._retry_at = None
+        self._stop = threading.Event()
+
+    def launch(self):
+        """브라우저 실행 후 CDP 응답을 기다리고 상태 파일 기록"""
+        self.profile = profile_manager.allocate('supervisor')
+        args = [self.binary, f'--remote-debugging-port={self.port}', '--remote-debugging-address=127.0.0.1',
+                f'--user-data-dir={self.profile.user_data_dir}', *CHROMIUM_ARGS, 'about:blank']
+        self._limit_exceeded = None
+        # 자원 한도를 넘으면 다음 점검에서 다시 띄움 (측정은 browser_resources와 같은 기준)
+        self.monitor = browser_resources.BrowserMonitor('supervisor', on_limit=self._on_limit).start()
+        # 자기 프로세스 그룹으로 실행해 종료할 때 그룹째 정리
+        self.process = subprocess.Popen(args, env=self.profile.environ(), stdin=subprocess.DEVNULL,
+                                        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True)
+        self.monitor.attach(self.process.pid)
+        self.started = time.monotonic()
+        deadline = time.monotonic() + 30
+        while not _probe(self.port):
+            if self.process.poll() is not None or time.monotonic() > deadline:
+                self.terminate()
+                raise RuntimeError(f"공유 브라우저가 시작되지 않았습니다 (포트 {self.port})")
+            time.sleep(0.1)
+        stat = browser_resources.read_stat(self.process.pid)
+        state = {'pid': self.process.pid, 'start_ticks': stat[3] if stat else 0, 'port': self.port}
+        tmp_path = f"{STATE_FILE}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, STATE_FILE)
+        logger.info(f"공유 브라우저 시작: 127.0.0.1:{self.port} (PID {self.process.pid}, {self.binary})")
+
+    def _on_limit(self, resource, value):
+        self._limit_exceeded = resource
+
+    def terminate(self):
+        """브라우저 프로세스 그룹 종료, 프로필 삭제, 상태 파일 제거"""
+        state = _read_state()
+        if state and self.process is not None and state.get('pid') == self.process.pid:
+            try:
+                os.remove(STATE_FILE)
+            except OSError:
+                pass
+        if self.process is not None:
+            try:
+                os.killpg(self.process.pid, signal.SIGTERM)
+                self.process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                os.killpg(self.process.pid, signal.SIGKILL)
+                self.process.wait(timeout=5)
+            except OSError:
+                pass
+            self.process = None
+        if self.monitor is not None:
+            # 자원 사용량 기록 및 그룹 밖에 남은 프로세스 정리
+            self.monitor.stop()
+            self.monitor = None
+        if self.profile is not None:
+            self.profile.release()
+            self.profile = None
+
+    def restart(self, reason):
+        """브라우저를 다시 띄움 (실패하면 process가 None인 채로 두고 다음 점검에서 간격을 늘려 재시도)"""
+        logger.warning(f"공유 브라우저를 다시 띄웁니다 ({reason})")
+        self.terminate()
+        try:
+            self.launch()
+        except Exception as e:
+            # Popen 실패 등으로 반쯤 준비된 프로필/모니터 정리
+            self.terminate()
+            self._launch_failures += 1
+            delay = min(BROWSER_SUPERVISOR_CHECK_SECONDS * 2 ** (self._launch_failures - 1),
+                        BROWSER_SUPERVISOR_RETRY_MAX_SECONDS)
+            self._retry_at = time.monotonic() + delay
+            logger.error(f"공유 브라우저를 다시 띄우지 못했습니다 ({self._launch_failures}회 연속, {delay:g}초 후 재시도): {str(e)}")
+            return False
+        self._launch_failures = 0
+        self._retry_at = None
+        return True
+
+    def check(self, failures):
+        """한 번 점검하고 연속 무응답 횟수 반환"""
+        if self.process is None:
+            # 직전 재실행 실패: 대기 시간이 지났으면 다시 시도
+            if self._retry_at is None or time.monotonic() >= self._retry_at:
+                self.restart('retry')
+            return 0
+        if self.process.poll() is not None:
+            self.restart('exited')
+            return 0
+        if self._limit_exceeded:
+            self.restart('limit')
+            return 0
+        if BROWSER_SUPERVISOR_RECYCLE_HOURS and time.monotonic() - self.started > BROWSER_SUPERVISOR_RECYCLE_HOURS * 3600:
+            self.restart('recycle')
+            return 0
+        # 오래 남은 프로필로 보고 회수(profile_manager.reclaim)하지 않도록 사용 중 표시
+        os.utime(self.profile.path)
+        if _probe(self.port, timeout=2):
+            return 0
+        failures += 1
+        if failures >= BROWSER_SUPERVISOR_MAX_FAILURES:
+            self.restart('unresponsive')
+            return 0
+        return failures
+
+    def run(self):
+        """종료 요청(stop)이 올 때까지 브라우저 유지"""
+        self.launch()
+        failures = 0
+        try:
+            while not self._stop.wait(BROWSER_SUPERVISOR_CHECK_SECONDS):
+                try:
+                    failures = self.check(failures)
+                except Exception as e:
+                    logger.error(f"공유 브라우저 점검 중 오류: {str(e)}")
+        finally:
+            self.terminate()
+            logger.info("공유 브라우저를 종료했습니다.")
+
+    def stop(self, *_):
+        self._stop.set()
+
+
+def main():
+    """감독 프로세스 실행 (SIGTERM/SIGINT로 종료)"""
+    import log_setup
+    log_setup.setup_logging('browser_supervisor.log')
+    if endpoint():
+        logger.error("공유 브라우저 감독 프로세스가 이미 실행 중입니다.")
+        return 1
+    supervisor = Supervisor()
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(signum, supervisor.stop)
+    supervisor.run()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,231 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import json
+import time
+import logging
+from urllib.parse import urlparse
+from dotenv import load_dotenv
+import metrics
+
+logger = logging.getLogger(__name__)
+
+# 환경 변수 로드
+load_dotenv()
+
+
+def _env_float(name, default):
+    """주석이 포함될 수 있는 실수 환경변수 로드"""
+    value = os.getenv(name, str(default)).split('#')[0].strip()
+    try:
+        return float(value)
+    except ValueError:
+        return default
+
+
+# 브라우저 성능 추적 모드 (1/true면 활성화)
+BROWSER_TRACE = os.getenv('BROWSER_TRACE', '0').split('#')[0].strip().lower() in ('1', 'true', 'yes', 'on')
+
+# 이 시간(초)을 넘긴 체크만 추적 데이터를 보관
+BROWSER_TRACE_THRESHOLD_SECONDS = _env_float('BROWSER_TRACE_THRESHOLD_SECONDS', 30)
+
+# 추적 데이터 저장 위치 (기본값: 메트릭 요약 파일 옆의 traces 디렉토리)
+BROWSER_TRACE_DIR = os.getenv(
+    'BROWSER_TRACE_DIR',
+    os.path.join(os.path.dirname(metrics.METRICS_SUMMARY_FILE) or '.', 'traces'),
+).split('#')[0].strip()
+
+# 보관할 최대 추적 세트 수
+BROWSER_TRACE_MAX_FILES = int(_env_float('BROWSER_TRACE_MAX_FILES', 20))
+
+# 내비게이션 타이밍 단계별 소요 시간 히스토그램 이름
+BROWSER_TIMING_METRIC = 'bearcreek_browser_timing_seconds'
+
+metrics.describe(BROWSER_TIMING_METRIC, 'histogram', '예약 페이지 내비게이션 단계별 소요 시간 (초)')
+
+# 페이지에서 Navigation/Resource Timing을 꺼내는 스크립트
+TIMING_SCRIPT = """
+return JSON.stringify({
+  navigation: performance.getEntriesByType('navigation').map(e => e.toJSON()),
+  resources: performance.getEntriesByType('resource').map(e => e.toJSON())
+});
+"""
+
+
+def summarize_timings(navigation, resources, page_url):
+    """내비게이션/리소스 타이밍을 단계별 소요 시간과 호스트별 합계로 요약"""
+    summary = {}
+    if navigation:
+        nav = navigation[-1]
+        phases = {
+            'redirect': nav.get('redirectEnd', 0) - nav.get('redirectStart', 0),
+            'dns': nav.get('domainLookupEnd', 0) - nav.get('domainLookupStart', 0),
+            'connect': nav.get('connectEnd', 0) - nav.get('connectStart', 0),
+            'ttfb': nav.get('responseStart', 0) - nav.get('requestStart', 0),
+            'download': nav.get('responseEnd', 0) - nav.get('responseStart', 0),
+            'dom_interactive': nav.get('domInteractive', 0),
+            'dom_content_loaded': nav.get('domContentLoadedEventEnd', 0),
+            'load': nav.get('loadEventEnd', 0),
+        }
+        summary['navigation_ms'] = {name: round(max(value, 0), 1) for name, value in phases.items()}
+
+    page_host = urlparse(page_url).hostname
+    by_host = {}
+    for entry in resources or []:
+        host = urlparse(entry.get('name', '')).hostname or 'unknown'
+        stats = by_host.setdefault(host, {'count': 0, 'duration_ms': 0.0, 'transfer_bytes': 0, 'third_party': host != page_host})
+        stats['count'] += 1
+        stats['duration_ms'] = round(stats['duration_ms'] + entry.get('duration', 0), 1)
+        stats['transfer_bytes'] += int(entry.get('transferSize', 0) or 0)
+    summary['resources_by_host'] = dict(sorted(by_host.items(), key=lambda item: -item[1]['duration_ms']))
+    summary['slowest_resources'] = [
+        {
+            'url': entry.get('name'),
+            'type': entry.get('initiatorType'),
+            'duration_ms': round(entry.get('duration', 0), 1),
+            'transfer_bytes': int(entry.get('transferSize', 0) or 0),
+        }
+        for entry in sorted(resources or [], key=lambda e: -e.get('duration', 0))[:15]
+    ]
+    return summary
+
+
+def _record_navigation_metrics(summary, checker):
+    """내비게이션 단계별 소요 시간을 메트릭에 기록"""
+    for phase, value in summary.get('navigation_ms', {}).items():
+        metrics.observe(BROWSER_TIMING_METRIC, value / 1000.0, checker=checker, phase=phase)
+
+
+def _trace_base(checker):
+    """추적 파일 경로 접두어 생성"""
+    os.makedirs(BROWSER_TRACE_DIR, exist_ok=True)
+    return os.path.join(BROWSER_TRACE_DIR, f"{checker}_{time.strftime('%Y%m%d_%H%M%S')}_{os.getpid()}")
+
+
+def _write_report(base, report):
+    """추적 보고서(JSON) 저장 후 오래된 추적 정리"""
+    with open(f"{base}.json", 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    _prune_traces()
+
+
+def _prune_traces():
+    """오래된 추적 세트 정리 (최대 BROWSER_TRACE_MAX_FILES개 유지)"""
+    try:
+        reports = sorted(
+            (entry for entry in os.scandir(BROWSER_TRACE_DIR) if entry.name.endswith('.json')),
+            key=lambda entry: entry.stat().st_mtime,
+        )
+        for entry in reports[:-BROWSER_TRACE_MAX_FILES] if BROWSER_TRACE_MAX_FILES > 0 else reports:
+            base = entry.path[:-len('.json')]
+            for suffix in ('.json', '.zip'):
+                if os.path.exists(base + suffix):
+                    os.remove(base + suffix)
+    except Exception as e:
+        logger.warning(f"추적 파일 정리 중 오류 (무시됨): {str(e)}")
+
+
+class PlaywrightTrace:
+    """Playwright 체크 한 번에 대한 추적 (트레이스 + 타이밍 + CDP 성능 지표)"""
+
+    def __init__(self, checker='playwright'):
+        self.checker = checker
+        self.enabled = BROWSER_TRACE
+        self.context = None
+        self.cdp = None
+        self.started = None
+
+    async def start(self, context, page):
+        """트레이스 기록 및 CDP 성능 지표 수집 시작"""
+        if not self.enabled or context is None:
+            return
+        self.context = context
+        self.started = time.monotonic()
+        try:
+            await context.tracing.start(screenshots=True, snapshots=True)
+            self.cdp = await context.new_cdp_session(page)
+            await self.cdp.send('Performance.enable')
+        except Exception as e:
+            logger.warning(f"Playwright 추적 시작 실패 (무시됨): {str(e)}")
+
+    async def finish(self, page, page_url):
+        """임계값을 넘긴 체크만 추적 데이터를 저장하고 나머지는 버림"""
+        if not self.enabled or self.context is None:
+            return None
+        elapsed = time.monotonic() - self.started
+        try:
+            timings = json.loads(await page.evaluate(f"() => {{ {TIMING_SCRIPT} }}"))
+            summary = summarize_timings(timings['navigation'], timings['resources'], page_url)
+            _record_navigation_metrics(summary, self.checker)
+
+            if elapsed < BROWSER_TRACE_THRESHOLD_SECONDS:
+                await self.context.tracing.stop()
+                return None
+
+            base = _trace_base(self.checker)
+            cdp_metrics = await self.cdp.send('Performance.getMetrics') if self.cdp else {}
+            await self.context.tracing.stop(path=f"{base}.zip")
+            _write_report(base, {
+                'checker': self.checker,
+                'elapsed_seconds': round(elapsed, 3),
+                'url': page_url,
+                'summary': summary,
+                'cdp_metrics': {m['name']: m['value'] for m in cdp_metrics.get('metrics', [])},
+                'navigation': timings['navigation'],
+                'resources': timings['resources'],
+            })
+            logger.warning(f"느린 체크 추적 저장 ({elapsed:.1f}초): {base}.zip / {base}.json")
+            return base
+        except Exception as e:
+            logger.warning(f"Playwright 추적 저장 실패 (무시됨): {str(e)}")
+            return None
+
+
+class SeleniumTrace:
+    """Selenium(Chrome) 체크 한 번에 대한 추적 (타이밍 + CDP 성능 지표)"""
+
+    def __init__(self, checker='selenium'):
+        self.checker = checker
+        self.enabled = BROWSER_TRACE
+        self.started = None
+
+    def start(self, driver):
+        """CDP 성능 지표 수집 시작"""
+        if not self.enabled or driver is None:
+            return
+        self.started = time.monotonic()
+        try:
+            driver.execute_cdp_cmd('Performance.enable', {})
+        except Exception as e:
+            logger.warning(f"Selenium 추적 시작 실패 (무시됨): {str(e)}")
+
+    def finish(self, driver, page_url):
+        """임계값을 넘긴 체크만 타이밍/CDP 지표를 저장"""
+        if not self.enabled or self.started is None or driver is None:
+            return None
+        elapsed = time.monotonic() - self.started
+        try:
+            timings = json.loads(driver.execute_script(TIMING_SCRIPT))
+            summary = summarize_timings(timings['navigation'], timings['resources'], page_url)
+            _record_navigation_metrics(summary, self.checker)
+
+            if elapsed < BROWSER_TRACE_THRESHOLD_SECONDS:
+                return None
+
+            base = _trace_base(self.checker)
+            cdp_metrics = driver.execute_cdp_cmd('Performance.getMetrics', {})
+            _write_report(base, {
+                'checker': self.checker,
+                'elapsed_seconds': round(elapsed, 3),
+                'url': page_url,
+                'summary': summary,
+                'cdp_metrics': {m['name']: m['value'] for m in cdp_metrics.get('metrics', [])},
+                'navigation': timings['navigation'],
+                'resources': timings['resources'],
+            })
+            logger.warning(f"느린 체크 추적 저장 ({elapsed:.1f}초): {base}.json")
+            return base
+        except Exception as e:
+            logger.warning(f"Selenium 추적 저장 실패 (무시됨): {str(e)}")
+            return None
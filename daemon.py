@@ -0,0 +1,285 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""체커, 알림, 정리 작업을 한 프로세스의 이벤트 루프에서 서비스로 실행하는 데몬
+
+    python bearcreek.py daemon --services check,clean --backend selenium
+
+각 서비스의 동기 작업은 작업 스레드에서 실행되고, 설정(.env), 로그 파일,
+텔레그램 발송(notifier)은 모든 서비스가 함께 쓴다.
+"""
+
+import os
+import time
+import signal
+import asyncio
+import logging
+import datetime
+import functools
+import importlib
+import concurrent.futures
+from dotenv import load_dotenv
+import log_setup
+
+logger = logging.getLogger(__name__)
+
+# 환경 변수 로드
+load_dotenv()
+
+
+def _env_float(name, default):
+    """주석이 포함될 수 있는 실수 환경변수 로드"""
+    value = os.getenv(name, str(default)).split('#')[0].strip()
+    try:
+        return float(value)
+    except ValueError:
+        return default
+
+
+# 실행할 서비스 목록 (check, alert, clean, cleanup 중 쉼표로 구분)
+DAEMON_SERVICES = os.getenv('DAEMON_SERVICES', 'check,clean').split('#')[0].strip()
+
+# 모든 서비스가 함께 쓰는 로그 파일
+DAEMON_LOG_FILE = os.getenv('DAEMON_LOG_FILE', 'bearcreek_daemon.log').split('#')[0].strip()
+
+# clean 서비스(simple_cleaner) 실행 간격 (분)과 cleanup 서비스(cleanup.py) 실행 시각 (HH:MM)
+DAEMON_CLEAN_INTERVAL_MINUTES = _env_float('DAEMON_CLEAN_INTERVAL_MINUTES', 60)
+DAEMON_CLEANUP_AT = os.getenv('DAEMON_CLEANUP_AT', '00:00').split('#')[0].strip()
+
+# 종료 시 실행 중인 작업을 기다리는 최대 시간 (초)
+DAEMON_STOP_TIMEOUT_SECONDS = _env_float('DAEMON_STOP_TIMEOUT_SECONDS', 30)
+
+SERVICE_RUNS_METRIC = 'bearcreek_daemon_service_runs_total'
+SERVICE_SECONDS_METRIC = 'bearcreek_daemon_service_seconds'
+
+
+class Service:
+    """데몬이 주기적으로 실행하는 작업
+
+    interval_seconds: 작업이 끝난 뒤 다음 실행까지의 간격
+    daily_at: 매일 실행할 시각 ('HH:MM', 로컬 시간)
+    setup: 데몬 시작 시 한 번 호출할 함수 (감시 스레드 시작 등)
+    teardown: 데몬 종료 시 호출할 함수 (작업 프로세스 정리 등)
+    """
+
+    def __init__(self, name, run, interval_seconds=None, daily_at=None, run_at_start=True, setup=None, teardown=None):
+        if interval_seconds is None and daily_at is None:
+            raise ValueError(f"서비스 {name}: interval_seconds 또는 daily_at이 필요합니다.")
+        self.name = name
+        self.run = run
+        self.interval_seconds = interval_seconds
+        self.daily_at = daily_at
+        self.run_at_start = run_at_start
+        self.setup = setup
+        self.teardown = teardown
+
+    def seconds_until_next(self, now=None):
+        """다음 실행까지 남은 시간 (초)"""
+        if self.daily_at is None:
+            return self.interval_seconds
+        now = now or datetime.datetime.now()
+        hour, minute = (int(part) for part in self.daily_at.split(':'))
+        target = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        if target <= now:
+            target += datetime.timedelta(days=1)
+        return (target - now).total_seconds()
+
+
+def _check_service(backend):
+    import bearcreek
+    import browser_pool
+    checker = importlib.import_module(bearcreek.BACKENDS[backend])
+    interval_seconds = checker.CHECK_INTERVAL_MINUTES * 60
+    if getattr(checker, 'BROWSER_CHECK', None):
+        # 브라우저 체크는 작업 프로세스에서 실행 (멈춘 브라우저는 시간 제한 후 종료되고 다음 주기로 넘어감)
+        return Service(f'check:{backend}', functools.partial(browser_pool.run, checker.BROWSER_CHECK),
+                       interval_seconds=interval_seconds, teardown=browser_pool.shutdown)
+    # 헤지 조회처럼 안에서 작업 프로세스를 쓰는 체크도 종료 시 작업 프로세스 정리
+    return Service(f'check:{backend}', checker.check_available_dates, interval_seconds=interval_seconds,
+                   teardown=browser_pool.shutdown)
+
+
+def _alert_service(backend):
+    import simple_alert
+    return Service('alert', simple_alert.check_and_notify, interval_seconds=simple_alert.CHECK_INTERVAL_MINUTES * 60)
+
+
+def _clean_service(backend):
+    import simple_cleaner
+    import artifacts
+    import artifact_catalog
+
+    def setup():
+        # 우리 코드 밖에서 생긴 디버깅 파일도 카탈로그에 반영 (ARTIFACT_INOTIFY=1)
+        artifact_catalog.start_watcher([artifacts.ARTIFACT_DIR])
+
+    return Service('clean', simple_cleaner.cleanup_system, interval_seconds=DAEMON_CLEAN_INTERVAL_MINUTES * 60, setup=setup)
+
+
+def _cleanup_service(backend):
+    import cleanup
+    return Service('cleanup', cleanup.cleanup_old_files, daily_at=DAEMON_CLEANUP_AT, run_at_start=False)
+
+
+# 서비스 이름 -> 생성 함수 (선택한 서비스의 모듈만 import)
+SERVICE_FACTORIES = {
+    'check': _check_service,
+    'alert': _alert_service,
+    'clean': _clean_service,
+    'cleanup': _cleanup_service,
+}
+
+
+def build_services(names, backend):
+    """서비스 이름 목록으로 Service 생성"""
+    unknown = [name for name in names if name not in SERVICE_FACTORIES]
+    if unknown:
+        raise ValueError(f"알 수 없는 서비스: {', '.join(unknown)} (선택: {', '.join(SERVICE_FACTORIES)})")
+    return [SERVICE_FACTORIES[name](backend) for name in names]
+
+
+class Daemon:
+    """서비스들을 하나의 asyncio 이벤트 루프에서 실행"""
+
+    def __init__(self, services):
+        self.services = services
+        self._stopping = None
+        self._running = set()
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=len(services) + 1, thread_name_prefix='service'
+        )
+
+    def stop(self):
+        """종료 요청 (시그널 처리기에서 호출)"""
+        if self._stopping is not None and not self._stopping.is_set():
+            logger.info("데몬 종료 요청을 받았습니다. 실행 중인 작업이 끝나면 종료합니다.")
+            self._stopping.set()
+
+    async def _sleep(self, seconds):
+        """종료 요청이 오면 바로 깨어나는 대기 (종료 요청 시 True)"""
+        try:
+            await asyncio.wait_for(self._stopping.wait(), timeout=max(seconds, 0))
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def _execute(self, service):
+        """작업 스레드에서 서비스 한 번 실행 (예외는 기록만 하고 다음 실행으로 넘어감)"""
+        import metrics
+        loop = asyncio.get_running_loop()
+        started = time.monotonic()
+        future = loop.run_in_executor(self._executor, service.run)
+        self._running.add(future)
+        try:
+            await asyncio.shield(future)
+            metrics.inc(SERVICE_RUNS_METRIC, service=service.name, result='ok')
+        except asyncio.CancelledError:
+            raise
+        except BaseException as e:
+            # 단일 실행용 sys.exit() 등도 데몬을 멈추지 않도록 잡아서 기록
+            metrics.inc(SERVICE_RUNS_METRIC, service=service.name, result='error')
+            logger.error(f"서비스 {service.name} 실행 중 오류: {type(e).__name__}: {str(e)}")
+        finally:
+            self._running.discard(future)
+            metrics.observe(SERVICE_SECONDS_METRIC, time.monotonic() - started, service=service.name)
+
+    async def _run_service(self, service):
+        if not service.run_at_start and await self._sleep(service.seconds_until_next()):
+            return
+        while not self._stopping.is_set():
+            await self._execute(service)
+            if await self._sleep(service.seconds_until_next()):
+                return
+
+    async def _housekeeping(self):
+        """사이클 사이 점검 (힙 스냅샷, RSS 상한)"""
+        import heap_monitor
+        loop = asyncio.get_running_loop()
+        while not await self._sleep(1):
+            await loop.run_in_executor(self._executor, heap_monitor.tick)
+
+    async def run(self):
+        import metrics
+        import profiler
+        import notifier
+        import heap_monitor
+        import disk_monitor
+
+        metrics.describe(SERVICE_RUNS_METRIC, 'counter', '데몬 서비스 실행 횟수 (result=ok|error)')
+        metrics.describe(SERVICE_SECONDS_METRIC, 'histogram', '데몬 서비스 1회 실행 시간 (초)')
+
+        loop = asyncio.get_running_loop()
+        self._stopping = asyncio.Event()
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            try:
+                loop.add_signal_handler(signum, self.stop)
+            except (NotImplementedError, RuntimeError):
+                pass
+
+        # 모든 서비스의 텔레그램 발송을 이 루프에서 봇 하나로 처리
+        notifier.attach(loop)
+        metrics.start_metrics_server()
+        profiler.install_signal_handler()
+        heap_monitor.start()
+        disk_monitor.start()
+        for service in self.services:
+            if service.setup is not None:
+                service.setup()
+
+        logger.info(f"데몬이 시작되었습니다. 서비스: {', '.join(service.name for service in self.services)} (PID {os.getpid()})")
+        tasks = [asyncio.create_task(self._run_service(service), name=service.name) for service in self.services]
+        tasks.append(asyncio.create_task(self._housekeeping(), name='housekeeping'))
+        try:
+            await self._stopping.wait()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            pending = set(self._running)
+            if pending:
+                logger.info(f"실행 중인 작업 {len(pending)}개를 최대 {DAEMON_STOP_TIMEOUT_SECONDS:g}초 기다립니다.")
+                _, pending = await asyncio.wait(pending, timeout=DAEMON_STOP_TIMEOUT_SECONDS)
+            for service in self.services:
+                if service.teardown is not None:
+                    try:
+                        service.teardown()
+                    except Exception as e:
+                        logger.warning(f"서비스 {service.name} 종료 처리 중 오류 (무시됨): {str(e)}")
+            if pending:
+                # 종료 처리로 작업 프로세스가 정리되면 기다리던 작업도 곧 끝남
+                _, pending = await asyncio.wait(pending, timeout=5)
+            await notifier.close()
+            notifier.detach()
+            disk_monitor.stop()
+            metrics.write_summary()
+            metrics.stop_metrics_server()
+        return not pending
+
+    def close(self, finished):
+        """작업 스레드 정리 (끝나지 않은 작업이 있으면 기다리지 않고 프로세스 종료)"""
+        if finished:
+            self._executor.shutdown(wait=True)
+            return
+        logger.warning("끝나지 않은 작업이 있어 강제로 종료합니다.")
+        log_setup.shutdown_logging()
+        os._exit(1)
+
+
+def main(services=None, backend=None):
+    """데몬 실행 (services: 서비스 이름 목록, backend: check 서비스의 체크 방식)"""
+    import bearcreek
+
+    # 서비스 모듈을 import 하기 전에 공용 로그 파일 설정 (이후 각 모듈의 설정은 무시됨)
+    log_setup.setup_logging(DAEMON_LOG_FILE)
+    names = services or [name.strip() for name in DAEMON_SERVICES.split(',') if name.strip()]
+    backend = backend or bearcreek.DEFAULT_BACKEND
+    daemon = Daemon(build_services(names, backend))
+    finished = asyncio.run(daemon.run())
+    daemon.close(finished)
+    logger.info("데몬을 종료합니다.")
+    return 0
+
+
+if __name__ == '__main__':
+    import bearcreek
+    bearcreek._load_env()
+    main()
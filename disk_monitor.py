@@ -0,0 +1,198 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import time
+import logging
+import threading
+from dotenv import load_dotenv
+import metrics
+
+logger = logging.getLogger(__name__)
+
+# 환경 변수 로드
+load_dotenv()
+
+
+def _env_float(name, default):
+    """주석이 포함될 수 있는 실수 환경변수 로드"""
+    value = os.getenv(name, str(default)).split('#')[0].strip()
+    try:
+        return float(value)
+    except ValueError:
+        return default
+
+
+# 감시할 경로 (디버깅 파일/보관소/로그가 쌓이는 파일 시스템)
+DISK_MONITOR_PATH = os.getenv('DISK_MONITOR_PATH', '.').split('#')[0].strip() or '.'
+
+# 백그라운드 샘플링 간격 (초) - 스레드 없이 level()만 부를 때도 이 간격으로 다시 측정
+DISK_SAMPLE_SECONDS = _env_float('DISK_SAMPLE_SECONDS', 30)
+
+# 압박 단계 기준: 여유 공간(MB)이 이보다 작거나, 사용률/inode 사용률(%)이 이보다 크면 해당 단계
+DISK_WARNING_FREE_MB = _env_float('DISK_WARNING_FREE_MB', 1024)
+DISK_CRITICAL_FREE_MB = _env_float('DISK_CRITICAL_FREE_MB', 500)
+DISK_WARNING_PERCENT = _env_float('DISK_WARNING_PERCENT', 80)
+DISK_CRITICAL_PERCENT = _env_float('DISK_CRITICAL_PERCENT', 90)
+DISK_INODE_WARNING_PERCENT = _env_float('DISK_INODE_WARNING_PERCENT', 80)
+DISK_INODE_CRITICAL_PERCENT = _env_float('DISK_INODE_CRITICAL_PERCENT', 90)
+
+# 단계를 내릴 때 기준보다 이만큼(%p) 더 여유가 생겨야 함 (경계에서 단계가 오락가락하지 않도록)
+DISK_RECOVERY_MARGIN_PERCENT = _env_float('DISK_RECOVERY_MARGIN_PERCENT', 2)
+
+# 압박 단계가 계속되는 동안 구독자를 다시 호출하는 간격 (분)
+DISK_REACT_MINUTES = _env_float('DISK_REACT_MINUTES', 10)
+
+OK, WARNING, CRITICAL = 0, 1, 2
+LEVEL_NAMES = {OK: 'ok', WARNING: 'warning', CRITICAL: 'critical'}
+
+DISK_FREE_METRIC = 'bearcreek_disk_free_bytes'
+DISK_USED_RATIO_METRIC = 'bearcreek_disk_used_ratio'
+DISK_PRESSURE_METRIC = 'bearcreek_disk_pressure_level'
+DISK_TRANSITION_METRIC = 'bearcreek_disk_pressure_transitions_total'
+
+metrics.describe(DISK_FREE_METRIC, 'gauge', '감시 중인 파일 시스템의 여유 공간 (바이트)')
+metrics.describe(DISK_USED_RATIO_METRIC, 'gauge', '감시 중인 파일 시스템 사용률 (0~1, resource=space|inodes)')
+metrics.describe(DISK_PRESSURE_METRIC, 'gauge', '디스크 압박 단계 (0=ok, 1=warning, 2=critical)')
+metrics.describe(DISK_TRANSITION_METRIC, 'counter', '디스크 압박 단계 변경 횟수 (level=바뀐 단계)')
+
+_state = {'level': OK, 'sample': None, 'sampled_at': None, 'reacted_at': None}
+_subscribers = []
+_lock = threading.Lock()
+_thread = None
+_stop = threading.Event()
+
+
+def sample(path=None):
+    """statvfs로 여유 공간과 inode 사용량 측정"""
+    st = os.statvfs(path or DISK_MONITOR_PATH)
+    total = st.f_frsize * st.f_blocks
+    free = st.f_frsize * st.f_bavail
+    # inode 수를 보고하지 않는 파일 시스템(f_files=0)은 inode 압박 없음으로 봄
+    inodes_used = (st.f_files - st.f_favail) / st.f_files if st.f_files else 0.0
+    return {
+        'total_bytes': total,
+        'free_bytes': free,
+        'used_percent': 100 - (st.f_bavail / st.f_blocks * 100) if st.f_blocks else 0.0,
+        'inodes_used_percent': inodes_used * 100,
+    }
+
+
+def classify(disk, margin=0.0):
+    """측정값의 압박 단계 (margin만큼 기준을 엄격하게 적용하면 회복 판정용)"""
+    free_mb = disk['free_bytes'] / (1024 * 1024)
+    margin_mb = disk['total_bytes'] / (1024 * 1024) * margin / 100
+    tiers = (
+        (CRITICAL, DISK_CRITICAL_FREE_MB, DISK_CRITICAL_PERCENT, DISK_INODE_CRITICAL_PERCENT),
+        (WARNING, DISK_WARNING_FREE_MB, DISK_WARNING_PERCENT, DISK_INODE_WARNING_PERCENT),
+    )
+    for level, free_limit, used_limit, inode_limit in tiers:
+        if free_limit and free_mb < free_limit + margin_mb:
+            return level
+        if used_limit and disk['used_percent'] > used_limit - margin:
+            return level
+        if inode_limit and disk['inodes_used_percent'] > inode_limit - margin:
+            return level
+    return OK
+
+
+def _format(disk):
+    return (
+        f"여유 공간 {disk['free_bytes'] / (1024 * 1024):.2f}MB ({disk['used_percent']:.1f}% 사용 중, "
+        f"inode {disk['inodes_used_percent']:.1f}%)"
+    )
+
+
+def describe():
+    """로그용 요약 문자열 (마지막 측정값과 압박 단계)"""
+    if _state['sample'] is None:
+        return "디스크 상태 미측정"
+    return f"{_format(_state['sample'])}, 압박 단계 {LEVEL_NAMES[_state['level']]}"
+
+
+def subscribe(callback):
+    """압박 단계 구독 등록: callback(level, previous, disk)
+
+    단계가 바뀔 때와, warning 이상이 계속되는 동안 DISK_REACT_MINUTES마다 호출된다.
+    """
+    with _lock:
+        if callback not in _subscribers:
+            _subscribers.append(callback)
+    return callback
+
+
+def check(path=None):
+    """지금 측정해 압박 단계를 갱신하고 필요하면 구독자 호출 (현재 단계 반환)"""
+    disk = sample(path)
+    now = time.monotonic()
+    with _lock:
+        previous = _state['level']
+        level = classify(disk)
+        # 단계를 내리는 것은 회복 여유까지 확보됐을 때만
+        if level < previous:
+            level = max(level, min(previous, classify(disk, DISK_RECOVERY_MARGIN_PERCENT)))
+        _state.update(level=level, sample=disk, sampled_at=now)
+        react = level != previous or (
+            level > OK and (_state['reacted_at'] is None or now - _state['reacted_at'] >= DISK_REACT_MINUTES * 60)
+        )
+        if react:
+            _state['reacted_at'] = now
+        subscribers = list(_subscribers)
+
+    metrics.set_gauge(DISK_FREE_METRIC, disk['free_bytes'])
+    metrics.set_gauge(DISK_USED_RATIO_METRIC, round(disk['used_percent'] / 100, 4), resource='space')
+    metrics.set_gauge(DISK_USED_RATIO_METRIC, round(disk['inodes_used_percent'] / 100, 4), resource='inodes')
+    metrics.set_gauge(DISK_PRESSURE_METRIC, level)
+    if level != previous:
+        metrics.inc(DISK_TRANSITION_METRIC, level=LEVEL_NAMES[level])
+        log = logger.info if level < previous else logger.warning
+        log(f"디스크 압박 단계 변경: {LEVEL_NAMES[previous]} -> {LEVEL_NAMES[level]} ({_format(disk)})")
+
+    if react:
+        for callback in subscribers:
+            try:
+                callback(level, previous, disk)
+            except Exception as e:
+                logger.error(f"디스크 압박 대응 중 오류 ({getattr(callback, '__module__', callback)}): {str(e)}")
+    return level
+
+
+def level():
+    """현재 압박 단계 (마지막 측정이 오래됐으면 다시 측정, 측정 실패 시 마지막 값)"""
+    sampled_at = _state['sampled_at']
+    if sampled_at is None or time.monotonic() - sampled_at >= DISK_SAMPLE_SECONDS:
+        try:
+            return check()
+        except OSError as e:
+            logger.debug("디스크 상태 측정 실패: %s", e)
+    return _state['level']
+
+
+def _run():
+    while True:
+        try:
+            check()
+        except Exception as e:
+            logger.warning(f"디스크 상태 측정 중 오류 (무시됨): {str(e)}")
+        if _stop.wait(DISK_SAMPLE_SECONDS):
+            return
+
+
+def start():
+    """백그라운드 샘플링 스레드 시작 (스케줄러 시작 시 호출, 이미 실행 중이면 무시)"""
+    global _thread
+    if _thread is not None and _thread.is_alive():
+        return
+    _stop.clear()
+    _thread = threading.Thread(target=_run, name='disk-monitor', daemon=True)
+    _thread.start()
+    logger.info(f"디스크 압박 감시 시작: {os.path.abspath(DISK_MONITOR_PATH)} ({DISK_SAMPLE_SECONDS:g}초 간격)")
+
+
+def stop():
+    """샘플링 스레드 종료"""
+    global _thread
+    _stop.set()
+    if _thread is not None:
+        _thread.join(timeout=5)
+        _thread = None
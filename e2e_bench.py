@@ -0,0 +1,243 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""로컬 fixture 서버를 띄우고 각 체커를 그 서버에 붙여 사이클 단위로 측정하는 종단간 벤치마크
+
+    python bearcreek.py e2e                                   # 모든 백엔드, 백엔드마다 3사이클
+    python bearcreek.py e2e effective ultimate --cycles 10 --latency-ms 300 --error-rate 0.1
+    python bearcreek.py e2e playwright --env BROWSER_SHARED=1 --json e2e.json
+
+사이클마다 `bearcreek.py check --backend X --single`을 임시 작업 디렉토리에서 새 프로세스로
+실행한다 (BEARCREEK_BASE_URL, TELEGRAM_API_BASE_URL을 fixture 서버로 지정). 작업 디렉토리는
+백엔드마다 하나를 계속 쓰므로 쿠키/자산 캐시 등은 두 번째 사이클부터 데워진 상태다.
+
+측정값
+- 사이클: 체커가 metrics_summary.json에 남긴 체크 사이클 시간 (import/브라우저 설치 제외)
+- 실행: 프로세스 시작부터 종료까지 시간
+- CPU: 끝난 하위 프로세스 트리의 user+sys 시간 (getrusage)
+- PSS/RSS: 실행 중 하위 프로세스 트리 합계의 최대값 (브라우저 포함)
+- 요청/알림: fixture 서버가 센 사이트 요청 수와 텔레그램 sendMessage/editMessageText 수
+"""
+
+import os
+import sys
+import json
+import time
+import signal
+import resource
+import tempfile
+import subprocess
+from dotenv import load_dotenv
+import metrics
+import fixture_server
+import browser_resources
+
+# 환경 변수 로드
+load_dotenv()
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+BEARCREEK_PY = os.path.join(HERE, 'bearcreek.py')
+
+# 측정할 백엔드 (bearcreek.BACKENDS 이름)
+BACKENDS = ('selenium', 'playwright', 'effective', 'ultimate', 'hedged')
+
+# 체커 프로세스에 항상 넘기는 환경 변수 (--env로 덮어쓸 수 있음)
+# 상태 파일은 작업 디렉토리 안에 두고, 요청 수를 그대로 세도록 속도 제한은 끔
+DEFAULT_ENV = {
+    'TELEGRAM_BOT_TOKEN': '123456:fixture',
+    'TELEGRAM_CHAT_ID': '1',
+    'RATE_LIMIT_PER_MINUTE': '0',
+    'METRICS_PORT': '0',
+    'METRICS_SUMMARY_FILE': 'metrics_summary.json',
+    'LIVE_BOARD_STATE_FILE': 'live_board_state.json',
+    'HEDGE_STATS_FILE': 'hedge_stats.json',
+    'RATE_LIMIT_DB': 'rate_limit.sqlite',
+    'ARTIFACT_DIR': 'artifacts',
+    'ARCHIVE_DIR': 'archive',
+    'ASSET_CACHE_DIR': 'asset_cache',
+}
+
+# 실행 중 자원 샘플링 간격 (초)
+SAMPLE_INTERVAL_SECONDS = 0.1
+
+MB = 1024 * 1024
+
+
+def _cpu_seconds():
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+def _last_cycle(workdir):
+    """체커가 남긴 마지막 체크 사이클 기록 (없으면 None)"""
+    try:
+        with open(os.path.join(workdir, 'metrics_summary.json'), 'r', encoding='utf-8') as f:
+            cycles = json.load(f).get('recent_cycles') or []
+    except (OSError, ValueError):
+        return None
+    return cycles[-1] if cycles else None
+
+
+def _seed_cookies(workdir, host):
+    """ultimate 체커가 쿠키 생성용 브라우저를 띄우지 않도록 fixture 도메인 쿠키를 미리 저장"""
+    path = os.path.join(workdir, 'bearcreek_cookies.json')
+    if not os.path.exists(path):
+        with open(path, 'w') as f:
+            json.dump([{'name': 'ASP.NET_SessionId', 'value': 'fixture', 'domain': host}], f)
+
+
+def run_cycle(backend, workdir, env, server, timeout, expect_message=False):
+    """체커 한 사이클 실행 후 측정값 반환
+
+    expect_message: 텔레그램 메시지가 한 번도 가지 않으면 실패로 셀지 여부 (열린 날짜가 있는 사이클)
+    """
+    try:
+        os.remove(os.path.join(workdir, 'metrics_summary.json'))
+    except FileNotFoundError:
+        pass
+    server.site.reset()
+    cpu_before = _cpu_seconds()
+    started = time.monotonic()
+    peak_rss = peak_pss = peak_processes = 0
+    with open(os.path.join(workdir, 'e2e_output.log'), 'ab') as output:
+        proc = subprocess.Popen(
+            [sys.executable, BEARCREEK_PY, 'check', '--backend', backend, '--single'],
+            cwd=workdir, env=env, stdout=output, stderr=subprocess.STDOUT, start_new_session=True,
+        )
+        timed_out = False
+        while proc.poll() is None:
+            snapshot = browser_resources.sample_tree(os.getpid())
+            peak_rss = max(peak_rss, snapshot['rss_bytes'])
+            peak_pss = max(peak_pss, snapshot['pss_bytes'])
+            peak_processes = max(peak_processes, snapshot['processes'])
+            if time.monotonic() - started > timeout:
+                timed_out = True
+                os.killpg(proc.pid, signal.SIGKILL)
+                proc.wait()
+                break
+            time.sleep(SAMPLE_INTERVAL_SECONDS)
+    wall = time.monotonic() - started
+    # 세션 밖으로 남은 브라우저 자식까지 정리 (정상 종료면 이미 없음)
+    try:
+        os.killpg(proc.pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass
+    stats = server.site.stats()
+    cycle = _last_cycle(workdir)
+    # 열린 날짜가 있는데 알림이 없으면 날짜를 뽑지 못한 것이므로 실패로 셈
+    missed = expect_message and stats['telegram_messages'] == 0
+    return {
+        'backend': backend,
+        # 사이트에 한 번도 요청하지 못한 사이클(브라우저 실행 실패 등)도 실패로 셈
+        'ok': proc.returncode == 0 and cycle is not None and not timed_out and stats['total'] > 0 and not missed,
+        'missed_notification': missed,
+        'returncode': proc.returncode,
+        'timed_out': timed_out,
+        'cycle_seconds': cycle['duration'] if cycle else None,
+        'phases': cycle['phases'] if cycle else {},
+        'wall_seconds': round(wall, 6),
+        'cpu_seconds': round(_cpu_seconds() - cpu_before, 6),
+        'peak_rss_bytes': peak_rss,
+        'peak_pss_bytes': peak_pss,
+        'peak_processes': peak_processes,
+        'requests': stats['total'],
+        'requests_by_route': stats['requests'],
+        'site_errors': stats['errors'],
+        'telegram_messages': stats['telegram_messages'],
+    }
+
+
+def summarize(backend, records):
+    """백엔드 하나의 사이클 기록 요약"""
+    cycles = [r['cycle_seconds'] for r in records if r['cycle_seconds'] is not None]
+    walls = [r['wall_seconds'] for r in records]
+    count = len(records) or 1
+    return {
+        'backend': backend,
+        'cycles': len(records),
+        'failures': sum(1 for r in records if not r['ok']),
+        'cycle_p50': metrics.quantile(cycles, 0.5),
+        'cycle_p95': metrics.quantile(cycles, 0.95),
+        'wall_p50': metrics.quantile(walls, 0.5),
+        'cpu_seconds': sum(r['cpu_seconds'] for r in records) / count,
+        'peak_rss_mb': max((r['peak_rss_bytes'] for r in records), default=0) / MB,
+        'peak_pss_mb': max((r['peak_pss_bytes'] for r in records), default=0) / MB,
+        'requests_per_cycle': sum(r['requests'] for r in records) / count,
+        'messages_per_cycle': sum(r['telegram_messages'] for r in records) / count,
+    }
+
+
+def _fmt(value, spec='.2f'):
+    return '-' if value is None else format(value, spec)
+
+
+def print_table(summaries, out=sys.stdout):
+    header = (f"{'백엔드':<10} {'성공':>7} {'사이클 p50':>10} {'p95':>8} {'실행 p50':>9} {'CPU(s)':>7} "
+              f"{'최대 PSS':>9} {'최대 RSS':>9} {'요청/사이클':>10} {'알림/사이클':>10}")
+    print(header, file=out)
+    for s in summaries:
+        print(
+            f"{s['backend']:<10} {s['cycles'] - s['failures']:>3}/{s['cycles']:<3} {_fmt(s['cycle_p50']):>10} "
+            f"{_fmt(s['cycle_p95']):>8} {_fmt(s['wall_p50']):>9} {_fmt(s['cpu_seconds']):>7} "
+            f"{_fmt(s['peak_pss_mb'], '.0f'):>7}MB {_fmt(s['peak_rss_mb'], '.0f'):>7}MB "
+            f"{_fmt(s['requests_per_cycle'], '.1f'):>10} {_fmt(s['messages_per_cycle'], '.1f'):>10}",
+            file=out,
+        )
+
+
+def main(backends=None, cycles=3, timeout=300, env_overrides=None, output=None, **fixture_config):
+    """fixture 서버를 띄우고 백엔드별로 cycles회 실행한 뒤 요약 표 출력 (실패한 사이클이 있으면 종료 코드 1)"""
+    backends = backends or list(BACKENDS)
+    server = fixture_server.start(port=0, **fixture_config)
+    site = server.site
+    print(
+        f"fixture 서버: {server.url} (지연 {site.latency_ms:g}±{site.jitter_ms:g}ms, 오류 비율 {site.error_rate:g}, "
+        f"열린 날짜 {site.open_dates}개), 백엔드마다 {cycles}사이클",
+        file=sys.stderr,
+    )
+    env = dict(os.environ, **DEFAULT_ENV)
+    env.update({
+        'BEARCREEK_BASE_URL': server.url,
+        'TELEGRAM_API_BASE_URL': server.telegram_url,
+        'YEAR': str(site.year),
+        'MONTH': str(site.month),
+        'PYTHONPATH': os.pathsep.join(filter(None, [HERE, os.environ.get('PYTHONPATH')])),
+    })
+    env.update(env_overrides or {})
+    # 라이브 보드는 내용이 같으면 편집하지 않으므로 첫 사이클에만 알림을 기대함
+    live = env.get('NOTIFY_MODE', 'push').split('#')[0].strip().lower() == 'live'
+
+    records = []
+    summaries = []
+    try:
+        for backend in backends:
+            with tempfile.TemporaryDirectory(prefix=f'bearcreek-e2e-{backend}-') as workdir:
+                _seed_cookies(workdir, '127.0.0.1')
+                backend_records = []
+                for i in range(cycles):
+                    expect_message = site.open_dates > 0 and (i == 0 or not live)
+                    record = run_cycle(backend, workdir, env, server, timeout, expect_message)
+                    record['cycle'] = i + 1
+                    backend_records.append(record)
+                    print(
+                        f"  {backend} #{i + 1}: {'성공' if record['ok'] else '실패'} "
+                        f"사이클 {_fmt(record['cycle_seconds'])}초, 실행 {record['wall_seconds']:.2f}초, "
+                        f"요청 {record['requests']}개, 알림 {record['telegram_messages']}개"
+                        + (" (열린 날짜 알림 없음)" if record['missed_notification'] else ""),
+                        file=sys.stderr,
+                    )
+                    if not record['ok']:
+                        # 실패한 사이클의 체커 출력 마지막 부분 (브라우저 미설치 등 원인 확인용)
+                        with open(os.path.join(workdir, 'e2e_output.log'), 'rb') as f:
+                            tail = f.read()[-2000:].decode('utf-8', 'replace').strip().splitlines()[-5:]
+                        for line in tail:
+                            print(f"    | {line}", file=sys.stderr)
+                records.extend(backend_records)
+                summaries.append(summarize(backend, backend_records))
+    finally:
+        server.stop()
+
+    print_table(summaries)
+    if output:
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump({'summary': summaries, 'cycles': records}, f, ensure_ascii=False, indent=2)
+    return 1 if any(s['failures'] for s in summaries) else 0
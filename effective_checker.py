@@ -6,29 +6,26 @@ import time
 import datetime
 import logging
 import schedule
-import asyncio
 import random
 import sys
 import pytz
 import requests
-from bs4 import BeautifulSoup
-import json
 from dotenv import load_dotenv
-from telegram import Bot
-from telegram.error import TelegramError
+import log_setup
+import notifier
+import message_renderer
+import metrics
+import profiler
+import artifacts
+import rate_limiter
+import response_cache
+import page_parser
 
 # 한국 시간대 설정
 KST = pytz.timezone('Asia/Seoul')
 
-# 로깅 설정
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("effective_checker.log", encoding='utf-8'),
-        logging.StreamHandler()
-    ]
-)
+# 로깅 설정 (큐 기반 비동기 로깅, 파일은 JSON lines 형식)
+log_setup.setup_logging("effective_checker.log")
 
 logger = logging.getLogger(__name__)
 
@@ -38,11 +35,14 @@ load_dotenv()
 # 설정 정보
 TELEGRAM_BOT_TOKEN = os.getenv('TELEGRAM_BOT_TOKEN')
 TELEGRAM_CHAT_ID = os.getenv('TELEGRAM_CHAT_ID')
-CHECK_INTERVAL_MINUTES = int(os.getenv('CHECK_INTERVAL_MINUTES', 5).replace('%', ''))
+CHECK_INTERVAL_MINUTES = int(os.getenv('CHECK_INTERVAL_MINUTES', '5').replace('%', ''))
+
+# 사이트 주소 (벤치마크에서는 로컬 fixture 서버 주소로 바꿈)
+BEARCREEK_BASE_URL = os.getenv('BEARCREEK_BASE_URL', 'https://www.bearcreek.co.kr').split('#')[0].strip().rstrip('/')
 
 # 베어크리크 골프장 예약 페이지 URL
-BEARCREEK_URL = "https://www.bearcreek.co.kr/Reservation/Reservation.aspx?strLGubun=110&strClubCode=N#aCourseSel"
-BEARCREEK_AJAX_URL = "https://www.bearcreek.co.kr/Reservation/XmlCalendarData.aspx"
+BEARCREEK_URL = f"{BEARCREEK_BASE_URL}/Reservation/Reservation.aspx?strLGubun=110&strClubCode=N#aCourseSel"
+BEARCREEK_AJAX_URL = f"{BEARCREEK_BASE_URL}/Reservation/XmlCalendarData.aspx"
 
 # 다양한 User-Agent 목록
 USER_AGENTS = [
@@ -61,39 +61,13 @@ PROXIES = [
 ]
 
 async def send_telegram_message(message):
-    """텔레그램 메시지 발송 함수"""
-    if not all([TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID]):
-        logger.error("텔레그램 설정이 완료되지 않았습니다. .env 파일을 확인하세요.")
-        return False
-    
-    try:
-        logger.info(f"텔레그램 봇 토큰 유효성 검사 중... (길이: {len(TELEGRAM_BOT_TOKEN)})")
-        logger.info(f"텔레그램 채팅 ID 유효성 검사 중... (값: {TELEGRAM_CHAT_ID})")
-        
-        bot = Bot(token=TELEGRAM_BOT_TOKEN)
-        logger.info("텔레그램 봇 객체 생성 완료")
-        
-        # 채팅 ID 처리
-        chat_id = TELEGRAM_CHAT_ID
-        if isinstance(chat_id, str):
-            if chat_id.startswith('-') and chat_id[1:].isdigit():
-                chat_id = int(chat_id)
-            elif chat_id.isdigit():
-                chat_id = int(chat_id)
-        
-        response = await bot.send_message(chat_id=chat_id, text=message, parse_mode='HTML')
-        logger.info(f"텔레그램 메시지가 성공적으로 전송되었습니다. 메시지 ID: {response.message_id}")
-        return True
-    except TelegramError as e:
-        logger.error(f"텔레그램 메시지 전송 중 오류가 발생했습니다: {str(e)}")
-        return False
-    except Exception as e:
-        logger.error(f"텔레그램 메시지 전송 중 예상치 못한 오류가 발생했습니다: {str(e)}")
-        return False
+    """텔레그램 메시지 발송 함수 (공용 notifier 사용)"""
+    return await notifier.send_message(message)
+
 
 def send_telegram_notification(message):
-    """텔레그램 메시지 발송을 위한 동기 래퍼 함수"""
-    asyncio.run(send_telegram_message(message))
+    """텔레그램 메시지 발송을 위한 동기 래퍼 함수 (데몬 모드에서는 데몬 루프에서 발송)"""
+    return notifier.notify(message)
 
 def get_random_headers():
     """랜덤 헤더 생성"""
@@ -104,7 +78,7 @@ def get_random_headers():
         'Accept-Language': 'ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7',
         'Accept-Encoding': 'gzip, deflate, br',
         'Connection': 'keep-alive',
-        'Referer': 'https://www.bearcreek.co.kr/',
+        'Referer': f'{BEARCREEK_BASE_URL}/',
         'Upgrade-Insecure-Requests': '1',
         'Sec-Fetch-Dest': 'document',
         'Sec-Fetch-Mode': 'navigate',
@@ -127,7 +101,8 @@ def fetch_with_retry(url, method='GET', max_retries=3, delay=5, data=None, param
             if attempt > 1:
                 time.sleep(delay * attempt)
             
-            session = requests.Session()
+            # 모든 체커/프로세스 공용 요청 한도 적용
+            session = rate_limiter.limit_session(requests.Session())
             
             # 요청 메소드에 따라 적절한 방식으로 호출
             if method.upper() == 'POST':
@@ -140,7 +115,7 @@ def fetch_with_retry(url, method='GET', max_retries=3, delay=5, data=None, param
                 
                 # Debug: 응답 내용의 일부 로깅
                 content_preview = response.text[:200].replace('\n', ' ')
-                logger.info(f"응답 내용 미리보기: {content_preview}...")
+                logger.debug("응답 내용 미리보기: %s...", content_preview)
                 
                 return response
             else:
@@ -151,10 +126,18 @@ def fetch_with_retry(url, method='GET', max_retries=3, delay=5, data=None, param
     logger.error(f"{max_retries}회 시도 후 요청 실패: {url}")
     return None
 
-def check_available_dates():
-    """베어크리크 골프장 예약 가능 날짜 확인"""
-    logger.info("베어크리크 골프장 예약 확인을 시작합니다...")
-    
+def fetch_text(url, params=None):
+    """응답 본문 (실패 시 None)"""
+    response = fetch_with_retry(url, params=params)
+    return response.text if response else None
+
+def parse_calendar_data(text):
+    """캘린더 데이터 응답에서 예약 가능 날짜 추출"""
+    with metrics.span('dom_extract'):
+        return page_parser.calendar_data_dates(text)
+
+def target_month():
+    """확인할 년월 (다음 달)"""
     # 현재 날짜 정보
     now = datetime.datetime.now(KST)
     current_year = now.year
@@ -163,6 +146,12 @@ def check_available_dates():
     # 확인할 년월 설정
     check_year = current_year if current_month <= 11 else current_year + 1
     check_month = (current_month + 1) if current_month <= 11 else 1
+    return check_year, check_month
+
+def fetch_available_dates(year=None, month=None):
+    """year/month(기본값: 다음 달)의 예약 가능 날짜 조회만 수행 (알림 없음, 요청 실패 시 None)"""
+    import freshness
+    check_year, check_month = (year, month) if year and month else target_month()
     
     # AJAX 요청 파라미터
     params = {
@@ -171,62 +160,83 @@ def check_available_dates():
         'strReserveDate': f'{check_year}-{check_month:02d}-01',  # 예약 날짜 형식: YYYY-MM-DD
     }
     
-    try:
-        # 메인 페이지 먼저 방문 (쿠키 수집)
-        main_response = fetch_with_retry(BEARCREEK_URL)
-        if not main_response:
-            logger.error("메인 페이지 로드 실패")
-            return False
-        
-        # 조금 대기 (자연스러운 흐름 모방)
+    def load_calendar_data():
+        text = fetch_text(BEARCREEK_AJAX_URL, params)
+        if text is not None:
+            # 응답 내용 저장 (디버깅 파일은 표본 사이클만, 스냅샷 보관소에는 매번 백그라운드 기록)
+            with metrics.span('page_dump'):
+                artifacts.save(f"calendar_data_{check_year}_{check_month:02d}.txt", text, target='calendar_data')
+        return text
+    
+    # 메인 페이지 먼저 방문 (쿠키 수집, 다른 체크가 방금 받은 응답이 있으면 공유)
+    with metrics.span('page_load'):
+        main_text = response_cache.fetch(BEARCREEK_URL, None, lambda: fetch_text(BEARCREEK_URL))
+    if main_text is None:
+        logger.error("메인 페이지 로드 실패")
+        return None
+    
+    # 조금 대기 (자연스러운 흐름 모방)
+    with metrics.span('wait'):
         time.sleep(random.uniform(2, 4))
-        
-        # 캘린더 데이터 요청 (XML/JSON 형식)
-        calendar_response = fetch_with_retry(BEARCREEK_AJAX_URL, params=params)
-        if not calendar_response:
-            logger.error("캘린더 데이터 요청 실패")
+    
+    # 캘린더 데이터 요청 및 분석 (XML/JSON 형식, 같은 달을 보는 다른 체크와 요청/파싱 결과 공유)
+    with metrics.span('calendar_fetch'):
+        available_dates = response_cache.fetch(BEARCREEK_AJAX_URL, params, load_calendar_data, parse=parse_calendar_data)
+    if available_dates is None:
+        logger.error("캘린더 데이터 요청 실패")
+        return None
+    # 공유된 결과를 이 체크에서 고쳐 쓰지 않도록 복사
+    available_dates = list(available_dates)
+    for date_str in available_dates:
+        freshness.mark_seen(date_str)
+    return available_dates
+
+@metrics.timed_cycle('requests')
+@profiler.profiled('requests')
+def check_available_dates():
+    """베어크리크 골프장 예약 가능 날짜 확인"""
+    import live_board
+    import freshness
+    logger.info("베어크리크 골프장 예약 확인을 시작합니다...")
+    check_year, check_month = target_month()
+    
+    try:
+        available_dates = fetch_available_dates()
+        if available_dates is None:
             return False
         
-        # 응답 내용 저장 (디버깅용)
-        with open(f"calendar_data_{check_year}_{check_month:02d}.txt", "w", encoding="utf-8") as f:
-            f.write(calendar_response.text)
-        
-        # 응답 분석
-        available_dates = []
+        # 알림 대기열 등록 시점 기록
+        freshness.mark_enqueued(available_dates)
         
-        # XML 또는 JSON 응답 형식에 따라 파싱 시도
-        try:
-            # 먼저 JSON으로 파싱 시도
-            data = json.loads(calendar_response.text)
-            # JSON 구조에 따라 예약 가능 날짜 추출 로직 추가
-            # (구체적인 키와 값은 실제 응답 형식에 맞게 수정 필요)
-            logger.info("JSON 응답 파싱 성공")
-        except json.JSONDecodeError:
-            # JSON 파싱 실패 시 XML로 시도
-            soup = BeautifulSoup(calendar_response.text, 'html.parser')
-            # XML 구조에 따라 예약 가능 날짜 추출 로직 추가
-            available_elements = soup.select('날짜 선택자')
-            for element in available_elements:
-                date_str = element.get('date')
-                if date_str:
-                    available_dates.append(date_str)
-            logger.info("XML 응답 파싱 성공")
+        # 라이브 보드 모드: 고정 메시지 하나만 갱신
+        if live_board.is_live_mode():
+            with metrics.span('telegram_send'):
+                live_board.update_live_board(
+                    f"{check_year}-{check_month:02d}",
+                    f"🏌️ <b>베어크리크 {check_year}년 {check_month}월 예약 현황</b>",
+                    available_dates,
+                    BEARCREEK_URL,
+                )
         
         # 예약 가능 날짜가 있을 경우 알림 전송
         if available_dates:
             logger.info(f"예약 가능 날짜 발견: {available_dates}")
+            if live_board.is_live_mode():
+                return True
             
-            # 알림 메시지 구성
-            message = f"🏌️ <b>베어크리크 예약 알림</b>\n\n"
-            message += f"다음 날짜에 예약이 가능합니다:\n\n"
-            
-            for date_str in available_dates:
-                message += f"- {date_str}\n"
-            
-            message += f"\n예약 페이지: {BEARCREEK_URL}"
+            # 알림 메시지 구성 (4096자 초과 시 날짜 단위로 분할)
+            messages = message_renderer.render_availability(
+                "🏌️ <b>베어크리크 예약 알림</b>",
+                available_dates,
+                BEARCREEK_URL,
+                intro="다음 날짜에 예약이 가능합니다:",
+                section=None,
+            )
             
             # 텔레그램 알림 전송
-            send_telegram_notification(message)
+            with metrics.span('telegram_send'):
+                for message in messages:
+                    send_telegram_notification(message)
             return True
         else:
             logger.info("예약 가능한 날짜를 찾을 수 없습니다.")
@@ -238,8 +248,22 @@ def check_available_dates():
 
 def run_scheduler():
     """스케줄러 실행"""
+    import heap_monitor
+    import disk_monitor
     logger.info(f"베어크리크 예약 확인 스케줄러가 시작되었습니다. 확인 주기: {CHECK_INTERVAL_MINUTES}분")
     
+    # 메트릭 엔드포인트 시작 (METRICS_PORT 설정 시)
+    metrics.start_metrics_server()
+    
+    # SIGUSR1 수신 시 다음 사이클 프로파일링
+    profiler.install_signal_handler()
+    
+    # 힙 추적 및 RSS 상한 점검 시작 (HEAP_TRACE, MAX_RSS_MB 설정 시)
+    heap_monitor.start()
+    
+    # 디스크 압박 감시 시작 (단계에 따라 디버깅 파일/보관소/로그 보관량 축소)
+    disk_monitor.start()
+    
     # 즉시 한 번 실행
     check_available_dates()
     
@@ -250,6 +274,7 @@ def run_scheduler():
     try:
         while True:
             schedule.run_pending()
+            heap_monitor.tick()
             time.sleep(1)
     except KeyboardInterrupt:
         logger.info("Ctrl+C로 프로그램이 중단되었습니다.")
@@ -261,7 +286,9 @@ def run_scheduler():
 if __name__ == "__main__":
     logger.info("베어크리크 예약 확인 서비스가 시작되었습니다.")
     
-    # 커맨드라인 인자 확인
+    # 커맨드라인 인자 확인 (--profile N: 처음 N회 사이클 프로파일링)
+    profiler.arm_from_argv(sys.argv)
+    
     if len(sys.argv) > 1 and sys.argv[1] == "--single":
         # 단일 실행 모드
         logger.info("단일 실행 모드로 실행합니다.")
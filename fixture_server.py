@@ -0,0 +1,392 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""체커를 실제 사이트 없이 돌려 보는 로컬 fixture 서버 (예약 사이트 + 가짜 텔레그램 Bot API)
+
+    python bearcreek.py fixture --port 8765 --open-dates 5 --latency-ms 200
+    BEARCREEK_BASE_URL=http://127.0.0.1:8765 TELEGRAM_API_BASE_URL=http://127.0.0.1:8765/bot \\
+        python bearcreek.py check --backend effective --single
+
+흉내 내는 경로
+- /Reservation/Reservation.aspx       예약 페이지 (달력: 열린 날짜는 title '예약가능' + 링크, 닫힌 날짜는 class 'red')
+- /Reservation/ReservationTime.aspx   날짜별 시간 표 조각 (table.table-body, 달력 날짜를 누르면 불러옴)
+- /Reservation/XmlCalendarData.aspx   캘린더 데이터 (XML, GET/POST의 strReserveDate 달)
+- /bot<토큰>/<메서드>                  가짜 Bot API (sendMessage, editMessageText, pinChatMessage 등)
+- /__fixture/stats, /__fixture/reset  경로별 요청 수 조회/초기화
+
+FIXTURE_PAGES_DIR에 녹화한 페이지(main_page.html, time_page_*.html, calendar_data_*.html 등)가
+있으면 합성 페이지 대신 그 내용을 돌려준다.
+"""
+
+import os
+import re
+import sys
+import glob
+import json
+import time
+import random
+import signal
+import logging
+import calendar
+import datetime
+import threading
+import collections
+from urllib.parse import urlsplit, parse_qs
+from dotenv import load_dotenv
+
+logger = logging.getLogger(__name__)
+
+# 환경 변수 로드
+load_dotenv()
+
+
+def _env_float(name, default):
+    """주석이 포함될 수 있는 실수 환경변수 로드"""
+    value = os.getenv(name, str(default)).split('#')[0].strip()
+    try:
+        return float(value)
+    except ValueError:
+        return default
+
+
+MONTH = int(os.getenv('MONTH', '4').replace('%', ''))
+YEAR = int(os.getenv('YEAR', '2025').replace('%', ''))
+
+# 포트 (127.0.0.1에만 바인딩, 0이면 빈 포트)
+FIXTURE_PORT = int(_env_float('FIXTURE_PORT', 8765))
+
+# 사이트 응답 지연 (밀리초, 기준값 ± 흔들림)과 텔레그램 응답 지연
+FIXTURE_LATENCY_MS = _env_float('FIXTURE_LATENCY_MS', 150)
+FIXTURE_JITTER_MS = _env_float('FIXTURE_JITTER_MS', 50)
+FIXTURE_TELEGRAM_LATENCY_MS = _env_float('FIXTURE_TELEGRAM_LATENCY_MS', 50)
+
+# 사이트 요청 중 오류로 답할 비율 (0~1)과 그때의 상태 코드 (실제 사이트의 406 차단 등)
+FIXTURE_ERROR_RATE = _env_float('FIXTURE_ERROR_RATE', 0)
+FIXTURE_ERROR_STATUS = int(_env_float('FIXTURE_ERROR_STATUS', 503))
+
+# 달마다 열린 날짜 수와 열린 날짜마다 시간 표 행 수
+FIXTURE_OPEN_DATES = int(_env_float('FIXTURE_OPEN_DATES', 5))
+FIXTURE_TEE_TIMES = int(_env_float('FIXTURE_TEE_TIMES', 6))
+
+# 녹화한 페이지 디렉토리 (비우면 합성 페이지)
+FIXTURE_PAGES_DIR = os.getenv('FIXTURE_PAGES_DIR', '').split('#')[0].strip()
+
+# 열린 날짜/오류 선택 난수 시드 (같은 시드면 같은 달력)
+FIXTURE_SEED = int(_env_float('FIXTURE_SEED', 1))
+
+# 녹화한 페이지 파일 이름 (앞에 있는 것 우선)
+RECORDED_PAGES = {
+    'reservation': ('reservation.html', 'main_page.html', 'page_source.html', 'bearcreek_main.html'),
+    'tee_times': ('tee_times.html', 'time_page_*.html'),
+    'calendar_data': ('calendar_data.xml', 'calendar_data_*.html', 'calendar_data_*.txt'),
+}
+
+COURSES = ('Lake', 'Valley', 'Mountain')
+
+_TELEGRAM_PATH = re.compile(r'^/bot(?P<token>[^/]+)/(?P<method>\w+)$')
+
+
+def _month_of(value, default):
+    """'YYYY-MM-DD' -> (년, 월), 형식이 다르면 default"""
+    try:
+        date = datetime.date.fromisoformat((value or '')[:10])
+        return date.year, date.month
+    except ValueError:
+        return default
+
+
+class FixtureSite:
+    """응답 내용, 지연/오류 설정, 경로별 요청 수"""
+
+    def __init__(self, latency_ms=None, jitter_ms=None, error_rate=None, error_status=None, open_dates=None,
+                 tee_times=None, pages_dir=None, seed=None, year=None, month=None):
+        self.latency_ms = FIXTURE_LATENCY_MS if latency_ms is None else latency_ms
+        self.jitter_ms = FIXTURE_JITTER_MS if jitter_ms is None else jitter_ms
+        self.error_rate = FIXTURE_ERROR_RATE if error_rate is None else error_rate
+        self.error_status = error_status or FIXTURE_ERROR_STATUS
+        self.open_dates = FIXTURE_OPEN_DATES if open_dates is None else open_dates
+        self.tee_times = FIXTURE_TEE_TIMES if tee_times is None else tee_times
+        self.pages_dir = FIXTURE_PAGES_DIR if pages_dir is None else pages_dir
+        self.seed = FIXTURE_SEED if seed is None else seed
+        self.year = year or YEAR
+        self.month = month or MONTH
+        self._rng = random.Random(self.seed)
+        self._lock = threading.Lock()
+        self._message_ids = 0
+        self.reset()
+
+    def reset(self):
+        """요청 수 초기화"""
+        with self._lock:
+            self.requests = collections.Counter()
+            self.telegram = collections.Counter()
+            self.errors = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                'requests': dict(self.requests),
+                'total': sum(self.requests.values()),
+                'errors': self.errors,
+                'telegram': dict(self.telegram),
+                'telegram_messages': self.telegram['sendmessage'] + self.telegram['editmessagetext'],
+            }
+
+    def count(self, route):
+        with self._lock:
+            self.requests[route] += 1
+
+    def delay(self):
+        """사이트 응답 지연"""
+        with self._lock:
+            jitter = self._rng.uniform(-self.jitter_ms, self.jitter_ms)
+        time.sleep(max(self.latency_ms + jitter, 0) / 1000)
+
+    def fail(self):
+        """이번 요청을 오류로 답할지 (FIXTURE_ERROR_RATE 비율)"""
+        with self._lock:
+            failed = self.error_rate > 0 and self._rng.random() < self.error_rate
+            if failed:
+                self.errors += 1
+        return failed
+
+    def recorded(self, kind):
+        """녹화한 페이지 내용 (없으면 None)"""
+        if not self.pages_dir:
+            return None
+        for pattern in RECORDED_PAGES[kind]:
+            for path in sorted(glob.glob(os.path.join(self.pages_dir, pattern))):
+                with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                    return f.read()
+        return None
+
+    def open_days(self, year, month):
+        """그 달의 열린 날짜(일) - 시드와 년월이 같으면 항상 같음"""
+        days = calendar.monthrange(year, month)[1]
+        rng = random.Random(f"{self.seed}:{year}-{month}")
+        return sorted(rng.sample(range(1, days + 1), min(self.open_dates, days)))
+
+    def reservation_page(self, year, month):
+        """예약 페이지 (table.calendar 달력, 날짜를 누르면 시간 표 조각을 불러옴)"""
+        recorded = self.recorded('reservation')
+        if recorded is not None:
+            return recorded
+        open_days = set(self.open_days(year, month))
+        rows = []
+        week = ['<td></td>'] * ((calendar.monthrange(year, month)[0] + 1) % 7)
+        for day in range(1, calendar.monthrange(year, month)[1] + 1):
+            date = f"{year}-{month:02d}-{day:02d}"
+            label = f"{year}년 {month:02d}월 {day:02d}일"
+            if day in open_days:
+                week.append(f'<td onclick="selectDate(\'{date}\')" title="{label} 예약가능">'
+                            f'<a href="#" onclick="selectDate(\'{date}\'); return false;">{day}</a></td>')
+            else:
+                week.append(f'<td class="red" onclick="return false;" title="{label} 예약마감">{day}</td>')
+            if len(week) == 7:
+                rows.append(f"<tr>{''.join(week)}</tr>")
+                week = []
+        if week:
+            rows.append(f"<tr>{''.join(week)}</tr>")
+        viewstate = random.getrandbits(128)
+        return f"""<!DOCTYPE html>
+<html lang="ko"><head><meta charset="utf-8"><title>베어크리크 예약 (fixture)</title></head>
+<body>
+<form id="form1"><input type="hidden" name="__VIEWSTATE" id="__VIEWSTATE" value="{viewstate:032x}"></form>
+<h2 id="aCourseSel">{year}년 {month}월</h2>
+<table class="calendar">
+<tr><th>일</th><th>월</th><th>화</th><th>수</th><th>목</th><th>금</th><th>토</th></tr>
+{''.join(rows)}
+</table>
+<div id="timeArea"></div>
+<script>
+function selectDate(date) {{
+  fetch('ReservationTime.aspx?strReserveDate=' + date)
+    .then(function (r) {{ return r.text(); }})
+    .then(function (html) {{ document.getElementById('timeArea').innerHTML = html; }});
+}}
+</script>
+</body></html>
+"""
+
+    def tee_time_fragment(self, date):
+        """날짜별 시간 표 조각 (코스, 시간, 홀, 가격)"""
+        recorded = self.recorded('tee_times')
+        if recorded is not None:
+            return recorded
+        rng = random.Random(f"{self.seed}:{date}")
+        rows = []
+        for i in range(self.tee_times):
+            minutes = 6 * 60 + 30 + i * 8 + rng.randrange(0, 8)
+            price = rng.choice((120000, 140000, 160000))
+            rows.append(f"<tr><td>{COURSES[i % len(COURSES)]}</td><td>{minutes // 60:02d}:{minutes % 60:02d}</td>"
+                        f"<td>18홀</td><td>{price:,}</td></tr>")
+        return f'<table class="table-body">{"".join(rows)}</table>'
+
+    def calendar_data(self, year, month):
+        """캘린더 데이터 (XML)"""
+        recorded = self.recorded('calendar_data')
+        if recorded is not None:
+            return recorded
+        days = calendar.monthrange(year, month)[1]
+        open_days = set(self.open_days(year, month))
+        items = ''.join(
+            f'<Day date="{year}-{month:02d}-{day:02d}" status="{"Y" if day in open_days else "N"}" />'
+            for day in range(1, days + 1)
+        )
+        return f'<?xml version="1.0" encoding="utf-8"?><CalendarData>{items}</CalendarData>'
+
+    def telegram_call(self, method, params):
+        """가짜 Bot API 응답의 result"""
+        method = method.lower()
+        with self._lock:
+            self.telegram[method] += 1
+            if method in ('sendmessage', 'editmessagetext') and not params.get('message_id'):
+                self._message_ids += 1
+                message_id = self._message_ids
+            else:
+                message_id = int(params.get('message_id') or 0)
+        if method == 'getme':
+            return {'id': 1, 'is_bot': True, 'first_name': 'fixture', 'username': 'fixture_bot'}
+        if method in ('sendmessage', 'editmessagetext'):
+            chat_id = params.get('chat_id') or 0
+            try:
+                chat_id = int(chat_id)
+            except (TypeError, ValueError):
+                pass
+            return {
+                'message_id': message_id,
+                'date': int(time.time()),
+                'chat': {'id': chat_id, 'type': 'private'},
+                'text': params.get('text', ''),
+            }
+        return True
+
+
+def _handler_class(site):
+    """요청 처리기 (site 설정을 쓰는 BaseHTTPRequestHandler)"""
+    from http.server import BaseHTTPRequestHandler
+
+    class _FixtureHandler(BaseHTTPRequestHandler):
+        # 실제 사이트처럼 연결 재사용 (requests/cloudscraper 세션 측정에 영향)
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            self._handle()
+
+        def do_POST(self):
+            self._handle()
+
+        def _params(self):
+            """쿼리와 본문(폼 또는 JSON) 파라미터"""
+            params = {key: values[-1] for key, values in parse_qs(urlsplit(self.path).query).items()}
+            length = int(self.headers.get('Content-Length') or 0)
+            body = self.rfile.read(length) if length else b''
+            if body:
+                if 'json' in (self.headers.get('Content-Type') or ''):
+                    try:
+                        params.update(json.loads(body))
+                    except ValueError:
+                        pass
+                else:
+                    params.update({key: values[-1] for key, values in parse_qs(body.decode('utf-8', 'replace')).items()})
+            return params
+
+        def _reply(self, status, body, content_type='text/html; charset=utf-8'):
+            data = body.encode('utf-8') if isinstance(body, str) else body
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            if self.command != 'HEAD':
+                self.wfile.write(data)
+
+        def _handle(self):
+            path = urlsplit(self.path).path
+            params = self._params()
+
+            telegram = _TELEGRAM_PATH.match(path)
+            if telegram:
+                time.sleep(FIXTURE_TELEGRAM_LATENCY_MS / 1000)
+                result = site.telegram_call(telegram.group('method'), params)
+                self._reply(200, json.dumps({'ok': True, 'result': result}), 'application/json')
+                return
+            if path == '/__fixture/stats':
+                self._reply(200, json.dumps(site.stats()), 'application/json')
+                return
+            if path == '/__fixture/reset':
+                site.reset()
+                self._reply(200, json.dumps({'ok': True}), 'application/json')
+                return
+
+            route = path.rsplit('/', 1)[-1].lower()
+            if route not in ('reservation.aspx', 'reservationtime.aspx', 'xmlcalendardata.aspx'):
+                self._reply(404, 'Not Found', 'text/plain; charset=utf-8')
+                return
+            site.count(route)
+            site.delay()
+            if site.fail():
+                self._reply(site.error_status, f'<html><body>fixture error {site.error_status}</body></html>')
+                return
+            year, month = _month_of(params.get('strReserveDate'), (site.year, site.month))
+            if route == 'reservation.aspx':
+                self._reply(200, site.reservation_page(year, month))
+            elif route == 'reservationtime.aspx':
+                self._reply(200, site.tee_time_fragment(params.get('strReserveDate', '')))
+            else:
+                self._reply(200, site.calendar_data(year, month), 'text/xml; charset=utf-8')
+
+        def log_message(self, format, *args):
+            logger.debug("fixture 요청: " + format, *args)
+
+    return _FixtureHandler
+
+
+class FixtureServer:
+    """백그라운드 스레드에서 실행 중인 fixture 서버"""
+
+    def __init__(self, site, port=None):
+        from http.server import ThreadingHTTPServer
+        self.site = site
+        self._server = ThreadingHTTPServer(('127.0.0.1', FIXTURE_PORT if port is None else port), _handler_class(site))
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self.url = f"http://127.0.0.1:{self.port}"
+        self.telegram_url = f"{self.url}/bot"
+        self._thread = threading.Thread(target=self._server.serve_forever, name='fixture-server', daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def start(port=None, **config):
+    """fixture 서버를 백그라운드로 시작 (config: FixtureSite 설정)"""
+    return FixtureServer(FixtureSite(**config), port).start()
+
+
+def main(port=None, **config):
+    """fixture 서버 실행 (SIGTERM/SIGINT로 종료)"""
+    import log_setup
+    log_setup.setup_logging('fixture_server.log')
+    server = start(port, **config)
+    site = server.site
+    logger.info(
+        f"fixture 서버 시작: {server.url} (지연 {site.latency_ms:g}±{site.jitter_ms:g}ms, "
+        f"오류 비율 {site.error_rate:g} → {site.error_status}, 열린 날짜 {site.open_dates}개"
+        f"{f', 녹화 페이지 {site.pages_dir}' if site.pages_dir else ''})"
+    )
+    logger.info(f"BEARCREEK_BASE_URL={server.url} TELEGRAM_API_BASE_URL={server.telegram_url}")
+    stopped = threading.Event()
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(signum, lambda *_: stopped.set())
+    stopped.wait()
+    server.stop()
+    logger.info(f"fixture 서버를 종료했습니다. 요청 수: {json.dumps(site.stats(), ensure_ascii=False)}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
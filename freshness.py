@@ -0,0 +1,180 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import json
+import time
+import logging
+import threading
+from dotenv import load_dotenv
+import metrics
+
+logger = logging.getLogger(__name__)
+
+# 환경 변수 로드
+load_dotenv()
+
+# 전달 완료된 슬롯 이벤트를 기록하는 JSON lines 파일 (빈 값이면 기록하지 않음)
+FRESHNESS_EVENTS_FILE = os.getenv('FRESHNESS_EVENTS_FILE', 'freshness_events.jsonl').split('#')[0].strip()
+
+# 체커별로 열려 있는 슬롯을 처음 본 시점과 전달 여부를 사이클을 넘어 저장하는 파일 (라이브 보드 상태 파일 옆)
+FRESHNESS_STATE_FILE = os.getenv('FRESHNESS_STATE_FILE', 'freshness_state.json').split('#')[0].strip()
+
+# 슬롯 이벤트 구간별 소요 시간 히스토그램 이름
+FRESHNESS_METRIC = 'bearcreek_freshness_seconds'
+
+# 구간별 백분위 게이지 이름
+FRESHNESS_QUANTILE_METRIC = 'bearcreek_freshness_quantile_seconds'
+
+# 측정 구간 (새로 열린 슬롯마다 한 번, 계속 열려 있는 슬롯은 다시 세지 않음)
+# detect: 처음 발견한 사이클 시작 -> DOM에서 처음 발견
+# queue: 처음 발견 -> 알림 대기열 등록
+# deliver: 알림 대기열 등록 -> 텔레그램 응답 (message_id)
+# end_to_end: 처음 발견한 사이클 시작 -> 텔레그램 응답
+LEGS = ('detect', 'queue', 'deliver', 'end_to_end')
+QUANTILES = (0.5, 0.95, 0.99)
+
+metrics.describe(FRESHNESS_METRIC, 'histogram', '슬롯 발견부터 텔레그램 전달까지 구간별 소요 시간 (초)')
+metrics.describe(FRESHNESS_QUANTILE_METRIC, 'gauge', '슬롯 전달 구간별 최근 백분위 (초)')
+metrics.describe_quantiles(FRESHNESS_QUANTILE_METRIC, FRESHNESS_METRIC, QUANTILES)
+
+_file_lock = threading.Lock()
+_state_lock = threading.Lock()
+_state = None  # 체커 -> {슬롯: {'cycle', 'seen', 'enqueued', 'delivered'}} (시각은 time.time())
+
+
+def _read_state():
+    try:
+        with open(FRESHNESS_STATE_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save(checker):
+    """checker의 슬롯 상태 저장 (다른 프로세스가 쓴 다른 체커 상태는 유지, _state_lock 안에서 호출)"""
+    if not FRESHNESS_STATE_FILE:
+        return
+    state = _read_state()
+    state[checker] = _state.get(checker, {})
+    tmp_path = f"{FRESHNESS_STATE_FILE}.tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False)
+        os.replace(tmp_path, FRESHNESS_STATE_FILE)
+    except OSError as e:
+        logger.warning(f"슬롯 상태 저장 중 오류 (무시됨): {str(e)}")
+
+
+def _events():
+    """현재 사이클 체커의 슬롯 상태 -> (사이클 상태, 슬롯 상태), 사이클 밖이면 (None, None)"""
+    global _state
+    cycle_state = metrics.current_cycle()
+    if cycle_state is None:
+        return None, None
+    with _state_lock:
+        if _state is None:
+            _state = _read_state() if FRESHNESS_STATE_FILE else {}
+        return cycle_state, _state.setdefault(cycle_state['checker'], {})
+
+
+def mark_seen(*keys):
+    """슬롯이 DOM에서 처음 발견된 시점 기록 (이전 사이클부터 열려 있던 슬롯은 그대로)"""
+    cycle_state, events = _events()
+    if events is None:
+        return
+    now = time.time()
+    with _state_lock:
+        for key in keys:
+            if key not in events:
+                events[key] = {'cycle': cycle_state['started'], 'seen': now}
+
+
+def mark_enqueued(keys):
+    """지금 열려 있는 슬롯 전체가 알림 대기열에 등록된 시점 기록
+
+    목록에 없는 슬롯은 닫힌 것으로 보고 잊는다 (다시 열리면 새 슬롯으로 측정).
+    """
+    cycle_state, events = _events()
+    if events is None:
+        return
+    now = time.time()
+    keys = set(keys)
+    with _state_lock:
+        for key in [key for key in events if key not in keys]:
+            del events[key]
+        for key in keys:
+            event = events.setdefault(key, {'cycle': cycle_state['started'], 'seen': now})
+            event.setdefault('enqueued', now)
+        _save(cycle_state['checker'])
+
+
+def mark_delivered(message_id, text=None):
+    """텔레그램이 메시지를 접수한 시점 기록 (text가 주어지면 본문에 포함된 슬롯만)
+
+    아직 전달되지 않은 새 슬롯만 기록한다. 같은 슬롯이 다음 푸시나 보드 편집에 다시 실려도 세지 않는다.
+    """
+    cycle_state, events = _events()
+    if not events:
+        return
+    now = time.time()
+    checker = cycle_state['checker']
+
+    delivered = []
+    with _state_lock:
+        for key, event in events.items():
+            if 'enqueued' not in event or 'delivered' in event:
+                continue
+            if text is not None and key not in text:
+                continue
+            event['delivered'] = message_id
+            delivered.append((key, {
+                'detect': event['seen'] - event['cycle'],
+                'queue': event['enqueued'] - event['seen'],
+                'deliver': now - event['enqueued'],
+                'end_to_end': now - event['cycle'],
+            }))
+        if delivered:
+            _save(checker)
+
+    for key, legs in delivered:
+        for leg, seconds in legs.items():
+            metrics.observe(FRESHNESS_METRIC, max(seconds, 0.0), checker=checker, leg=leg)
+        _write_event(checker, key, message_id, legs)
+    if delivered:
+        _publish_quantiles(checker)
+
+
+def _publish_quantiles(checker):
+    """구간별 p50/p95/p99를 게이지로 갱신 (브라우저 풀 부모 프로세스는 merge_state에서 다시 계산)"""
+    for leg in LEGS:
+        metrics.publish_quantiles(FRESHNESS_METRIC, checker=checker, leg=leg)
+
+
+def _write_event(checker, key, message_id, legs):
+    """전달 완료 이벤트를 JSON lines 파일에 추가"""
+    if not FRESHNESS_EVENTS_FILE:
+        return
+    record = {
+        'time': time.time(),
+        'checker': checker,
+        'slot': key,
+        'message_id': message_id,
+        'legs': {leg: round(seconds, 3) for leg, seconds in legs.items()},
+    }
+    try:
+        with _file_lock, open(FRESHNESS_EVENTS_FILE, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    except Exception as e:
+        logger.warning(f"슬롯 이벤트 기록 중 오류 (무시됨): {str(e)}")
+
+
+def quantiles(checker=None):
+    """구간별 p50/p95/p99 조회"""
+    checker = checker or metrics.current_checker()
+    result = {}
+    for leg in LEGS:
+        histogram = metrics.get_histogram(FRESHNESS_METRIC, checker=checker, leg=leg)
+        if histogram is not None:
+            result[leg] = {f"p{int(q * 100)}": histogram.quantile(q) for q in QUANTILES}
+    return result
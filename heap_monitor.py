@@ -0,0 +1,273 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import time
+import logging
+import logging.handlers
+import tracemalloc
+from dotenv import load_dotenv
+import metrics
+import log_setup
+
+logger = logging.getLogger(__name__)
+
+# 환경 변수 로드
+load_dotenv()
+
+
+def _env_float(name, default):
+    """주석이 포함될 수 있는 실수 환경변수 로드"""
+    value = os.getenv(name, str(default)).split('#')[0].strip()
+    try:
+        return float(value)
+    except ValueError:
+        return default
+
+
+# tracemalloc 힙 추적 여부 (추적 중에는 할당마다 비용이 들어 기본값은 꺼짐)
+HEAP_TRACE = os.getenv('HEAP_TRACE', '0').split('#')[0].strip().lower() in ('1', 'true', 'yes', 'on')
+
+# 할당 위치별로 보관할 호출 스택 깊이
+HEAP_TRACE_FRAMES = int(_env_float('HEAP_TRACE_FRAMES', 1))
+
+# 스냅샷 간격 (분)과 보고서에 남길 상위 항목 수
+HEAP_SNAPSHOT_MINUTES = _env_float('HEAP_SNAPSHOT_MINUTES', 60)
+HEAP_TOP_N = int(_env_float('HEAP_TOP_N', 15))
+
+# 힙 증가 보고서 파일 (크기 기준 로테이션)
+HEAP_REPORT_FILE = os.getenv('HEAP_REPORT_FILE', 'heap_growth.log').split('#')[0].strip()
+HEAP_REPORT_MAX_BYTES = int(_env_float('HEAP_REPORT_MAX_BYTES', 1024 * 1024))
+HEAP_REPORT_BACKUPS = int(_env_float('HEAP_REPORT_BACKUPS', 3))
+
+# 프로세스 RSS 상한 (MB, 0이면 비활성화) - 넘으면 사이클 사이에 자기 자신을 재시작
+# (include_rss로 등록한 브라우저 작업 프로세스 트리 RSS도 함께 셈)
+MAX_RSS_MB = _env_float('MAX_RSS_MB', 0)
+
+# RSS 확인 간격 (초)
+RSS_CHECK_SECONDS = _env_float('RSS_CHECK_SECONDS', 30)
+
+# 재시작 직후 다시 재시작하는 반복을 막기 위한 최소 가동 시간 (초)
+RESTART_MIN_UPTIME_SECONDS = _env_float('RESTART_MIN_UPTIME_SECONDS', 600)
+
+PROCESS_RSS_METRIC = 'bearcreek_process_rss_bytes'
+HEAP_TRACED_METRIC = 'bearcreek_heap_traced_bytes'
+RESTART_METRIC = 'bearcreek_process_restarts'
+CHILD_RSS_METRIC = 'bearcreek_child_rss_bytes'
+
+metrics.describe(PROCESS_RSS_METRIC, 'gauge', '스케줄러 프로세스 RSS (바이트)')
+metrics.describe(HEAP_TRACED_METRIC, 'gauge', 'tracemalloc이 추적 중인 Python 힙 크기 (바이트, stat=current|peak)')
+metrics.describe(RESTART_METRIC, 'gauge', 'RSS 상한으로 인한 누적 자기 재시작 횟수')
+metrics.describe(CHILD_RSS_METRIC, 'gauge', 'RSS 상한에 함께 세는 작업 프로세스 트리 RSS (바이트, 브라우저 포함)')
+
+# 스냅샷에서 제외할 내부 할당
+SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+    tracemalloc.Filter(False, '<unknown>'),
+)
+
+_state = {
+    'started': None,
+    'baseline': None,
+    'previous': None,
+    'next_snapshot': None,
+    'next_rss_check': None,
+    'restart_pending': None,
+}
+_report_logger = None
+_restart_hooks = []
+_rss_sources = []
+_restart_blockers = []
+
+
+def current_rss():
+    """현재 프로세스 RSS (바이트)"""
+    try:
+        with open('/proc/self/statm', 'rb') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        import resource
+        # /proc이 없는 환경에서는 최대 RSS로 대신함 (Linux: KB, macOS: 바이트)
+        usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return usage if sys.platform == 'darwin' else usage * 1024
+
+
+def _get_report_logger():
+    """힙 증가 보고서 전용 로거 (로테이션 파일, 상위 로거로 전파하지 않음)"""
+    global _report_logger
+    if _report_logger is None:
+        _report_logger = logging.getLogger('heap_monitor.report')
+        _report_logger.propagate = False
+        _report_logger.setLevel(logging.INFO)
+        handler = logging.handlers.RotatingFileHandler(
+            HEAP_REPORT_FILE, maxBytes=HEAP_REPORT_MAX_BYTES, backupCount=HEAP_REPORT_BACKUPS, encoding='utf-8'
+        )
+        handler.setFormatter(log_setup.KSTFormatter('%(asctime)s %(message)s'))
+        _report_logger.addHandler(handler)
+    return _report_logger
+
+
+def start():
+    """스케줄러 시작 시 호출: 힙 추적 시작 및 점검 일정 초기화"""
+    now = time.monotonic()
+    _state['started'] = now
+    _state['next_rss_check'] = now
+    if HEAP_TRACE and HEAP_REPORT_FILE:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(HEAP_TRACE_FRAMES)
+        _state['next_snapshot'] = now + HEAP_SNAPSHOT_MINUTES * 60
+        logger.info(f"Python 힙 추적 시작: {HEAP_SNAPSHOT_MINUTES:g}분마다 {HEAP_REPORT_FILE}에 증가 상위 {HEAP_TOP_N}개 기록")
+    if MAX_RSS_MB:
+        restarts = int(os.environ.get('BEARCREEK_RESTART_COUNT', '0'))
+        metrics.set_gauge(RESTART_METRIC, restarts)
+        logger.info(f"RSS 상한 {MAX_RSS_MB:g}MB 설정됨 (누적 재시작 {restarts}회)")
+
+
+def tick():
+    """스케줄러 루프에서 사이클 사이마다 호출 (예정된 점검만 수행)"""
+    if _state['started'] is None:
+        return
+    now = time.monotonic()
+    if _state['next_snapshot'] is not None and now >= _state['next_snapshot']:
+        _state['next_snapshot'] = now + HEAP_SNAPSHOT_MINUTES * 60
+        try:
+            write_snapshot_report()
+        except Exception as e:
+            logger.warning(f"힙 스냅샷 기록 중 오류 (무시됨): {str(e)}")
+    if now >= _state['next_rss_check'] or (_state['restart_pending'] and not _restart_blocked()):
+        # 미뤄 둔 재시작은 작업이 끝나는 대로 다시 측정해 진행
+        _state['next_rss_check'] = now + RSS_CHECK_SECONDS
+        check_rss()
+
+
+def _format_stats(title, stats, limit):
+    lines = [title]
+    for stat in stats[:limit]:
+        frame = stat.traceback[0]
+        lines.append(
+            f"  {stat.size_diff / 1024:+10.1f} KiB {stat.count_diff:+8d} blocks "
+            f"(총 {stat.size / 1024:.1f} KiB)  {frame.filename}:{frame.lineno}"
+        )
+    return lines
+
+
+def write_snapshot_report():
+    """직전/최초 스냅샷 대비 증가 상위 항목을 보고서 파일에 기록"""
+    if not tracemalloc.is_tracing():
+        return
+    snapshot = tracemalloc.take_snapshot().filter_traces(SNAPSHOT_FILTERS)
+    traced, peak = tracemalloc.get_traced_memory()
+    metrics.set_gauge(HEAP_TRACED_METRIC, traced, stat='current')
+    metrics.set_gauge(HEAP_TRACED_METRIC, peak, stat='peak')
+
+    lines = [f"pid={os.getpid()} rss={current_rss() / 1048576:.1f}MB traced={traced / 1048576:.1f}MB peak={peak / 1048576:.1f}MB"]
+    if _state['previous'] is not None:
+        growth = [s for s in snapshot.compare_to(_state['previous'], 'lineno') if s.size_diff > 0]
+        lines += _format_stats("직전 스냅샷 대비 증가:", growth, HEAP_TOP_N)
+    if _state['baseline'] is not None:
+        growth = [s for s in snapshot.compare_to(_state['baseline'], 'lineno') if s.size_diff > 0]
+        lines += _format_stats("최초 스냅샷 대비 증가:", growth, HEAP_TOP_N)
+    else:
+        _state['baseline'] = snapshot
+    _state['previous'] = snapshot
+    _get_report_logger().info("\n".join(lines))
+
+
+def _child_rss():
+    """include_rss로 등록한 하위 프로세스 RSS 합계 (바이트)"""
+    total = 0
+    for callback in _rss_sources:
+        try:
+            total += callback()
+        except Exception as e:
+            logger.warning(f"하위 프로세스 RSS 측정 중 오류 (무시됨): {str(e)}")
+    return total
+
+
+def _restart_blocked():
+    """defer_restart_while로 등록한 작업 중 하나라도 진행 중인지"""
+    for callback in _restart_blockers:
+        try:
+            if callback():
+                return True
+        except Exception as e:
+            logger.warning(f"재시작 가능 여부 확인 중 오류 (무시됨): {str(e)}")
+    return False
+
+
+def check_rss():
+    """RSS(등록한 하위 프로세스 포함)를 기록하고 상한을 넘으면 진행 중인 작업이 없을 때 재시작"""
+    rss = current_rss()
+    metrics.set_gauge(PROCESS_RSS_METRIC, rss)
+    children = _child_rss() if _rss_sources else 0
+    if _rss_sources:
+        metrics.set_gauge(CHILD_RSS_METRIC, children)
+    total = rss + children
+    if not MAX_RSS_MB or total <= MAX_RSS_MB * 1048576:
+        _state['restart_pending'] = None
+        return
+    uptime = time.monotonic() - _state['started']
+    if uptime < RESTART_MIN_UPTIME_SECONDS:
+        logger.warning(f"RSS {total / 1048576:.0f}MB가 상한 {MAX_RSS_MB:g}MB를 넘었지만 가동 {uptime:.0f}초라 재시작하지 않습니다.")
+        return
+    reason = f"RSS {total / 1048576:.0f}MB (작업 프로세스 {children / 1048576:.0f}MB 포함) > 상한 {MAX_RSS_MB:g}MB"
+    if _restart_blocked():
+        # 진행 중인 체크를 죽이지 않도록 사이클 사이(작업이 끝난 뒤)로 미룸
+        if not _state['restart_pending']:
+            logger.warning(f"{reason} - 진행 중인 작업이 끝나면 재시작합니다.")
+        _state['restart_pending'] = reason
+        return
+    restart(reason)
+
+
+def before_restart(callback):
+    """재시작(os.execv) 직전에 호출할 정리 함수 등록 (자식 프로세스 종료 등)"""
+    if callback not in _restart_hooks:
+        _restart_hooks.append(callback)
+    return callback
+
+
+def include_rss(callback):
+    """RSS 상한에 함께 셀 하위 프로세스 RSS 측정 함수 등록 (callback() -> 바이트)"""
+    if callback not in _rss_sources:
+        _rss_sources.append(callback)
+    return callback
+
+
+def defer_restart_while(callback):
+    """callback()이 참인 동안(작업 진행 중) RSS 상한 재시작을 미루도록 등록"""
+    if callback not in _restart_blockers:
+        _restart_blockers.append(callback)
+    return callback
+
+
+def restart(reason):
+    """현재 프로세스를 같은 인자로 다시 실행 (PID 유지, nohup/리다이렉션 그대로)"""
+    if tracemalloc.is_tracing():
+        try:
+            write_snapshot_report()
+        except Exception as e:
+            logger.warning(f"재시작 전 힙 스냅샷 기록 실패: {str(e)}")
+    os.environ['BEARCREEK_RESTART_COUNT'] = str(int(os.environ.get('BEARCREEK_RESTART_COUNT', '0')) + 1)
+    logger.warning(f"프로세스를 재시작합니다: {reason}")
+
+    for callback in _restart_hooks:
+        try:
+            callback()
+        except Exception as e:
+            logger.warning(f"재시작 전 정리 중 오류 (무시됨): {str(e)}")
+
+    metrics.write_summary()
+    metrics.stop_metrics_server()
+    log_setup.shutdown_logging()
+    for stream in (sys.stdout, sys.stderr):
+        try:
+            stream.flush()
+        except Exception:
+            pass
+
+    argv = list(getattr(sys, 'orig_argv', None) or [sys.executable] + sys.argv)
+    os.execv(sys.executable, argv)
@@ -0,0 +1,355 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""여러 체크 백엔드를 순서대로 띄워 가장 먼저 온 결과를 쓰는 헤지(hedged) 조회
+
+    python bearcreek.py check --backend hedged --single
+
+가장 가벼운 백엔드(HEDGE_BACKENDS의 첫 번째)부터 조회하고, 그 백엔드가 평소 p90 지연 안에
+답하지 않으면 다음 백엔드를 추가로 띄운다. 실패하면 바로 다음 백엔드로 넘어간다.
+처음 도착한 날짜가 있는 결과를 쓰고 나머지는 취소한다. 빈 결과는 파서가 날짜를 못 읽은
+경우와 구분되지 않으므로 HEDGE_EMPTY_AGREEMENT개 백엔드가 같이 비었다고 답해야 쓴다.
+모든 백엔드에 같은 년월(YEAR/MONTH)을 넘긴다.
+
+백엔드별 지연/성공 통계는 HEDGE_STATS_FILE에 남겨 다음 실행의 헤지 지연 계산에 쓴다.
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import schedule
+import threading
+import concurrent.futures
+from dotenv import load_dotenv
+import log_setup
+import notifier
+import message_renderer
+import metrics
+import profiler
+import browser_pool
+import bearcreek
+
+# 로그 파일 (로깅 설정은 import 시점이 아니라 run_scheduler/단일 실행 시작 시 적용 - 라이브러리로 import해도 전역 핸들러를 바꾸지 않음)
+LOG_FILE = "hedged_fetch.log"
+
+logger = logging.getLogger(__name__)
+
+# 환경 변수 로드
+load_dotenv()
+
+
+def _env_float(name, default):
+    """주석이 포함될 수 있는 실수 환경변수 로드"""
+    value = os.getenv(name, str(default)).split('#')[0].strip()
+    try:
+        return float(value)
+    except ValueError:
+        return default
+
+
+CHECK_INTERVAL_MINUTES = int(os.getenv('CHECK_INTERVAL_MINUTES', '5').replace('%', ''))
+MONTH = int(os.getenv('MONTH', '4').replace('%', ''))
+YEAR = int(os.getenv('YEAR', '2025').replace('%', ''))
+
+# 사이트 주소 (벤치마크에서는 로컬 fixture 서버 주소로 바꿈)
+BEARCREEK_BASE_URL = os.getenv('BEARCREEK_BASE_URL', 'https://www.bearcreek.co.kr').split('#')[0].strip().rstrip('/')
+BEARCREEK_URL = f"{BEARCREEK_BASE_URL}/Reservation/Reservation.aspx?strLGubun=110&strClubCode=N#aCourseSel"
+
+# 띄우는 순서 (가벼운 백엔드부터, bearcreek.py의 백엔드 이름)
+# effective는 캘린더 데이터 파서가 아직 날짜를 뽑지 못하므로 기본 순서에서 제외
+HEDGE_BACKENDS = os.getenv('HEDGE_BACKENDS', 'ultimate,playwright,selenium').split('#')[0].strip()
+
+# 빈 결과(예약 가능 날짜 없음)를 쓰기 전에 같은 답을 내야 하는 백엔드 수
+HEDGE_EMPTY_AGREEMENT = int(_env_float('HEDGE_EMPTY_AGREEMENT', 2))
+
+# 다음 백엔드를 띄우기 전 기다리는 지연의 기준 백분위와, 통계가 부족할 때의 기본 지연 (초)
+HEDGE_QUANTILE = _env_float('HEDGE_QUANTILE', 0.9)
+HEDGE_DEFAULT_DELAY_SECONDS = _env_float('HEDGE_DEFAULT_DELAY_SECONDS', 20)
+HEDGE_MIN_DELAY_SECONDS = _env_float('HEDGE_MIN_DELAY_SECONDS', 1)
+
+# 지연 백분위를 계산하기 시작하는 최소 성공 횟수와 보관할 최근 기록 수
+HEDGE_MIN_SAMPLES = int(_env_float('HEDGE_MIN_SAMPLES', 5))
+HEDGE_WINDOW = int(_env_float('HEDGE_WINDOW', 100))
+
+# 백엔드별 지연/성공 통계 파일
+HEDGE_STATS_FILE = os.getenv('HEDGE_STATS_FILE', 'hedge_stats.json').split('#')[0].strip()
+
+# 작업 프로세스에서 실행하는 브라우저 백엔드 (취소 시 작업 프로세스를 종료)
+BROWSER_BACKENDS = ('selenium', 'playwright')
+
+HEDGE_LAUNCH_METRIC = 'bearcreek_hedge_launches_total'
+HEDGE_RESULT_METRIC = 'bearcreek_hedge_results_total'
+HEDGE_BACKEND_SECONDS_METRIC = 'bearcreek_hedge_backend_seconds'
+HEDGE_DELAY_METRIC = 'bearcreek_hedge_delay_seconds'
+
+metrics.describe(HEDGE_LAUNCH_METRIC, 'counter', '헤지 조회에서 띄운 백엔드 수 (reason=first|hedge|failover|confirm)')
+metrics.describe(HEDGE_RESULT_METRIC, 'counter', '헤지 조회 백엔드 결과 (result=won|empty|lost|failed|cancelled)')
+metrics.describe(HEDGE_BACKEND_SECONDS_METRIC, 'histogram', '백엔드 조회 소요 시간 (초, 결과를 쓰지 않은 백엔드 포함)')
+metrics.describe(HEDGE_DELAY_METRIC, 'gauge', '다음 백엔드를 띄우기 전 기다리는 시간 (초)')
+
+# HTTP 백엔드는 스레드에서 실행 (취소할 수 없으므로 진 백엔드는 끝까지 실행되고 통계만 남김)
+_executor = concurrent.futures.ThreadPoolExecutor(max_workers=4, thread_name_prefix='hedge')
+_lock = threading.Lock()
+_stats = None
+
+
+def _load_stats():
+    global _stats
+    if _stats is None:
+        try:
+            with open(HEDGE_STATS_FILE, 'r', encoding='utf-8') as f:
+                _stats = json.load(f)
+        except (OSError, ValueError):
+            _stats = {}
+    return _stats
+
+
+def _save_stats():
+    tmp_path = f"{HEDGE_STATS_FILE}.tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(_stats, f)
+        os.replace(tmp_path, HEDGE_STATS_FILE)
+    except OSError as e:
+        logger.warning(f"헤지 통계 저장 실패 (무시됨): {str(e)}")
+
+
+def record(backend, ok, seconds):
+    """백엔드 조회 한 번의 결과 기록 (성공한 조회의 지연만 백분위 계산에 사용)"""
+    metrics.observe(HEDGE_BACKEND_SECONDS_METRIC, seconds, backend=backend, result='ok' if ok else 'failed')
+    with _lock:
+        entry = _load_stats().setdefault(backend, {'latencies': [], 'outcomes': []})
+        if ok:
+            entry['latencies'] = (entry['latencies'] + [round(seconds, 3)])[-HEDGE_WINDOW:]
+        entry['outcomes'] = (entry['outcomes'] + [1 if ok else 0])[-HEDGE_WINDOW:]
+        _save_stats()
+
+
+def hedge_delay(backend):
+    """backend를 띄운 뒤 다음 백엔드를 띄우기까지 기다릴 시간
+
+    성공한 조회 지연의 p90에 최근 성공률을 곱함 (자주 실패하는 백엔드는 오래 기다리지 않음)
+    """
+    with _lock:
+        entry = _load_stats().get(backend, {})
+        latencies = list(entry.get('latencies', []))
+        outcomes = list(entry.get('outcomes', []))
+    if len(latencies) < HEDGE_MIN_SAMPLES:
+        delay = HEDGE_DEFAULT_DELAY_SECONDS
+    else:
+        delay = metrics.quantile(latencies, HEDGE_QUANTILE) * (sum(outcomes) / len(outcomes))
+    delay = max(delay, HEDGE_MIN_DELAY_SECONDS)
+    metrics.set_gauge(HEDGE_DELAY_METRIC, round(delay, 3), backend=backend)
+    return delay
+
+
+def _launch(backend, year, month):
+    """백엔드의 fetch_available_dates(year, month)를 시작하고 Future 반환"""
+    module = bearcreek.BACKENDS[backend]
+    if backend in BROWSER_BACKENDS and browser_pool.BROWSER_WORKERS > 0:
+        return browser_pool.get_pool().submit(f"{module}:fetch_available_dates", year, month)
+
+    def run():
+        import importlib
+        return importlib.import_module(module).fetch_available_dates(year, month)
+
+    return _executor.submit(run)
+
+
+def _cancel(backend, future):
+    if backend in BROWSER_BACKENDS and browser_pool.BROWSER_WORKERS > 0:
+        return browser_pool.get_pool().cancel(future)
+    return future.cancel()
+
+
+def fetch(backends=None, year=None, month=None):
+    """year/month(기본값: YEAR/MONTH) 헤지 조회 -> (결과를 쓴 백엔드, 예약 가능 날짜 목록), 모든 백엔드 실패 시 (None, None)"""
+    order = list(backends or [name.strip() for name in HEDGE_BACKENDS.split(',') if name.strip()])
+    year, month = year or YEAR, month or MONTH
+    running = {}  # Future -> (백엔드, 시작 시각)
+    empty = []  # 빈 결과를 낸 백엔드 (다른 백엔드가 확인할 때까지 보류)
+
+    def finished(backend, started):
+        def callback(future):
+            # 결과를 쓰지 않은 백엔드도 끝나면 지연/성공 통계에 반영 (취소된 경우는 제외)
+            if future.cancelled() or isinstance(future.exception(), browser_pool.BrowserTaskCancelled):
+                return
+            ok = future.exception() is None and future.result() is not None
+            record(backend, ok, time.monotonic() - started)
+        return callback
+
+    def launch(reason):
+        backend = order.pop(0)
+        logger.info(f"헤지 조회: {backend} 시작 ({reason})")
+        metrics.inc(HEDGE_LAUNCH_METRIC, backend=backend, reason=reason)
+        started = time.monotonic()
+        future = _launch(backend, year, month)
+        future.add_done_callback(finished(backend, started))
+        running[future] = (backend, started)
+        return time.monotonic() + hedge_delay(backend)
+
+    hedge_at = launch('first')
+    try:
+        while running:
+            timeout = max(hedge_at - time.monotonic(), 0) if order else None
+            done, _ = concurrent.futures.wait(running, timeout=timeout, return_when=concurrent.futures.FIRST_COMPLETED)
+            if not done:
+                hedge_at = launch('hedge')
+                continue
+            reason = None
+            for future in done:
+                backend, started = running.pop(future)
+                error = future.exception()
+                result = None if error is not None else future.result()
+                if result:
+                    logger.info(f"헤지 조회: {backend} 결과 사용 ({time.monotonic() - started:.1f}초)")
+                    metrics.inc(HEDGE_RESULT_METRIC, backend=backend, result='won')
+                    return backend, result
+                if result is not None:
+                    empty.append(backend)
+                    metrics.inc(HEDGE_RESULT_METRIC, backend=backend, result='empty')
+                    if len(empty) >= HEDGE_EMPTY_AGREEMENT:
+                        logger.info(f"헤지 조회: {', '.join(empty)} 모두 예약 가능 날짜 없음")
+                        return backend, []
+                    logger.info(f"헤지 조회: {backend} 결과 없음, 다른 백엔드로 확인합니다.")
+                    reason = reason or 'confirm'
+                else:
+                    metrics.inc(HEDGE_RESULT_METRIC, backend=backend, result='failed')
+                    logger.warning(f"헤지 조회: {backend} 실패{f' ({error})' if error else ''}")
+                    reason = 'failover'
+            if order and reason:
+                # 실패했거나 빈 결과를 낸 백엔드 대신 다음 백엔드를 바로 띄움
+                hedge_at = launch(reason)
+        if empty:
+            # 확인해 줄 백엔드가 더 없으면 빈 결과 사용
+            logger.info(f"헤지 조회: 남은 백엔드가 없어 {empty[-1]}의 빈 결과를 사용합니다.")
+            return empty[-1], []
+        logger.error("헤지 조회: 모든 백엔드가 실패했습니다.")
+        return None, None
+    finally:
+        # 남은 백엔드 취소 (브라우저 작업은 작업 프로세스째 종료)
+        for future, (backend, _) in running.items():
+            if _cancel(backend, future):
+                metrics.inc(HEDGE_RESULT_METRIC, backend=backend, result='cancelled')
+            else:
+                metrics.inc(HEDGE_RESULT_METRIC, backend=backend, result='lost')
+
+
+async def send_telegram_message(message):
+    """텔레그램 메시지 발송 함수 (공용 notifier 사용)"""
+    return await notifier.send_message(message)
+
+
+def send_telegram_notification(message):
+    """텔레그램 메시지 발송을 위한 동기 래퍼 함수 (데몬 모드에서는 데몬 루프에서 발송)"""
+    return notifier.notify(message)
+
+
+@metrics.timed_cycle('hedged')
+@profiler.profiled('hedged')
+def check_available_dates():
+    """헤지 조회로 예약 가능 날짜 확인 후 알림"""
+    import live_board
+    import freshness
+    logger.info("베어크리크 골프장 예약 확인을 시작합니다 (헤지 조회)...")
+    try:
+        with metrics.span('hedged_fetch'):
+            backend, available_dates = fetch(year=YEAR, month=MONTH)
+        if available_dates is None:
+            return False
+
+        # 알림 대기열 등록 시점 기록
+        freshness.mark_enqueued(available_dates)
+
+        # 라이브 보드 모드: 고정 메시지 하나만 갱신
+        if live_board.is_live_mode():
+            with metrics.span('telegram_send'):
+                live_board.update_live_board(
+                    f"{YEAR}-{MONTH:02d}",
+                    f"🏌️ <b>베어크리크 {YEAR}년 {MONTH}월 예약 현황</b>",
+                    available_dates,
+                    BEARCREEK_URL,
+                )
+
+        if available_dates:
+            logger.info(f"예약 가능 날짜 발견 ({backend}): {available_dates}")
+            if live_board.is_live_mode():
+                return True
+
+            # 알림 메시지 구성 (4096자 초과 시 날짜 단위로 분할)
+            messages = message_renderer.render_availability(
+                "🏌️ <b>베어크리크 예약 알림</b>",
+                available_dates,
+                BEARCREEK_URL,
+                intro=f"{YEAR}년 {MONTH}월에 다음 날짜에 예약이 가능합니다:",
+                section=None,
+            )
+
+            # 텔레그램 알림 전송
+            with metrics.span('telegram_send'):
+                for message in messages:
+                    send_telegram_notification(message)
+            return True
+        else:
+            logger.info(f"예약 가능한 날짜를 찾을 수 없습니다 ({backend}).")
+            return False
+
+    except Exception as e:
+        logger.error(f"예약 확인 중 예외 발생: {str(e)}")
+        return False
+
+
+def run_scheduler():
+    """스케줄러 실행"""
+    import heap_monitor
+    import disk_monitor
+    # 로깅 설정 (큐 기반 비동기 로깅, 파일은 JSON lines 형식, 이미 설정돼 있으면 그대로 사용)
+    log_setup.setup_logging(LOG_FILE)
+    logger.info(f"베어크리크 예약 확인 스케줄러가 시작되었습니다 (헤지 조회: {HEDGE_BACKENDS}). 확인 주기: {CHECK_INTERVAL_MINUTES}분")
+
+    # 메트릭 엔드포인트 시작 (METRICS_PORT 설정 시)
+    metrics.start_metrics_server()
+
+    # SIGUSR1 수신 시 다음 사이클 프로파일링
+    profiler.install_signal_handler()
+
+    # 힙 추적 및 RSS 상한 점검 시작 (HEAP_TRACE, MAX_RSS_MB 설정 시)
+    heap_monitor.start()
+
+    # 디스크 압박 감시 시작 (단계에 따라 디버깅 파일/보관소/로그 보관량 축소)
+    disk_monitor.start()
+
+    # 즉시 한 번 실행
+    check_available_dates()
+
+    # 스케줄 설정
+    schedule.every(CHECK_INTERVAL_MINUTES).minutes.do(check_available_dates)
+
+    # 스케줄러 무한 루프
+    try:
+        while True:
+            schedule.run_pending()
+            heap_monitor.tick()
+            time.sleep(1)
+    except KeyboardInterrupt:
+        logger.info("Ctrl+C로 프로그램이 중단되었습니다.")
+    except Exception as e:
+        logger.error(f"스케줄러 실행 중 오류 발생: {str(e)}")
+    finally:
+        browser_pool.shutdown()
+        logger.info("프로그램을 종료합니다.")
+
+
+if __name__ == "__main__":
+    log_setup.setup_logging(LOG_FILE)
+    logger.info("베어크리크 예약 확인 서비스가 시작되었습니다 (헤지 조회).")
+
+    # 커맨드라인 인자 확인 (--profile N: 처음 N회 사이클 프로파일링)
+    profiler.arm_from_argv(sys.argv)
+
+    if len(sys.argv) > 1 and sys.argv[1] == "--single":
+        logger.info("단일 실행 모드로 실행합니다.")
+        check_available_dates()
+    else:
+        run_scheduler()
@@ -0,0 +1,222 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import json
+import hashlib
+import datetime
+import logging
+import pytz
+from dotenv import load_dotenv
+import message_renderer
+import metrics
+import freshness
+import notifier
+
+# 한국 시간대 설정
+KST = pytz.timezone('Asia/Seoul')
+
+logger = logging.getLogger(__name__)
+
+# 환경 변수 로드
+load_dotenv()
+
+# 설정 정보
+TELEGRAM_CHAT_ID = os.getenv('TELEGRAM_CHAT_ID')
+
+# 알림 모드: push (매번 새 메시지) 또는 live (고정 메시지 하나를 편집)
+NOTIFY_MODE = os.getenv('NOTIFY_MODE', 'push').split('#')[0].strip().lower()
+
+# 갱신 시간 표시줄을 위해 보드 본문 길이에서 남겨둘 여유 공간
+BOARD_FOOTER_RESERVE = 48
+
+# 채팅/체커/대상별 고정 메시지 상태 저장 파일
+LIVE_BOARD_STATE_FILE = os.getenv('LIVE_BOARD_STATE_FILE', 'live_board_state.json').split('#')[0].strip()
+
+
+def is_live_mode():
+    """라이브 보드 알림 모드 사용 여부"""
+    return NOTIFY_MODE == 'live'
+
+
+def load_board_state():
+    """저장된 라이브 보드 상태 로드"""
+    try:
+        if os.path.exists(LIVE_BOARD_STATE_FILE):
+            with open(LIVE_BOARD_STATE_FILE, 'r', encoding='utf-8') as f:
+                return json.load(f)
+    except Exception as e:
+        logger.error(f"라이브 보드 상태 로드 중 오류: {str(e)}")
+    return {}
+
+
+def save_board_state(state):
+    """라이브 보드 상태 저장 (임시 파일에 쓴 뒤 교체)"""
+    try:
+        tmp_path = f"{LIVE_BOARD_STATE_FILE}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False)
+        os.replace(tmp_path, LIVE_BOARD_STATE_FILE)
+    except Exception as e:
+        logger.error(f"라이브 보드 상태 저장 중 오류: {str(e)}")
+
+
+def normalize_slots(slots):
+    """날짜 목록 또는 {날짜: [시간, ...]} 형태를 정렬된 딕셔너리로 변환"""
+    if slots is None:
+        return None
+    if isinstance(slots, dict):
+        return {date: sorted(set(times or [])) for date, times in sorted(slots.items())}
+    return {date: [] for date in sorted(set(slots))}
+
+
+def find_new_slots(previous, current):
+    """이전 상태에 없던 날짜/시간만 추출"""
+    previous = previous or {}
+    new_slots = {}
+    for date, times in (current or {}).items():
+        if date not in previous:
+            new_slots[date] = list(times)
+            continue
+        added = [t for t in times if t not in previous[date]]
+        if added:
+            new_slots[date] = added
+    return new_slots
+
+
+def render_board(title, slots, url, note=None):
+    """보드 본문 생성 (갱신 시각 제외, 해시 대상)"""
+    return message_renderer.render_single(
+        title,
+        slots,
+        url,
+        intro=note,
+        empty_text=None if slots is None else "현재 예약 가능한 날짜가 없습니다.",
+        limit=message_renderer.TELEGRAM_MESSAGE_LIMIT - BOARD_FOOTER_RESERVE,
+    )
+
+
+def board_hash(body):
+    """보드 본문 해시"""
+    return hashlib.sha256(body.encode('utf-8')).hexdigest()
+
+
+def render_new_slots_messages(title, new_slots, url):
+    """새로 열린 슬롯 푸시 메시지 목록 생성"""
+    return message_renderer.render_availability(f"🆕 {title}", new_slots, url, section="새로 열린 예약:")
+
+
+def board_key(chat_id, target, checker=None):
+    """보드 상태 키 (채팅:체커:대상) - 체커마다 보여 주는 내용(날짜만/날짜별 시간)이 달라 보드를 따로 둠"""
+    return f"{chat_id}:{checker or metrics.current_checker()}:{target}"
+
+
+async def _send_and_pin(bot, chat_id, text, deliveries):
+    """새 보드 메시지 발송 후 고정"""
+    from telegram.error import TelegramError
+
+    response = await bot.send_message(chat_id=chat_id, text=text, parse_mode='HTML')
+    deliveries.append((response.message_id, text))
+    try:
+        await bot.pin_chat_message(chat_id=chat_id, message_id=response.message_id, disable_notification=True)
+    except TelegramError as e:
+        logger.warning(f"라이브 보드 메시지 고정 실패 (무시됨): {str(e)}")
+    return response.message_id
+
+
+async def _publish(bot, chat_id, key, target, title, slots, url, note):
+    """보드 편집/발송 (공용 봇으로 실행) -> 전달된 [(message_id, 본문)], 실패 시 None"""
+    from telegram.error import TelegramError, BadRequest
+
+    state = load_board_state()
+    entry = state.get(key)
+    if entry is None:
+        # 체커 이름 없이 저장된 이전 형식의 보드는 메시지만 이어 씀 (슬롯 비교 기준은 새로 시작)
+        legacy = state.get(f"{chat_id}:{target}")
+        entry = {'message_id': legacy['message_id']} if legacy else {}
+
+    slots = normalize_slots(slots)
+    body = render_board(title, slots, url, note)
+    digest = board_hash(body)
+    now = datetime.datetime.now(KST).strftime('%Y-%m-%d %H:%M:%S')
+    text = f"{body}🕒 갱신 시간: {now}"
+    deliveries = []
+
+    try:
+        message_id = entry.get('message_id')
+
+        if message_id and entry.get('hash') == digest:
+            logger.info(f"라이브 보드 내용 변경 없음, 편집 생략: {key}")
+        elif message_id:
+            try:
+                await bot.edit_message_text(chat_id=chat_id, message_id=message_id, text=text, parse_mode='HTML')
+                deliveries.append((message_id, text))
+                logger.info(f"라이브 보드 메시지 편집 완료: {key} (메시지 ID: {message_id})")
+            except BadRequest as e:
+                if "not modified" in str(e).lower():
+                    logger.info(f"라이브 보드 내용이 이미 최신입니다: {key}")
+                else:
+                    # 메시지가 삭제되었거나 편집할 수 없는 경우 새로 발송
+                    logger.warning(f"라이브 보드 편집 실패, 새 메시지로 대체: {str(e)}")
+                    message_id = await _send_and_pin(bot, chat_id, text, deliveries)
+        else:
+            message_id = await _send_and_pin(bot, chat_id, text, deliveries)
+            logger.info(f"라이브 보드 메시지 생성 및 고정: {key} (메시지 ID: {message_id})")
+
+        # 새로 열린 슬롯만 별도 푸시 (보드 최초 생성 시에는 보드 자체가 알림 역할)
+        if slots is not None and 'slots' in entry:
+            new_slots = find_new_slots(entry.get('slots'), slots)
+            if new_slots:
+                for message in render_new_slots_messages(title, new_slots, url):
+                    response = await bot.send_message(chat_id=chat_id, text=message, parse_mode='HTML')
+                    deliveries.append((response.message_id, message))
+                logger.info(f"새로 열린 슬롯 알림 발송: {len(new_slots)}개 날짜")
+
+        entry = {'message_id': message_id, 'hash': digest}
+        if slots is not None:
+            entry['slots'] = slots
+        # 데몬 루프에서 다른 보드 갱신과 번갈아 실행되므로 저장 직전에 다시 읽어 이 키만 바꿈
+        state = load_board_state()
+        state.pop(f"{chat_id}:{target}", None)
+        state[key] = entry
+        save_board_state(state)
+        return deliveries
+    except TelegramError as e:
+        logger.error(f"라이브 보드 갱신 중 오류가 발생했습니다: {str(e)}")
+        return None
+    except Exception as e:
+        logger.error(f"라이브 보드 갱신 중 예상치 못한 오류가 발생했습니다: {str(e)}")
+        return None
+
+
+def _mark_delivered(deliveries):
+    """전달 기록은 사이클 상태가 있는 호출한 스레드에서 남김 -> 성공 여부"""
+    if deliveries is None:
+        return False
+    for message_id, text in deliveries:
+        freshness.mark_delivered(message_id, text)
+    return True
+
+
+async def publish_board(target, title, slots, url, note=None, checker=None):
+    """라이브 보드 갱신: 내용이 바뀐 경우에만 편집하고 새 슬롯만 별도 푸시
+
+    checker(기본값: 현재 사이클의 체커)마다 보드를 따로 두고, 발송은 공용 notifier 봇으로 한다
+    (데몬 모드에서는 데몬 루프의 봇 하나).
+    """
+    if not notifier.ready():
+        return False
+    chat_id = notifier.normalize_chat_id(TELEGRAM_CHAT_ID)
+    key = board_key(chat_id, target, checker)
+    deliveries = await notifier.run(lambda bot: _publish(bot, chat_id, key, target, title, slots, url, note))
+    return _mark_delivered(deliveries)
+
+
+def update_live_board(target, title, slots, url, note=None, checker=None):
+    """라이브 보드 갱신을 위한 동기 래퍼 함수"""
+    if not notifier.ready():
+        return False
+    chat_id = notifier.normalize_chat_id(TELEGRAM_CHAT_ID)
+    key = board_key(chat_id, target, checker)
+    deliveries = notifier.run_sync(lambda bot: _publish(bot, chat_id, key, target, title, slots, url, note))
+    return _mark_delivered(deliveries)
@@ -0,0 +1,280 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import re
+import glob
+import gzip
+import json
+import time
+import logging
+import threading
+from dotenv import load_dotenv
+import disk_monitor
+
+logger = logging.getLogger(__name__)
+
+# 환경 변수 로드
+load_dotenv()
+
+
+def _env_float(name, default):
+    """주석이 포함될 수 있는 실수 환경변수 로드"""
+    value = os.getenv(name, str(default)).split('#')[0].strip()
+    try:
+        return float(value)
+    except ValueError:
+        return default
+
+
+# 이 크기(MB)를 넘거나 마지막 로테이션 후 이 시간이 지나면 로테이션
+LOG_ROTATE_MAX_MB = _env_float('LOG_ROTATE_MAX_MB', 5)
+LOG_ROTATE_INTERVAL_HOURS = _env_float('LOG_ROTATE_INTERVAL_HOURS', 24)
+
+# 로그 파일당 보관할 압축 세대 수
+LOG_ROTATE_KEEP = int(_env_float('LOG_ROTATE_KEEP', 5))
+
+# 압축 방식: gzip, zstd (zstandard 패키지가 없으면 gzip)
+LOG_ROTATE_COMPRESSION = os.getenv('LOG_ROTATE_COMPRESSION', 'gzip').split('#')[0].strip().lower()
+
+# 이름을 바꾼 뒤 기존 파일을 열고 있던 프로세스가 놓기를 기다리는 시간 (초)
+LOG_ROTATE_GRACE_SECONDS = _env_float('LOG_ROTATE_GRACE_SECONDS', 2)
+
+# 스트리밍 압축 단위 (바이트)
+CHUNK_SIZE = 1024 * 1024
+
+# log_setup으로 기록되는 로그 파일 (WatchedFileHandler라 이름이 바뀌면 다음 기록 때 새 파일을 엶)
+DEFAULT_LOG_FILES = (
+    'bearcreek_checker.log', 'playwright_checker.log', 'effective_checker.log', 'ultimate_checker.log',
+    'simple_alert.log', 'cleanup.log', 'cleaner.log', 'bearcreek.log', 'bearcreek_daemon.log',
+    'browser_supervisor.log', 'hedged_fetch.log', 'fixture_server.log',
+)
+
+# 로테이션된 세그먼트 이름: <로그 파일>.<YYYYmmdd_HHMMSS>[.gz|.zst]
+SEGMENT_PATTERN = re.compile(r'\.(\d{8}_\d{6})(?:\.(gz|zst))?$')
+
+STATE_FILE = '.log_rotation.json'
+LOCK_FILE = '.log_rotation.lock'
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+if LOG_ROTATE_COMPRESSION == 'zstd' and zstandard is None:
+    LOG_ROTATE_COMPRESSION = 'gzip'
+
+_thread_lock = threading.Lock()
+
+
+def _segments(path):
+    """로그 파일의 로테이션 세그먼트 목록 (오래된 순)"""
+    result = []
+    for candidate in glob.glob(glob.escape(path) + '.*'):
+        match = SEGMENT_PATTERN.search(candidate[len(path):])
+        if match and candidate[len(path):] == match.group(0):
+            result.append((match.group(1), candidate))
+    return [candidate for _, candidate in sorted(result)]
+
+
+def _load_state(directory):
+    try:
+        with open(os.path.join(directory, STATE_FILE), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_state(directory, state):
+    path = os.path.join(directory, STATE_FILE)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f)
+    os.replace(tmp_path, path)
+
+
+def retention():
+    """보관할 압축 세대 수 (디스크 압박 warning이면 최대 2개, critical이면 1개)"""
+    pressure = disk_monitor.level()
+    if pressure >= disk_monitor.CRITICAL:
+        return min(LOG_ROTATE_KEEP, 1)
+    if pressure >= disk_monitor.WARNING:
+        return min(LOG_ROTATE_KEEP, 2)
+    return LOG_ROTATE_KEEP
+
+
+def should_rotate(path, last_rotated, now=None, force=False):
+    """크기 또는 시간 기준으로 로테이션이 필요한지 확인 (force=True면 비어 있지 않은 파일은 모두)"""
+    try:
+        size = os.path.getsize(path)
+    except OSError:
+        return False
+    if size == 0:
+        return False
+    if force:
+        return True
+    if LOG_ROTATE_MAX_MB and size >= LOG_ROTATE_MAX_MB * 1024 * 1024:
+        return True
+    now = now or time.time()
+    return bool(LOG_ROTATE_INTERVAL_HOURS) and last_rotated is not None and now - last_rotated >= LOG_ROTATE_INTERVAL_HOURS * 3600
+
+
+def rotate(path):
+    """이름 바꾸기로 원자적 로테이션 (기록 중인 프로세스는 기존 파일에 계속 쓰다가 다음 기록 때 새 파일을 엶)"""
+    segment = f"{path}.{time.strftime('%Y%m%d_%H%M%S')}"
+    if os.path.exists(segment):
+        return None
+    os.rename(path, segment)
+    logger.info(f"로그 로테이션: {path} -> {segment}")
+    return segment
+
+
+def open_holders(path):
+    """해당 파일을 열고 있는 프로세스 PID 목록 (/proc이 없으면 빈 목록)"""
+    target = os.path.abspath(path)
+    holders = []
+    try:
+        pids = [name for name in os.listdir('/proc') if name.isdigit()]
+    except OSError:
+        return holders
+    for pid in pids:
+        fd_dir = f"/proc/{pid}/fd"
+        try:
+            fds = os.listdir(fd_dir)
+        except OSError:
+            continue
+        for fd in fds:
+            try:
+                if os.readlink(os.path.join(fd_dir, fd)) == target:
+                    holders.append(int(pid))
+                    break
+            except OSError:
+                continue
+    return holders
+
+
+def compress_segment(segment):
+    """세그먼트를 일정한 크기 단위로 스트리밍 압축 후 원본 삭제 (메모리 사용량은 로그 크기와 무관)"""
+    suffix = '.zst' if LOG_ROTATE_COMPRESSION == 'zstd' else '.gz'
+    final_path = segment + suffix
+    tmp_path = f"{final_path}.tmp"
+    stat = os.stat(segment)
+    with open(segment, 'rb') as src:
+        if suffix == '.zst':
+            with open(tmp_path, 'wb') as raw, zstandard.ZstdCompressor(level=10).stream_writer(raw) as dst:
+                for chunk in iter(lambda: src.read(CHUNK_SIZE), b''):
+                    dst.write(chunk)
+        else:
+            with gzip.open(tmp_path, 'wb', compresslevel=6) as dst:
+                for chunk in iter(lambda: src.read(CHUNK_SIZE), b''):
+                    dst.write(chunk)
+    os.utime(tmp_path, (stat.st_atime, stat.st_mtime))
+    os.replace(tmp_path, final_path)
+    os.remove(segment)
+    logger.info(f"로그 세그먼트 압축 완료: {final_path} ({stat.st_size / 1024:.0f}KB -> {os.path.getsize(final_path) / 1024:.0f}KB)")
+    return final_path
+
+
+def prune(path, keep=None):
+    """압축된 세그먼트를 최근 keep개만 남기고 삭제"""
+    keep = retention() if keep is None else keep
+    compressed = [segment for segment in _segments(path) if segment.endswith(('.gz', '.zst'))]
+    for segment in compressed[:-keep] if keep > 0 else compressed:
+        os.remove(segment)
+        logger.info(f"오래된 로그 세그먼트 삭제: {segment}")
+
+
+def _compress_pending(paths):
+    """압축되지 않은 세그먼트를 압축 (아직 열고 있는 프로세스가 있으면 다음 실행으로 미룸)"""
+    if LOG_ROTATE_GRACE_SECONDS:
+        time.sleep(LOG_ROTATE_GRACE_SECONDS)
+    for path in paths:
+        for segment in _segments(path):
+            if segment.endswith(('.gz', '.zst')):
+                continue
+            holders = open_holders(segment)
+            if holders:
+                logger.warning(
+                    f"로그 세그먼트를 아직 프로세스 {holders}가 열고 있어 압축을 미룹니다: {segment} "
+                    "(nohup 출력 리다이렉션처럼 파일을 다시 열지 않는 기록자는 로그를 log_setup 파일로 남기세요)"
+                )
+                continue
+            try:
+                compress_segment(segment)
+            except Exception as e:
+                logger.error(f"로그 세그먼트 압축 중 오류: {segment} - {str(e)}")
+        try:
+            prune(path)
+        except Exception as e:
+            logger.error(f"로그 세그먼트 정리 중 오류: {path} - {str(e)}")
+
+
+def _acquire_lock(directory):
+    """같은 디렉토리의 로테이션을 한 프로세스만 수행하도록 파일 잠금 (잠금 실패 시 None)"""
+    try:
+        import fcntl
+    except ImportError:
+        return open(os.path.join(directory, LOCK_FILE), 'a')
+    handle = open(os.path.join(directory, LOCK_FILE), 'a')
+    try:
+        fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        handle.close()
+        return None
+    return handle
+
+
+def rotate_logs(log_files=DEFAULT_LOG_FILES, directory='.', wait=False, force=False):
+    """로그 파일 로테이션 후 압축/세대 정리를 백그라운드 스레드에서 수행
+
+    wait=True이면 압축이 끝날 때까지 기다린다 (한 번 실행하고 끝나는 스크립트용).
+    force=True이면 크기/시간과 관계없이 로테이션한다.
+    """
+    if not _thread_lock.acquire(blocking=False):
+        logger.info("이전 로그 로테이션이 아직 진행 중이라 건너뜁니다.")
+        return None
+    lock = _acquire_lock(directory)
+    if lock is None:
+        _thread_lock.release()
+        logger.info("다른 프로세스가 로그 로테이션 중이라 건너뜁니다.")
+        return None
+
+    paths = [os.path.join(directory, name) for name in log_files]
+    try:
+        state = _load_state(directory)
+        now = time.time()
+        for path in paths:
+            key = os.path.abspath(path)
+            if key not in state:
+                state[key] = now
+            if should_rotate(path, state[key], now, force):
+                try:
+                    if rotate(path):
+                        state[key] = now
+                except OSError as e:
+                    logger.error(f"로그 로테이션 중 오류: {path} - {str(e)}")
+        _save_state(directory, state)
+    except Exception:
+        lock.close()
+        _thread_lock.release()
+        raise
+
+    def run():
+        try:
+            _compress_pending(paths)
+        finally:
+            lock.close()
+            _thread_lock.release()
+
+    thread = threading.Thread(target=run, name='log-rotation', daemon=not wait)
+    thread.start()
+    if wait:
+        thread.join()
+    return thread
+
+
+@disk_monitor.subscribe
+def _on_disk_pressure(level, previous, disk):
+    """디스크 압박 시 줄어든 세대 수로 정리 (critical이면 현재 로그도 바로 로테이션해 압축)"""
+    if level >= disk_monitor.WARNING:
+        rotate_logs(force=level >= disk_monitor.CRITICAL)
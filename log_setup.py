@@ -0,0 +1,172 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import json
+import time
+import queue
+import atexit
+import logging
+import logging.handlers
+import threading
+
+# 한국 표준시 오프셋 (일광절약시간 없음)
+KST_OFFSET_SECONDS = 9 * 3600
+
+# 콘솔 출력 형식
+TEXT_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+
+def _env_int(name, default):
+    """주석이 포함될 수 있는 정수 환경변수 로드"""
+    value = os.getenv(name, str(default)).split('#')[0].strip()
+    try:
+        return int(value)
+    except ValueError:
+        return default
+
+
+# 로그 레벨 (기본값: INFO)
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').split('#')[0].strip().upper()
+
+# 같은 위치(파일:줄)에서 나오는 INFO 이하 로그를 창(window)마다 최대 몇 개까지 남길지
+LOG_SAMPLE_LIMIT = _env_int('LOG_SAMPLE_LIMIT', 20)
+LOG_SAMPLE_WINDOW_SECONDS = _env_int('LOG_SAMPLE_WINDOW_SECONDS', 60)
+
+_listener = None
+_log_file = None
+_lock = threading.Lock()
+
+
+class KSTFormatter(logging.Formatter):
+    """한국 시간 포맷터 - 같은 초의 레코드는 캐시된 문자열 재사용"""
+
+    def __init__(self, fmt=None, datefmt=None):
+        super().__init__(fmt, datefmt)
+        self._cached_second = None
+        self._cached_text = None
+
+    def formatTime(self, record, datefmt=None):
+        second = int(record.created)
+        if second != self._cached_second:
+            self._cached_text = time.strftime(datefmt or "%Y-%m-%d %H:%M:%S", time.gmtime(second + KST_OFFSET_SECONDS))
+            self._cached_second = second
+        return self._cached_text
+
+
+class JSONLinesFormatter(KSTFormatter):
+    """한 줄에 하나의 JSON 객체로 출력하는 포맷터"""
+
+    def format(self, record):
+        payload = {
+            'time': self.formatTime(record),
+            'ts': round(record.created, 3),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        if record.exc_info:
+            payload['exc'] = self.formatException(record.exc_info)
+        suppressed = getattr(record, 'suppressed', None)
+        if suppressed:
+            payload['suppressed'] = suppressed
+        return json.dumps(payload, ensure_ascii=False)
+
+
+class SamplingFilter(logging.Filter):
+    """반복되는 INFO 이하 로그를 호출 위치별로 샘플링 (WARNING 이상은 항상 통과)"""
+
+    def __init__(self, limit=LOG_SAMPLE_LIMIT, window=LOG_SAMPLE_WINDOW_SECONDS):
+        super().__init__()
+        self.limit = limit
+        self.window = window
+        self._sites = {}
+        # 필터는 로그를 남기는 스레드마다 호출되므로 호출 위치별 카운터 갱신을 잠금으로 보호
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING or self.limit <= 0:
+            return True
+        site = (record.pathname, record.lineno)
+        now = record.created
+        with self._lock:
+            state = self._sites.get(site)
+            if state is not None and now - state[0] < self.window:
+                state[1] += 1
+                if state[1] <= self.limit:
+                    return True
+                state[2] += 1
+                return False
+            suppressed = state[2] if state else 0
+            self._sites[site] = [now, 1, 0]
+        if suppressed:
+            # 이전 창에서 생략된 개수를 다음 통과 레코드에 붙여 알림
+            record.suppressed = suppressed
+            record.msg = f"{record.msg} (같은 위치 로그 {suppressed}개 생략됨)"
+        return True
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """메시지 포맷팅을 리스너 스레드로 미루는 QueueHandler"""
+
+    def prepare(self, record):
+        # 기본 구현은 호출 스레드에서 format()을 수행하므로 레코드를 그대로 전달
+        return record
+
+
+def _log_uncaught(exc_type, exc, tb):
+    """처리되지 않은 예외도 로그 파일에 남김 (nohup 출력을 버려도 추적 가능)"""
+    if issubclass(exc_type, KeyboardInterrupt):
+        sys.__excepthook__(exc_type, exc, tb)
+        return
+    logging.getLogger().critical("처리되지 않은 예외로 종료합니다.", exc_info=(exc_type, exc, tb))
+
+
+def setup_logging(log_file=None, level=None):
+    """큐 기반 비동기 로깅 설정 (프로세스당 한 번만 적용)"""
+    global _listener, _log_file
+    with _lock:
+        root = logging.getLogger()
+        if _listener is not None:
+            return root
+
+        handlers = []
+        console = logging.StreamHandler()
+        console.setFormatter(KSTFormatter(TEXT_FORMAT))
+        handlers.append(console)
+        if log_file:
+            # 외부에서 이름을 바꿔 로테이션해도 새 파일을 다시 여는 핸들러
+            file_handler = logging.handlers.WatchedFileHandler(log_file, encoding='utf-8')
+            file_handler.setFormatter(JSONLinesFormatter())
+            handlers.append(file_handler)
+
+        log_queue = queue.SimpleQueue()
+        queue_handler = DeferredQueueHandler(log_queue)
+        queue_handler.addFilter(SamplingFilter())
+
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        root.addHandler(queue_handler)
+        root.setLevel(level or getattr(logging, LOG_LEVEL, logging.INFO))
+
+        _log_file = log_file
+        _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _listener.start()
+        atexit.register(shutdown_logging)
+        sys.excepthook = _log_uncaught
+        return root
+
+
+def current_log_file():
+    """setup_logging()에서 설정한 로그 파일 (하위 프로세스가 같은 파일에 기록하도록 전달할 때 사용)"""
+    return _log_file
+
+
+def shutdown_logging():
+    """리스너를 멈추고 남은 로그를 모두 기록"""
+    global _listener
+    with _lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
@@ -0,0 +1,170 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import html
+
+# 텔레그램 메시지 최대 길이
+TELEGRAM_MESSAGE_LIMIT = 4096
+
+# 분할 메시지 번호 표시 등을 위한 여유 공간
+CHUNK_RESERVE = 16
+
+# 전체 시간 슬롯 수가 이 값을 넘으면 압축 형식으로 렌더링
+try:
+    COMPACT_SLOT_THRESHOLD = int(os.getenv('MESSAGE_COMPACT_THRESHOLD', 40))
+except ValueError:
+    COMPACT_SLOT_THRESHOLD = int(os.getenv('MESSAGE_COMPACT_THRESHOLD', '40').split('#')[0].strip())
+
+# 미리 컴파일된 메시지 템플릿 (바인딩된 format 메서드)
+DATE_LINE = "• <b>{date}</b>\n".format
+TIME_HEADER = "  <u>이용 가능 시간:</u>\n"
+TIME_LINE = "  - {slot}\n".format
+COMPACT_DATE_LINE = "• <b>{date}</b> ({count}): {slots}\n".format
+SECTION_TITLE = "<b>{title}</b>\n".format
+FOOTER = "\n예약 페이지: {url}\n".format
+FOOTER_TIME = "알림 시간: {time}\n".format
+CHUNK_MARKER = "\n({index}/{total})".format
+TRUNCATED_LINE = "… 외 {count}개 날짜\n".format
+
+
+def escape(text):
+    """텔레그램 HTML 파싱용 이스케이프"""
+    return html.escape(str(text), quote=False)
+
+
+def normalize_slots(slots):
+    """날짜 목록 또는 {날짜: [시간, ...]} 형태를 (날짜, 시간 목록) 리스트로 변환"""
+    if not slots:
+        return []
+    if isinstance(slots, dict):
+        return [(date, list(times or [])) for date, times in slots.items()]
+    return [(date, []) for date in slots]
+
+
+def count_slots(slots):
+    """전체 시간 슬롯 수 (시간 정보가 없는 날짜는 1개로 계산)"""
+    return sum(max(len(times), 1) for _, times in normalize_slots(slots))
+
+
+def render_date_block(date, times):
+    """날짜 하나에 대한 상세 블록"""
+    parts = [DATE_LINE(date=escape(date))]
+    if times:
+        parts.append(TIME_HEADER)
+        parts.extend(TIME_LINE(slot=escape(slot)) for slot in times)
+    return "".join(parts)
+
+
+def render_compact_block(date, times):
+    """날짜 하나에 대한 압축 블록 (시간을 한 줄로 나열)"""
+    if not times:
+        return DATE_LINE(date=escape(date))
+    return COMPACT_DATE_LINE(date=escape(date), count=len(times), slots=", ".join(escape(slot) for slot in times))
+
+
+def render_blocks(slots, compact=None):
+    """날짜별 블록 목록 생성"""
+    items = normalize_slots(slots)
+    if compact is None:
+        compact = count_slots(items) > COMPACT_SLOT_THRESHOLD
+    renderer = render_compact_block if compact else render_date_block
+    return [renderer(date, times) for date, times in items]
+
+
+def render_header(title, intro=None, section="예약 가능 날짜:"):
+    """메시지 머리말 생성 (title/intro는 HTML이 포함된 신뢰된 문자열)"""
+    parts = [title, "\n\n"]
+    if intro:
+        parts.append(intro)
+        parts.append("\n\n")
+    if section:
+        parts.append(SECTION_TITLE(title=section))
+    return "".join(parts)
+
+
+def render_footer(url, notify_time=None):
+    """메시지 꼬리말 생성"""
+    footer = FOOTER(url=url)
+    if notify_time:
+        footer += FOOTER_TIME(time=notify_time)
+    return footer
+
+
+def _split_oversized(block, limit):
+    """한도를 넘는 블록을 줄 단위로 분할 (한 줄이 한도를 넘으면 잘라냄)"""
+    pieces = []
+    current = []
+    size = 0
+    for line in block.splitlines(keepends=True):
+        if len(line) > limit:
+            line = line[:limit - 2] + "…\n"
+        if size + len(line) > limit and current:
+            pieces.append("".join(current))
+            current = []
+            size = 0
+        current.append(line)
+        size += len(line)
+    if current:
+        pieces.append("".join(current))
+    return pieces
+
+
+def split_blocks(header, blocks, footer, limit=TELEGRAM_MESSAGE_LIMIT):
+    """날짜 블록 경계에서 메시지를 나눠 한도 이하의 메시지 목록 생성"""
+    budget = limit - CHUNK_RESERVE
+    chunks = []
+    current = [header]
+    size = len(header)
+
+    for block in blocks:
+        pieces = [block] if len(block) <= budget else _split_oversized(block, budget)
+        for piece in pieces:
+            if size + len(piece) > budget and size:
+                chunks.append("".join(current))
+                current = []
+                size = 0
+            current.append(piece)
+            size += len(piece)
+
+    if size + len(footer) > budget and size:
+        chunks.append("".join(current))
+        current = []
+    current.append(footer)
+    chunks.append("".join(current))
+
+    total = len(chunks)
+    if total == 1:
+        return chunks
+    return [chunk.rstrip("\n") + CHUNK_MARKER(index=index, total=total) for index, chunk in enumerate(chunks, 1)]
+
+
+def render_availability(title, slots, url, intro=None, notify_time=None, compact=None, section="예약 가능 날짜:", limit=TELEGRAM_MESSAGE_LIMIT):
+    """예약 가능 알림 메시지를 한도 이하의 메시지 목록으로 렌더링"""
+    header = render_header(title, intro, section)
+    footer = render_footer(url, notify_time)
+    return split_blocks(header, render_blocks(slots, compact), footer, limit)
+
+
+def render_single(title, slots, url, intro=None, section="예약 가능 날짜:", empty_text=None, limit=TELEGRAM_MESSAGE_LIMIT):
+    """편집용 단일 메시지 렌더링 (넘치면 압축 형식 후 뒤쪽 날짜를 생략)"""
+    header = render_header(title, intro, section if slots else None)
+    footer = render_footer(url)
+    if not slots:
+        body = f"{empty_text}\n" if empty_text else ""
+        return f"{header}{body}{footer}"
+
+    blocks = render_blocks(slots)
+    if len(header) + sum(map(len, blocks)) + len(footer) > limit:
+        blocks = render_blocks(slots, compact=True)
+
+    budget = limit - len(header) - len(footer) - CHUNK_RESERVE
+    parts = []
+    size = 0
+    for index, block in enumerate(blocks):
+        if size + len(block) > budget:
+            parts.append(TRUNCATED_LINE(count=len(blocks) - index))
+            break
+        parts.append(block)
+        size += len(block)
+    return f"{header}{''.join(parts)}{footer}"
@@ -0,0 +1,414 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import json
+import math
+import time
+import bisect
+import logging
+import threading
+import functools
+from collections import deque
+from contextlib import contextmanager
+from dotenv import load_dotenv
+
+logger = logging.getLogger(__name__)
+
+# 환경 변수 로드
+load_dotenv()
+
+
+def _env_int(name, default):
+    """주석이 포함될 수 있는 정수 환경변수 로드"""
+    value = os.getenv(name, str(default)).split('#')[0].strip()
+    try:
+        return int(value)
+    except ValueError:
+        return default
+
+
+# Prometheus 엔드포인트 포트 (0이면 비활성화, 항상 localhost에만 바인딩)
+METRICS_PORT = _env_int('METRICS_PORT', 0)
+
+# 최근 사이클 요약을 기록하는 JSON 파일
+METRICS_SUMMARY_FILE = os.getenv('METRICS_SUMMARY_FILE', 'metrics_summary.json').split('#')[0].strip()
+
+# 요약 파일에 유지할 최근 사이클 수
+METRICS_SUMMARY_CYCLES = _env_int('METRICS_SUMMARY_CYCLES', 50)
+
+# 백분위 계산용으로 보관하는 최근 관측값 수
+RESERVOIR_SIZE = 512
+
+# 히스토그램 버킷 경계 (초)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300)
+
+# 단계별 소요 시간 히스토그램 이름
+PHASE_METRIC = 'bearcreek_phase_seconds'
+
+_lock = threading.Lock()
+_histograms = {}
+_counters = {}
+_gauges = {}
+_descriptions = {
+    PHASE_METRIC: ('histogram', '체크 단계별 소요 시간 (초)'),
+}
+# 히스토그램 이름 -> (백분위 게이지 이름, 백분위 목록): 히스토그램에서 계산하는 게이지
+_quantile_gauges = {}
+_recent_cycles = deque(maxlen=METRICS_SUMMARY_CYCLES)
+_local = threading.local()
+_server = None
+
+
+class Histogram:
+    """고정 버킷 히스토그램 + 백분위 계산용 최근 관측값"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.recent = deque(maxlen=RESERVOIR_SIZE)
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+        self.recent.append(value)
+
+    def merge(self, other):
+        """다른 프로세스에서 기록한 같은 버킷의 히스토그램 합치기"""
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+        self.recent.extend(other.recent)
+
+    def quantile(self, q):
+        return quantile(self.recent, q)
+
+    def summary(self):
+        return {
+            'count': self.count,
+            'sum': round(self.total, 6),
+            'avg': round(self.total / self.count, 6) if self.count else 0.0,
+            'p50': self.quantile(0.5),
+            'p95': self.quantile(0.95),
+            'p99': self.quantile(0.99),
+            'max': round(self.max, 6),
+        }
+
+
+def quantile(values, q):
+    """최근 관측값의 백분위 (nearest-rank)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))
+    return round(ordered[index], 6)
+
+
+def _key(name, labels):
+    return (name, tuple(sorted(labels.items())))
+
+
+def describe(name, metric_type, help_text):
+    """메트릭 유형과 설명 등록 (Prometheus HELP/TYPE 출력용)"""
+    _descriptions[name] = (metric_type, help_text)
+
+
+def describe_quantiles(gauge, histogram, quantiles):
+    """histogram의 라벨별 백분위를 gauge(같은 라벨 + quantile)로 내보내도록 등록
+
+    작업 프로세스의 히스토그램은 작업마다 비워지므로, 게이지는 옮기지 않고 합친 히스토그램에서 다시 계산한다.
+    """
+    _quantile_gauges[histogram] = (gauge, tuple(quantiles))
+
+
+def _update_quantile_gauges(keys):
+    """keys(히스토그램 키) 중 백분위 게이지가 등록된 것의 게이지 갱신 (_lock 안에서 호출)"""
+    for key in keys:
+        name, labels = key
+        derived = _quantile_gauges.get(name)
+        histogram = _histograms.get(key)
+        if derived is None or histogram is None:
+            continue
+        gauge, quantiles = derived
+        for q in quantiles:
+            value = histogram.quantile(q)
+            if value is not None:
+                _gauges[(gauge, tuple(sorted(labels + (('quantile', q),))))] = value
+
+
+def publish_quantiles(name, **labels):
+    """히스토그램 하나의 백분위 게이지 갱신 (describe_quantiles로 등록한 경우)"""
+    with _lock:
+        _update_quantile_gauges([_key(name, labels)])
+
+
+def observe(name, value, buckets=DEFAULT_BUCKETS, **labels):
+    """히스토그램에 관측값 기록"""
+    key = _key(name, labels)
+    with _lock:
+        histogram = _histograms.get(key)
+        if histogram is None:
+            histogram = _histograms[key] = Histogram(buckets)
+        histogram.observe(value)
+
+
+def inc(name, amount=1, **labels):
+    """카운터 증가"""
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + amount
+
+
+def set_gauge(name, value, **labels):
+    """게이지 값 설정"""
+    with _lock:
+        _gauges[_key(name, labels)] = value
+
+
+def get_histogram(name, **labels):
+    """히스토그램 조회 (없으면 None)"""
+    with _lock:
+        return _histograms.get(_key(name, labels))
+
+
+def export_state():
+    """이 프로세스에서 기록한 메트릭을 꺼내고 비움 (작업 프로세스 -> 부모 프로세스 전달용)"""
+    global _histograms, _counters
+    with _lock:
+        derived = {gauge for gauge, _ in _quantile_gauges.values()}
+        state = {
+            'descriptions': dict(_descriptions),
+            'histograms': _histograms,
+            'counters': _counters,
+            # 백분위 게이지는 이번 작업의 히스토그램만 반영하므로 빼고, 부모가 합친 히스토그램에서 다시 계산
+            'gauges': {key: value for key, value in _gauges.items() if key[0] not in derived},
+            'quantile_gauges': dict(_quantile_gauges),
+            'cycles': list(_recent_cycles),
+        }
+        _histograms, _counters = {}, {}
+        _recent_cycles.clear()
+    return state
+
+
+def merge_state(state):
+    """export_state()로 받은 메트릭을 이 프로세스의 메트릭에 합치고 요약 파일 갱신"""
+    with _lock:
+        for name, description in state['descriptions'].items():
+            _descriptions.setdefault(name, description)
+        for key, other in state['histograms'].items():
+            histogram = _histograms.get(key)
+            if histogram is None:
+                _histograms[key] = other
+            elif histogram.buckets == other.buckets:
+                histogram.merge(other)
+        for key, value in state['counters'].items():
+            _counters[key] = _counters.get(key, 0) + value
+        _gauges.update(state['gauges'])
+        # 부모가 해당 모듈을 import하지 않았어도 백분위 게이지를 계산할 수 있도록 등록 정보도 합침
+        for name, derived in state.get('quantile_gauges', {}).items():
+            _quantile_gauges.setdefault(name, derived)
+        _update_quantile_gauges(state['histograms'].keys())
+        _recent_cycles.extend(state['cycles'])
+    if state['cycles']:
+        write_summary()
+
+
+def current_cycle():
+    """현재 스레드에서 실행 중인 사이클 상태 (없으면 None)"""
+    return getattr(_local, 'cycle', None)
+
+
+def current_checker():
+    """현재 스레드에서 실행 중인 사이클의 체커 이름"""
+    cycle_state = current_cycle()
+    return cycle_state['checker'] if cycle_state else 'default'
+
+
+@contextmanager
+def span(phase, checker=None):
+    """단계 소요 시간 측정: with metrics.span('driver_launch'): ..."""
+    checker = checker or current_checker()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        observe(PHASE_METRIC, elapsed, checker=checker, phase=phase)
+        cycle_state = getattr(_local, 'cycle', None)
+        if cycle_state is not None:
+            phases = cycle_state['phases']
+            phases[phase] = round(phases.get(phase, 0.0) + elapsed, 6)
+
+
+@contextmanager
+def cycle(checker):
+    """체크 사이클 하나를 측정하고 종료 시 요약 파일 갱신"""
+    previous = getattr(_local, 'cycle', None)
+    cycle_state = {'checker': checker, 'started': time.time(), 'monotonic': time.monotonic(), 'phases': {}}
+    _local.cycle = cycle_state
+    start = time.perf_counter()
+    try:
+        with span('total', checker):
+            yield cycle_state
+    finally:
+        _local.cycle = previous
+        record = {
+            'checker': checker,
+            'started': cycle_state['started'],
+            'duration': round(time.perf_counter() - start, 6),
+            'phases': cycle_state['phases'],
+        }
+        if cycle_state.get('resources'):
+            record['resources'] = cycle_state['resources']
+        with _lock:
+            _recent_cycles.append(record)
+        write_summary()
+
+
+def timed_cycle(checker):
+    """체크 함수 전체를 하나의 사이클로 측정하는 데코레이터"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with cycle(checker):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels, extra=None):
+    items = list(labels) + (list(extra) if extra else [])
+    if not items:
+        return ''
+    return '{' + ','.join(f'{k}="{_escape_label(v)}"' for k, v in items) + '}'
+
+
+def render_prometheus():
+    """Prometheus 텍스트 형식으로 전체 메트릭 출력"""
+    lines = []
+    with _lock:
+        histograms = sorted(_histograms.items())
+        counters = sorted(_counters.items())
+        gauges = sorted(_gauges.items())
+
+    described = set()
+
+    def header(name, default_type):
+        if name in described:
+            return
+        described.add(name)
+        metric_type, help_text = _descriptions.get(name, (default_type, name))
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {metric_type}")
+
+    for (name, labels), histogram in histograms:
+        header(name, 'histogram')
+        cumulative = 0
+        for bound, count in zip(histogram.buckets, histogram.counts):
+            cumulative += count
+            lines.append(f"{name}_bucket{_format_labels(labels, [('le', bound)])} {cumulative}")
+        lines.append(f"{name}_bucket{_format_labels(labels, [('le', '+Inf')])} {histogram.count}")
+        lines.append(f"{name}_sum{_format_labels(labels)} {histogram.total}")
+        lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+    for (name, labels), value in counters:
+        header(name, 'counter')
+        lines.append(f"{name}{_format_labels(labels)} {value}")
+    for (name, labels), value in gauges:
+        header(name, 'gauge')
+        lines.append(f"{name}{_format_labels(labels)} {value}")
+    return "\n".join(lines) + "\n"
+
+
+def build_summary():
+    """JSON 요약 데이터 생성"""
+    def label_key(name, labels):
+        return name + _format_labels(labels)
+
+    with _lock:
+        return {
+            'updated': time.time(),
+            'histograms': {label_key(n, l): h.summary() for (n, l), h in sorted(_histograms.items())},
+            'counters': {label_key(n, l): v for (n, l), v in sorted(_counters.items())},
+            'gauges': {label_key(n, l): v for (n, l), v in sorted(_gauges.items())},
+            'recent_cycles': list(_recent_cycles),
+        }
+
+
+def write_summary(path=None):
+    """JSON 요약 파일 갱신 (임시 파일에 쓴 뒤 교체)"""
+    path = path or METRICS_SUMMARY_FILE
+    if not path:
+        return
+    try:
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(build_summary(), f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+    except Exception as e:
+        logger.warning(f"메트릭 요약 파일 저장 중 오류 (무시됨): {str(e)}")
+
+
+def _handler_class():
+    """/metrics 와 /summary 요청 처리기 (http.server는 서버를 띄울 때만 import)"""
+    from http.server import BaseHTTPRequestHandler
+
+    class _MetricsHandler(BaseHTTPRequestHandler):
+
+        def do_GET(self):
+            if self.path.startswith('/metrics'):
+                body = render_prometheus().encode('utf-8')
+                content_type = 'text/plain; version=0.0.4; charset=utf-8'
+            elif self.path.startswith('/summary'):
+                body = json.dumps(build_summary(), ensure_ascii=False).encode('utf-8')
+                content_type = 'application/json; charset=utf-8'
+            else:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return _MetricsHandler
+
+
+def start_metrics_server(port=None):
+    """localhost 전용 메트릭 HTTP 서버를 백그라운드 스레드로 시작"""
+    global _server
+    port = METRICS_PORT if port is None else port
+    if not port or _server is not None:
+        return _server
+    from http.server import ThreadingHTTPServer
+    try:
+        _server = ThreadingHTTPServer(('127.0.0.1', port), _handler_class())
+        thread = threading.Thread(target=_server.serve_forever, name='metrics-server', daemon=True)
+        thread.start()
+        logger.info(f"메트릭 서버 시작: http://127.0.0.1:{port}/metrics")
+    except OSError as e:
+        logger.error(f"메트릭 서버 시작 실패: {str(e)}")
+        _server = None
+    return _server
+
+
+def stop_metrics_server():
+    """메트릭 HTTP 서버 종료"""
+    global _server
+    if _server is not None:
+        _server.shutdown()
+        _server.server_close()
+        _server = None
@@ -0,0 +1,187 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import logging
+import threading
+from dotenv import load_dotenv
+import freshness
+
+logger = logging.getLogger(__name__)
+
+# 환경 변수 로드
+load_dotenv()
+
+# 설정 정보
+TELEGRAM_BOT_TOKEN = os.getenv('TELEGRAM_BOT_TOKEN')
+TELEGRAM_CHAT_ID = os.getenv('TELEGRAM_CHAT_ID')
+
+# Bot API 주소 (비우면 https://api.telegram.org/bot, 벤치마크에서는 fixture 서버의 가짜 Bot API)
+TELEGRAM_API_BASE_URL = os.getenv('TELEGRAM_API_BASE_URL', '').split('#')[0].strip()
+
+# 데몬 모드에서 모든 발송을 처리할 이벤트 루프와 그 루프에 묶인 봇 (단독 실행 시에는 None)
+_loop = None
+_loop_thread = None
+_bot = None
+_lock = threading.Lock()
+
+
+def normalize_chat_id(chat_id):
+    """문자열 채팅 ID를 정수로 변환 (음수 그룹 ID 유지)"""
+    if isinstance(chat_id, str):
+        if chat_id.startswith('-') and chat_id[1:].isdigit():
+            return int(chat_id)
+        if chat_id.isdigit():
+            return int(chat_id)
+    return chat_id
+
+
+def attach(loop):
+    """데몬 이벤트 루프에 연결 (루프를 실행하는 스레드에서 호출)
+
+    이후 어느 스레드에서 보내든 이 루프에서 봇 하나로 발송한다.
+    """
+    global _loop, _loop_thread, _bot
+    with _lock:
+        _loop = loop
+        _loop_thread = threading.current_thread() if loop is not None else None
+        _bot = None
+
+
+def detach():
+    """데몬 루프 연결 해제"""
+    attach(None)
+
+
+def new_bot(Bot):
+    """설정한 토큰과 Bot API 주소로 봇 생성"""
+    if TELEGRAM_API_BASE_URL:
+        return Bot(token=TELEGRAM_BOT_TOKEN, base_url=TELEGRAM_API_BASE_URL)
+    return Bot(token=TELEGRAM_BOT_TOKEN)
+
+
+def _get_bot(Bot):
+    """데몬 루프에서는 봇(HTTP 연결)을 재사용하고, 단독 실행에서는 매번 새로 만듦"""
+    global _bot
+    if _loop is None:
+        return new_bot(Bot)
+    if _bot is None:
+        _bot = new_bot(Bot)
+    return _bot
+
+
+def ready():
+    """텔레그램 설정(토큰, 채팅 ID, 토큰 형식) 확인"""
+    if not all([TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID]):
+        logger.error("텔레그램 설정이 완료되지 않았습니다. .env 파일을 확인하세요.")
+        return False
+    # 봇 토큰 형식 확인
+    if ":" not in TELEGRAM_BOT_TOKEN:
+        logger.error("봇 토큰 형식이 잘못되었습니다. 올바른 형식: 123456789:AbCdEfGhIjKlMnOpQrStUvWxYz")
+        return False
+    return True
+
+
+async def _with_bot(func):
+    # 텔레그램 라이브러리는 실제로 발송할 때만 import (단일 실행 시작 시간 단축)
+    from telegram import Bot
+    bot = _get_bot(Bot)
+    logger.debug("텔레그램 봇 객체 준비 완료")
+    return await func(bot)
+
+
+def _running_loop():
+    # asyncio는 실제로 발송할 때만 import (체커 import 시간 단축)
+    import asyncio
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+async def run(func):
+    """func(bot) 코루틴을 공용 봇으로 실행하고 결과 반환
+
+    데몬 루프에 연결되어 있으면 다른 스레드/루프에서 호출해도 데몬 루프에서 봇 하나로 실행한다.
+    """
+    import asyncio
+    loop = _loop
+    if loop is not None and loop.is_running() and _running_loop() is not loop:
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(_with_bot(func), loop))
+    return await _with_bot(func)
+
+
+def run_sync(func):
+    """동기 코드에서 run (데몬 루프에 연결되어 있으면 그 루프에 맡기고 결과를 기다림)"""
+    import asyncio
+    loop = _loop
+    if loop is not None and loop.is_running():
+        if threading.current_thread() is _loop_thread:
+            raise RuntimeError("데몬 루프 안에서는 await notifier.send_message() 또는 await notifier.run()을 사용하세요.")
+        return asyncio.run_coroutine_threadsafe(_with_bot(func), loop).result()
+    return asyncio.run(_with_bot(func))
+
+
+async def _send(bot, message):
+    """발송 후 텔레그램 message_id 반환 (실패 시 None)"""
+    from telegram.error import TelegramError
+
+    try:
+        response = await bot.send_message(chat_id=normalize_chat_id(TELEGRAM_CHAT_ID), text=message, parse_mode='HTML')
+        logger.info(f"텔레그램 메시지가 성공적으로 전송되었습니다. 메시지 ID: {response.message_id}")
+        return response.message_id
+    except TelegramError as e:
+        logger.error(f"텔레그램 메시지 전송 중 오류가 발생했습니다: {str(e)}")
+        logger.error(f"오류 유형: {type(e).__name__}")
+        # 추가 디버깅 정보
+        if "Unauthorized" in str(e):
+            logger.error("봇 토큰이 유효하지 않습니다. 새로운 토큰을 생성하거나 토큰 값을 확인하세요.")
+        elif "Chat not found" in str(e):
+            logger.error("채팅 ID를 찾을 수 없습니다. 채팅 ID가 올바른지 확인하세요.")
+        elif "Bad Request" in str(e):
+            logger.error("잘못된 요청입니다. 메시지 형식이나 매개변수를 확인하세요.")
+        return None
+    except Exception as e:
+        logger.error(f"텔레그램 메시지 전송 중 예상치 못한 오류가 발생했습니다: {str(e)}")
+        return None
+
+
+def _delivered(message_id, message, mark_delivered):
+    """발송 결과 -> 성공 여부
+
+    전달 기록은 사이클 상태가 있는 호출한 스레드에서 남긴다 (데몬 루프 스레드에는 사이클이 없음).
+    """
+    if message_id is None:
+        return False
+    if mark_delivered:
+        freshness.mark_delivered(message_id, message)
+    return True
+
+
+async def send_message(message, mark_delivered=True):
+    """텔레그램 메시지 발송 (mark_delivered: 알림 지연 측정용 전달 기록)
+
+    데몬 루프에 연결되어 있으면 다른 스레드/루프에서 호출해도 데몬 루프에서 발송한다.
+    """
+    if not ready():
+        return False
+    return _delivered(await run(lambda bot: _send(bot, message)), message, mark_delivered)
+
+
+def notify(message, mark_delivered=True):
+    """동기 코드에서 발송 (데몬 루프에 연결되어 있으면 그 루프에 맡기고 결과를 기다림)"""
+    if not ready():
+        return False
+    # 발송은 데몬 루프에서, 전달 기록은 이 스레드의 사이클에
+    return _delivered(run_sync(lambda bot: _send(bot, message)), message, mark_delivered)
+
+
+async def close():
+    """데몬 종료 시 재사용 중인 봇 연결 정리"""
+    global _bot
+    bot, _bot = _bot, None
+    if bot is not None:
+        try:
+            await bot.shutdown()
+        except Exception as e:
+            logger.debug("텔레그램 봇 종료 중 오류 (무시됨): %s", e)
@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""예약 페이지/시간 조회 페이지/캘린더 데이터에서 값을 뽑는 순수 함수 모음
+
+체커는 브라우저 DOM이나 응답 본문에서 이 함수들로 날짜와 시간을 뽑고, replay.py는 보관된
+HTML에 같은 함수를 적용한다. 브라우저나 네트워크에 의존하지 않으므로 작업 프로세스 어디서든
+가볍게 import 할 수 있다 (BeautifulSoup은 HTML 전체를 파싱할 때만 로드).
+"""
+
+import re
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+_FULL_DATE = re.compile(r'(\d{4})년\s*(\d{2})월\s*(\d{2})일')
+_MONTH_DAY = re.compile(r'(\d{1,2})월\s*(\d{1,2})일')
+_DAY = re.compile(r'(\d{1,2})일')
+
+
+def _soup(html):
+    from bs4 import BeautifulSoup
+    return BeautifulSoup(html, 'html.parser')
+
+
+def date_from_title(title, year, month):
+    """'예약가능' 날짜 칸의 title에서 날짜 (YYYY-MM-DD, 년/월이 없으면 year/month 사용, 없으면 None)"""
+    match = _FULL_DATE.search(title or '')
+    if match:
+        y, m, d = map(int, match.groups())
+        return f"{y}-{m:02d}-{d:02d}"
+    match = _MONTH_DAY.search(title or '')
+    if match:
+        m, d = map(int, match.groups())
+        return f"{year}-{m:02d}-{d:02d}"
+    match = _DAY.search(title or '')
+    if match:
+        return f"{year}-{month:02d}-{int(match.group(1)):02d}"
+    return None
+
+
+def is_closed_cell(class_attr):
+    """예약 불가능한 달력 칸인지 (class에 'red' 포함)"""
+    if isinstance(class_attr, (list, tuple)):
+        return 'red' in class_attr
+    return 'red' in (class_attr or '')
+
+
+def cell_date(text, year, month):
+    """클릭 가능한 달력 칸의 텍스트(일)에서 날짜 (숫자가 아니면 None)"""
+    text = (text or '').strip()
+    if not text.isdigit():
+        return None
+    return f"{year}-{month:02d}-{int(text):02d}"
+
+
+def format_tee_time(course, tee_time, price):
+    """시간 표 한 행 -> '코스 시간 (가격원)' (코스/시간이 비어 있으면 None)"""
+    course, tee_time, price = (course or '').strip(), (tee_time or '').strip(), (price or '').strip()
+    if not course or not tee_time:
+        return None
+    return f"{course} {tee_time} ({price}원)"
+
+
+def title_dates(html, year, month):
+    """예약 페이지에서 title에 '예약가능'이 있는 칸의 날짜 목록 (Selenium 체커 방식)"""
+    dates = []
+    for td in _soup(html).find_all('td', title=lambda value: value and '예약가능' in value):
+        # Selenium 체커는 링크가 있는 칸만 클릭할 수 있으므로 같은 조건 적용
+        if td.find('a') is None:
+            continue
+        date_str = date_from_title(td['title'], year, month)
+        if date_str and date_str not in dates:
+            dates.append(date_str)
+    return dates
+
+
+def calendar_dates(html, year, month):
+    """예약 페이지 달력(table.calendar)에서 클릭 가능하고 막히지 않은 칸의 날짜 목록 (Playwright/CloudScraper 체커 방식)
+
+    달력 테이블이 없으면 None
+    """
+    table = _soup(html).select_one('table.calendar')
+    if table is None:
+        return None
+    dates = []
+    for cell in table.select('td[onclick]'):
+        if is_closed_cell(cell.get('class', [])):
+            continue
+        date_str = cell_date(cell.get_text(), year, month)
+        if date_str:
+            dates.append(date_str)
+    return dates
+
+
+def tee_times(html):
+    """시간 조회 페이지의 시간 표(table.table-body)에서 '코스 시간 (가격원)' 목록"""
+    entries = []
+    for table in _soup(html).find_all('table', class_='table-body'):
+        for row in table.find_all('tr'):
+            cells = row.find_all('td')
+            if len(cells) < 4:
+                continue
+            entry = format_tee_time(cells[0].get_text(), cells[1].get_text(), cells[3].get_text())
+            if entry:
+                entries.append(entry)
+    return entries
+
+
+def calendar_data_dates(text):
+    """캘린더 데이터(XmlCalendarData.aspx) 응답에서 예약 가능 날짜 추출"""
+    available_dates = []
+    # XML 또는 JSON 응답 형식에 따라 파싱 시도
+    try:
+        # 먼저 JSON으로 파싱 시도
+        data = json.loads(text)
+        # JSON 구조에 따라 예약 가능 날짜 추출 로직 추가
+        # (구체적인 키와 값은 실제 응답 형식에 맞게 수정 필요)
+        logger.info("JSON 응답 파싱 성공")
+    except json.JSONDecodeError:
+        # JSON 파싱 실패 시 XML로 시도
+        soup = _soup(text)
+        # XML 구조에 따라 예약 가능 날짜 추출 로직 추가
+        available_elements = soup.select('날짜 선택자')
+        for element in available_elements:
+            date_str = element.get('date')
+            if date_str:
+                available_dates.append(date_str)
+        logger.info("XML 응답 파싱 성공")
+    return available_dates
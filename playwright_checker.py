@@ -6,28 +6,30 @@ import time
 import datetime
 import logging
 import schedule
-import asyncio
 import sys
 import pytz
 import random
 from pathlib import Path
 from dotenv import load_dotenv
-from telegram import Bot
-from telegram.error import TelegramError
 from playwright.async_api import async_playwright, Page
+import log_setup
+import notifier
+import message_renderer
+import metrics
+import profiler
+import browser_pool
+import browser_trace
+import browser_supervisor
+import asset_cache
+import rate_limiter
+import artifacts
+import page_parser
 
 # 한국 시간대 설정
 KST = pytz.timezone('Asia/Seoul')
 
-# 로깅 설정
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("playwright_checker.log", encoding='utf-8'),
-        logging.StreamHandler()
-    ]
-)
+# 로깅 설정 (큐 기반 비동기 로깅, 파일은 JSON lines 형식)
+log_setup.setup_logging("playwright_checker.log")
 
 logger = logging.getLogger(__name__)
 
@@ -37,47 +39,27 @@ load_dotenv()
 # 설정 정보
 TELEGRAM_BOT_TOKEN = os.getenv('TELEGRAM_BOT_TOKEN')
 TELEGRAM_CHAT_ID = os.getenv('TELEGRAM_CHAT_ID')
-CHECK_INTERVAL_MINUTES = int(os.getenv('CHECK_INTERVAL_MINUTES', 5).replace('%', ''))
-MONTH = int(os.getenv('MONTH', 4).replace('%', ''))
-YEAR = int(os.getenv('YEAR', 2025).replace('%', ''))
+CHECK_INTERVAL_MINUTES = int(os.getenv('CHECK_INTERVAL_MINUTES', '5').replace('%', ''))
+MONTH = int(os.getenv('MONTH', '4').replace('%', ''))
+YEAR = int(os.getenv('YEAR', '2025').replace('%', ''))
+
+# 사이트 주소 (벤치마크에서는 로컬 fixture 서버 주소로 바꿈)
+BEARCREEK_BASE_URL = os.getenv('BEARCREEK_BASE_URL', 'https://www.bearcreek.co.kr').split('#')[0].strip().rstrip('/')
 
 # 베어크리크 골프장 예약 페이지 URL
-BEARCREEK_URL = "https://www.bearcreek.co.kr/Reservation/Reservation.aspx?strLGubun=110&strClubCode=N#aCourseSel"
+BEARCREEK_URL = f"{BEARCREEK_BASE_URL}/Reservation/Reservation.aspx?strLGubun=110&strClubCode=N#aCourseSel"
+
+# 작업 프로세스에서 실행할 체크 함수 (스크립트로 실행해도 모듈 이름으로 import 되도록 문자열로 지정)
+BROWSER_CHECK = 'playwright_checker:check_available_dates'
 
 async def send_telegram_message(message):
-    """텔레그램 메시지 발송 함수"""
-    if not all([TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID]):
-        logger.error("텔레그램 설정이 완료되지 않았습니다. .env 파일을 확인하세요.")
-        return False
-    
-    try:
-        logger.info(f"텔레그램 봇 토큰 유효성 검사 중... (길이: {len(TELEGRAM_BOT_TOKEN)})")
-        logger.info(f"텔레그램 채팅 ID 유효성 검사 중... (값: {TELEGRAM_CHAT_ID})")
-        
-        bot = Bot(token=TELEGRAM_BOT_TOKEN)
-        logger.info("텔레그램 봇 객체 생성 완료")
-        
-        # 채팅 ID 처리
-        chat_id = TELEGRAM_CHAT_ID
-        if isinstance(chat_id, str):
-            if chat_id.startswith('-') and chat_id[1:].isdigit():
-                chat_id = int(chat_id)
-            elif chat_id.isdigit():
-                chat_id = int(chat_id)
-        
-        response = await bot.send_message(chat_id=chat_id, text=message, parse_mode='HTML')
-        logger.info(f"텔레그램 메시지가 성공적으로 전송되었습니다. 메시지 ID: {response.message_id}")
-        return True
-    except TelegramError as e:
-        logger.error(f"텔레그램 메시지 전송 중 오류가 발생했습니다: {str(e)}")
-        return False
-    except Exception as e:
-        logger.error(f"텔레그램 메시지 전송 중 예상치 못한 오류가 발생했습니다: {str(e)}")
-        return False
+    """텔레그램 메시지 발송 함수 (공용 notifier 사용)"""
+    return await notifier.send_message(message)
+
 
 def send_telegram_notification(message):
-    """텔레그램 메시지 발송을 위한 동기 래퍼 함수"""
-    asyncio.run(send_telegram_message(message))
+    """텔레그램 메시지 발송을 위한 동기 래퍼 함수 (데몬 모드에서는 데몬 루프에서 발송)"""
+    return notifier.notify(message)
 
 async def setup_stealth_page():
     """스텔스 모드가 적용된 Playwright 브라우저 페이지 설정"""
@@ -85,27 +67,40 @@ async def setup_stealth_page():
         # Playwright 시작
         playwright = await async_playwright().start()
         
-        # 브라우저 시작 옵션 설정
+        # 공유 브라우저 감독 프로세스가 있으면 붙어서 새 컨텍스트만 만듦 (브라우저 시작 시간 생략)
         browser_type = playwright.chromium
-        browser = await browser_type.launch(
-            headless=True,  # 서버에서는 headless 모드 사용
-            args=[
-                '--disable-blink-features=AutomationControlled',
-                '--disable-features=IsolateOrigins,site-per-process',
-                '--disable-extensions',
-                '--disable-component-extensions-with-background-pages',
-                '--disable-default-apps',
-                '--disable-dev-shm-usage',
-                '--disable-setuid-sandbox',
-                '--disable-background-timer-throttling',
-                '--disable-renderer-backgrounding',
-                '--disable-backgrounding-occluded-windows',
-                '--disable-background-networking',
-                '--no-sandbox',
-                '--disable-web-security',
-                '--disable-infobars',
-            ]
-        )
+        browser = None
+        shared = browser_supervisor.endpoint()
+        if shared:
+            try:
+                browser = await browser_type.connect_over_cdp(f"http://{shared}", timeout=10000)
+                browser_supervisor.record_attach('playwright', 'shared')
+                logger.info(f"공유 브라우저에 연결했습니다: {shared}")
+            except Exception as e:
+                logger.warning(f"공유 브라우저 연결 실패, 브라우저를 직접 실행합니다: {str(e)}")
+        
+        # 브라우저 시작 옵션 설정
+        if browser is None:
+            browser_supervisor.record_attach('playwright', 'launched')
+            browser = await browser_type.launch(
+                headless=True,  # 서버에서는 headless 모드 사용
+                args=[
+                    '--disable-blink-features=AutomationControlled',
+                    '--disable-features=IsolateOrigins,site-per-process',
+                    '--disable-extensions',
+                    '--disable-component-extensions-with-background-pages',
+                    '--disable-default-apps',
+                    '--disable-dev-shm-usage',
+                    '--disable-setuid-sandbox',
+                    '--disable-background-timer-throttling',
+                    '--disable-renderer-backgrounding',
+                    '--disable-backgrounding-occluded-windows',
+                    '--disable-background-networking',
+                    '--no-sandbox',
+                    '--disable-web-security',
+                    '--disable-infobars',
+                ]
+            )
         
         # 브라우저 컨텍스트 생성
         context = await browser.new_context(
@@ -183,61 +178,73 @@ async def clean_up_resources(page=None, browser=None, context=None, playwright=N
     except Exception as e:
         logger.error(f"리소스 정리 중 오류: {str(e)}")
 
-async def check_available_dates_async():
-    """베어크리크 골프장 예약 가능 날짜 확인 (비동기)"""
+async def fetch_available_dates_async(handle=None, year=None, month=None):
+    """예약 가능 날짜 조회 (실패 시 None)
+
+    handle: 브라우저를 닫기 전에 날짜 목록으로 호출할 코루틴 함수 (알림 발송 등) - 반환값을 그대로 돌려줌
+    year/month: 달력 칸의 날짜에 쓸 년월 (기본값: YEAR/MONTH)
+    """
+    import asyncio
+    import freshness
+    import browser_resources
+    year, month = year or YEAR, month or MONTH
     page, browser, context, playwright = None, None, None, None
+    cache_stats = None
+    tracer = browser_trace.PlaywrightTrace('playwright')
+    monitor = browser_resources.BrowserMonitor('playwright').start()
     
     try:
         logger.info("Playwright를 사용하여 베어크리크 골프장 예약 확인을 시작합니다...")
         
-        page, browser, context, playwright = await setup_stealth_page()
+        with metrics.span('driver_launch'):
+            page, browser, context, playwright = await setup_stealth_page()
+            monitor.attach(browser_resources.playwright_driver_pid(playwright))
         if not page:
             logger.error("Playwright 페이지 설정 실패")
-            return False
+            return None
+        # 정적 에셋(JS, CSS, 이미지, 폰트)은 세션 간 디스크 캐시에서 제공
+        cache_stats = await asset_cache.install(context)
+        await tracer.start(context, page)
         
         # 메인 페이지 접속
         logger.info(f"베어크리크 예약 페이지로 이동 중: {BEARCREEK_URL}")
-        response = await page.goto(BEARCREEK_URL, wait_until='domcontentloaded')
+        await rate_limiter.acquire_async(BEARCREEK_URL)
+        with metrics.span('page_load'):
+            response = await page.goto(BEARCREEK_URL, wait_until='domcontentloaded')
         
         # 응답 확인
         if not response or response.status != 200:
             logger.error(f"페이지 로드 실패: 상태 코드 {response.status if response else 'unknown'}")
             
-            # 실패 시 페이지 스크린샷 저장
-            screenshot_path = "access_failed.png"
-            await page.screenshot(path=screenshot_path)
-            logger.info(f"실패 페이지 스크린샷 저장됨: {screenshot_path}")
-            
-            # 페이지 소스 저장
-            html_content = await page.content()
-            with open("access_failed.html", "w", encoding="utf-8") as f:
-                f.write(html_content)
-            logger.info("실패 페이지 소스 저장됨: access_failed.html")
+            # 실패 시 페이지 스크린샷 및 소스 저장 (백그라운드)
+            try:
+                artifacts.save("access_failed.png", await page.screenshot(), failed=True)
+                path = artifacts.save("access_failed.html", await page.content(), failed=True, target='reservation')
+                logger.info(f"실패 페이지 저장 예약됨: {path}")
+            except Exception as e:
+                logger.warning(f"실패 페이지 캡처 실패 (무시됨): {str(e)}")
             
-            return False
+            return None
         
         # 페이지 로딩 대기
         logger.info("페이지 완전히 로드될 때까지 대기 중...")
-        await page.wait_for_load_state('networkidle')
-        await asyncio.sleep(3)  # 추가 대기
+        with metrics.span('wait'):
+            await page.wait_for_load_state('networkidle')
+            await asyncio.sleep(3)  # 추가 대기
         
         # 예약 페이지 접속 성공 확인
         title = await page.title()
         logger.info(f"페이지 제목: {title}")
         
-        # 페이지 스크린샷 저장
-        screenshot_path = "bearcreek_main.png"
-        await page.screenshot(path=screenshot_path)
-        logger.info(f"메인 페이지 스크린샷 저장됨: {screenshot_path}")
-        
-        # 페이지 소스 저장
-        html_content = await page.content()
-        with open("bearcreek_main.html", "w", encoding="utf-8") as f:
-            f.write(html_content)
-        logger.info("메인 페이지 소스 저장됨: bearcreek_main.html")
+        # 달력 스크린샷 및 페이지 소스 (디버깅용, 표본 사이클만 백그라운드 저장)
+        if artifacts.wants():
+            with metrics.span('screenshot'):
+                artifacts.save("bearcreek_main.png", await artifacts.page_png(page, "table.calendar"))
+            with metrics.span('page_dump'):
+                artifacts.save("bearcreek_main.html", await page.content(), target='reservation')
         
         # 달력 선택 (년/월)
-        logger.info(f"날짜 선택: {YEAR}년 {MONTH}월")
+        logger.info(f"날짜 선택: {year}년 {month}월")
         
         # 페이지 내 달력 표시 확인
         calendar_selector = "table.calendar"
@@ -246,47 +253,30 @@ async def check_available_dates_async():
             logger.info("달력 테이블 발견됨")
         except Exception as e:
             logger.error(f"달력 테이블을 찾을 수 없음: {str(e)}")
-            return False
+            return None
         
         # 달력에서 예약 가능한 날짜 찾기
         available_dates = []
         
         # 달력 테이블의 날짜 셀 확인
-        date_cells = await page.query_selector_all("table.calendar td[onclick]")
-        logger.info(f"발견된 날짜 셀: {len(date_cells)}개")
+        with metrics.span('dom_extract'):
+            date_cells = await page.query_selector_all("table.calendar td[onclick]")
+            logger.info(f"발견된 날짜 셀: {len(date_cells)}개")
         
-        for cell in date_cells:
-            # 클릭 가능한 날짜인지 확인 (빨간색 아님)
-            class_attr = await cell.get_attribute("class")
-            if "red" not in (class_attr or ""):
-                # 날짜 텍스트 추출
-                date_text = await cell.inner_text()
-                if date_text.strip():
-                    # 현재 년월과 셀의 날짜를 조합
-                    day = date_text.strip()
-                    date_str = f"{YEAR}-{MONTH:02d}-{int(day):02d}"
-                    available_dates.append(date_str)
-                    logger.info(f"예약 가능한 날짜 발견: {date_str}")
+            for cell in date_cells:
+                # 클릭 가능한 날짜인지 확인 (빨간색 아님)
+                class_attr = await cell.get_attribute("class")
+                if not page_parser.is_closed_cell(class_attr):
+                    # 현재 년월과 셀의 날짜(텍스트)를 조합
+                    date_str = page_parser.cell_date(await cell.inner_text(), year, month)
+                    if date_str:
+                        available_dates.append(date_str)
+                        freshness.mark_seen(date_str)
+                        logger.debug("예약 가능한 날짜 발견: %s", date_str)
         
-        # 예약 가능 날짜가 있을 경우 알림 전송
-        if available_dates:
-            logger.info(f"총 {len(available_dates)}개의 예약 가능 날짜를 찾았습니다.")
-            
-            # 알림 메시지 구성
-            message = f"🏌️ <b>베어크리크 예약 알림</b>\n\n"
-            message += f"{YEAR}년 {MONTH}월에 다음 날짜에 예약이 가능합니다:\n\n"
-            
-            for date_str in available_dates:
-                message += f"- {date_str}\n"
-            
-            message += f"\n예약 페이지: {BEARCREEK_URL}"
-            
-            # 텔레그램 알림 전송
-            await send_telegram_message(message)
-            return True
-        else:
-            logger.info(f"{YEAR}년 {MONTH}월에 예약 가능한 날짜를 찾을 수 없습니다.")
-            return False
+        if handle is not None:
+            return await handle(available_dates)
+        return available_dates
     
     except Exception as e:
         logger.error(f"예약 확인 중 예외 발생: {str(e)}")
@@ -294,35 +284,118 @@ async def check_available_dates_async():
         # 오류 발생 시 스크린샷
         if page:
             try:
-                await page.screenshot(path="error.png")
-                logger.info("오류 페이지 스크린샷 저장됨: error.png")
+                artifacts.save("error.png", await page.screenshot(), failed=True)
             except:
                 pass
         
-        return False
+        return None
     
     finally:
+        # 느린 체크는 브라우저 추적 데이터 보관
+        if page:
+            await tracer.finish(page, BEARCREEK_URL)
         # 리소스 정리
-        await clean_up_resources(page, browser, context, playwright)
+        with metrics.span('cleanup'):
+            await clean_up_resources(page, browser, context, playwright)
+        # 에셋 캐시 적중률 기록 및 크기 상한 유지
+        if cache_stats is not None:
+            cache_stats.report()
+            try:
+                asset_cache.enforce()
+            except Exception as e:
+                logger.warning(f"에셋 캐시 정리 실패 (무시됨): {str(e)}")
+        # 브라우저 자원 사용량 기록 및 남은 프로세스 정리
+        monitor.stop()
+
+async def notify_available_dates(available_dates):
+    """조회한 예약 가능 날짜 알림 (라이브 보드 갱신 또는 텔레그램 발송)"""
+    import live_board
+    import freshness
+    # 알림 대기열 등록 시점 기록
+    freshness.mark_enqueued(available_dates)
+    
+    # 라이브 보드 모드: 고정 메시지 하나만 갱신
+    if live_board.is_live_mode():
+        with metrics.span('telegram_send'):
+            await live_board.publish_board(
+                f"{YEAR}-{MONTH:02d}",
+                f"🏌️ <b>베어크리크 {YEAR}년 {MONTH}월 예약 현황</b>",
+                available_dates,
+                BEARCREEK_URL,
+            )
+    
+    # 예약 가능 날짜가 있을 경우 알림 전송
+    if available_dates:
+        logger.info(f"총 {len(available_dates)}개의 예약 가능 날짜를 찾았습니다.")
+        if live_board.is_live_mode():
+            return True
+        
+        # 알림 메시지 구성 (4096자 초과 시 날짜 단위로 분할)
+        messages = message_renderer.render_availability(
+            "🏌️ <b>베어크리크 예약 알림</b>",
+            available_dates,
+            BEARCREEK_URL,
+            intro=f"{YEAR}년 {MONTH}월에 다음 날짜에 예약이 가능합니다:",
+            section=None,
+        )
+        
+        # 텔레그램 알림 전송
+        with metrics.span('telegram_send'):
+            for message in messages:
+                await send_telegram_message(message)
+        return True
+    else:
+        logger.info(f"{YEAR}년 {MONTH}월에 예약 가능한 날짜를 찾을 수 없습니다.")
+        return False
+
+async def check_available_dates_async():
+    """베어크리크 골프장 예약 가능 날짜 확인 (비동기)"""
+    return bool(await fetch_available_dates_async(notify_available_dates))
+
+def fetch_available_dates(year=None, month=None):
+    """예약 가능 날짜 조회만 수행 (알림 없음, 실패 시 None)"""
+    import asyncio
+    return asyncio.run(fetch_available_dates_async(year=year, month=month))
 
+@metrics.timed_cycle('playwright')
+@profiler.profiled('playwright')
 def check_available_dates():
     """베어크리크 골프장 예약 가능 날짜 확인 (동기 래퍼)"""
+    import asyncio
     return asyncio.run(check_available_dates_async())
 
 def run_scheduler():
     """스케줄러 실행"""
+    import heap_monitor
+    import disk_monitor
     logger.info(f"베어크리크 예약 확인 스케줄러가 시작되었습니다. 확인 주기: {CHECK_INTERVAL_MINUTES}분")
     
+    # 메트릭 엔드포인트 시작 (METRICS_PORT 설정 시)
+    metrics.start_metrics_server()
+    
+    # SIGUSR1 수신 시 다음 사이클 프로파일링
+    profiler.install_signal_handler()
+    
+    # 힙 추적 및 RSS 상한 점검 시작 (HEAP_TRACE, MAX_RSS_MB 설정 시)
+    heap_monitor.start()
+    
+    # 디스크 압박 감시 시작 (단계에 따라 디버깅 파일/보관소/로그 보관량 축소)
+    disk_monitor.start()
+    
+    # 체크는 브라우저 작업 프로세스에서 실행 (멈춘 브라우저가 스케줄러를 막지 않도록)
+    check_job = browser_pool.background(BROWSER_CHECK)
+    
     # 즉시 한 번 실행
-    check_available_dates()
+    check_job()
     
     # 스케줄 설정
-    schedule.every(CHECK_INTERVAL_MINUTES).minutes.do(check_available_dates)
+    schedule.every(CHECK_INTERVAL_MINUTES).minutes.do(check_job)
     
     # 스케줄러 무한 루프
     try:
         while True:
             schedule.run_pending()
+            heap_monitor.tick()
             time.sleep(1)
     except KeyboardInterrupt:
         logger.info("Ctrl+C로 프로그램이 중단되었습니다.")
@@ -334,7 +407,9 @@ def run_scheduler():
 if __name__ == "__main__":
     logger.info("베어크리크 예약 확인 서비스가 시작되었습니다.")
     
-    # 커맨드라인 인자 확인
+    # 커맨드라인 인자 확인 (--profile N: 처음 N회 사이클 프로파일링)
+    profiler.arm_from_argv(sys.argv)
+    
     if len(sys.argv) > 1 and sys.argv[1] == "--single":
         # 단일 실행 모드
         logger.info("단일 실행 모드로 실행합니다.")
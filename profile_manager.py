@@ -0,0 +1,222 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import time
+import shutil
+import logging
+import secrets
+import tempfile
+from dotenv import load_dotenv
+import metrics
+import disk_monitor
+import browser_resources
+
+logger = logging.getLogger(__name__)
+
+# 환경 변수 로드
+load_dotenv()
+
+
+def _env_float(name, default):
+    """주석이 포함될 수 있는 실수 환경변수 로드"""
+    value = os.getenv(name, str(default)).split('#')[0].strip()
+    try:
+        return float(value)
+    except ValueError:
+        return default
+
+
+def _default_root():
+    uid = os.getuid() if hasattr(os, 'getuid') else os.getpid()
+    return os.path.join(tempfile.gettempdir(), f"bearcreek-profiles-{uid}")
+
+
+# 브라우저 프로필/임시 디렉토리를 만드는 전용 루트 (이 아래에서 만든 것만 정리함)
+BROWSER_PROFILE_ROOT = os.getenv('BROWSER_PROFILE_ROOT', '').split('#')[0].strip() or _default_root()
+
+# 소유 프로세스가 살아 있어도 이 시간이 지난 디렉토리는 남은 것으로 보고 회수 (0이면 비활성화)
+BROWSER_PROFILE_STALE_HOURS = _env_float('BROWSER_PROFILE_STALE_HOURS', 6)
+
+PROFILE_RECLAIMED_METRIC = 'bearcreek_profile_reclaimed_total'
+PROFILE_RECLAIMED_BYTES_METRIC = 'bearcreek_profile_reclaimed_bytes_total'
+
+metrics.describe(PROFILE_RECLAIMED_METRIC, 'counter', '회수한 브라우저 프로필 디렉토리 수 (reason=owner_exited|stale)')
+metrics.describe(PROFILE_RECLAIMED_BYTES_METRIC, 'counter', '회수한 브라우저 프로필 디렉토리 크기 합계 (바이트)')
+
+
+def _start_ticks(pid):
+    """PID 재사용 확인용 프로세스 시작 시각 (/proc이 없으면 0)"""
+    stat = browser_resources.read_stat(pid)
+    return stat[3] if stat is not None else 0
+
+
+def _owner_alive(pid, start_ticks):
+    """디렉토리를 만든 프로세스가 아직 살아 있는지 (PID가 재사용된 경우는 죽은 것으로 봄)"""
+    if browser_resources.available():
+        stat = browser_resources.read_stat(pid)
+        return stat is not None and (not start_ticks or stat[3] == start_ticks)
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def parse_name(name):
+    """디렉토리 이름 <prefix>-<pid>-<시작 시각>-<토큰>에서 (pid, 시작 시각) 추출 (형식이 다르면 None)"""
+    parts = name.rsplit('-', 3)
+    if len(parts) != 4 or not parts[1].isdigit() or not parts[2].isdigit():
+        return None
+    return int(parts[1]), int(parts[2])
+
+
+def _ensure_root():
+    os.makedirs(BROWSER_PROFILE_ROOT, mode=0o700, exist_ok=True)
+    return BROWSER_PROFILE_ROOT
+
+
+def _tree_size(path):
+    """os.scandir로 디렉토리 크기 합계 계산 (심볼릭 링크는 따라가지 않음)"""
+    total = 0
+    stack = [path]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        else:
+                            total += entry.stat(follow_symlinks=False).st_blocks * 512
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+    return total
+
+
+def _browser_pids(path):
+    """명령줄에 해당 디렉토리가 들어 있는 프로세스 {pid: 시작 시각} (user-data-dir로 띄운 브라우저)"""
+    if not browser_resources.available():
+        return {}
+    needle = os.fsencode(path)
+    result = {}
+    for name in os.listdir(browser_resources.PROC_DIR):
+        if not name.isdigit() or int(name) == os.getpid():
+            continue
+        try:
+            with open(f"{browser_resources.PROC_DIR}/{name}/cmdline", 'rb') as f:
+                if needle not in f.read():
+                    continue
+        except OSError:
+            continue
+        start_ticks = _start_ticks(name)
+        if start_ticks:
+            result[int(name)] = start_ticks
+    return result
+
+
+def _remove(path, reason):
+    """디렉토리를 쓰던 브라우저 프로세스를 PID로 종료한 뒤 삭제"""
+    leftovers = _browser_pids(path)
+    if leftovers:
+        logger.warning(f"브라우저 프로필을 쓰던 프로세스 {len(leftovers)}개 종료: {sorted(leftovers)}")
+        browser_resources.kill_processes(leftovers)
+    size = _tree_size(path)
+    shutil.rmtree(path, ignore_errors=True)
+    if os.path.exists(path):
+        return 0
+    metrics.inc(PROFILE_RECLAIMED_METRIC, reason=reason)
+    metrics.inc(PROFILE_RECLAIMED_BYTES_METRIC, size)
+    logger.debug("브라우저 프로필 회수 (%s): %s (%d bytes)", reason, path, size)
+    return size
+
+
+class BrowserProfile:
+    """현재 프로세스가 소유하는 브라우저 프로필 디렉토리
+
+    profile = profile_manager.allocate('chromedata')
+    chrome_options.add_argument(f"--user-data-dir={profile.user_data_dir}")
+    service = Service(env=profile.environ())
+    ...
+    profile.release()
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.user_data_dir = os.path.join(path, 'profile')
+        self.tmp_dir = os.path.join(path, 'tmp')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+        return False
+
+    def environ(self):
+        """브라우저/드라이버 프로세스용 환경변수 (임시 파일도 이 디렉토리 아래에 생기도록 TMPDIR 지정)"""
+        return dict(os.environ, TMPDIR=self.tmp_dir)
+
+    def release(self):
+        """브라우저 종료 후 디렉토리 삭제"""
+        if os.path.isdir(self.path):
+            shutil.rmtree(self.path, ignore_errors=True)
+
+
+def allocate(prefix='chrome'):
+    """전용 루트 아래에 현재 프로세스 소유의 프로필 디렉토리 생성"""
+    root = _ensure_root()
+    pid = os.getpid()
+    path = os.path.join(root, f"{prefix}-{pid}-{_start_ticks(pid)}-{secrets.token_hex(4)}")
+    profile = BrowserProfile(path)
+    os.mkdir(path, 0o700)
+    os.mkdir(profile.user_data_dir, 0o700)
+    os.mkdir(profile.tmp_dir, 0o700)
+    return profile
+
+
+def reclaim(stale_seconds=None, now=None):
+    """소유 프로세스가 끝났거나 오래 남은 프로필 디렉토리 회수 (반환값: (삭제 수, 바이트))
+
+    전용 루트 바로 아래 항목만 os.scandir로 확인하므로 /tmp의 다른 파일은 건드리지 않는다.
+    """
+    if stale_seconds is None:
+        stale_seconds = BROWSER_PROFILE_STALE_HOURS * 3600
+    now = now or time.time()
+    removed = freed = 0
+    try:
+        entries = list(os.scandir(BROWSER_PROFILE_ROOT))
+    except FileNotFoundError:
+        return 0, 0
+    for entry in entries:
+        owner = parse_name(entry.name)
+        if owner is None or not entry.is_dir(follow_symlinks=False):
+            continue
+        if not _owner_alive(*owner):
+            reason = 'owner_exited'
+        elif stale_seconds and now - entry.stat(follow_symlinks=False).st_mtime > stale_seconds:
+            reason = 'stale'
+        else:
+            continue
+        try:
+            size = _remove(entry.path, reason)
+        except Exception as e:
+            logger.warning(f"브라우저 프로필 회수 중 오류 (무시됨): {entry.path} - {str(e)}")
+            continue
+        if not os.path.exists(entry.path):
+            removed += 1
+            freed += size
+    if removed:
+        logger.info(f"브라우저 프로필 {removed}개 회수 ({freed / 1048576:.1f}MB)")
+    return removed, freed
+
+
+@disk_monitor.subscribe
+def _on_disk_pressure(level, previous, disk):
+    """디스크 압박 시 회수 가능한 프로필 디렉토리를 바로 정리"""
+    if level >= disk_monitor.WARNING:
+        reclaim()
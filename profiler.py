@@ -0,0 +1,182 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import time
+import signal
+import logging
+import threading
+import functools
+from dotenv import load_dotenv
+
+logger = logging.getLogger(__name__)
+
+# 환경 변수 로드
+load_dotenv()
+
+
+def _env_int(name, default):
+    """주석이 포함될 수 있는 정수 환경변수 로드"""
+    value = os.getenv(name, str(default)).split('#')[0].strip()
+    try:
+        return int(value)
+    except ValueError:
+        return default
+
+
+# 시작 시 프로파일링할 사이클 수 (0이면 비활성화)
+PROFILE_CYCLES = _env_int('PROFILE_CYCLES', 0)
+
+# 시그널(SIGUSR1) 수신 시 프로파일링할 사이클 수
+PROFILE_SIGNAL_CYCLES = _env_int('PROFILE_SIGNAL_CYCLES', 1)
+
+# 프로파일 방식: cprofile, sampling, both
+PROFILE_MODE = os.getenv('PROFILE_MODE', 'both').split('#')[0].strip().lower()
+
+# 프로파일 파일 저장 디렉토리와 최대 파일 수
+PROFILE_DIR = os.getenv('PROFILE_DIR', 'profiles').split('#')[0].strip()
+PROFILE_MAX_FILES = _env_int('PROFILE_MAX_FILES', 20)
+
+# 샘플링 간격 (밀리초)
+PROFILE_SAMPLE_INTERVAL_MS = _env_int('PROFILE_SAMPLE_INTERVAL_MS', 5)
+
+# 남은 프로파일링 사이클 수 (0이면 래퍼는 카운터 확인만 하고 바로 원 함수를 호출)
+_remaining = PROFILE_CYCLES
+_lock = threading.Lock()
+
+
+def arm(cycles=1):
+    """다음 N번의 체크 사이클을 프로파일링하도록 설정"""
+    global _remaining
+    with _lock:
+        _remaining += max(int(cycles), 0)
+    logger.info(f"다음 {cycles}회 체크 사이클을 프로파일링합니다. (저장 위치: {PROFILE_DIR})")
+
+
+def arm_from_argv(argv):
+    """커맨드라인의 --profile [N] 옵션 처리"""
+    if '--profile' not in argv:
+        return
+    index = argv.index('--profile')
+    cycles = 1
+    if index + 1 < len(argv) and argv[index + 1].isdigit():
+        cycles = int(argv[index + 1])
+    arm(cycles)
+
+
+def install_signal_handler(signum=None):
+    """실행 중인 스케줄러에 SIGUSR1을 보내면 다음 사이클부터 프로파일링"""
+    signum = signum or getattr(signal, 'SIGUSR1', None)
+    if signum is None or threading.current_thread() is not threading.main_thread():
+        return
+    signal.signal(signum, lambda *_: arm(PROFILE_SIGNAL_CYCLES))
+    logger.info(f"프로파일링 시그널 대기 중: kill -USR1 {os.getpid()}")
+
+
+def _take():
+    """프로파일링할 차례이면 카운터를 하나 줄이고 True 반환"""
+    global _remaining
+    with _lock:
+        if _remaining <= 0:
+            return False
+        _remaining -= 1
+        return True
+
+
+def claim():
+    """프로파일링할 차례를 가져감 (사이클을 다른 프로세스에서 실행할 때 그쪽에서 arm 하도록)"""
+    return _remaining > 0 and _take()
+
+
+class StackSampler:
+    """대상 스레드의 호출 스택을 주기적으로 수집해 collapsed stack 형식으로 집계"""
+
+    def __init__(self, thread_id, interval):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.counts = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            key = ";".join(reversed(stack))
+            self.counts[key] = self.counts.get(key, 0) + 1
+
+    def write(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in sorted(self.counts.items()):
+                f.write(f"{stack} {count}\n")
+
+
+def _prune_profiles():
+    """프로파일 디렉토리의 오래된 파일 정리 (최대 PROFILE_MAX_FILES개 유지)"""
+    try:
+        entries = [entry for entry in os.scandir(PROFILE_DIR) if entry.is_file()]
+        entries.sort(key=lambda entry: entry.stat().st_mtime)
+        for entry in entries[:-PROFILE_MAX_FILES] if PROFILE_MAX_FILES > 0 else entries:
+            os.remove(entry.path)
+    except Exception as e:
+        logger.warning(f"프로파일 파일 정리 중 오류 (무시됨): {str(e)}")
+
+
+def _run_profiled(name, func, args, kwargs):
+    """함수 한 번 실행을 프로파일링하고 결과 파일 저장"""
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    stamp = time.strftime('%Y%m%d_%H%M%S')
+    base = os.path.join(PROFILE_DIR, f"{name}_{stamp}_{os.getpid()}")
+
+    profile = None
+    sampler = None
+    if PROFILE_MODE in ('cprofile', 'both'):
+        import cProfile
+        profile = cProfile.Profile()
+    if PROFILE_MODE in ('sampling', 'both'):
+        sampler = StackSampler(threading.get_ident(), PROFILE_SAMPLE_INTERVAL_MS / 1000.0)
+        sampler.start()
+
+    start = time.perf_counter()
+    try:
+        if profile is not None:
+            return profile.runcall(func, *args, **kwargs)
+        return func(*args, **kwargs)
+    finally:
+        elapsed = time.perf_counter() - start
+        try:
+            if sampler is not None:
+                sampler.stop()
+                sampler.write(f"{base}.collapsed")
+            if profile is not None:
+                profile.dump_stats(f"{base}.prof")
+            logger.info(f"사이클 프로파일 저장: {base}.* ({elapsed:.2f}초)")
+        except Exception as e:
+            logger.warning(f"프로파일 저장 중 오류 (무시됨): {str(e)}")
+        _prune_profiles()
+
+
+def profiled(name):
+    """프로파일링이 설정된 경우에만 체크 함수를 프로파일링하는 데코레이터"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _remaining <= 0 or not _take():
+                return func(*args, **kwargs)
+            return _run_profiled(name, func, args, kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,199 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""모든 체커와 프로세스가 함께 쓰는 호스트별 요청 속도 제한 (토큰 버킷)
+
+    rate_limiter.acquire(BEARCREEK_URL)                # Selenium driver.get 직전
+    await rate_limiter.acquire_async(BEARCREEK_URL)    # Playwright goto 직전
+    session = rate_limiter.limit_session(requests.Session())  # requests/cloudscraper 요청마다
+
+버킷은 SQLite 파일(RATE_LIMIT_DB) 하나에 있으므로 스케줄러, 작업 프로세스, cron 단일 실행이
+모두 같은 한도를 나눠 쓴다. 토큰이 없으면 먼저 예약한 순서대로 기다린다.
+"""
+
+import os
+import time
+import sqlite3
+import logging
+import threading
+from urllib.parse import urlsplit
+from dotenv import load_dotenv
+import metrics
+
+logger = logging.getLogger(__name__)
+
+# 환경 변수 로드
+load_dotenv()
+
+
+def _env_float(name, default):
+    """주석이 포함될 수 있는 실수 환경변수 로드"""
+    value = os.getenv(name, str(default)).split('#')[0].strip()
+    try:
+        return float(value)
+    except ValueError:
+        return default
+
+
+# 호스트별 기본 한도: 분당 요청 수(0이면 제한 없음)와 연속으로 바로 보낼 수 있는 요청 수
+RATE_LIMIT_PER_MINUTE = _env_float('RATE_LIMIT_PER_MINUTE', 20)
+RATE_LIMIT_BURST = _env_float('RATE_LIMIT_BURST', 5)
+
+# 호스트별 한도 ('호스트=분당요청수:버스트', 쉼표로 구분, 예: www.bearcreek.co.kr=12:3)
+RATE_LIMIT_HOSTS = os.getenv('RATE_LIMIT_HOSTS', '').split('#')[0].strip()
+
+# 이보다 오래 기다려야 하면 요청하지 않고 RateLimitExceeded (체크 시간 제한에 걸리지 않도록)
+RATE_LIMIT_MAX_WAIT_SECONDS = _env_float('RATE_LIMIT_MAX_WAIT_SECONDS', 60)
+
+# 버킷 상태를 공유하는 파일
+RATE_LIMIT_DB = os.getenv('RATE_LIMIT_DB', 'rate_limit.sqlite').split('#')[0].strip()
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS buckets (
+    host TEXT PRIMARY KEY,
+    tokens REAL NOT NULL,
+    updated REAL NOT NULL
+);
+"""
+
+RATE_LIMIT_WAIT_METRIC = 'bearcreek_rate_limit_wait_seconds'
+RATE_LIMIT_REQUESTS_METRIC = 'bearcreek_rate_limit_requests_total'
+
+metrics.describe(RATE_LIMIT_WAIT_METRIC, 'histogram', '요청 속도 제한으로 기다린 시간 (초)')
+metrics.describe(RATE_LIMIT_REQUESTS_METRIC, 'counter', '속도 제한을 거친 요청 수 (result=immediate|delayed|rejected)')
+
+_lock = threading.RLock()
+_conn = None
+
+
+class RateLimitExceeded(RuntimeError):
+    """대기 시간이 RATE_LIMIT_MAX_WAIT_SECONDS를 넘어 요청을 포기함"""
+
+
+def _parse_hosts(value):
+    """RATE_LIMIT_HOSTS -> {호스트: (분당 요청 수, 버스트)}"""
+    limits = {}
+    for item in value.split(','):
+        host, _, limit = item.strip().partition('=')
+        if not host or not limit:
+            continue
+        rate, _, burst = limit.partition(':')
+        try:
+            limits[host.strip().lower()] = (float(rate), float(burst) if burst else RATE_LIMIT_BURST)
+        except ValueError:
+            logger.warning(f"RATE_LIMIT_HOSTS 항목을 무시합니다: {item.strip()}")
+    return limits
+
+
+HOST_LIMITS = _parse_hosts(RATE_LIMIT_HOSTS)
+
+
+def host_of(url):
+    """URL(또는 호스트 이름)에서 호스트"""
+    if '://' not in url:
+        return url.lower()
+    return (urlsplit(url).hostname or '').lower()
+
+
+def limits_for(host):
+    """호스트의 (분당 요청 수, 버스트)"""
+    return HOST_LIMITS.get(host, (RATE_LIMIT_PER_MINUTE, RATE_LIMIT_BURST))
+
+
+def _connect():
+    """버킷 파일 연결 (트랜잭션은 reserve에서 직접 시작)"""
+    global _conn
+    if _conn is None:
+        directory = os.path.dirname(RATE_LIMIT_DB)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        _conn = sqlite3.connect(RATE_LIMIT_DB, timeout=10, check_same_thread=False, isolation_level=None)
+        _conn.execute('PRAGMA journal_mode=WAL')
+        _conn.execute('PRAGMA synchronous=NORMAL')
+        _conn.executescript(SCHEMA)
+    return _conn
+
+
+def reserve(host, max_wait=None):
+    """토큰 하나를 예약하고 보내기 전까지 기다릴 시간(초) 반환
+
+    토큰이 모자라면 빚으로 예약하므로 기다리는 요청들은 예약한 순서대로 나간다.
+    """
+    rate_per_minute, burst = limits_for(host)
+    if rate_per_minute <= 0:
+        return 0.0
+    rate = rate_per_minute / 60
+    max_wait = RATE_LIMIT_MAX_WAIT_SECONDS if max_wait is None else max_wait
+    with _lock:
+        conn = _connect()
+        # 다른 프로세스의 예약과 겹치지 않도록 쓰기 잠금을 먼저 잡음
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute('SELECT tokens, updated FROM buckets WHERE host = ?', (host,)).fetchone()
+            now = time.time()
+            if row is None:
+                tokens = burst
+            else:
+                tokens = min(burst, row[0] + max(now - row[1], 0) * rate)
+            wait = max(1 - tokens, 0) / rate
+            if wait > max_wait:
+                conn.execute('ROLLBACK')
+                metrics.inc(RATE_LIMIT_REQUESTS_METRIC, host=host, result='rejected')
+                raise RateLimitExceeded(f"{host} 요청 한도 초과: {wait:.1f}초 대기 필요 (최대 {max_wait:g}초)")
+            conn.execute(
+                'INSERT INTO buckets (host, tokens, updated) VALUES (?, ?, ?) '
+                'ON CONFLICT(host) DO UPDATE SET tokens = excluded.tokens, updated = excluded.updated',
+                (host, tokens - 1, now),
+            )
+            conn.execute('COMMIT')
+        except sqlite3.Error:
+            conn.execute('ROLLBACK')
+            raise
+    metrics.inc(RATE_LIMIT_REQUESTS_METRIC, host=host, result='delayed' if wait > 0 else 'immediate')
+    metrics.observe(RATE_LIMIT_WAIT_METRIC, wait, host=host)
+    return wait
+
+
+def _reserve_or_pass(url):
+    """예약 (버킷 파일 오류 시에는 제한 없이 진행)"""
+    host = host_of(url)
+    try:
+        return host, reserve(host)
+    except sqlite3.Error as e:
+        logger.warning(f"요청 속도 제한 확인 실패 (제한 없이 진행): {str(e)}")
+        return host, 0.0
+
+
+def acquire(url):
+    """요청 전에 호출: 한도에 맞을 때까지 기다림 (기다린 시간 반환)"""
+    host, wait = _reserve_or_pass(url)
+    if wait > 0:
+        logger.info(f"요청 속도 제한: {host} 요청 전 {wait:.1f}초 대기")
+        with metrics.span('rate_limit'):
+            time.sleep(wait)
+    return wait
+
+
+async def acquire_async(url):
+    """비동기 코드용 acquire (이벤트 루프를 막지 않고 기다림)"""
+    import asyncio
+    host, wait = _reserve_or_pass(url)
+    if wait > 0:
+        logger.info(f"요청 속도 제한: {host} 요청 전 {wait:.1f}초 대기")
+        with metrics.span('rate_limit'):
+            await asyncio.sleep(wait)
+    return wait
+
+
+def limit_session(session):
+    """requests/cloudscraper 세션의 모든 전송(리디렉션, 챌린지 재요청 포함)에 속도 제한 적용"""
+    if getattr(session, '_rate_limited', False):
+        return session
+    send = session.send
+
+    def limited_send(request, **kwargs):
+        acquire(request.url)
+        return send(request, **kwargs)
+
+    session.send = limited_send
+    session._rate_limited = True
+    return session
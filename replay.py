@@ -0,0 +1,249 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""보관된 페이지를 실제 체크와 같은 추출/비교 코드로 다시 돌리는 재생 도구
+
+    python bearcreek.py replay artifacts/ saved_pages/          # 디렉토리의 page_source.html, time_page_*.html 등
+    python bearcreek.py replay --since 2025-03-01 --kind reservation   # 스냅샷 보관소 (ARCHIVE_DIR)
+    python bearcreek.py replay saved_pages/ --all --output events.jsonl
+
+페이지마다 page_parser로 날짜/시간을 뽑고 live_board와 같은 방식으로 직전 페이지와 비교해
+새로 열린/닫힌 슬롯을 이벤트(JSON lines)로 출력한다. 추출은 프로세스 풀에서 병렬로 실행하고,
+같은 내용(보관소의 같은 blob)은 한 번만 추출한다. 끝나면 처리량(pages/sec)을 표준 오류로 보고한다.
+"""
+
+import os
+import re
+import sys
+import gzip
+import json
+import time
+import datetime
+import collections
+import concurrent.futures
+from dotenv import load_dotenv
+import page_parser
+import live_board
+
+# 환경 변수 로드
+load_dotenv()
+
+
+def _env_int(name, default):
+    """주석이 포함될 수 있는 정수 환경변수 로드"""
+    value = os.getenv(name, str(default)).split('#')[0].strip()
+    try:
+        return int(value)
+    except ValueError:
+        return default
+
+
+MONTH = int(os.getenv('MONTH', '4').replace('%', ''))
+YEAR = int(os.getenv('YEAR', '2025').replace('%', ''))
+
+# 추출 작업 프로세스 수 (0이면 CPU 수)와 작업 프로세스에 한 번에 넘기는 페이지 수
+REPLAY_WORKERS = _env_int('REPLAY_WORKERS', 0)
+REPLAY_CHUNK_SIZE = _env_int('REPLAY_CHUNK_SIZE', 16)
+
+# 페이지 종류 (스냅샷 보관소의 target과 같은 이름)
+KINDS = ('reservation', 'tee_times', 'calendar_data')
+
+# 예약 페이지 추출 방식: title (Selenium 체커), calendar (Playwright/CloudScraper 체커)
+PARSERS = {
+    'title': page_parser.title_dates,
+    'calendar': page_parser.calendar_dates,
+}
+
+# 디버깅 파일 이름 -> (종류, 예약 페이지 추출 방식) - 압축 확장자(.gz, .zst)는 떼고 비교
+FILE_PATTERNS = (
+    (re.compile(r'^page_source.*\.html?$'), 'reservation', 'title'),
+    (re.compile(r'^(?:main_page|bearcreek_main).*\.html?$'), 'reservation', 'calendar'),
+    (re.compile(r'^time_page_(?P<date>\d{4}-\d{2}-\d{2}).*\.html?$'), 'tee_times', None),
+    (re.compile(r'^calendar_data_.*\.(?:html?|txt)$'), 'calendar_data', None),
+)
+
+# 재생할 페이지 하나 (source_type: file|blob, date: 시간 조회 페이지의 날짜)
+Page = collections.namedtuple('Page', 'time kind parser date source_type source')
+
+
+def classify(name):
+    """파일 이름 -> (종류, 예약 페이지 추출 방식, 날짜), 재생 대상이 아니면 None"""
+    base = name
+    for suffix in ('.gz', '.zst'):
+        if base.endswith(suffix):
+            base = base[:-len(suffix)]
+    for pattern, kind, parser in FILE_PATTERNS:
+        match = pattern.match(base)
+        if match:
+            return kind, parser, match.groupdict().get('date')
+    return None
+
+
+def collect_files(paths, kind=None, parser=None):
+    """파일/디렉토리(하위 포함)에서 재생할 페이지를 수정 시각 순으로 수집"""
+    pages = []
+    for path in paths:
+        if os.path.isdir(path):
+            candidates = (os.path.join(root, name) for root, _, names in os.walk(path) for name in names)
+        else:
+            candidates = [path]
+        for candidate in candidates:
+            found = classify(os.path.basename(candidate))
+            if found is None or (kind and found[0] != kind):
+                continue
+            page_kind, page_parser_name, date = found
+            if page_kind == 'reservation' and parser:
+                page_parser_name = parser
+            pages.append(Page(os.path.getmtime(candidate), page_kind, page_parser_name, date, 'file', candidate))
+    pages.sort(key=lambda page: (page.time, page.source))
+    return pages
+
+
+def collect_archive(kind=None, parser=None, since=None, limit=None):
+    """스냅샷 보관소의 스냅샷을 시간 순으로 수집"""
+    import snapshot_archive
+    pages = []
+    for when, target, digest in snapshot_archive.history(kind, since, limit):
+        if target not in KINDS:
+            continue
+        page_parser_name = (parser or 'calendar') if target == 'reservation' else None
+        pages.append(Page(when, target, page_parser_name, None, 'blob', digest))
+    return pages
+
+
+def _read(source_type, source):
+    """페이지 본문 읽기 (디버깅 파일의 gzip/zstd 압축 해제 포함)"""
+    if source_type == 'blob':
+        import snapshot_archive
+        return snapshot_archive.load(source, touch=False)
+    with open(source, 'rb') as f:
+        data = f.read()
+    if source.endswith('.gz'):
+        data = gzip.decompress(data)
+    elif source.endswith('.zst'):
+        import zstandard
+        data = zstandard.ZstdDecompressor().decompress(data)
+    return data.decode('utf-8', errors='replace')
+
+
+def extract(kind, text, parser=None, date=None, year=YEAR, month=MONTH):
+    """페이지 본문에서 슬롯 추출 ({날짜: [시간, ...]}, live_board와 같은 형태)"""
+    if kind == 'reservation':
+        dates = PARSERS[parser or 'calendar'](text, year, month)
+        if dates is None:
+            raise ValueError("달력 테이블을 찾을 수 없습니다.")
+        return live_board.normalize_slots(dates)
+    if kind == 'tee_times':
+        # 날짜를 모르는 시간 조회 페이지(보관소)는 빈 키로 묶음
+        return live_board.normalize_slots({date or '': page_parser.tee_times(text)})
+    if kind == 'calendar_data':
+        return live_board.normalize_slots(page_parser.calendar_data_dates(text))
+    raise ValueError(f"알 수 없는 페이지 종류: {kind}")
+
+
+def extract_page(job):
+    """작업 프로세스에서 실행: (종류, 추출 방식, 날짜, 출처 종류, 출처, 년, 월) -> (슬롯, 오류, 본문 크기)"""
+    kind, parser, date, source_type, source, year, month = job
+    try:
+        text = _read(source_type, source)
+    except Exception as e:
+        return None, f"읽기 실패: {type(e).__name__}: {e}", 0
+    try:
+        return extract(kind, text, parser, date, year, month), None, len(text)
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}", len(text)
+
+
+def _job(page, year, month):
+    return page.kind, page.parser, page.date, page.source_type, page.source, year, month
+
+
+def _stream_key(page):
+    """비교 기준이 되는 직전 페이지의 묶음 (종류, 예약 페이지 추출 방식, 시간 조회 날짜)"""
+    return page.kind, page.parser, page.date
+
+
+def replay(pages, workers=None, chunksize=None, year=YEAR, month=MONTH, emit=None, emit_all=False):
+    """페이지를 시간 순으로 재생하며 이벤트를 emit(dict)에 넘기고 요약 반환"""
+    workers = workers or REPLAY_WORKERS or os.cpu_count() or 1
+    chunksize = max(chunksize or REPLAY_CHUNK_SIZE, 1)
+    # 같은 내용은 한 번만 추출 (보관소는 같은 페이지가 같은 blob을 가리킴)
+    jobs = list(dict.fromkeys(_job(page, year, month) for page in pages))
+    index = {job: i for i, job in enumerate(jobs)}
+    started = time.monotonic()
+    executor = concurrent.futures.ProcessPoolExecutor(max_workers=workers) if workers > 1 and len(jobs) > 1 else None
+    summary = {'pages': len(pages), 'parsed': len(jobs), 'errors': 0, 'events': 0, 'bytes': 0,
+               'workers': workers if executor else 1}
+    try:
+        # map은 입력 순서대로 결과를 돌려주므로 앞 페이지 결과가 나오는 대로 바로 비교/출력
+        results = executor.map(extract_page, jobs, chunksize=chunksize) if executor else map(extract_page, jobs)
+        done = []
+        state = {}
+        for page in pages:
+            position = index[_job(page, year, month)]
+            while len(done) <= position:
+                done.append(next(results))
+                summary['bytes'] += done[-1][2]
+            slots, error, _ = done[position]
+            event = {
+                'time': datetime.datetime.fromtimestamp(page.time).isoformat(timespec='seconds'),
+                'kind': page.kind,
+                'source': page.source if page.source_type == 'file' else f"archive:{page.source[:12]}",
+            }
+            if error is not None:
+                # 추출에 실패한 페이지(챌린지 페이지 등)는 직전 상태를 바꾸지 않음
+                summary['errors'] += 1
+                event['error'] = error
+            else:
+                key = _stream_key(page)
+                previous = state.get(key)
+                event['new'] = live_board.find_new_slots(previous, slots)
+                event['removed'] = live_board.find_new_slots(slots, previous) if previous is not None else {}
+                state[key] = slots
+                if previous is not None and not event['new'] and not event['removed'] and not emit_all:
+                    continue
+                event['slots'] = slots
+            summary['events'] += 1
+            if emit is not None:
+                emit(event)
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+    summary['seconds'] = time.monotonic() - started
+    summary['pages_per_second'] = summary['pages'] / summary['seconds'] if summary['seconds'] > 0 else 0.0
+    return summary
+
+
+def _parse_since(value):
+    """'2025-03-01' 또는 '2025-03-01T09:00' -> 타임스탬프"""
+    return datetime.datetime.fromisoformat(value).timestamp() if value else None
+
+
+def main(paths=None, kind=None, parser=None, since=None, limit=None, workers=None, output=None, emit_all=False,
+         year=YEAR, month=MONTH):
+    """재생 실행: 경로를 주면 디렉토리/파일, 없으면 스냅샷 보관소"""
+    if paths:
+        pages = collect_files(paths, kind, parser)
+    else:
+        pages = collect_archive(kind, parser, _parse_since(since), limit)
+    if not pages:
+        print("재생할 페이지가 없습니다.", file=sys.stderr)
+        return 1
+
+    out = open(output, 'w', encoding='utf-8') if output else sys.stdout
+    try:
+        def emit(event):
+            out.write(json.dumps(event, ensure_ascii=False) + '\n')
+        summary = replay(pages, workers, year=year, month=month, emit=emit, emit_all=emit_all)
+    finally:
+        if output:
+            out.close()
+        else:
+            out.flush()
+    print(
+        f"재생 완료: 페이지 {summary['pages']}개 (추출 {summary['parsed']}개, 오류 {summary['errors']}개), "
+        f"이벤트 {summary['events']}개, {summary['seconds']:.2f}초, "
+        f"{summary['pages_per_second']:.1f} pages/sec, {summary['bytes'] / 1024 / 1024 / max(summary['seconds'], 1e-9):.1f} MB/s "
+        f"(작업 프로세스 {summary['workers']}개)",
+        file=sys.stderr,
+    )
+    return 0
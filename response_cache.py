@@ -0,0 +1,140 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""같은 (엔드포인트, 파라미터) 응답을 짧은 시간 동안 공유하는 응답 캐시 (single-flight)
+
+    dates = response_cache.fetch(BEARCREEK_AJAX_URL, params, load, parse=parse_calendar_data)
+
+- TTL 안에 다시 요청하면 저장된 본문을 씀 (hit)
+- 같은 키를 다른 스레드가 이미 받아오는 중이면 그 요청이 끝나기를 기다려 결과를 나눠 씀 (coalesced)
+- 파싱 결과도 (키, parse 함수)마다 한 번만 계산해 공유
+
+데몬에서 여러 체크 서비스가 같은 달을 보더라도 사이트에는 한 번만 요청한다.
+"""
+
+import os
+import time
+import logging
+import threading
+from urllib.parse import urlsplit
+from dotenv import load_dotenv
+import metrics
+
+logger = logging.getLogger(__name__)
+
+# 환경 변수 로드
+load_dotenv()
+
+
+def _env_float(name, default):
+    """주석이 포함될 수 있는 실수 환경변수 로드"""
+    value = os.getenv(name, str(default)).split('#')[0].strip()
+    try:
+        return float(value)
+    except ValueError:
+        return default
+
+
+# 응답을 공유하는 시간 (초, 0이면 저장하지 않고 동시 요청만 합침)
+RESPONSE_CACHE_TTL_SECONDS = _env_float('RESPONSE_CACHE_TTL_SECONDS', 30)
+
+RESPONSE_CACHE_REQUESTS_METRIC = 'bearcreek_response_cache_requests_total'
+
+metrics.describe(RESPONSE_CACHE_REQUESTS_METRIC, 'counter', '응답 캐시 요청 수 (result=hit|miss|coalesced)')
+
+_lock = threading.Lock()
+_entries = {}  # 키 -> _Entry
+_flights = {}  # 키 -> 진행 중인 _Flight
+
+
+class _Entry:
+    def __init__(self, body, expires):
+        self.body = body
+        self.expires = expires
+        self.parsed = {}
+
+
+class _Flight:
+    """진행 중인 요청 하나 (끝나면 done이 설정되고 entry 또는 error가 채워짐)"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.entry = None
+        self.error = None
+
+
+def make_key(endpoint, params=None):
+    """(엔드포인트, 정렬된 파라미터) - URL 조각(#...)은 요청에 포함되지 않으므로 제외"""
+    return endpoint.split('#')[0], tuple(sorted((params or {}).items()))
+
+
+def _endpoint_label(endpoint):
+    """메트릭 라벨용 엔드포인트 이름 (경로 마지막 부분)"""
+    return urlsplit(endpoint).path.rsplit('/', 1)[-1] or endpoint
+
+
+def _parse(entry, parse):
+    """파싱 결과를 항목에 저장해 같은 본문을 다시 파싱하지 않음"""
+    if parse is None or entry.body is None:
+        return entry.body
+    if parse not in entry.parsed:
+        value = parse(entry.body)
+        with _lock:
+            entry.parsed.setdefault(parse, value)
+    return entry.parsed[parse]
+
+
+def fetch(endpoint, params, load, parse=None, ttl=None):
+    """(endpoint, params)의 응답 본문(load 반환값)을 공유하고 parse 결과 반환
+
+    load: 실제 요청 함수, 응답 본문 반환 (실패 시 None - 기다리던 요청에는 전달하되 저장하지 않음)
+    parse: 본문 -> 파싱 결과 (None이면 본문 그대로)
+    """
+    ttl = RESPONSE_CACHE_TTL_SECONDS if ttl is None else ttl
+    key = make_key(endpoint, params)
+    label = _endpoint_label(endpoint)
+    with _lock:
+        now = time.monotonic()
+        # 만료된 항목 정리
+        for expired in [k for k, entry in _entries.items() if entry.expires <= now]:
+            del _entries[expired]
+        entry = _entries.get(key)
+        flight = None
+        if entry is None:
+            flight = _flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = _flights[key] = _Flight()
+
+    if entry is not None:
+        metrics.inc(RESPONSE_CACHE_REQUESTS_METRIC, endpoint=label, result='hit')
+        logger.debug("응답 캐시 사용: %s", label)
+        return _parse(entry, parse)
+
+    if not leader:
+        metrics.inc(RESPONSE_CACHE_REQUESTS_METRIC, endpoint=label, result='coalesced')
+        logger.info(f"진행 중인 {label} 요청의 결과를 기다립니다.")
+        flight.done.wait()
+        if flight.error is not None:
+            raise flight.error
+        return _parse(flight.entry, parse)
+
+    metrics.inc(RESPONSE_CACHE_REQUESTS_METRIC, endpoint=label, result='miss')
+    try:
+        body = load()
+        flight.entry = _Entry(body, time.monotonic() + ttl)
+    except BaseException as e:
+        flight.error = e
+        raise
+    finally:
+        with _lock:
+            del _flights[key]
+            if flight.entry is not None and flight.entry.body is not None and ttl > 0:
+                _entries[key] = flight.entry
+        flight.done.set()
+    return _parse(flight.entry, parse)
+
+
+def clear():
+    """저장된 응답 모두 삭제 (진행 중인 요청은 그대로)"""
+    with _lock:
+        _entries.clear()
@@ -3,21 +3,17 @@
 
 import os
 import time
-import glob
 import logging
-import datetime
-import sys
 import schedule
+import log_setup
+import artifacts
+import artifact_catalog
+import log_rotation
+import profile_manager
+import disk_monitor
 
-# 로그 설정
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('cleaner.log', encoding='utf-8'),
-        logging.StreamHandler()
-    ]
-)
+# 로그 설정 (큐 기반 비동기 로깅, 파일은 JSON lines 형식)
+log_setup.setup_logging('cleaner.log')
 logger = logging.getLogger(__name__)
 
 def cleanup_system():
@@ -27,51 +23,35 @@ def cleanup_system():
     # 현재 디렉토리
     current_dir = os.path.dirname(os.path.abspath(__file__))
     
-    # 먼저 디스크 사용량 체크
-    disk_usage_percent = 0
-    free_space_mb = 0
-    if sys.platform == 'linux':
-        try:
-            statvfs = os.statvfs('/')
-            free_space_mb = (statvfs.f_frsize * statvfs.f_bavail) / (1024 * 1024)
-            disk_usage_percent = 100 - (statvfs.f_bavail / statvfs.f_blocks * 100)
-            logger.info(f'디스크 여유 공간: {free_space_mb:.2f}MB ({disk_usage_percent:.1f}% 사용 중)')
-        except Exception as e:
-            logger.error(f'디스크 공간 확인 오류: {e}')
+    # 먼저 디스크 사용량 체크 (압박 단계가 올라가면 구독한 모듈들이 스스로 정리)
+    pressure = disk_monitor.OK
+    try:
+        pressure = disk_monitor.check(current_dir)
+        logger.info(f'디스크 상태: {disk_monitor.describe()}')
+    except Exception as e:
+        logger.error(f'디스크 공간 확인 오류: {e}')
     
-    # 오래된 이미지 및 HTML 파일 삭제
-    total_removed = 0
-    patterns = ['*.png', '*.html']
-    for pattern in patterns:
-        files = glob.glob(os.path.join(current_dir, pattern))
-        for file_path in files:
-            try:
-                os.remove(file_path)
-                logger.info(f'파일 삭제: {file_path}')
-                total_removed += 1
-            except Exception as e:
-                logger.error(f'파일 삭제 오류: {file_path} - {e}')
+    # 디버깅 파일 정리 (카탈로그 조회로 기간/크기 상한을 넘는 파일만 삭제)
+    # 카탈로그가 비어 있으면 도입 전부터 있던 파일을 한 번 등록
+    artifact_catalog.bootstrap([
+        (current_dir, ['*.png', '*.html']),
+        (os.path.join(current_dir, artifacts.ARTIFACT_DIR), ['*']),
+    ])
+    total_removed, _ = artifact_catalog.enforce()
     
-    # 로그 로테이션
-    log_files = ['bearcreek_checker.log', 'bearcreek.log', 'new_log.txt', 'final_log.txt', 'starter.log']
-    for log_file in log_files:
-        log_path = os.path.join(current_dir, log_file)
-        if os.path.exists(log_path):
-            try:
-                with open(log_path, 'w') as f:
-                    f.write(f'로그 정리됨: {datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")}\n')
-                logger.info(f'로그 파일 정리: {log_file}')
-            except Exception as e:
-                logger.error(f'로그 파일 정리 오류: {log_file} - {e}')
+    # 로그 로테이션 (이름 바꾸기 + 백그라운드 스트리밍 압축, N세대 유지)
+    log_rotation.rotate_logs(
+        log_rotation.DEFAULT_LOG_FILES + ('new_log.txt', 'final_log.txt', 'starter.log'),
+        directory=current_dir,
+    )
     
-    # Chrome 임시 파일 정리
-    os.system('rm -rf /tmp/.com.google.Chrome* /tmp/chromedriver* /tmp/.org.chromium.Chromium* 2>/dev/null')
-    os.system('rm -rf /tmp/junk* /tmp/scoped_dir* 2>/dev/null')
+    # Chrome 임시 파일 정리 (소유 프로세스가 끝났거나 오래 남은 프로필 디렉토리만 회수)
+    profile_manager.reclaim()
     os.system('rm -rf ~/.cache/chromium/* ~/.cache/google-chrome/* 2>/dev/null')
     logger.info('Chrome 임시 파일 정리 완료')
     
-    # Snap 패키지 정리 - 디스크 사용량이 높을 때만 실행
-    if disk_usage_percent > 80:
+    # Snap 패키지 정리 - 디스크 압박 단계가 warning 이상일 때만 실행
+    if pressure >= disk_monitor.WARNING:
         try:
             logger.info('디스크 사용량이 높아 스냅 패키지 정리를 시도합니다')
             
@@ -104,14 +84,11 @@ def cleanup_system():
         logger.info('디스크 사용량이 정상 범위 내에 있어 스냅 정리를 건너뜁니다')
     
     # 최종 디스크 사용량 체크
-    if sys.platform == 'linux':
-        try:
-            statvfs = os.statvfs(current_dir)
-            free_space_mb = (statvfs.f_frsize * statvfs.f_bavail) / (1024 * 1024)
-            used_percent = 100 - (statvfs.f_bavail / statvfs.f_blocks * 100)
-            logger.info(f'정리 후 디스크 여유 공간: {free_space_mb:.2f}MB ({used_percent:.1f}% 사용 중)')
-        except Exception as e:
-            logger.error(f'디스크 공간 확인 오류: {e}')
+    try:
+        disk_monitor.check(current_dir)
+        logger.info(f'정리 후 디스크 상태: {disk_monitor.describe()}')
+    except Exception as e:
+        logger.error(f'디스크 공간 확인 오류: {e}')
     
     logger.info(f'시스템 정리 완료: {total_removed}개 파일 삭제됨')
     return total_removed
@@ -119,6 +96,12 @@ def cleanup_system():
 if __name__ == '__main__':
     logger.info('시스템 정리 스크립트 시작')
     
+    # 우리 코드 밖에서 생긴 디버깅 파일도 카탈로그에 반영 (ARTIFACT_INOTIFY=1)
+    artifact_catalog.start_watcher([artifacts.ARTIFACT_DIR])
+    
+    # 디스크 압박 감시 시작 (정리 주기 사이에도 압박 단계에 따라 대응)
+    disk_monitor.start()
+    
     # 즉시 한 번 실행
     cleanup_system()
     
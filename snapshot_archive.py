@@ -0,0 +1,343 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import re
+import gzip
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from dotenv import load_dotenv
+import metrics
+import disk_monitor
+
+logger = logging.getLogger(__name__)
+
+# 환경 변수 로드
+load_dotenv()
+
+
+def _env_float(name, default):
+    """주석이 포함될 수 있는 실수 환경변수 로드"""
+    value = os.getenv(name, str(default)).split('#')[0].strip()
+    try:
+        return float(value)
+    except ValueError:
+        return default
+
+
+# 페이지 스냅샷 보관소 디렉토리 (blobs/, dicts/, index.sqlite)
+ARCHIVE_DIR = os.getenv('ARCHIVE_DIR', 'archive').split('#')[0].strip()
+
+# 보관소 전체 크기 상한 (MB, 압축 후 기준) - 넘으면 가장 오래 쓰이지 않은 blob부터 삭제
+ARCHIVE_MAX_MB = _env_float('ARCHIVE_MAX_MB', 200)
+
+# 스냅샷 보관 기간 (일, 0이면 기간 제한 없음)
+ARCHIVE_MAX_AGE_DAYS = _env_float('ARCHIVE_MAX_AGE_DAYS', 30)
+
+# zstd 사전 학습에 사용할 blob 수 (이만큼 쌓이면 한 번 학습)
+ARCHIVE_DICT_SAMPLES = int(_env_float('ARCHIVE_DICT_SAMPLES', 32))
+
+# zstd 사전 크기 (바이트)와 압축 레벨
+ARCHIVE_DICT_SIZE = int(_env_float('ARCHIVE_DICT_SIZE', 112 * 1024))
+ARCHIVE_ZSTD_LEVEL = int(_env_float('ARCHIVE_ZSTD_LEVEL', 10))
+
+# 기간 만료 정리 간격 (초)
+PRUNE_INTERVAL_SECONDS = 3600
+
+ARCHIVE_SNAPSHOT_METRIC = 'bearcreek_archive_snapshots_total'
+ARCHIVE_BYTES_METRIC = 'bearcreek_archive_bytes'
+ARCHIVE_BLOBS_METRIC = 'bearcreek_archive_blobs'
+ARCHIVE_EVICTED_METRIC = 'bearcreek_archive_evicted_blobs_total'
+
+metrics.describe(ARCHIVE_SNAPSHOT_METRIC, 'counter', '보관한 페이지 스냅샷 수 (result=new|dedup)')
+metrics.describe(ARCHIVE_BYTES_METRIC, 'gauge', '스냅샷 보관소 크기 (바이트, kind=raw|stored)')
+metrics.describe(ARCHIVE_BLOBS_METRIC, 'gauge', '스냅샷 보관소의 고유 blob 수')
+metrics.describe(ARCHIVE_EVICTED_METRIC, 'counter', '크기/기간 제한으로 삭제한 blob 수')
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# 매 요청마다 바뀌는 ASP.NET 숨김 필드 (값을 비워 같은 페이지가 같은 해시를 갖도록 함)
+VOLATILE_FIELDS = ('__VIEWSTATE', '__VIEWSTATEGENERATOR', '__EVENTVALIDATION', '__PREVIOUSPAGE', '__REQUESTDIGEST')
+_INPUT_TAG = re.compile(r'<input\b[^>]*>', re.IGNORECASE)
+_VOLATILE_NAME = re.compile(r'\b(?:name|id)\s*=\s*["\'](?:%s)["\']' % '|'.join(VOLATILE_FIELDS), re.IGNORECASE)
+_VALUE_ATTR = re.compile(r'(\bvalue\s*=\s*)(["\']).*?\2', re.IGNORECASE | re.DOTALL)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    hash TEXT PRIMARY KEY,
+    codec TEXT NOT NULL,
+    dict_id INTEGER,
+    raw_size INTEGER NOT NULL,
+    stored_size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY,
+    time REAL NOT NULL,
+    target TEXT NOT NULL,
+    hash TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS snapshots_target_time ON snapshots(target, time);
+CREATE INDEX IF NOT EXISTS snapshots_hash ON snapshots(hash);
+CREATE INDEX IF NOT EXISTS blobs_last_used ON blobs(last_used);
+"""
+
+_lock = threading.RLock()
+_conn = None
+_dicts = {}
+_current_dict_id = None
+_last_prune = 0.0
+
+
+def normalize_html(html):
+    """해시 계산 전 매 요청마다 달라지는 부분(뷰스테이트 등) 제거"""
+    def strip_value(match):
+        tag = match.group(0)
+        if not _VOLATILE_NAME.search(tag):
+            return tag
+        return _VALUE_ATTR.sub(r'\1\2\2', tag)
+    return _INPUT_TAG.sub(strip_value, html)
+
+
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def _connect():
+    """보관소 인덱스 연결 (처음 호출 시 스키마와 사전 로드)"""
+    global _conn, _current_dict_id
+    if _conn is None:
+        os.makedirs(os.path.join(ARCHIVE_DIR, 'blobs'), exist_ok=True)
+        _conn = sqlite3.connect(os.path.join(ARCHIVE_DIR, 'index.sqlite'), check_same_thread=False)
+        _conn.execute('PRAGMA journal_mode=WAL')
+        _conn.execute('PRAGMA synchronous=NORMAL')
+        _conn.executescript(SCHEMA)
+        _current_dict_id = _load_dicts()
+    return _conn
+
+
+def _dict_dir():
+    return os.path.join(ARCHIVE_DIR, 'dicts')
+
+
+def _load_dicts():
+    """저장된 zstd 사전 로드 후 가장 최근 사전 ID 반환"""
+    if zstandard is None or not os.path.isdir(_dict_dir()):
+        return None
+    latest = None
+    for name in sorted(os.listdir(_dict_dir())):
+        if not name.endswith('.dict'):
+            continue
+        with open(os.path.join(_dict_dir(), name), 'rb') as f:
+            dictionary = zstandard.ZstdCompressionDict(f.read())
+        _dicts[dictionary.dict_id()] = dictionary
+        latest = dictionary.dict_id()
+    return latest
+
+
+def _blob_path(digest, codec):
+    suffix = {'zstd': '.zst', 'gzip': '.gz'}[codec]
+    return os.path.join(ARCHIVE_DIR, 'blobs', digest[:2], digest + suffix)
+
+
+def _compress(data):
+    """(codec, dict_id, 압축 데이터) - zstandard가 없으면 gzip"""
+    if zstandard is None:
+        return 'gzip', None, gzip.compress(data, compresslevel=9)
+    dictionary = _dicts.get(_current_dict_id)
+    compressor = zstandard.ZstdCompressor(level=ARCHIVE_ZSTD_LEVEL, dict_data=dictionary) if dictionary else zstandard.ZstdCompressor(level=ARCHIVE_ZSTD_LEVEL)
+    return 'zstd', _current_dict_id if dictionary else None, compressor.compress(data)
+
+
+def _decompress(codec, dict_id, data):
+    if codec == 'gzip':
+        return gzip.decompress(data)
+    if zstandard is None:
+        raise RuntimeError("zstd로 압축된 스냅샷을 읽으려면 zstandard 패키지가 필요합니다.")
+    dictionary = _dicts.get(dict_id) if dict_id else None
+    if dict_id and dictionary is None:
+        raise RuntimeError(f"zstd 사전을 찾을 수 없습니다: {dict_id}")
+    decompressor = zstandard.ZstdDecompressor(dict_data=dictionary) if dictionary else zstandard.ZstdDecompressor()
+    return decompressor.decompress(data)
+
+
+def archive(target, html, when=None):
+    """페이지 스냅샷 보관 (정규화 후 같은 내용은 한 번만 저장), blob 해시 반환"""
+    when = when or time.time()
+    data = normalize_html(html).encode('utf-8') if isinstance(html, str) else html
+    digest = content_hash(data)
+    with _lock:
+        conn = _connect()
+        exists = conn.execute('SELECT 1 FROM blobs WHERE hash = ?', (digest,)).fetchone()
+        if exists:
+            conn.execute('UPDATE blobs SET last_used = ? WHERE hash = ?', (when, digest))
+        else:
+            codec, dict_id, payload = _compress(data)
+            path = _blob_path(digest, codec)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+            conn.execute(
+                'INSERT INTO blobs (hash, codec, dict_id, raw_size, stored_size, created, last_used) VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (digest, codec, dict_id, len(data), len(payload), when, when),
+            )
+        conn.execute('INSERT INTO snapshots (time, target, hash) VALUES (?, ?, ?)', (when, target, digest))
+        conn.commit()
+        metrics.inc(ARCHIVE_SNAPSHOT_METRIC, result='dedup' if exists else 'new')
+        if not exists:
+            _maybe_train_dictionary()
+            enforce_limits()
+    return digest
+
+
+def load(digest, touch=True):
+    """blob 해시로 정규화된 페이지 내용 읽기 (touch=False면 사용 시각을 갱신하지 않는 읽기 전용 조회)"""
+    with _lock:
+        conn = _connect()
+        row = conn.execute('SELECT codec, dict_id FROM blobs WHERE hash = ?', (digest,)).fetchone()
+        if row is None:
+            raise KeyError(digest)
+        if touch:
+            conn.execute('UPDATE blobs SET last_used = ? WHERE hash = ?', (time.time(), digest))
+            conn.commit()
+    codec, dict_id = row
+    with open(_blob_path(digest, codec), 'rb') as f:
+        return _decompress(codec, dict_id, f.read()).decode('utf-8')
+
+
+def history(target=None, since=None, limit=None):
+    """(시각, 대상, 해시) 목록을 시간 순으로 조회"""
+    query = 'SELECT time, target, hash FROM snapshots WHERE 1=1'
+    params = []
+    if target:
+        query += ' AND target = ?'
+        params.append(target)
+    if since:
+        query += ' AND time >= ?'
+        params.append(since)
+    query += ' ORDER BY time'
+    if limit:
+        query += ' LIMIT ?'
+        params.append(int(limit))
+    with _lock:
+        return _connect().execute(query, params).fetchall()
+
+
+def _maybe_train_dictionary():
+    """사전 없이 저장된 zstd blob이 충분히 쌓이면 한 번 사전 학습"""
+    if zstandard is None or _current_dict_id is not None or ARCHIVE_DICT_SAMPLES <= 0:
+        return
+    count = _conn.execute("SELECT COUNT(*) FROM blobs WHERE codec = 'zstd' AND dict_id IS NULL").fetchone()[0]
+    if count >= ARCHIVE_DICT_SAMPLES:
+        train_dictionary()
+
+
+def train_dictionary(sample_limit=200):
+    """최근 blob으로 zstd 사전을 학습해 이후 저장분에 사용"""
+    global _current_dict_id
+    if zstandard is None:
+        logger.warning("zstandard 패키지가 없어 사전을 학습할 수 없습니다.")
+        return None
+    with _lock:
+        rows = _connect().execute(
+            'SELECT hash, codec, dict_id FROM blobs ORDER BY created DESC LIMIT ?', (sample_limit,)
+        ).fetchall()
+        samples = []
+        for digest, codec, dict_id in rows:
+            try:
+                with open(_blob_path(digest, codec), 'rb') as f:
+                    samples.append(_decompress(codec, dict_id, f.read()))
+            except Exception as e:
+                logger.debug("사전 학습 샘플 읽기 실패: %s (%s)", digest, e)
+        try:
+            dictionary = zstandard.train_dictionary(ARCHIVE_DICT_SIZE, samples)
+        except Exception as e:
+            logger.warning(f"zstd 사전 학습 실패 (샘플 {len(samples)}개): {str(e)}")
+            return None
+        os.makedirs(_dict_dir(), exist_ok=True)
+        with open(os.path.join(_dict_dir(), f"{int(time.time())}_{dictionary.dict_id()}.dict"), 'wb') as f:
+            f.write(dictionary.as_bytes())
+        _dicts[dictionary.dict_id()] = dictionary
+        _current_dict_id = dictionary.dict_id()
+        logger.info(f"스냅샷 zstd 사전 학습 완료: {dictionary.dict_id()} (샘플 {len(samples)}개)")
+        return _current_dict_id
+
+
+def _delete_blobs(conn, rows):
+    for digest, codec in rows:
+        try:
+            os.remove(_blob_path(digest, codec))
+        except FileNotFoundError:
+            pass
+        conn.execute('DELETE FROM snapshots WHERE hash = ?', (digest,))
+        conn.execute('DELETE FROM blobs WHERE hash = ?', (digest,))
+    if rows:
+        metrics.inc(ARCHIVE_EVICTED_METRIC, len(rows))
+
+
+def enforce_limits(force_prune=False, max_bytes=None):
+    """기간 만료 스냅샷 삭제 후 크기 상한(기본값: ARCHIVE_MAX_MB)을 넘는 만큼 오래 쓰이지 않은 blob부터 삭제"""
+    global _last_prune
+    with _lock:
+        conn = _connect()
+        now = time.time()
+        if ARCHIVE_MAX_AGE_DAYS and (force_prune or now - _last_prune >= PRUNE_INTERVAL_SECONDS):
+            _last_prune = now
+            conn.execute('DELETE FROM snapshots WHERE time < ?', (now - ARCHIVE_MAX_AGE_DAYS * 86400,))
+            orphans = conn.execute(
+                'SELECT hash, codec FROM blobs WHERE hash NOT IN (SELECT hash FROM snapshots)'
+            ).fetchall()
+            _delete_blobs(conn, orphans)
+
+        budget = ARCHIVE_MAX_MB * 1024 * 1024 if max_bytes is None else max_bytes
+        stored = conn.execute('SELECT COALESCE(SUM(stored_size), 0) FROM blobs').fetchone()[0]
+        if budget and stored > budget:
+            evicted = []
+            for digest, codec, size in conn.execute('SELECT hash, codec, stored_size FROM blobs ORDER BY last_used'):
+                if stored <= budget:
+                    break
+                evicted.append((digest, codec))
+                stored -= size
+            _delete_blobs(conn, evicted)
+            logger.info(f"스냅샷 보관소 크기 제한으로 blob {len(evicted)}개 삭제")
+        conn.commit()
+
+        blobs, raw, stored = conn.execute(
+            'SELECT COUNT(*), COALESCE(SUM(raw_size), 0), COALESCE(SUM(stored_size), 0) FROM blobs'
+        ).fetchone()
+        metrics.set_gauge(ARCHIVE_BLOBS_METRIC, blobs)
+        metrics.set_gauge(ARCHIVE_BYTES_METRIC, raw, kind='raw')
+        metrics.set_gauge(ARCHIVE_BYTES_METRIC, stored, kind='stored')
+
+
+@disk_monitor.subscribe
+def _on_disk_pressure(level, previous, disk):
+    """디스크 압박 시 보관소 축소 (warning: 상한의 1/2, critical: 1/10까지 오래 쓰이지 않은 blob 삭제)"""
+    if level < disk_monitor.WARNING or not ARCHIVE_DIR or not os.path.exists(os.path.join(ARCHIVE_DIR, 'index.sqlite')):
+        return
+    budget = ARCHIVE_MAX_MB * 1024 * 1024
+    with _lock:
+        stored = _connect().execute('SELECT COALESCE(SUM(stored_size), 0) FROM blobs').fetchone()[0]
+    # 상한이 없으면 현재 크기를 기준으로 줄임
+    budget = budget or stored
+    enforce_limits(force_prune=True, max_bytes=max(int(budget * (0.1 if level >= disk_monitor.CRITICAL else 0.5)), 1))
+
+
+def stats():
+    """보관소 요약 (스냅샷 수, 고유 blob 수, 원본/저장 크기)"""
+    with _lock:
+        conn = _connect()
+        snapshots = conn.execute('SELECT COUNT(*) FROM snapshots').fetchone()[0]
+        blobs, raw, stored = conn.execute(
+            'SELECT COUNT(*), COALESCE(SUM(raw_size), 0), COALESCE(SUM(stored_size), 0) FROM blobs'
+        ).fetchone()
+    return {'snapshots': snapshots, 'blobs': blobs, 'raw_bytes': raw, 'stored_bytes': stored, 'dict_id': _current_dict_id}
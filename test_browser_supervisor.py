@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""browser_supervisor.Supervisor 재실행 실패 후 복구 테스트 (실제 브라우저 대신 정해 둔 실행 결과 사용)"""
+
+import types
+import pytest
+import browser_supervisor
+
+
+class _Process:
+    pid = 12345
+
+    def __init__(self):
+        self.returncode = None
+
+    def poll(self):
+        return self.returncode
+
+
+class _Supervisor(browser_supervisor.Supervisor):
+    """launch는 outcomes 순서대로 성공(True) 또는 실패(False), terminate는 프로세스만 비움"""
+
+    def __init__(self, outcomes, profile_path):
+        super().__init__(port=1, binary='chromium')
+        self.outcomes = list(outcomes)
+        self.profile_path = profile_path
+        self.launches = 0
+
+    def launch(self):
+        self.launches += 1
+        if not self.outcomes.pop(0):
+            raise RuntimeError('공유 브라우저가 시작되지 않았습니다')
+        self.process = _Process()
+        self.profile = types.SimpleNamespace(path=self.profile_path)
+        self.started = browser_supervisor.time.monotonic()
+
+    def terminate(self):
+        self.process = None
+        self.profile = None
+
+
+@pytest.fixture
+def clock(monkeypatch, tmp_path):
+    fake = types.SimpleNamespace(now=1000.0, profile=str(tmp_path))
+    fake.monotonic = lambda: fake.now
+    monkeypatch.setattr(browser_supervisor, 'time', fake)
+    monkeypatch.setattr(browser_supervisor, 'BROWSER_SUPERVISOR_CHECK_SECONDS', 5)
+    monkeypatch.setattr(browser_supervisor, 'BROWSER_SUPERVISOR_RETRY_MAX_SECONDS', 12)
+    monkeypatch.setattr(browser_supervisor, '_probe', lambda port, timeout=None: True)
+    return fake
+
+
+def test_failed_relaunch_is_retried_with_backoff(clock):
+    supervisor = _Supervisor([True, False, False, False, True], clock.profile)
+    supervisor.launch()
+    supervisor.process.returncode = -9
+
+    # 종료 감지 -> 재실행 실패: 예외 없이 process가 비고 5초 뒤 재시도
+    assert supervisor.check(0) == 0
+    assert supervisor.process is None and supervisor.launches == 2
+    assert supervisor.check(0) == 0
+    assert supervisor.launches == 2
+
+    clock.now += 5
+    supervisor.check(0)
+    assert supervisor.launches == 3
+    # 두 번째 실패는 10초, 세 번째부터는 상한 12초
+    clock.now += 9
+    supervisor.check(0)
+    assert supervisor.launches == 3
+    clock.now += 1
+    supervisor.check(0)
+    assert supervisor.launches == 4
+    clock.now += 12
+    supervisor.check(0)
+    assert supervisor.launches == 5
+    assert supervisor.process is not None
+
+
+def test_backoff_resets_after_successful_launch(clock):
+    supervisor = _Supervisor([True, False, True, False], clock.profile)
+    supervisor.launch()
+    assert supervisor.restart('exited') is False
+    clock.now += 5
+    supervisor.check(0)
+    assert supervisor.process is not None
+    assert supervisor.restart('limit') is False
+    assert supervisor._retry_at == clock.now + 5
+
+
+def test_check_keeps_running_browser(clock):
+    supervisor = _Supervisor([True], clock.profile)
+    supervisor.launch()
+    assert supervisor.check(0) == 0
+    assert supervisor.launches == 1
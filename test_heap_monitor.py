@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""heap_monitor RSS 상한 재시작 테스트 (작업 프로세스 RSS 합산, 진행 중 작업이 있으면 재시작 연기)"""
+
+import pytest
+import heap_monitor
+
+MB = 1048576
+
+
+@pytest.fixture
+def monitor(monkeypatch):
+    """RSS 상한 100MB, 자기 RSS 60MB, restart는 호출 기록만 남김"""
+    restarts = []
+    monkeypatch.setattr(heap_monitor, 'MAX_RSS_MB', 100)
+    monkeypatch.setattr(heap_monitor, 'RESTART_MIN_UPTIME_SECONDS', 0)
+    monkeypatch.setattr(heap_monitor, 'current_rss', lambda: 60 * MB)
+    monkeypatch.setattr(heap_monitor, 'restart', restarts.append)
+    monkeypatch.setattr(heap_monitor, '_rss_sources', [])
+    monkeypatch.setattr(heap_monitor, '_restart_blockers', [])
+    monkeypatch.setattr(heap_monitor, '_state', dict(heap_monitor._state, started=0.0, next_rss_check=0.0,
+                                                     next_snapshot=None, restart_pending=None))
+    return restarts
+
+
+def test_under_ceiling_without_workers(monitor):
+    heap_monitor.check_rss()
+    assert monitor == []
+
+
+def test_worker_rss_counts_toward_ceiling(monitor):
+    heap_monitor.include_rss(lambda: 50 * MB)
+    heap_monitor.check_rss()
+    assert len(monitor) == 1
+    assert '110MB' in monitor[0]
+
+
+def test_restart_deferred_while_task_in_flight(monitor):
+    busy = [True]
+    heap_monitor.include_rss(lambda: 50 * MB)
+    heap_monitor.defer_restart_while(lambda: busy[0])
+    heap_monitor.check_rss()
+    assert monitor == []
+    assert heap_monitor._state['restart_pending']
+
+    # 작업이 끝나면 다음 tick에서 (RSS 점검 간격과 상관없이) 다시 측정해 재시작
+    heap_monitor._state['next_rss_check'] = float('inf')
+    heap_monitor.tick()
+    assert monitor == []
+    busy[0] = False
+    heap_monitor.tick()
+    assert len(monitor) == 1
+
+
+def test_pending_restart_dropped_when_rss_falls(monitor):
+    worker_rss = [50 * MB]
+    heap_monitor.include_rss(lambda: worker_rss[0])
+    heap_monitor.defer_restart_while(lambda: True)
+    heap_monitor.check_rss()
+    assert heap_monitor._state['restart_pending']
+    worker_rss[0] = 0
+    heap_monitor.check_rss()
+    assert heap_monitor._state['restart_pending'] is None
+    assert monitor == []
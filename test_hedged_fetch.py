@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""hedged_fetch.fetch 결과 선택 테스트 (실제 백엔드 대신 정해 둔 결과를 돌려주는 가짜 백엔드 사용)"""
+
+import time
+import concurrent.futures
+import pytest
+import hedged_fetch
+
+
+@pytest.fixture
+def backends(monkeypatch, tmp_path):
+    """백엔드 이름 -> (지연 초, 결과 또는 예외)를 등록하면 _launch가 그대로 흉내 냄"""
+    table = {}
+    launched = []
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=4)
+
+    def launch(backend, year, month):
+        launched.append((backend, year, month))
+        delay, outcome = table[backend]
+
+        def run():
+            time.sleep(delay)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+        return executor.submit(run)
+
+    monkeypatch.setattr(hedged_fetch, '_launch', launch)
+    monkeypatch.setattr(hedged_fetch, 'hedge_delay', lambda backend: 5)
+    monkeypatch.setattr(hedged_fetch, 'HEDGE_STATS_FILE', str(tmp_path / 'hedge_stats.json'))
+    monkeypatch.setattr(hedged_fetch, '_stats', None)
+    monkeypatch.setattr(hedged_fetch, 'HEDGE_EMPTY_AGREEMENT', 2)
+    yield table, launched
+    executor.shutdown(wait=True)
+
+
+def test_first_result_with_dates_wins(backends):
+    table, launched = backends
+    table['a'] = (0, ['2025-04-10'])
+    table['b'] = (0, ['2025-04-11'])
+    assert hedged_fetch.fetch(['a', 'b'], 2025, 4) == ('a', ['2025-04-10'])
+    assert launched == [('a', 2025, 4)]
+
+
+def test_empty_result_waits_for_other_backend(backends):
+    table, launched = backends
+    table['a'] = (0, [])
+    table['b'] = (0.05, ['2025-04-12'])
+    assert hedged_fetch.fetch(['a', 'b'], 2025, 4) == ('b', ['2025-04-12'])
+    assert [name for name, _, _ in launched] == ['a', 'b']
+
+
+def test_empty_result_accepted_when_backends_agree(backends):
+    table, _ = backends
+    table['a'] = (0, [])
+    table['b'] = (0, [])
+    table['c'] = (0, ['2025-04-13'])
+    assert hedged_fetch.fetch(['a', 'b', 'c'], 2025, 4) == ('b', [])
+
+
+def test_empty_result_used_when_no_backend_left(backends):
+    table, _ = backends
+    table['a'] = (0, RuntimeError('blocked'))
+    table['b'] = (0, [])
+    assert hedged_fetch.fetch(['a', 'b'], 2025, 4) == ('b', [])
+
+
+def test_all_backends_failed(backends):
+    table, _ = backends
+    table['a'] = (0, None)
+    table['b'] = (0, RuntimeError('blocked'))
+    assert hedged_fetch.fetch(['a', 'b'], 2025, 4) == (None, None)
+
+
+def test_same_target_month_for_every_backend(backends):
+    table, launched = backends
+    table['a'] = (0, None)
+    table['b'] = (0, ['2025-06-01'])
+    hedged_fetch.fetch(['a', 'b'], 2025, 6)
+    assert {(year, month) for _, year, month in launched} == {(2025, 6)}
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""live_board.find_new_slots / board_key 테스트"""
+
+import live_board
+
+
+def test_no_previous_state_everything_is_new():
+    current = {"2025-04-10": ["09:00"], "2025-04-11": []}
+    assert live_board.find_new_slots(None, current) == current
+    assert live_board.find_new_slots({}, current) == current
+
+
+def test_only_added_times_are_new():
+    previous = {"2025-04-10": ["09:00", "10:00"]}
+    current = {"2025-04-10": ["09:00", "10:00", "11:00"]}
+    assert live_board.find_new_slots(previous, current) == {"2025-04-10": ["11:00"]}
+
+
+def test_new_date_is_reported_with_all_times():
+    previous = {"2025-04-10": ["09:00"]}
+    current = {"2025-04-10": ["09:00"], "2025-04-12": ["13:00", "14:00"]}
+    assert live_board.find_new_slots(previous, current) == {"2025-04-12": ["13:00", "14:00"]}
+
+
+def test_removed_slots_are_not_reported():
+    previous = {"2025-04-10": ["09:00", "10:00"], "2025-04-11": []}
+    current = {"2025-04-10": ["09:00"]}
+    assert live_board.find_new_slots(previous, current) == {}
+    assert live_board.find_new_slots(previous, None) == {}
+
+
+def test_date_only_slots():
+    previous = {"2025-04-10": []}
+    current = {"2025-04-10": [], "2025-04-11": []}
+    assert live_board.find_new_slots(previous, current) == {"2025-04-11": []}
+
+
+def test_board_key_separates_checkers():
+    assert live_board.board_key(1, "2025-04", "selenium") != live_board.board_key(1, "2025-04", "cloudscraper")
+    assert live_board.board_key(1, "2025-04", "selenium") == "1:selenium:2025-04"
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""message_renderer 메시지 분할 테스트 (텔레그램 4096자 한도)"""
+
+import datetime
+import message_renderer
+from message_renderer import TELEGRAM_MESSAGE_LIMIT
+
+
+def _many_slots(days=60, times=20):
+    start = datetime.date(2025, 4, 1)
+    return {
+        (start + datetime.timedelta(days=day)).isoformat(): [f"{hour:02d}:00 - {hour:02d}:30" for hour in range(times)]
+        for day in range(days)
+    }
+
+
+def test_short_message_is_not_split():
+    chunks = message_renderer.render_availability("제목", ["2025-04-10"], "https://example.com")
+    assert len(chunks) == 1
+    assert "(1/" not in chunks[0]
+
+
+def test_long_message_split_within_limit():
+    slots = _many_slots()
+    chunks = message_renderer.render_availability("제목", slots, "https://example.com", compact=False)
+    assert len(chunks) > 1
+    assert all(len(chunk) <= TELEGRAM_MESSAGE_LIMIT for chunk in chunks)
+    total = len(chunks)
+    for index, chunk in enumerate(chunks, 1):
+        assert chunk.endswith(f"({index}/{total})")
+
+
+def test_split_keeps_date_blocks_whole():
+    slots = _many_slots()
+    chunks = message_renderer.render_availability("제목", slots, "https://example.com", compact=False)
+    text = "".join(chunks)
+    for date, times in slots.items():
+        block = message_renderer.render_date_block(date, times)
+        assert sum(block in chunk for chunk in chunks) == 1
+        assert text.count(f"<b>{date}</b>") == 1
+
+
+def test_oversized_block_split_by_line():
+    times = [f"슬롯 {i:04d}" for i in range(800)]
+    chunks = message_renderer.render_availability("제목", {"2025-04-10": times}, "https://example.com", compact=False)
+    assert len(chunks) > 1
+    assert all(len(chunk) <= TELEGRAM_MESSAGE_LIMIT for chunk in chunks)
+    assert sum(chunk.count("  - 슬롯 ") for chunk in chunks) == len(times)
+
+
+def test_exact_limit_boundary():
+    header = message_renderer.render_header("제목")
+    footer = message_renderer.render_footer("https://example.com")
+    budget = TELEGRAM_MESSAGE_LIMIT - message_renderer.CHUNK_RESERVE
+    filler = "x" * (budget - len(header) - len(footer) - 1) + "\n"
+    assert message_renderer.split_blocks(header, [filler], footer) == [header + filler + footer]
+    chunks = message_renderer.split_blocks(header, [filler, "y\n"], footer)
+    assert len(chunks) == 2
+    assert all(len(chunk) <= TELEGRAM_MESSAGE_LIMIT for chunk in chunks)
+
+
+def test_single_message_truncates_to_limit():
+    body = message_renderer.render_single("제목", _many_slots(days=200), "https://example.com")
+    assert len(body) <= TELEGRAM_MESSAGE_LIMIT
+    assert "외" in body and "개 날짜" in body
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""metrics.export_state/merge_state 테스트 (브라우저 풀 작업 프로세스 -> 부모 프로세스 전달)"""
+
+from collections import deque
+import pytest
+import metrics
+
+HISTOGRAM = 'test_latency_seconds'
+GAUGE = 'test_latency_quantile_seconds'
+
+
+@pytest.fixture(autouse=True)
+def fresh_metrics(monkeypatch):
+    monkeypatch.setattr(metrics, '_histograms', {})
+    monkeypatch.setattr(metrics, '_counters', {})
+    monkeypatch.setattr(metrics, '_gauges', {})
+    monkeypatch.setattr(metrics, '_quantile_gauges', {})
+    monkeypatch.setattr(metrics, '_recent_cycles', deque(maxlen=10))
+
+
+def _gauge(q, **labels):
+    return metrics._gauges.get(metrics._key(GAUGE, dict(labels, quantile=q)))
+
+
+def _task(values, **labels):
+    """작업 프로세스 한 작업: 관측 후 게이지 갱신, export_state로 꺼냄"""
+    for value in values:
+        metrics.observe(HISTOGRAM, value, **labels)
+    metrics.publish_quantiles(HISTOGRAM, **labels)
+    return metrics.export_state()
+
+
+def test_quantile_gauges_follow_merged_histogram():
+    metrics.describe_quantiles(GAUGE, HISTOGRAM, (0.5, 0.99))
+    states = [_task([1.0] * 9, checker='a'), _task([50.0], checker='a')]
+    # 부모는 describe_quantiles를 호출한 모듈을 import하지 않았을 수 있음
+    metrics._quantile_gauges.clear()
+    for state in states:
+        metrics.merge_state(state)
+    assert _gauge(0.5, checker='a') == 1.0
+    assert _gauge(0.99, checker='a') == 50.0
+    assert metrics.get_histogram(HISTOGRAM, checker='a').count == 10
+
+
+def test_publish_quantiles_in_worker():
+    metrics.describe_quantiles(GAUGE, HISTOGRAM, (0.5,))
+    for value in (1.0, 2.0, 3.0):
+        metrics.observe(HISTOGRAM, value, checker='a')
+    metrics.publish_quantiles(HISTOGRAM, checker='a')
+    assert _gauge(0.5, checker='a') == 2.0
+
+
+def test_plain_gauges_and_counters_are_merged():
+    metrics.set_gauge('test_peak_bytes', 10, checker='a')
+    metrics.inc('test_total', checker='a')
+    state = metrics.export_state()
+    metrics.inc('test_total', checker='a')
+    metrics.merge_state(state)
+    assert metrics._gauges[metrics._key('test_peak_bytes', {'checker': 'a'})] == 10
+    assert metrics._counters[metrics._key('test_total', {'checker': 'a'})] == 2
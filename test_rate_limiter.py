@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""rate_limiter 토큰 예약/빚 테스트 (임시 버킷 파일과 가짜 시계 사용)"""
+
+import types
+import pytest
+import rate_limiter
+
+HOST = 'www.bearcreek.co.kr'
+
+
+@pytest.fixture
+def clock(monkeypatch, tmp_path):
+    """rate_limiter.time을 가짜 시계로 바꾸고 버킷 파일을 임시 디렉토리에 둠 (분당 60회, 버스트 3)"""
+    fake = types.SimpleNamespace(now=1_000_000.0, slept=[])
+    fake.time = lambda: fake.now
+
+    def sleep(seconds):
+        fake.slept.append(seconds)
+        fake.now += seconds
+    fake.sleep = sleep
+
+    monkeypatch.setattr(rate_limiter, 'time', fake)
+    monkeypatch.setattr(rate_limiter, 'RATE_LIMIT_DB', str(tmp_path / 'rate_limit.sqlite'))
+    monkeypatch.setattr(rate_limiter, 'HOST_LIMITS', {HOST: (60.0, 3.0)})
+    monkeypatch.setattr(rate_limiter, 'RATE_LIMIT_MAX_WAIT_SECONDS', 60)
+    monkeypatch.setattr(rate_limiter, '_conn', None)
+    yield fake
+    if rate_limiter._conn is not None:
+        rate_limiter._conn.close()
+        rate_limiter._conn = None
+
+
+def test_burst_is_immediate(clock):
+    assert [rate_limiter.reserve(HOST) for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert rate_limiter.reserve(HOST) == pytest.approx(1.0)
+
+
+def test_waiting_requests_queue_up_as_debt(clock):
+    for _ in range(3):
+        rate_limiter.reserve(HOST)
+    waits = [rate_limiter.reserve(HOST) for _ in range(3)]
+    assert waits == pytest.approx([1.0, 2.0, 3.0])
+
+
+def test_tokens_refill_over_time_up_to_burst(clock):
+    for _ in range(4):
+        rate_limiter.reserve(HOST)
+    clock.now += 2
+    assert rate_limiter.reserve(HOST) == pytest.approx(0.0)
+    clock.now += 3600
+    assert [rate_limiter.reserve(HOST) for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert rate_limiter.reserve(HOST) == pytest.approx(1.0)
+
+
+def test_rejected_request_does_not_take_a_token(clock):
+    for _ in range(3):
+        rate_limiter.reserve(HOST)
+    with pytest.raises(rate_limiter.RateLimitExceeded):
+        rate_limiter.reserve(HOST, max_wait=0.5)
+    assert rate_limiter.reserve(HOST) == pytest.approx(1.0)
+
+
+def test_bucket_is_shared_through_file(clock):
+    for _ in range(3):
+        rate_limiter.reserve(HOST)
+    # 다른 프로세스처럼 새로 연결해도 같은 버킷을 이어 씀
+    rate_limiter._conn.close()
+    rate_limiter._conn = None
+    assert rate_limiter.reserve(HOST) == pytest.approx(1.0)
+
+
+def test_hosts_have_separate_buckets(clock):
+    for _ in range(3):
+        rate_limiter.reserve(HOST)
+    assert rate_limiter.reserve('other.example.com') == 0.0
+
+
+def test_unlimited_host(clock, monkeypatch):
+    monkeypatch.setattr(rate_limiter, 'HOST_LIMITS', {HOST: (0.0, 1.0)})
+    assert [rate_limiter.reserve(HOST) for _ in range(10)] == [0.0] * 10
+
+
+def test_acquire_sleeps_for_reserved_wait(clock):
+    url = f'https://{HOST}/index.asp'
+    for _ in range(4):
+        rate_limiter.acquire(url)
+    assert clock.slept == pytest.approx([1.0])
+
+
+def test_parse_hosts():
+    assert rate_limiter._parse_hosts('A.example=12:3, b.example=6, broken, c.example=x') == {
+        'a.example': (12.0, 3.0),
+        'b.example': (6.0, rate_limiter.RATE_LIMIT_BURST),
+    }
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""response_cache single-flight 공유와 오류 전달 테스트"""
+
+import time
+import types
+import threading
+import pytest
+import response_cache
+
+URL = 'https://www.bearcreek.co.kr/Reservation/AjaxCalendarData.aspx'
+PARAMS = {'year': 2025, 'month': 4}
+FOLLOWERS = 4
+
+
+class _CountingEvent(threading.Event):
+    """wait()에 들어온 스레드 수를 세는 Event"""
+
+    waiting = 0
+    entered = threading.Condition()
+
+    def wait(self, timeout=None):
+        with _CountingEvent.entered:
+            _CountingEvent.waiting += 1
+            _CountingEvent.entered.notify_all()
+        return super().wait(timeout)
+
+
+class _CountingFlight(response_cache._Flight):
+    def __init__(self):
+        super().__init__()
+        self.done = _CountingEvent()
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache(monkeypatch):
+    monkeypatch.setattr(response_cache, '_Flight', _CountingFlight)
+    _CountingEvent.waiting = 0
+    response_cache.clear()
+    yield
+    response_cache.clear()
+
+
+def _run_concurrently(load, parse=None):
+    """리더 하나가 load에 들어간 뒤 FOLLOWERS개 스레드가 모두 기다리기 시작하면 load를 풀어 줌"""
+    release = threading.Event()
+    entered = threading.Event()
+    calls = []
+
+    def blocking_load():
+        calls.append(1)
+        entered.set()
+        assert release.wait(5)
+        return load()
+
+    results = [None] * (FOLLOWERS + 1)
+
+    def worker(index):
+        try:
+            results[index] = ('ok', response_cache.fetch(URL, PARAMS, blocking_load, parse=parse))
+        except Exception as e:
+            results[index] = ('error', e)
+
+    threads = [threading.Thread(target=worker, args=(0,))]
+    threads[0].start()
+    assert entered.wait(5)
+    threads += [threading.Thread(target=worker, args=(i,)) for i in range(1, FOLLOWERS + 1)]
+    for thread in threads[1:]:
+        thread.start()
+    with _CountingEvent.entered:
+        assert _CountingEvent.entered.wait_for(lambda: _CountingEvent.waiting == FOLLOWERS, 5)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    return calls, results
+
+
+def test_concurrent_requests_share_one_load():
+    parsed = []
+
+    def parse(body):
+        parsed.append(body)
+        return body.upper()
+
+    calls, results = _run_concurrently(lambda: 'calendar', parse=parse)
+    assert len(calls) == 1
+    assert results == [('ok', 'CALENDAR')] * (FOLLOWERS + 1)
+    assert parsed == ['calendar']
+
+
+def test_error_reaches_every_waiter_and_is_not_cached():
+    error = ConnectionError('blocked')
+
+    def load():
+        raise error
+
+    calls, results = _run_concurrently(load)
+    assert len(calls) == 1
+    assert results == [('error', error)] * (FOLLOWERS + 1)
+    assert response_cache.fetch(URL, PARAMS, lambda: 'retry') == 'retry'
+
+
+def test_failed_load_shared_but_not_cached():
+    calls, results = _run_concurrently(lambda: None)
+    assert len(calls) == 1
+    assert results == [('ok', None)] * (FOLLOWERS + 1)
+    assert response_cache.fetch(URL, PARAMS, lambda: 'retry') == 'retry'
+
+
+def test_hit_within_ttl_and_reload_after_expiry(monkeypatch):
+    loads = []
+
+    def load():
+        loads.append(1)
+        return f'body {len(loads)}'
+
+    assert response_cache.fetch(URL, PARAMS, load, ttl=30) == 'body 1'
+    assert response_cache.fetch(URL, dict(reversed(list(PARAMS.items()))), load, ttl=30) == 'body 1'
+    later = time.monotonic() + 31
+    monkeypatch.setattr(response_cache, 'time', types.SimpleNamespace(monotonic=lambda: later))
+    assert response_cache.fetch(URL, PARAMS, load, ttl=30) == 'body 2'
+
+
+def test_zero_ttl_only_coalesces():
+    loads = []
+
+    def load():
+        loads.append(1)
+        return 'body'
+
+    response_cache.fetch(URL, PARAMS, load, ttl=0)
+    response_cache.fetch(URL, PARAMS, load, ttl=0)
+    assert len(loads) == 2
+
+
+def test_parse_result_cached_per_function():
+    calls = []
+
+    def parse_a(body):
+        calls.append('a')
+        return len(body)
+
+    def parse_b(body):
+        calls.append('b')
+        return body[::-1]
+
+    assert response_cache.fetch(URL, PARAMS, lambda: 'abc', parse=parse_a) == 3
+    assert response_cache.fetch(URL, PARAMS, lambda: 'abc', parse=parse_a) == 3
+    assert response_cache.fetch(URL, PARAMS, lambda: 'abc', parse=parse_b) == 'cba'
+    assert calls == ['a', 'b']
@@ -4,15 +4,10 @@
 import os
 import logging
 import sys
+import log_setup
 
-# 로그 설정
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler()
-    ]
-)
+# 로그 설정 (콘솔 전용)
+log_setup.setup_logging()
 logger = logging.getLogger(__name__)
 
 def create_snap_cleanup_script():
@@ -6,32 +6,32 @@ import time
 import datetime
 import logging
 import schedule
-import asyncio
 import sys
 import pytz
 import json
 import random
 import re
+import functools
 import cloudscraper
 from pathlib import Path
 from bs4 import BeautifulSoup
 from dotenv import load_dotenv
-from telegram import Bot
-from telegram.error import TelegramError
-from playwright.async_api import async_playwright
+import log_setup
+import notifier
+import message_renderer
+import metrics
+import profiler
+import browser_supervisor
+import rate_limiter
+import response_cache
+import page_parser
+import artifacts
 
 # 한국 시간대 설정
 KST = pytz.timezone('Asia/Seoul')
 
-# 로깅 설정
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("ultimate_checker.log", encoding='utf-8'),
-        logging.StreamHandler()
-    ]
-)
+# 로깅 설정 (큐 기반 비동기 로깅, 파일은 JSON lines 형식)
+log_setup.setup_logging("ultimate_checker.log")
 
 logger = logging.getLogger(__name__)
 
@@ -41,13 +41,16 @@ load_dotenv()
 # 설정 정보
 TELEGRAM_BOT_TOKEN = os.getenv('TELEGRAM_BOT_TOKEN')
 TELEGRAM_CHAT_ID = os.getenv('TELEGRAM_CHAT_ID')
-CHECK_INTERVAL_MINUTES = int(os.getenv('CHECK_INTERVAL_MINUTES', 5).replace('%', ''))
-MONTH = int(os.getenv('MONTH', 4).replace('%', ''))
-YEAR = int(os.getenv('YEAR', 2025).replace('%', ''))
+CHECK_INTERVAL_MINUTES = int(os.getenv('CHECK_INTERVAL_MINUTES', '5').replace('%', ''))
+MONTH = int(os.getenv('MONTH', '4').replace('%', ''))
+YEAR = int(os.getenv('YEAR', '2025').replace('%', ''))
+
+# 사이트 주소 (벤치마크에서는 로컬 fixture 서버 주소로 바꿈)
+BEARCREEK_BASE_URL = os.getenv('BEARCREEK_BASE_URL', 'https://www.bearcreek.co.kr').split('#')[0].strip().rstrip('/')
 
 # 베어크리크 골프장 URL 정보
-BEARCREEK_URL = "https://www.bearcreek.co.kr/Reservation/Reservation.aspx?strLGubun=110&strClubCode=N#aCourseSel"
-BEARCREEK_API_URL = "https://www.bearcreek.co.kr/Reservation/XmlCalendarData.aspx"
+BEARCREEK_URL = f"{BEARCREEK_BASE_URL}/Reservation/Reservation.aspx?strLGubun=110&strClubCode=N#aCourseSel"
+BEARCREEK_API_URL = f"{BEARCREEK_BASE_URL}/Reservation/XmlCalendarData.aspx"
 
 # 클라우드스크레이퍼 세션 (전역변수)
 scraper = None
@@ -64,39 +67,13 @@ USER_AGENTS = [
 COOKIES_FILE = 'bearcreek_cookies.json'
 
 async def send_telegram_message(message):
-    """텔레그램 메시지 발송 함수"""
-    if not all([TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID]):
-        logger.error("텔레그램 설정이 완료되지 않았습니다. .env 파일을 확인하세요.")
-        return False
-    
-    try:
-        logger.info(f"텔레그램 봇 토큰 유효성 검사 중... (길이: {len(TELEGRAM_BOT_TOKEN)})")
-        logger.info(f"텔레그램 채팅 ID 유효성 검사 중... (값: {TELEGRAM_CHAT_ID})")
-        
-        bot = Bot(token=TELEGRAM_BOT_TOKEN)
-        logger.info("텔레그램 봇 객체 생성 완료")
-        
-        # 채팅 ID 처리
-        chat_id = TELEGRAM_CHAT_ID
-        if isinstance(chat_id, str):
-            if chat_id.startswith('-') and chat_id[1:].isdigit():
-                chat_id = int(chat_id)
-            elif chat_id.isdigit():
-                chat_id = int(chat_id)
-        
-        response = await bot.send_message(chat_id=chat_id, text=message, parse_mode='HTML')
-        logger.info(f"텔레그램 메시지가 성공적으로 전송되었습니다. 메시지 ID: {response.message_id}")
-        return True
-    except TelegramError as e:
-        logger.error(f"텔레그램 메시지 전송 중 오류가 발생했습니다: {str(e)}")
-        return False
-    except Exception as e:
-        logger.error(f"텔레그램 메시지 전송 중 예상치 못한 오류가 발생했습니다: {str(e)}")
-        return False
+    """텔레그램 메시지 발송 함수 (공용 notifier 사용)"""
+    return await notifier.send_message(message)
+
 
 def send_telegram_notification(message):
-    """텔레그램 메시지 발송을 위한 동기 래퍼 함수"""
-    asyncio.run(send_telegram_message(message))
+    """텔레그램 메시지 발송을 위한 동기 래퍼 함수 (데몬 모드에서는 데몬 루프에서 발송)"""
+    return notifier.notify(message)
 
 def get_random_user_agent():
     """무작위 사용자 에이전트 선택"""
@@ -125,28 +102,43 @@ def save_cookies_to_file(cookies):
         logger.error(f"쿠키 저장 중 오류: {str(e)}")
 
 async def generate_cookies_with_playwright():
-    """Playwright를 사용하여 쿠키 생성"""
+    """Playwright를 사용하여 쿠키 생성 (쿠키가 없거나 차단됐을 때만 실행되므로 Playwright는 여기서 import)"""
+    from playwright.async_api import async_playwright
+    import browser_resources
     logger.info("Playwright를 사용하여 새 쿠키 생성 중...")
     
     playwright = None
     browser = None
     context = None
     page = None
+    monitor = browser_resources.BrowserMonitor().start()
     
     try:
         playwright = await async_playwright().start()
+        monitor.attach(browser_resources.playwright_driver_pid(playwright))
         browser_type = playwright.chromium
         
+        # 공유 브라우저 감독 프로세스가 있으면 붙어서 새 컨텍스트만 만듦
+        shared = browser_supervisor.endpoint()
+        if shared:
+            try:
+                browser = await browser_type.connect_over_cdp(f"http://{shared}", timeout=10000)
+                browser_supervisor.record_attach('cloudscraper', 'shared')
+            except Exception as e:
+                logger.warning(f"공유 브라우저 연결 실패, 브라우저를 직접 실행합니다: {str(e)}")
+        
         # 브라우저 시작 (스텔스 모드)
-        browser = await browser_type.launch(
-            headless=True,
-            args=[
-                '--disable-blink-features=AutomationControlled',
-                '--disable-extensions',
-                '--no-sandbox',
-                '--disable-web-security',
-            ]
-        )
+        if browser is None:
+            browser_supervisor.record_attach('cloudscraper', 'launched')
+            browser = await browser_type.launch(
+                headless=True,
+                args=[
+                    '--disable-blink-features=AutomationControlled',
+                    '--disable-extensions',
+                    '--no-sandbox',
+                    '--disable-web-security',
+                ]
+            )
         
         # 브라우저 컨텍스트 생성
         context = await browser.new_context(
@@ -183,6 +175,7 @@ async def generate_cookies_with_playwright():
         
         # 메인 페이지 접속
         logger.info(f"베어크리크 메인 페이지 접속 중: {BEARCREEK_URL}")
+        await rate_limiter.acquire_async(BEARCREEK_URL)
         await page.goto(BEARCREEK_URL, wait_until='networkidle')
         
         # 페이지 로드 대기 (추가 여유)
@@ -224,10 +217,12 @@ async def generate_cookies_with_playwright():
             await browser.close()
         if playwright:
             await playwright.stop()
+        monitor.stop()
 
 def setup_cloudscraper():
     """CloudScraper 설정"""
     global scraper
+    import asyncio
     
     try:
         # 이미 생성된 경우 재사용
@@ -245,13 +240,15 @@ def setup_cloudscraper():
             delay=5,  # 각 요청 사이 지연 시간
             debug=False
         )
+        # 챌린지 재요청과 리디렉션을 포함한 모든 요청에 공용 요청 한도 적용
+        rate_limiter.limit_session(scraper)
         
         # 사용자 에이전트 설정
         scraper.headers.update({
             'User-Agent': get_random_user_agent(),
             'Accept-Language': 'ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8',
-            'Referer': 'https://www.bearcreek.co.kr/',
+            'Referer': f'{BEARCREEK_BASE_URL}/',
         })
         
         # 저장된 쿠키 로드
@@ -274,168 +271,201 @@ def setup_cloudscraper():
         logger.error(f"CloudScraper 설정 중 오류: {str(e)}")
         return None
 
-def extract_valid_dates(html_content):
-    """HTML에서 예약 가능한 날짜 추출"""
+def extract_valid_dates(html_content, year=None, month=None):
+    """HTML에서 예약 가능한 날짜 추출 (year/month 기본값: YEAR/MONTH)"""
     try:
-        soup = BeautifulSoup(html_content, 'html.parser')
-        available_dates = []
-        
-        # 달력 테이블 찾기
-        calendar_table = soup.select_one('table.calendar')
-        if not calendar_table:
+        # 달력 테이블의 클릭 가능한 날짜 중 예약 불가능(class에 'red')이 아닌 날짜
+        available_dates = page_parser.calendar_dates(html_content, year or YEAR, month or MONTH)
+        if available_dates is None:
             logger.warning("달력 테이블을 찾을 수 없습니다.")
             return []
         
-        # 클릭 가능한 날짜 찾기 (onclick 속성이 있는 td)
-        date_cells = calendar_table.select('td[onclick]')
-        logger.info(f"발견된 날짜 셀: {len(date_cells)}개")
-        
-        for cell in date_cells:
-            # 예약 불가능한 날짜 제외 (class에 'red'가 포함된 경우)
-            if 'red' in cell.get('class', []):
-                continue
-            
-            # 날짜 텍스트 추출
-            date_text = cell.text.strip()
-            if date_text and date_text.isdigit():
-                day = int(date_text)
-                date_str = f"{YEAR}-{MONTH:02d}-{day:02d}"
-                available_dates.append(date_str)
-                logger.info(f"예약 가능한 날짜 발견: {date_str}")
-        
+        logger.info(f"예약 가능한 날짜 셀: {len(available_dates)}개")
         return available_dates
     except Exception as e:
         logger.error(f"HTML에서 날짜 추출 중 오류: {str(e)}")
         return []
 
-def check_available_dates():
-    """베어크리크 골프장 예약 가능 날짜 확인 (CloudScraper 사용)"""
-    logger.info("베어크리크 골프장 예약 확인을 시작합니다...")
+@functools.lru_cache(maxsize=None)
+def _valid_dates_parser(year, month):
+    """year/month 달력 추출 함수 (응답 캐시가 같은 달의 파싱 결과를 공유하도록 같은 함수 객체 반환)"""
+    return lambda html_content: extract_valid_dates(html_content, year, month)
+
+def load_main_page():
+    """메인 페이지 본문 (Cloudflare 차단 시 쿠키를 새로 만들어 한 번 재시도, 실패 시 None)"""
+    import asyncio
+    response = scraper.get(BEARCREEK_URL, timeout=30)
+    if response.status_code != 200:
+        logger.error(f"메인 페이지 접속 실패: 상태 코드 {response.status_code}")
+        
+        # 응답 내용 저장 (디버깅용)
+        path = artifacts.save("cloudflare_challenge.html", response.text, failed=True, target='reservation')
+        logger.info(f"응답 내용 저장 예약됨: {path}")
+        
+        # Cloudflare 우회 실패 시 새 쿠키 생성 시도
+        with metrics.span('cookie_refresh'):
+            new_cookies = asyncio.run(generate_cookies_with_playwright())
+        if not new_cookies:
+            return None
+        for cookie in new_cookies:
+            scraper.cookies.set(cookie['name'], cookie['value'], domain=cookie['domain'])
+        
+        # 재시도
+        logger.info("새 쿠키로 메인 페이지 접속 재시도 중...")
+        response = scraper.get(BEARCREEK_URL, timeout=30)
+        if response.status_code != 200:
+            logger.error(f"재시도 실패: 상태 코드 {response.status_code}")
+            return None
     
+    # 응답 내용 저장 (디버깅 파일은 표본 사이클만, 스냅샷 보관소에는 매번 백그라운드 기록)
+    with metrics.span('page_dump'):
+        artifacts.save("main_page.html", response.text, target='reservation')
+    return response.text
+
+def fetch_available_dates(year=None, month=None):
+    """year/month(기본값: YEAR/MONTH)의 예약 가능 날짜 조회만 수행 (알림 없음, 요청 실패 시 None)"""
+    import freshness
+    year, month = year or YEAR, month or MONTH
     # CloudScraper 설정
     global scraper
-    scraper = setup_cloudscraper()
+    with metrics.span('driver_launch'):
+        scraper = setup_cloudscraper()
     if not scraper:
         logger.error("CloudScraper 설정 실패")
-        return False
+        return None
     
-    try:
-        # 1. 메인 페이지 접속 (쿠키 및 토큰 수집)
-        logger.info(f"메인 페이지 접속 중: {BEARCREEK_URL}")
+    # 1. 메인 페이지 접속 (쿠키 및 토큰 수집)
+    logger.info(f"메인 페이지 접속 중: {BEARCREEK_URL}")
+    
+    # Cloudflare 우회를 위한 추가 헤더
+    scraper.headers.update({
+        'User-Agent': get_random_user_agent(),
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.9',
+        'Accept-Language': 'ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7',
+        'Accept-Encoding': 'gzip, deflate, br',
+        'Cache-Control': 'max-age=0',
+        'Connection': 'keep-alive',
+        'Upgrade-Insecure-Requests': '1',
+        'Sec-Fetch-Dest': 'document',
+        'Sec-Fetch-Mode': 'navigate',
+        'Sec-Fetch-Site': 'none',
+        'Sec-Fetch-User': '?1',
+        'sec-ch-ua': '"Chromium";v="110", "Not A(Brand";v="24"',
+        'sec-ch-ua-mobile': '?0',
+        'sec-ch-ua-platform': '"Windows"',
+    })
+    
+    # 같은 달을 보는 다른 체크가 방금 받은 페이지가 있으면 요청/파싱 결과 공유
+    with metrics.span('page_load'):
+        main_dates = response_cache.fetch(BEARCREEK_URL, None, load_main_page, parse=_valid_dates_parser(year, month))
+    if main_dates is None:
+        return None
+    
+    # 2. AJAX 요청을 통해 캘린더 데이터 가져오기
+    # 요청 파라미터 설정
+    calendar_params = {
+        'strClubCode': 'N', 
+        'strLGubun': '110',
+        'strReserveDate': f'{year}-{month:02d}-01'
+    }
+    
+    # AJAX 요청 헤더 설정 (더 자연스러운 요청 흉내)
+    ajax_headers = {
+        'X-Requested-With': 'XMLHttpRequest',
+        'Referer': BEARCREEK_URL,
+        'Origin': BEARCREEK_BASE_URL,
+        'Content-Type': 'application/x-www-form-urlencoded; charset=UTF-8',
+        'Accept': 'application/json, text/javascript, */*; q=0.01',
+    }
+    
+    # 일단 메인 페이지 HTML에서 파싱한 달력 사용 (공유된 결과를 고쳐 쓰지 않도록 복사)
+    available_dates = list(main_dates)
+    for date_str in available_dates:
+        freshness.mark_seen(date_str)
+    if available_dates:
+        # 달력 데이터가 메인 페이지에서 추출되면 API 호출 불필요
+        logger.info("메인 페이지에서 달력 데이터 추출 성공")
+    else:
+        # 메인 페이지에서 달력 추출 실패 시 API 호출 시도
+        logger.info(f"캘린더 데이터 요청 중: {BEARCREEK_API_URL}")
         
-        # Cloudflare 우회를 위한 추가 헤더
-        scraper.headers.update({
-            'User-Agent': get_random_user_agent(),
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.9',
-            'Accept-Language': 'ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'Cache-Control': 'max-age=0',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-            'Sec-Fetch-Dest': 'document',
-            'Sec-Fetch-Mode': 'navigate',
-            'Sec-Fetch-Site': 'none',
-            'Sec-Fetch-User': '?1',
-            'sec-ch-ua': '"Chromium";v="110", "Not A(Brand";v="24"',
-            'sec-ch-ua-mobile': '?0',
-            'sec-ch-ua-platform': '"Windows"',
-        })
+        def load_calendar_data():
+            calendar_response = scraper.post(
+                BEARCREEK_API_URL, 
+                headers=ajax_headers,
+                data=calendar_params,
+                timeout=30
+            )
+            if calendar_response.status_code != 200:
+                logger.error(f"캘린더 데이터 요청 실패: 상태 코드 {calendar_response.status_code}")
+                return None
+            # 응답 내용 저장 (디버깅 파일은 표본 사이클만, 스냅샷 보관소에는 매번 백그라운드 기록)
+            with metrics.span('page_dump'):
+                artifacts.save(f"calendar_data_{year}_{month:02d}.html", calendar_response.text, target='calendar_data')
+            return calendar_response.text
         
-        response = scraper.get(BEARCREEK_URL, timeout=30)
-        if response.status_code != 200:
-            logger.error(f"메인 페이지 접속 실패: 상태 코드 {response.status_code}")
-            
-            # 응답 내용 저장 (디버깅용)
-            with open("cloudflare_challenge.html", "w", encoding="utf-8") as f:
-                f.write(response.text)
-            logger.info("응답 내용이 cloudflare_challenge.html에 저장되었습니다.")
+        try:
+            with metrics.span('calendar_fetch'):
+                calendar_text = response_cache.fetch(BEARCREEK_API_URL, calendar_params, load_calendar_data)
             
-            # Cloudflare 우회 실패 시 새 쿠키 생성 시도
-            new_cookies = asyncio.run(generate_cookies_with_playwright())
-            if new_cookies:
-                for cookie in new_cookies:
-                    scraper.cookies.set(cookie['name'], cookie['value'], domain=cookie['domain'])
+            if calendar_text is not None:
+                # 응답된 XML/HTML에서 날짜 추출 시도
+                soup = BeautifulSoup(calendar_text, 'html.parser')
+                logger.info(f"캘린더 데이터 길이: {len(calendar_text)}")
                 
-                # 재시도
-                logger.info("새 쿠키로 메인 페이지 접속 재시도 중...")
-                response = scraper.get(BEARCREEK_URL, timeout=30)
-                if response.status_code != 200:
-                    logger.error(f"재시도 실패: 상태 코드 {response.status_code}")
-                    return False
-            else:
-                return False
-        
-        # 응답 내용 저장 (디버깅용)
-        with open("main_page.html", "w", encoding="utf-8") as f:
-            f.write(response.text)
-        logger.info("메인 페이지 내용이 main_page.html에 저장되었습니다.")
-        
-        # 2. AJAX 요청을 통해 캘린더 데이터 가져오기
-        # 요청 파라미터 설정
-        calendar_params = {
-            'strClubCode': 'N', 
-            'strLGubun': '110',
-            'strReserveDate': f'{YEAR}-{MONTH:02d}-01'
-        }
+                # 디버깅용 API 응답 출력
+                preview = calendar_text[:200].replace('\n', ' ')
+                logger.debug("캘린더 API 응답 미리보기: %s...", preview)
+        except Exception as e:
+            logger.error(f"캘린더 API 요청 중 예외 발생: {str(e)}")
+    
+    return available_dates
+
+@metrics.timed_cycle('cloudscraper')
+@profiler.profiled('cloudscraper')
+def check_available_dates():
+    """베어크리크 골프장 예약 가능 날짜 확인 (CloudScraper 사용)"""
+    import live_board
+    import freshness
+    logger.info("베어크리크 골프장 예약 확인을 시작합니다...")
+    
+    try:
+        available_dates = fetch_available_dates()
+        if available_dates is None:
+            return False
         
-        # AJAX 요청 헤더 설정 (더 자연스러운 요청 흉내)
-        ajax_headers = {
-            'X-Requested-With': 'XMLHttpRequest',
-            'Referer': BEARCREEK_URL,
-            'Origin': 'https://www.bearcreek.co.kr',
-            'Content-Type': 'application/x-www-form-urlencoded; charset=UTF-8',
-            'Accept': 'application/json, text/javascript, */*; q=0.01',
-        }
+        # 4. 결과 처리
+        # 알림 대기열 등록 시점 기록
+        freshness.mark_enqueued(available_dates)
         
-        # 일단 메인 페이지 HTML로 직접 달력 파싱 시도
-        available_dates = extract_valid_dates(response.text)
-        if available_dates:
-            # 달력 데이터가 메인 페이지에서 추출되면 API 호출 불필요
-            logger.info("메인 페이지에서 달력 데이터 추출 성공")
-        else:
-            # 메인 페이지에서 달력 추출 실패 시 API 호출 시도
-            logger.info(f"캘린더 데이터 요청 중: {BEARCREEK_API_URL}")
-            try:
-                calendar_response = scraper.post(
-                    BEARCREEK_API_URL, 
-                    headers=ajax_headers,
-                    data=calendar_params,
-                    timeout=30
+        # 라이브 보드 모드: 고정 메시지 하나만 갱신
+        if live_board.is_live_mode():
+            with metrics.span('telegram_send'):
+                live_board.update_live_board(
+                    f"{YEAR}-{MONTH:02d}",
+                    f"🏌️ <b>베어크리크 {YEAR}년 {MONTH}월 예약 현황</b>",
+                    available_dates,
+                    BEARCREEK_URL,
                 )
-                
-                if calendar_response.status_code != 200:
-                    logger.error(f"캘린더 데이터 요청 실패: 상태 코드 {calendar_response.status_code}")
-                else:
-                    # 응답 내용 저장 (디버깅용)
-                    with open(f"calendar_data_{YEAR}_{MONTH:02d}.html", "w", encoding="utf-8") as f:
-                        f.write(calendar_response.text)
-                    logger.info(f"캘린더 데이터가 calendar_data_{YEAR}_{MONTH:02d}.html에 저장되었습니다.")
-                    
-                    # 응답된 XML/HTML에서 날짜 추출 시도
-                    soup = BeautifulSoup(calendar_response.text, 'html.parser')
-                    logger.info(f"캘린더 데이터 길이: {len(calendar_response.text)}")
-                    
-                    # 디버깅용 API 응답 출력
-                    preview = calendar_response.text[:200].replace('\n', ' ')
-                    logger.info(f"캘린더 API 응답 미리보기: {preview}...")
-            except Exception as e:
-                logger.error(f"캘린더 API 요청 중 예외 발생: {str(e)}")
         
-        # 4. 결과 처리
         if available_dates:
             logger.info(f"총 {len(available_dates)}개의 예약 가능 날짜를 찾았습니다.")
+            if live_board.is_live_mode():
+                return True
             
-            # 알림 메시지 구성
-            message = f"🏌️ <b>베어크리크 예약 알림</b>\n\n"
-            message += f"{YEAR}년 {MONTH}월에 다음 날짜에 예약이 가능합니다:\n\n"
-            
-            for date_str in available_dates:
-                message += f"- {date_str}\n"
-            
-            message += f"\n예약 페이지: {BEARCREEK_URL}"
+            # 알림 메시지 구성 (4096자 초과 시 날짜 단위로 분할)
+            messages = message_renderer.render_availability(
+                "🏌️ <b>베어크리크 예약 알림</b>",
+                available_dates,
+                BEARCREEK_URL,
+                intro=f"{YEAR}년 {MONTH}월에 다음 날짜에 예약이 가능합니다:",
+                section=None,
+            )
             
             # 텔레그램 알림 전송
-            send_telegram_notification(message)
+            with metrics.span('telegram_send'):
+                for message in messages:
+                    send_telegram_notification(message)
             return True
         else:
             logger.info(f"{YEAR}년 {MONTH}월에 예약 가능한 날짜를 찾을 수 없습니다.")
@@ -447,8 +477,22 @@ def check_available_dates():
 
 def run_scheduler():
     """스케줄러 실행"""
+    import heap_monitor
+    import disk_monitor
     logger.info(f"베어크리크 예약 확인 스케줄러가 시작되었습니다. 확인 주기: {CHECK_INTERVAL_MINUTES}분")
     
+    # 메트릭 엔드포인트 시작 (METRICS_PORT 설정 시)
+    metrics.start_metrics_server()
+    
+    # SIGUSR1 수신 시 다음 사이클 프로파일링
+    profiler.install_signal_handler()
+    
+    # 힙 추적 및 RSS 상한 점검 시작 (HEAP_TRACE, MAX_RSS_MB 설정 시)
+    heap_monitor.start()
+    
+    # 디스크 압박 감시 시작 (단계에 따라 디버깅 파일/보관소/로그 보관량 축소)
+    disk_monitor.start()
+    
     # 즉시 한 번 실행
     check_available_dates()
     
@@ -459,6 +503,7 @@ def run_scheduler():
     try:
         while True:
             schedule.run_pending()
+            heap_monitor.tick()
             time.sleep(1)
     except KeyboardInterrupt:
         logger.info("Ctrl+C로 프로그램이 중단되었습니다.")
@@ -470,7 +515,9 @@ def run_scheduler():
 if __name__ == "__main__":
     logger.info("베어크리크 예약 확인 서비스가 시작되었습니다.")
     
-    # 커맨드라인 인자 확인
+    # 커맨드라인 인자 확인 (--profile N: 처음 N회 사이클 프로파일링)
+    profiler.arm_from_argv(sys.argv)
+    
     if len(sys.argv) > 1 and sys.argv[1] == "--single":
         # 단일 실행 모드
         logger.info("단일 실행 모드로 실행합니다.")